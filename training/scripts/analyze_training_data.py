@@ -53,6 +53,23 @@ class TrainingDataAnalyzer:
             except Exception as e:
                 print(f"❌ Error loading {file.name}: {e}")
         
+        # JSONL dataset shards (dataset/<data_type>/shard-NNNNN.jsonl), up to their durable size
+        manifest_path = self.output_dir / "dataset" / "manifest.json"
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                shards = json.load(f).get('shards', [])
+            print(f"📂 Found {len(shards)} dataset shards")
+            for shard in shards:
+                try:
+                    with open(manifest_path.parent / shard['path'], 'rb') as f:
+                        durable = f.read(shard['bytes'])
+                    samples = [json.loads(line) for line in durable.splitlines() if line.strip()]
+                except Exception as e:
+                    print(f"❌ Error loading {shard['path']}: {e}")
+                    continue
+                self.data_by_type[shard['data_type']].extend(samples)
+                counts[shard['data_type']] += len(samples)
+        
         print(f"\n✅ Loaded {sum(counts.values()):,} total samples")
         for dtype, count in counts.items():
             print(f"   • {dtype}: {count:,}")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Parser Benchmark and Regression Corpus
+
+Builds a versioned fixture set from failed_*.txt debug dumps (and raw
+completions in a ResponseCache), then measures ``_parse_json_response``
+recovery rate, objects recovered and µs/KB for each repair parser.
+
+Examples:
+    python scripts/benchmark_parser.py build --failed-dir data --output tests/fixtures/parser_corpus_v1.jsonl
+    python scripts/benchmark_parser.py build --cache-db training_output/response_cache.sqlite3 --output corpus.jsonl
+    python scripts/benchmark_parser.py run --corpus tests/fixtures/parser_corpus_v1.jsonl --repeat 20
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from unwritten.training.config import EnhancedTrainingConfig
+from unwritten.training.parser_corpus import (
+    benchmark_parser,
+    build_corpus,
+    harvest_failed_dumps,
+    harvest_response_cache,
+    load_corpus,
+)
+from unwritten.training.qwen3_generator import Qwen3DataGenerator
+from unwritten.training.schemas import get_schema
+
+PARSERS = ("tolerant", "legacy")
+DEFAULT_CORPUS = project_root / "tests" / "fixtures" / "parser_corpus_v1.jsonl"
+
+
+def make_parse(parser: str, output_dir: Path):
+    """``_parse_json_response`` with the given repair parser (schema = data type when registered)"""
+    config = EnhancedTrainingConfig(output_dir=str(output_dir))
+    config.structured_output["parser"] = parser
+    config.response_cache["mode"] = "off"
+    generator = Qwen3DataGenerator(config)
+
+    def parse(response_text: str, data_type: str):
+        schema = data_type if get_schema(data_type) is not None else None
+        return generator._parse_json_response(response_text, data_type, schema=schema)
+
+    return generator, parse
+
+
+def cmd_build(args) -> None:
+    entries = []
+    for directory in args.failed_dir or []:
+        found = harvest_failed_dumps(Path(directory))
+        print(f"   • {directory}: {len(found)} failed dumps")
+        entries.extend(found)
+    for path in args.cache_db or []:
+        found = harvest_response_cache(Path(path), args.data_type)
+        print(f"   • {path}: {len(found)} cached responses")
+        entries.extend(found)
+    count = build_corpus(entries, Path(args.output))
+    print(f"\n✅ Wrote {count} corpus entries to {args.output}")
+
+
+def cmd_run(args) -> None:
+    entries = load_corpus(Path(args.corpus))
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="unwritten_parser_bench_") as output_dir:
+        for parser in args.parsers:
+            generator, parse = make_parse(parser, Path(output_dir) / parser)
+            try:
+                results[parser] = benchmark_parser(entries, parse, repeat=args.repeat)
+            finally:
+                generator.client.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("\n" + "=" * 70)
+    print(f"📊 PARSER BENCHMARK ({len(entries)} responses)")
+    print("=" * 70)
+    for parser, result in results.items():
+        print(f"\n   {parser}:")
+        print(f"     • recovered:     {result['recovered']}/{result['responses']} ({result['recovery_rate']:.0%})")
+        print(f"     • objects:       {result['objects']}")
+        print(f"     • µs/KB:         {result['us_per_kb']}")
+    if len(results) > 1:
+        baseline, *others = results
+        print()
+        for entry in entries:
+            counts = [results[p]["per_entry"][entry["id"]] for p in results]
+            if len(set(counts)) > 1:
+                print(f"   Δ {entry['source']}: " + ", ".join(f"{p}={c}" for p, c in zip(results, counts)))
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parser regression corpus and benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Harvest failed dumps / cached responses into a corpus")
+    build.add_argument("--failed-dir", action="append", help="Directory searched for failed_*.txt (repeatable)")
+    build.add_argument("--cache-db", action="append", help="ResponseCache database (repeatable)")
+    build.add_argument("--data-type", action="append", help="Only cached responses of this data type")
+    build.add_argument("--output", default=str(DEFAULT_CORPUS), help="Corpus JSONL to write")
+    build.set_defaults(func=cmd_build)
+
+    run = commands.add_parser("run", help="Benchmark parsers over a corpus")
+    run.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="Corpus JSONL")
+    run.add_argument("--parsers", nargs="+", choices=PARSERS, default=list(PARSERS))
+    run.add_argument("--repeat", type=int, default=5, help="Parses per response for timing (default: 5)")
+    run.add_argument("--json", action="store_true", help="Print results as JSON")
+    run.set_defaults(func=cmd_run)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Offline Throughput Benchmark
+
+Drives MultiStepPipeline and SystematicParameterGenerator end to end against
+the record/replay fake Ollama server (no GPU needed) and reports samples/min,
+so orchestration overhead, concurrency gains and parser throughput can be
+measured before touching real hardware.
+
+Examples:
+    python scripts/benchmark_pipeline.py --samples 40 --max-in-flight 8
+    python scripts/benchmark_pipeline.py --corpus data --malformed-rate 0.1 --empty-rate 0.05
+    python scripts/benchmark_pipeline.py --cache-db training_output/response_cache.sqlite3
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from unwritten.training.config import EnhancedTrainingConfig
+from unwritten.training.fake_ollama import CompletionLibrary, FakeOllama, LatencyProfile
+from unwritten.training.multi_step_pipeline import MultiStepPipeline
+from unwritten.training.systematic_generator import SystematicParameterGenerator
+
+COMPLEXITY_TYPES = ["baseline", "people_pleasing", "misjudgment_over", "defensive_lashing", "mixed_emotions"]
+AUTHENTICITY_TARGETS = ["failed", "struggling", "authentic", "excellent"]
+CAPACITY_LEVELS = ["crisis", "low", "medium", "high"]
+
+
+def build_library(args) -> CompletionLibrary:
+    library = CompletionLibrary(seed=args.seed)
+    if args.corpus:
+        print(f"   • failed_*.txt corpus: {library.load_failed_corpus(Path(args.corpus))} responses")
+    for path in args.recordings or []:
+        print(f"   • recordings {path}: {library.load_recordings(Path(path))} responses")
+    if args.cache_db:
+        print(f"   • response cache {args.cache_db}: {library.load_response_cache(Path(args.cache_db))} responses")
+    return library
+
+
+def build_config(args, url: str, output_dir: Path) -> EnhancedTrainingConfig:
+    config = EnhancedTrainingConfig(ollama_url=f"{url}/api/generate", output_dir=str(output_dir))
+    config.ollama_concurrency["max_in_flight"] = args.max_in_flight
+    config.ollama_concurrency["default_per_model"] = args.max_in_flight
+    config.streaming["enabled"] = not args.no_stream
+    config.response_cache["mode"] = "off"
+    config.resilience["backoff_base_seconds"] = 0.0
+    config.model_scheduling["warm_up"] = False
+    return config
+
+
+def run_multi_step(config: EnhancedTrainingConfig, samples: int) -> dict:
+    pipeline = MultiStepPipeline(config)
+    per_base = pipeline.dialogues_per_base if pipeline.scenario_pool is not None else 1
+    specs = [
+        {
+            "complexity_type": COMPLEXITY_TYPES[i // per_base % len(COMPLEXITY_TYPES)],
+            "authenticity_target": AUTHENTICITY_TARGETS[i % len(AUTHENTICITY_TARGETS)],
+            "capacity_level": CAPACITY_LEVELS[i // per_base % len(CAPACITY_LEVELS)],
+            "support_needed": random.uniform(3.0, 9.0),
+        }
+        for i in range(samples)
+    ]
+    try:
+        start = time.time()
+        produced = sum(1 for interaction in pipeline.generate_fanned_out_interactions(specs) if interaction)
+        elapsed = time.time() - start
+    finally:
+        pipeline.client.close()
+    return _result(pipeline, produced, elapsed)
+
+
+def run_systematic(config: EnhancedTrainingConfig, samples: int) -> dict:
+    generator = SystematicParameterGenerator(config)
+    try:
+        start = time.time()
+        produced = len(generator.generate_systematic_emotional_batch(batch_size=samples))
+        elapsed = time.time() - start
+    finally:
+        generator.client.close()
+    return _result(generator, produced, elapsed)
+
+
+def _result(generator, produced: int, elapsed: float) -> dict:
+    return {
+        "samples": produced,
+        "seconds": round(elapsed, 2),
+        "samples_per_minute": round(produced / elapsed * 60, 1) if elapsed else 0.0,
+        "parse_outcomes": generator.parse_stats(),
+        "throughput": generator.throughput_summary()["total"],
+        "steps": generator.step_stats() if hasattr(generator, "step_stats") else None,
+        "scenario_pool": generator.pool_stats() if hasattr(generator, "pool_stats") else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generation pipelines against a fake Ollama server")
+    parser.add_argument("--samples", type=int, default=20, help="Samples per pipeline (default: 20)")
+    parser.add_argument(
+        "--pipeline",
+        choices=["multi_step", "systematic", "both"],
+        default="both",
+        help="Pipeline(s) to drive (default: both)",
+    )
+    parser.add_argument("--max-in-flight", type=int, default=4, help="Client in-flight limit (default: 4)")
+    parser.add_argument("--no-stream", action="store_true", help="Disable streaming generation")
+    parser.add_argument(
+        "--latency",
+        choices=["fixed", "uniform", "lognormal"],
+        default="lognormal",
+        help="Latency distribution (default: lognormal)",
+    )
+    parser.add_argument("--latency-median", type=float, default=0.05, help="Median seconds per request")
+    parser.add_argument("--latency-spread", type=float, default=0.5, help="Lognormal sigma / uniform ± fraction")
+    parser.add_argument("--empty-rate", type=float, default=0.0, help="Share of empty responses")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of failed_*.txt replays")
+    parser.add_argument("--load-seconds", type=float, default=0.0, help="Simulated model load time")
+    parser.add_argument("--corpus", help="Directory searched for failed_*.txt debug dumps")
+    parser.add_argument("--recordings", action="append", help='JSONL of {"schema", "response"} (repeatable)')
+    parser.add_argument("--cache-db", help="ResponseCache database to replay")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print("\n📼 Loading completions...")
+    library = build_library(args)
+
+    fake = FakeOllama(
+        library,
+        latency=LatencyProfile(args.latency, args.latency_median, args.latency_spread),
+        empty_rate=args.empty_rate,
+        malformed_rate=args.malformed_rate,
+        load_seconds=args.load_seconds,
+        seed=args.seed,
+    )
+
+    results = {}
+    with fake, tempfile.TemporaryDirectory(prefix="unwritten_benchmark_") as output_dir:
+        if args.pipeline in ("multi_step", "both"):
+            results["multi_step"] = run_multi_step(build_config(args, fake.url, Path(output_dir) / "multi_step"), args.samples)
+        if args.pipeline in ("systematic", "both"):
+            results["systematic"] = run_systematic(build_config(args, fake.url, Path(output_dir) / "systematic"), args.samples)
+        results["server"] = fake.stats()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("\n" + "=" * 70)
+    print("📊 BENCHMARK RESULTS (fake Ollama)")
+    print("=" * 70)
+    for name in ("multi_step", "systematic"):
+        if name not in results:
+            continue
+        result = results[name]
+        print(f"\n   {name}:")
+        print(f"     • samples:        {result['samples']}")
+        print(f"     • wall time:      {result['seconds']}s")
+        print(f"     • samples/min:    {result['samples_per_minute']}")
+        print(f"     • Ollama calls:   {result['throughput']['calls']}")
+        print(f"     • parse outcomes: {result['parse_outcomes']}")
+        for step, stats in (result["steps"] or {}).items():
+            print(
+                f"     • step {step:<11} max queue={stats['max_queue_depth']:<4} "
+                f"p50={stats['latency_p50']}s p95={stats['latency_p95']}s wait p50={stats['queue_wait_p50']}s"
+            )
+    print(f"\n   server: {results['server']}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,26 +20,16 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
 from unwritten.training.config import EnhancedTrainingConfig, initialize_enhanced_config
+from unwritten.training.dataset_writer import DatasetWriter
+from unwritten.training.job_journal import JobJournal
 from unwritten.training.multi_step_pipeline import MultiStepPipeline
+from unwritten.training.ollama_client import check_ollama_connection
 from unwritten.utils.logger import AppLogger
 import random
 import json
 from datetime import datetime
 
 
-def check_ollama_connection(url: str = "http://localhost:11434/api/tags") -> bool:
-    """Check if Ollama service is running"""
-    import requests
-    
-    try:
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        return True
-    except Exception as e:
-        AppLogger.error("Failed to connect to Ollama service", e)
-        return False
-
-
 def display_systematic_features():
     """Display systematic approach improvements"""
     print("\n" + "=" * 70)
@@ -156,7 +146,10 @@ def main():
     print(f"Estimated time: ~{target_samples * 2:.0f} minutes ({target_samples * 2 / 60:.1f} hours)")
     
     print(f"\n✅ MULTI-STEP PIPELINE BENEFITS:")
-    print(f"  • Step 1: NPC Primitives (name, OCEAN, trust) - ~12 sec")
+    if pipeline.npc_synthesizer is not None:
+        print(f"  • Step 1: NPC Primitives (name, OCEAN, trust) - local Latin hypercube, <1 sec")
+    else:
+        print(f"  • Step 1: NPC Primitives (name, OCEAN, trust) - ~12 sec")
     print(f"  • Step 2: Context (capacity, urgency, situation) - ~40 sec")
     print(f"  • Step 3: Tension/Subtext (hooks, subtext) - ~15 sec")
     print(f"  • Step 4: Dialogue (60-120 word prose) - ~20 sec")
@@ -170,9 +163,12 @@ def main():
     print(f"  • Round-robin selection ensures even distribution")
     
     print("\n💡 IMPORTANT:")
-    print("  • Each interaction saved to batch JSON file")
-    print("  • Progress updates every 10 samples")
-    print("  • Press Ctrl+C to stop early (data preserved)")
+    if config.dataset_writer.get("enabled", False):
+        print("  • Each chunk appended to JSONL dataset shards as it finishes")
+    else:
+        print("  • Each interaction saved to batch JSON file")
+    print("  • Progress updates after every pipelined chunk")
+    print("  • Press Ctrl+C to stop early (data preserved, rerun to resume)")
     print("  • Generated dialogues include proper contractions")
     
     print("\n" + "=" * 70)
@@ -181,6 +177,12 @@ def main():
     
     print("\n🎯 Starting multi-step data generation...\n")
     
+    # Crash-safe journal (resumes an interrupted run with the same target)
+    journal = JobJournal.from_config(config, "multi_step", {"target_samples": target_samples})
+    # Interactions are appended to JSONL shards per chunk instead of held until the end
+    writer = DatasetWriter.from_config(config)
+    data_type = "multi_step_interactions"
+    
     # Define parameter spaces for systematic coverage
     complexity_types = ["baseline", "people_pleasing", "misjudgment", "defensive_lashing", 
                        "emotional_shutdown", "over_commitment", "avoidance", "projection"]
@@ -196,55 +198,111 @@ def main():
         }
         
         generated_interactions = []
+        generated_count = 0
         start_time = datetime.now()
         
-        # Generate interactions
-        for i in range(target_samples):
-            # Systematic selection (round-robin with randomization)
-            complexity_type = complexity_types[i % len(complexity_types)]
-            authenticity_target = authenticity_targets[i % len(authenticity_targets)]
-            capacity_level = capacity_levels[i % len(capacity_levels)]
-            support_needed = random.uniform(3.0, 9.0)
+        # Plan every interaction up front; an interrupted run resumes its plan
+        specs = journal.planned() if journal is not None and journal.resumed else {}
+        if specs:
+            journal.restore_rng_state()
+            print(f"\n♻️  Resuming interrupted run {journal.run_id}: {journal.stats()}")
+        else:
+            # Consecutive interactions share complexity and capacity, so they fan out from one pooled base
+            per_base = pipeline.dialogues_per_base if pipeline.scenario_pool is not None else 1
+            for i in range(target_samples):
+                # Systematic selection (round-robin with randomization)
+                group = i // per_base
+                specs[f"interaction:{i}"] = {
+                    "complexity_type": complexity_types[group % len(complexity_types)],
+                    "authenticity_target": authenticity_targets[i % len(authenticity_targets)],
+                    "capacity_level": capacity_levels[group % len(capacity_levels)],
+                    "support_needed": random.uniform(3.0, 9.0),
+                    # Ordinal of the group's NPC within its complexity type (its hypercube stratum)
+                    "npc_index": group // len(complexity_types),
+                }
+                if journal is not None:
+                    journal.plan(f"interaction:{i}", specs[f"interaction:{i}"])
+        completed = journal.completed() if journal is not None else {}
+        
+        # Restore interactions finished before an interruption
+        pending = []
+        for key, spec in specs.items():
+            if key in completed:
+                if writer is None:
+                    generated_interactions.extend(completed[key])  # With a writer they are already in the shards
+                generated_count += len(completed[key])
+                coverage_stats['authenticity_spectrum'][spec["authenticity_target"]] += 1
+                coverage_stats['complexity_types'][spec["complexity_type"]] += 1
+                coverage_stats['capacity_levels'][spec["capacity_level"]] += 1
+            else:
+                pending.append((key, spec))
+        
+        # Generate interactions in pipelined chunks (steps of different interactions overlap)
+        chunk_size = pipeline.step_executor.max_in_flight * 4 * pipeline.dialogues_per_base
+        run_tag = journal.run_id if journal is not None else start_time.strftime("%Y%m%d_%H%M%S")
+        done_count = generated_count
+        for offset in range(0, len(pending), chunk_size):
+            chunk = pending[offset:offset + chunk_size]
+            print(f"\n[{done_count + 1}-{done_count + len(chunk)}/{target_samples}] Generating {len(chunk)} interactions")
             
-            try:
-                print(f"\n[{i+1}/{target_samples}] Generating: {complexity_type}, {authenticity_target}, {capacity_level}")
-                
-                interaction = pipeline.generate_complete_interaction(
-                    complexity_type=complexity_type,
-                    authenticity_target=authenticity_target,
-                    capacity_level=capacity_level,
-                    support_needed=support_needed
-                )
-                
-                generated_interactions.append(interaction)
+            if journal is not None:
+                for key, _ in chunk:
+                    journal.start(key)
+            # Interaction IDs key the stored step outputs, so a resumed run reuses finished steps
+            interactions = pipeline.generate_fanned_out_interactions(
+                [{**spec, "interaction_id": f"{run_tag}:{key}"} for key, spec in chunk]
+            )
+            
+            finished = []
+            for (key, spec), interaction in zip(chunk, interactions):
+                if interaction is None:
+                    print(f"❌ Failed: {spec['complexity_type']}, {spec['authenticity_target']}, {spec['capacity_level']}")
+                    if journal is not None:
+                        journal.fail(key, "pipeline step failed")
+                    continue
+                finished.append((key, interaction))
                 
                 # Update coverage stats
-                coverage_stats['authenticity_spectrum'][authenticity_target] += 1
-                coverage_stats['complexity_types'][complexity_type] += 1
-                coverage_stats['capacity_levels'][capacity_level] += 1
-                
-                # Progress update every 10 samples
-                if (i + 1) % 10 == 0:
-                    elapsed = (datetime.now() - start_time).total_seconds()
-                    avg_time = elapsed / (i + 1)
-                    remaining = avg_time * (target_samples - (i + 1))
-                    print(f"\n📊 Progress: {i+1}/{target_samples} ({(i+1)/target_samples*100:.1f}%)")
-                    print(f"   Time: {elapsed/60:.1f} min elapsed, ~{remaining/60:.1f} min remaining")
-                
-            except Exception as e:
-                AppLogger.error(f"Failed to generate interaction {i+1}", e)
-                print(f"❌ Failed: {str(e)}")
-                continue
-        
-        # Save all interactions to a batch file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        batch_filename = f"multi_step_batch_{timestamp}.json"
-        output_path = Path(config.output_dir) / batch_filename
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(generated_interactions, f, indent=2)
+                coverage_stats['authenticity_spectrum'][spec["authenticity_target"]] += 1
+                coverage_stats['complexity_types'][spec["complexity_type"]] += 1
+                coverage_stats['capacity_levels'][spec["capacity_level"]] += 1
+            
+            if writer is not None:
+                # Durable in the shards before the journal marks them complete
+                writer.write_many(data_type, [interaction for _, interaction in finished])
+                writer.flush()
+            else:
+                generated_interactions.extend(interaction for _, interaction in finished)
+            generated_count += len(finished)
+            if journal is not None:
+                for key, interaction in finished:
+                    journal.complete(key, [interaction])
+                journal.save_rng_state()
+            
+            # Progress update after every chunk
+            done_count += len(chunk)
+            elapsed = (datetime.now() - start_time).total_seconds()
+            avg_time = elapsed / done_count
+            remaining = avg_time * (target_samples - done_count)
+            print(f"\n📊 Progress: {done_count}/{target_samples} ({done_count/target_samples*100:.1f}%)")
+            print(f"   Time: {elapsed/60:.1f} min elapsed, ~{remaining/60:.1f} min remaining")
         
-        print(f"\n💾 Saved {len(generated_interactions)} interactions to: {output_path}")
+        if writer is not None:
+            writer.close()
+            output_path = writer.shard_path(data_type)
+            print(f"\n💾 Appended {generated_count} interactions to shards in: {output_path}")
+        else:
+            # Save all interactions to a batch file
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            batch_filename = f"multi_step_batch_{timestamp}.json"
+            output_path = Path(config.output_dir) / batch_filename
+            
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(generated_interactions, f, indent=2)
+            
+            print(f"\n💾 Saved {len(generated_interactions)} interactions to: {output_path}")
+        if journal is not None:
+            journal.finish()
         
         # Display final summary
         print("\n" + "=" * 70)
@@ -252,14 +310,14 @@ def main():
         print("=" * 70)
         
         print("\n✅ SAMPLES GENERATED:")
-        print(f"  Total: {len(generated_interactions):,} samples")
+        print(f"  Total: {generated_count:,} samples")
         print(f"  Target: {target_samples:,} samples")
-        completion = (len(generated_interactions) / target_samples * 100) if target_samples > 0 else 0
+        completion = (generated_count / target_samples * 100) if target_samples > 0 else 0
         print(f"  Achievement: {completion:.1f}%")
         
         total_time = (datetime.now() - start_time).total_seconds()
         print(f"  Total time: {total_time/60:.1f} minutes")
-        print(f"  Average: {total_time/len(generated_interactions):.1f} seconds per interaction")
+        print(f"  Average: {total_time/max(1, generated_count):.1f} seconds per interaction")
         
         print(f"\n📈 SYSTEMATIC COVERAGE ACHIEVED:")
         print(f"  Authenticity spectrum:")
@@ -281,13 +339,23 @@ def main():
         print("  • All samples generated with multi-step pipeline")
         print("  • Novel-quality prose with proper contractions")
         print("  • Systematic parameter space coverage")
-        print("  • See batch file for complete interaction data")
+        print("  • See output location for complete interaction data")
+        
+        print(f"\n⏱️  Per-step pipeline stats: {pipeline.step_stats()}")
+        print(f"♻️  Scenario pool: {pipeline.pool_stats()}")
+        if pipeline.npc_synthesizer is not None:
+            print(f"🎲 NPC synthesizer: {pipeline.npc_synthesizer.stats()}")
+        if pipeline.telemetry is not None:
+            print(pipeline.telemetry.format_summary())
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Generation interrupted by user")
         
         # Save partial data
-        if generated_interactions:
+        if writer is not None:
+            writer.close()  # Finished chunks are already in the shards
+            print(f"💾 {generated_count} interactions in shards at: {writer.shard_path(data_type)}")
+        elif generated_interactions:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             batch_filename = f"multi_step_batch_PARTIAL_{timestamp}.json"
             output_path = Path(config.output_dir) / batch_filename
@@ -309,7 +377,7 @@ def main():
     
     print(f"\n📍 NEXT STEPS:")
     print(f"  1. Review generated interactions:")
-    print(f"     - Open batch file in JSON viewer")
+    print(f"     - Open the batch file (or JSONL shards) in a JSON viewer")
     print(f"     - Check dialogue quality and variety")
     print(f"  2. Analyze data quality:")
     print(f"     - Verify authenticity spectrum coverage")
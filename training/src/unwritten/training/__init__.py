@@ -11,6 +11,7 @@ from .config import TrainingConfig, EnhancedTrainingConfig, initialize_enhanced_
 from .systematic_generator import SystematicParameterGenerator
 from .multi_step_systematic import MultiStepSystematicGenerator
 from .validation import TrainingDataValidator
+from .ollama_client import OllamaClient, AsyncOllamaClient
 
 __all__ = [
     'Qwen3DataGenerator',
@@ -19,6 +20,8 @@ __all__ = [
     'initialize_enhanced_config',
     'SystematicParameterGenerator',
     'MultiStepSystematicGenerator',
-    'TrainingDataValidator'
+    'TrainingDataValidator',
+    'OllamaClient',
+    'AsyncOllamaClient'
 ]
 
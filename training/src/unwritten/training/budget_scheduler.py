@@ -0,0 +1,171 @@
+"""
+Deadline-Aware Budget Scheduler
+
+A :class:`~.job_queue.JobQueue` that spends a fixed time window instead of a
+fixed batch count. It measures each data type's yield (accepted samples per
+GPU-minute) live, and hands the next worker slot to the type with the
+largest weighted quota progress per minute:
+
+    score = weight * (yield per minute / target)
+
+``weight`` comes from the type's quality threshold, so stricter types get
+budget first. The greedy choice is the optimum for progress that is linear
+until a quota is met. Types that have not run yet borrow their model's
+yield, then the overall mean, and go first while nothing has been measured.
+
+Near the deadline no job is started that is not expected to finish in
+time, so the run drains and ends on schedule. With ``fill_window`` the queue
+keeps generating past the quotas, in proportion to the targets, until the
+deadline, so an overnight run uses the whole window.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .job_queue import GenerationJob, JobQueue, TypeQuota
+
+
+class YieldTracker:
+    """EWMA of samples per GPU-minute and seconds per job, by data type and by model"""
+
+    def __init__(self, alpha: float = 0.3):
+        self.alpha = alpha
+        self._rates: Dict[str, float] = {}
+        self._durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _update(self, table: Dict[str, float], key: str, value: float) -> None:
+        previous = table.get(key)
+        table[key] = value if previous is None else previous + self.alpha * (value - previous)
+
+    def record(self, data_type: str, model: Optional[str], samples: int, seconds: float) -> None:
+        seconds = max(seconds, 1e-3)
+        rate = samples / (seconds / 60)
+        with self._lock:
+            for key in (f"type:{data_type}", f"model:{model}", "all"):
+                self._update(self._rates, key, rate)
+                self._update(self._durations, key, seconds)
+
+    def _lookup(self, table: Dict[str, float], data_type: str, model: Optional[str]) -> Optional[float]:
+        with self._lock:
+            for key in (f"type:{data_type}", f"model:{model}", "all"):
+                if key in table:
+                    return table[key]
+        return None
+
+    def rate(self, data_type: str, model: Optional[str] = None) -> Optional[float]:
+        """Samples per GPU-minute (None before anything was measured)"""
+        return self._lookup(self._rates, data_type, model)
+
+    def job_seconds(self, data_type: str, model: Optional[str] = None) -> Optional[float]:
+        return self._lookup(self._durations, data_type, model)
+
+    def measured(self, data_type: str) -> bool:
+        with self._lock:
+            return f"type:{data_type}" in self._rates
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                key.split(":", 1)[1]: {
+                    "samples_per_gpu_minute": round(rate, 2),
+                    "seconds_per_job": round(self._durations[key], 1),
+                }
+                for key, rate in self._rates.items()
+                if key != "all"
+            }
+
+
+class BudgetedJobQueue(JobQueue):
+    """Job queue that allocates a time budget by measured yield"""
+
+    def __init__(
+        self,
+        quotas: List[TypeQuota],
+        deadline: float,
+        weights: Optional[Dict[str, float]] = None,
+        models: Optional[Dict[str, str]] = None,
+        fill_window: bool = False,
+        alpha: float = 0.3,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(quotas)
+        self.deadline = deadline
+        self.weights = weights or {}
+        self.models = models or {}
+        self.fill_window = fill_window
+        self.clock = clock
+        self.yields = YieldTracker(alpha)
+        self.draining = False
+        self.skipped_for_deadline = 0
+        self._started: Dict[str, float] = {}
+
+    @property
+    def remaining_seconds(self) -> float:
+        return self.deadline - self.clock()
+
+    def _score(self, quota: TypeQuota) -> Tuple[int, float]:
+        """Sort key (higher first): unmeasured types, then weighted quota progress per minute"""
+        if not self.yields.measured(quota.data_type):
+            return (1, -quota.priority)
+        rate = self.yields.rate(quota.data_type, self.models.get(quota.data_type)) or 0.0
+        weight = self.weights.get(quota.data_type, 1.0)
+        if self.fill_window and not quota.wants_more():
+            # Past the quota: keep types in proportion to their targets
+            return (0, weight * rate / max(1, quota.samples + quota.target_samples))
+        return (0, weight * rate / max(1, quota.target_samples))
+
+    def _fits(self, quota: TypeQuota, remaining: float) -> bool:
+        expected = self.yields.job_seconds(quota.data_type, self.models.get(quota.data_type))
+        return expected is None or expected <= remaining
+
+    def next_job(self) -> Optional[GenerationJob]:
+        with self._lock:
+            remaining = self.remaining_seconds
+            if remaining <= 0:
+                self.draining = True
+                return None
+
+            candidates = [quota for quota in self.quotas.values() if quota.wants_more()]
+            if not candidates and self.fill_window:
+                candidates = [quota for quota in self.quotas.values() if quota.target_samples > 0]
+            fitting = [quota for quota in candidates if self._fits(quota, remaining)]
+            if len(fitting) < len(candidates):
+                self.skipped_for_deadline += 1
+            if not fitting:
+                self.draining = self.draining or bool(candidates)
+                return None
+
+            quota = max(fitting, key=self._score)
+            job = GenerationJob(quota.data_type, quota.issued)
+            quota.issued += 1
+            quota.in_flight += 1
+            self._started[job.key] = self.clock()
+            return job
+
+    def complete(self, job: GenerationJob, samples: int) -> None:
+        with self._lock:
+            started = self._started.pop(job.key, None)
+        if started is not None:
+            self.yields.record(job.data_type, self.models.get(job.data_type), samples, self.clock() - started)
+        super().complete(job, samples)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = super().stats()
+        for data_type, measured in self.yields.stats().items():
+            if data_type in stats:
+                stats[data_type].update(measured)
+        return stats
+
+    def budget_stats(self) -> Dict[str, Any]:
+        return {
+            "remaining_seconds": round(max(0.0, self.remaining_seconds), 1),
+            "draining": self.draining,
+            "deadline_skips": self.skipped_for_deadline,
+            "models": {
+                key: value
+                for key, value in self.yields.stats().items()
+                if key not in self.quotas
+            },
+        }
@@ -202,6 +202,52 @@ class EnhancedTrainingConfig:
             "coverage_report_frequency": 10,  # Generate report every 10 batches
             "gap_filling_priority": True,  # Prioritize filling gaps
             "max_duplicate_combinations": 2,  # Max times to generate same parameter combo
+            # Coverage counts live in memory; the database is written behind in batches
+            "flush_every": 25,  # Increments per batched INSERT ... ON CONFLICT transaction
+            "flush_seconds": 30.0,  # Or at least this often
+            # Cycle coverage is a streaming CoverageAccumulator (O(1) per sample)
+            "histogram_bins": 10,  # Authenticity histogram bins per parameter cell
+            "keep_examples": True,  # False: cycle result omits examples (batches are on disk)
+        }
+    )
+
+    # Per-cell quotas (capacity x authenticity x complexity) from the
+    # systematic_coverage weights and target_emotional_authenticity; the
+    # systematic generators lease scenarios by largest remaining deficit
+    # from a shared plan (output_dir/scenario_plan.db)
+    scenario_planner: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "path": None,  # Defaults to <output_dir>/scenario_plan.db
+            "min_per_cell": 1,
+            "plan_chunk": 256,  # Slots appended to the plan at a time
+            "lease_seconds": 1800,  # Unfinished leases return to the plan after this
+            "worker_id": None,  # Defaults to <hostname>:<pid>
+        }
+    )
+
+    # One row per generation attempt (cell, model, latencies, tokens, parse
+    # outcome, validation score, output file offset) with indexed analytics
+    # queries for reports and schedulers (output_dir/generation_ledger.db)
+    generation_ledger: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "path": None,  # Defaults to <output_dir>/generation_ledger.db
+            "flush_every": 50,  # Rows per batched insert
+        }
+    )
+
+    # Generated samples are appended as compact JSONL to size-rotated shards
+    # (output_dir/dataset/<data_type>/) by a background writer with batched
+    # fsync and an atomic manifest, instead of one indented JSON file per batch
+    dataset_writer: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "directory": None,  # Defaults to <output_dir>/dataset
+            "shard_mb": 64,  # Rotate shards at this size
+            "fsync_every": 256,  # Records per fsync + manifest update
+            "fsync_seconds": 2.0,  # Or at least this often
+            "queue_size": 4096,  # Queued records before write() blocks
         }
     )
 
@@ -335,6 +381,267 @@ class EnhancedTrainingConfig:
         }
     )
 
+    # ===================================================================
+    # THROUGHPUT: CONCURRENT GENERATION (NEW)
+    # ===================================================================
+
+    # Keeps several requests in flight so OLLAMA_NUM_PARALLEL slots stay busy
+    ollama_concurrency: Dict = field(
+        default_factory=lambda: {
+            "max_in_flight": 4,  # Match OLLAMA_NUM_PARALLEL on the server (default 4)
+            "default_per_model": 2,  # In-flight cap for models not listed below
+            "per_model": {},  # e.g. {"qwen3:30b": 1} for memory-heavy models
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: STREAMING WITH EARLY STOP (NEW)
+    # ===================================================================
+
+    # Stream tokens and close the request once the JSON is complete or off-schema
+    streaming: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "max_preamble_chars": 400,  # Prose allowed before the first [ or { (think blocks excluded)
+            "max_response_chars": 24000,  # ~6000 tokens; beyond max_tokens=4000 is runaway output
+            "repetition_min_period": 16,  # Shortest repeated span that counts as a loop
+            "repetition_max_period": 200,  # Longest repeated span checked
+            "repetition_repeats": 4,  # Consecutive copies before aborting
+            "completion_grace_chunks": 8,  # Chunks allowed after the JSON closes (keeps final metrics)
+            "return_partial_on_abort": True,  # Hand truncated JSON to the parser (repetition/length)
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: PERSISTENT RESPONSE CACHE (NEW)
+    # ===================================================================
+
+    # Raw completions stored in output_dir/llm_cache.db
+    # off | read_through (resume a crashed run) | write_through (record only) | replay (no GPU)
+    response_cache: Dict = field(
+        default_factory=lambda: {
+            "mode": "write_through",
+            "path": None,  # Defaults to <output_dir>/llm_cache.db
+            "max_size_mb": 2048,
+            "max_age_days": 90,
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: MODEL-AFFINITY SCHEDULING (NEW)
+    # ===================================================================
+
+    # 12GB VRAM holds one of 8b/30b/32b: admit requests in per-model waves
+    # so Ollama does not unload/reload weights between interleaved calls.
+    # With waves on, in-flight requests are bounded by the active model's
+    # per_model limit in ollama_concurrency.
+    model_scheduling: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "max_wave": 32,  # Admissions per wave before yielding to a waiting model
+            "keep_alive": "30m",  # Keep weights resident between waves
+            "warm_up": True,  # Load each model explicitly before its phase
+            "warm_up_timeout": 600,
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: STATIC PROMPT-PREFIX REUSE (NEW)
+    # ===================================================================
+
+    # Batch prompts send their static instructions/schema as a stable prefix
+    # chat:    prefix as /api/chat system message (KV prefix reused by the runner)
+    # context: prime the prefix once and pass Ollama's returned context
+    # off:     legacy single prompt
+    prefix_reuse: Dict = field(
+        default_factory=lambda: {
+            "strategy": "chat",
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: SCHEMA-CONSTRAINED OUTPUT (NEW)
+    # ===================================================================
+
+    # Send each data type's JSON schema as Ollama's `format` so decoding is
+    # constrained; responses are validated on receipt and only fall back to
+    # the repair parser when strict parsing fails
+    structured_output: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "drop_invalid_items": True,  # Drop array items that fail the schema after repair
+            "parser": "tolerant",  # Repair parser: "tolerant" (single pass, json_extract) or "legacy"
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: ADAPTIVE TIMEOUTS, RETRIES, CIRCUIT BREAKER (NEW)
+    # ===================================================================
+
+    # Static timeouts above become ceilings; once a model has min_samples
+    # successful calls its timeout is p99 * timeout_multiplier
+    resilience: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "latency_window": 200,  # Rolling successful-call latencies per model
+            "min_samples": 5,
+            "timeout_multiplier": 3.0,
+            "min_timeout": 60,  # Never drop an adaptive timeout below this (seconds)
+            "max_attempts": 3,  # Including the first attempt
+            "backoff_base_seconds": 2.0,  # Full jitter: uniform(0, base * 2**retry)
+            "backoff_max_seconds": 60.0,
+            "failure_threshold": 3,  # Consecutive failures/empty responses before opening
+            "cooldown_seconds": 300,  # Open circuit pauses the model this long
+            "fallback_models": {},  # e.g. {"qwen3:30b-a3b": "qwen3:8b"} while a circuit is open
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: MULTI-ENDPOINT OLLAMA POOL (NEW)
+    # ===================================================================
+
+    # Empty endpoints: single host at ollama_url. Otherwise requests go to the
+    # least-loaded healthy host serving the model, e.g.
+    # [{"url": "http://gpu-1:11434", "models": ["qwen3:30b-a3b"], "max_in_flight": 4},
+    #  {"url": "http://gpu-2:11434", "max_in_flight": 2}]  # no models: discover via /api/tags
+    endpoint_pool: Dict = field(
+        default_factory=lambda: {
+            "endpoints": [],
+            "drain_seconds": 60,  # Failed hosts sit out this long before a health check
+            "failure_threshold": 3,  # Consecutive request failures before draining a host
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: TOKEN-LEVEL TELEMETRY (NEW)
+    # ===================================================================
+
+    # Per-call prompt/eval token counts and prefill/decode/load timings,
+    # tagged by model, data type and pipeline step
+    telemetry: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "metrics_file": None,  # None: <output_dir>/metrics/ollama_calls_<timestamp>.jsonl
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: CONCURRENT JOB QUEUE (NEW)
+    # ===================================================================
+
+    # run_production_cycle queues every (data_type, batch) as a job on one
+    # worker pool: lower priority runs first, and each type stops once its
+    # target_* quota of samples is collected (failed batches are replaced)
+    job_queue: Dict = field(
+        default_factory=lambda: {
+            "workers": None,  # None: ollama_concurrency.max_in_flight
+            "priorities": {
+                "emotional_authenticity": 0,
+                "dramatic_irony": 1,
+                "tension_building": 1,
+                "memory_resonance": 1,
+                "personality_traits": 2,
+                "relationship_scoring": 2,
+            },
+            "max_batch_factor": 1.5,  # Batch cap per type = expected batches * factor
+            "rate_limit_per_second": None,  # Job dispatch rate limit (None = unlimited)
+            "burst": 4,
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: DEADLINE-AWARE BUDGET SCHEDULING (NEW)
+    # ===================================================================
+
+    # run_production_cycle(duration_hours=...) spends the window by measured
+    # yield (samples per GPU-minute, weighted by quality_thresholds) and
+    # stops starting jobs that would not finish before the deadline
+    budget_scheduler: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "fill_window": False,  # Keep generating past the target_* quotas until the deadline
+            "ewma_alpha": 0.3,  # Smoothing of the live yield measurements
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: PIPELINED MULTI-STEP EXECUTION (NEW)
+    # ===================================================================
+
+    # MultiStepPipeline.generate_complete_interactions runs the five steps of
+    # many interactions as a DAG; steps of different interactions overlap
+    pipeline_executor: Dict = field(
+        default_factory=lambda: {
+            "max_in_flight": None,  # None: ollama_concurrency.max_in_flight
+            "per_step": {},  # e.g. {"dialogue": 2} to cap the long dialogue step
+            "per_model": {},  # e.g. {"qwen3:30b": 2}; the client's per_model limit still applies
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: STEP MEMOIZATION AND PARTIAL RETRY (NEW)
+    # ===================================================================
+
+    # Multi-step outputs stored per interaction ID (output_dir/step_store.db);
+    # a failed step is retried on its own with nudged temperature and a new
+    # seed instead of discarding the whole interaction
+    step_store: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "path": None,  # Defaults to <output_dir>/step_store.db
+            "max_step_attempts": 3,
+            "temperature_step": 0.05,  # Added to the step temperature per retry
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: REUSABLE SCENARIO POOL (NEW)
+    # ===================================================================
+
+    # Validated NPC primitives + context bases (output_dir/scenario_pool.db)
+    # shared by several dialogues each, so a finished sample costs ~1.3 LLM
+    # calls instead of 4; reuse is capped per base to protect diversity
+    scenario_pool: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "path": None,  # Defaults to <output_dir>/scenario_pool.db
+            "dialogues_per_base": 5,  # Dialogues fanned out per draw (one tension each draw)
+            "max_uses": 15,  # Dialogues drawn from one base over its lifetime
+            "new_base_fraction": 0.2,  # Draws that generate a new base even when one is free
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: LOCAL NPC PRIMITIVE SYNTHESIS (NEW)
+    # ===================================================================
+
+    # Multi-step step 1 (OCEAN, capacity, trust, relationship, name) drawn by
+    # a seeded Latin hypercube sampler conditioned on complexity type instead
+    # of an LLM call; names come from a bank and repeat only once it runs out
+    npc_synthesizer: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "seed": 1729,  # Keyed NPCs are derived from (seed, type, npc_index); None picks a seed per run
+            "block_size": 64,  # NPCs per stratified block (per complexity type)
+            "names_path": None,  # Defaults to <output_dir>/npc_names_used.txt
+        }
+    )
+
+    # ===================================================================
+    # THROUGHPUT: DURABLE JOB JOURNAL (NEW)
+    # ===================================================================
+
+    # Append-only log of planned / in-flight / completed work items, their
+    # samples and the RNG state (output_dir/job_journal.db); an interrupted
+    # run with the same parameters resumes where it stopped
+    job_journal: Dict = field(
+        default_factory=lambda: {
+            "enabled": True,
+            "path": None,  # Defaults to <output_dir>/job_journal.db
+            "resume": True,  # False: always start a fresh run
+        }
+    )
+
     # ===================================================================
     # IMPROVEMENT 11: MODE-SPECIFIC OVERRIDES
     # ===================================================================
@@ -509,6 +816,28 @@ class EnhancedTrainingConfig:
         if self.batch_processing["batch_api_max_examples"] > 10:
             raise ValueError("batch_api_max_examples should not exceed 10 for quality")
 
+        if self.ollama_concurrency["max_in_flight"] < 1:
+            raise ValueError("ollama_concurrency.max_in_flight must be at least 1")
+
+        if self.prefix_reuse.get("strategy", "off") not in ("chat", "context", "off"):
+            raise ValueError("prefix_reuse.strategy must be 'chat', 'context' or 'off'")
+
+        if self.structured_output.get("parser", "tolerant") not in ("tolerant", "legacy"):
+            raise ValueError("structured_output.parser must be 'tolerant' or 'legacy'")
+
+        for endpoint in self.endpoint_pool.get("endpoints", []):
+            if "url" not in endpoint:
+                raise ValueError("endpoint_pool.endpoints entries need a 'url'")
+
+        if self.resilience.get("max_attempts", 1) < 1:
+            raise ValueError("resilience.max_attempts must be at least 1")
+
+        if (self.job_queue.get("workers") or 1) < 1:
+            raise ValueError("job_queue.workers must be at least 1")
+
+        if self.scenario_pool.get("dialogues_per_base", 1) > self.scenario_pool.get("max_uses", 1):
+            raise ValueError("scenario_pool.dialogues_per_base cannot exceed scenario_pool.max_uses")
+
         # Create output directory
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir, exist_ok=True)
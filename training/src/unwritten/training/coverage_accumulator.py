@@ -0,0 +1,187 @@
+"""
+Streaming Coverage Accumulator
+
+``track_generation_coverage`` used to re-walk every sample generated so far
+after each batch (O(n²) over a run, with every sample held in memory just to
+be counted). The accumulator folds each sample in once:
+
+- Counts per authenticity bucket, capacity level and complexity type
+- Running mean/variance of ``authenticity_score`` (Welford)
+- A fixed-bin authenticity histogram per (capacity level, authenticity
+  target, complexity type) cell
+
+Updates and reports cost the same at sample 100 and sample 100,000.
+``snapshot()`` returns a JSON-ready dict and ``merge()`` combines
+accumulators (or snapshots) from parallel workers exactly.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+
+Cell = Tuple[str, str, str]  # (capacity_level, authenticity_target, complexity_type)
+
+# Upper bound (exclusive) of each authenticity bucket, checked in order
+AUTHENTICITY_BUCKETS = [
+    ("failed (0.2-0.4)", 0.4),
+    ("struggling (0.4-0.6)", 0.6),
+    ("authentic (0.6-0.8)", 0.8),
+    ("excellent (0.8-1.0)", math.inf),
+]
+
+REQUIRED_MINIMUMS = {
+    "failed (0.2-0.4)": 2,
+    "struggling (0.4-0.6)": 3,
+    "authentic (0.6-0.8)": 4,
+    "excellent (0.8-1.0)": 3,
+}
+
+REQUIRED_COMPLEXITY = [
+    "baseline",
+    "people_pleasing",
+    "misjudgment_over",
+    "emergency_override",
+    "mixed_emotions",
+]
+
+DEFAULT_SCORE = 0.8  # Assumed when a sample carries no usable authenticity_score
+
+
+def _bump(counts: Dict[str, int], key: str, count: int = 1) -> None:
+    counts[key] = counts.get(key, 0) + count
+
+
+class CoverageAccumulator:
+    """O(1)-per-sample coverage counts, authenticity moments and per-cell histograms"""
+
+    def __init__(self, histogram_bins: int = 10):
+        self.histogram_bins = max(1, histogram_bins)
+        self.total = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the running mean
+        self.authenticity: Dict[str, int] = {}
+        self.capacity: Dict[str, int] = {}
+        self.complexity: Dict[str, int] = {}
+        self.histograms: Dict[Cell, List[int]] = {}
+
+    def update(self, example: Dict) -> None:
+        """Fold one sample into the counts"""
+        try:
+            score = float(example.get("authenticity_score", DEFAULT_SCORE))
+        except (TypeError, ValueError):
+            score = DEFAULT_SCORE
+
+        self.total += 1
+        delta = score - self.mean
+        self.mean += delta / self.total
+        self._m2 += delta * (score - self.mean)
+
+        bucket = next(name for name, upper in AUTHENTICITY_BUCKETS if score < upper)
+        _bump(self.authenticity, bucket)
+
+        metadata = example.get("_systematic_metadata", {})
+        complexity = metadata.get("complexity_type", example.get("complexity_type", "unknown"))
+        capacity = metadata.get("capacity_level", "unknown")
+        _bump(self.complexity, complexity)
+        _bump(self.capacity, capacity)
+
+        cell = (capacity, metadata.get("authenticity_target", "unknown"), complexity)
+        histogram = self.histograms.setdefault(cell, [0] * self.histogram_bins)
+        histogram[min(self.histogram_bins - 1, max(0, int(score * self.histogram_bins)))] += 1
+
+    def extend(self, examples: Iterable[Dict]) -> "CoverageAccumulator":
+        for example in examples:
+            self.update(example)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of authenticity scores"""
+        return self._m2 / (self.total - 1) if self.total > 1 else 0.0
+
+    def merge(self, other: Any) -> "CoverageAccumulator":
+        """Add another worker's accumulator (or its snapshot) into this one"""
+        if isinstance(other, dict):
+            other = CoverageAccumulator.from_snapshot(other)
+        if other.histogram_bins != self.histogram_bins:
+            raise ValueError(
+                f"Cannot merge histograms with {other.histogram_bins} bins into {self.histogram_bins}"
+            )
+        if other.total:
+            total = self.total + other.total
+            delta = other.mean - self.mean
+            self.mean += delta * other.total / total
+            self._m2 += other._m2 + delta * delta * self.total * other.total / total
+            self.total = total
+        for mine, theirs in (
+            (self.authenticity, other.authenticity),
+            (self.capacity, other.capacity),
+            (self.complexity, other.complexity),
+        ):
+            for key, count in theirs.items():
+                _bump(mine, key, count)
+        for cell, histogram in other.histograms.items():
+            merged = self.histograms.setdefault(cell, [0] * self.histogram_bins)
+            for i, count in enumerate(histogram):
+                merged[i] += count
+        return self
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-ready state; ``from_snapshot`` restores it exactly"""
+        return {
+            "histogram_bins": self.histogram_bins,
+            "total": self.total,
+            "mean": self.mean,
+            "m2": self._m2,
+            "authenticity": dict(self.authenticity),
+            "capacity": dict(self.capacity),
+            "complexity": dict(self.complexity),
+            "histograms": [[*cell, list(histogram)] for cell, histogram in self.histograms.items()],
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any]) -> "CoverageAccumulator":
+        accumulator = cls(histogram_bins=data.get("histogram_bins", 10))
+        accumulator.total = data.get("total", 0)
+        accumulator.mean = data.get("mean", 0.0)
+        accumulator._m2 = data.get("m2", 0.0)
+        accumulator.authenticity = dict(data.get("authenticity", {}))
+        accumulator.capacity = dict(data.get("capacity", {}))
+        accumulator.complexity = dict(data.get("complexity", {}))
+        accumulator.histograms = {
+            (capacity, target, complexity): list(histogram)
+            for capacity, target, complexity, histogram in data.get("histograms", [])
+        }
+        return accumulator
+
+    def report(self, histograms: bool = False) -> Dict[str, Any]:
+        """
+        Coverage in the shape ``track_generation_coverage`` has always returned
+
+        Adds ``authenticity_stats``; per-cell histograms only when requested.
+        """
+        gaps = []
+        for auth_type, minimum in REQUIRED_MINIMUMS.items():
+            actual = self.authenticity.get(auth_type, 0)
+            if actual < minimum:
+                gaps.append(f"Need {minimum - actual} more {auth_type} examples")
+        for complexity_type in REQUIRED_COMPLEXITY:
+            if complexity_type not in self.complexity:
+                gaps.append(f"Missing complexity type: {complexity_type}")
+
+        report = {
+            "total_examples": self.total,
+            "authenticity_distribution": dict(self.authenticity),
+            "capacity_distribution": dict(self.capacity),
+            "complexity_coverage": dict(self.complexity),
+            "authenticity_stats": {
+                "mean": round(self.mean, 4),
+                "variance": round(self.variance, 4),
+                "std": round(math.sqrt(self.variance), 4),
+            },
+            "gaps": gaps,
+        }
+        if histograms:
+            report["cell_histograms"] = {
+                "/".join(cell): list(histogram) for cell, histogram in self.histograms.items()
+            }
+        return report
@@ -0,0 +1,194 @@
+"""
+In-Memory Coverage Matrix
+
+Parameter coverage (capacity level × authenticity target × complexity type)
+used to cost a fresh SQLite connection, a SELECT and an UPDATE/INSERT commit
+per sample, and another connection plus ``ORDER BY generated_count`` query
+per batch. The counts now live in a dense numpy tensor that scheduling reads
+directly; ``coverage_tracking.db`` is a write-behind copy:
+
+- Increments go to the tensor and to a pending-delta tensor
+- Every ``flush_every`` increments (or ``flush_seconds``) the deltas are
+  written in one ``INSERT ... ON CONFLICT DO UPDATE`` transaction (WAL mode)
+- Deltas are added, never overwritten, so several generator processes can
+  share one database; each flush reloads the merged totals
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.logger import AppLogger
+
+AXES = ("capacity_level", "authenticity_target", "complexity_type")
+
+
+class CoverageMatrix:
+    """Dense generated-count tensor with batched, additive persistence"""
+
+    def __init__(
+        self,
+        path: Path,
+        capacity_levels: Sequence[str],
+        authenticity_targets: Sequence[str],
+        complexity_types: Sequence[str],
+        flush_every: int = 25,
+        flush_seconds: float = 30.0,
+    ):
+        self.path = Path(path)
+        self.labels: List[List[str]] = [list(capacity_levels), list(authenticity_targets), list(complexity_types)]
+        self.flush_every = max(1, flush_every)
+        self.flush_seconds = flush_seconds
+        self.counts = np.zeros([len(axis) for axis in self.labels], dtype=np.int64)
+        self._pending = np.zeros_like(self.counts)
+        self._ranges: Dict[Tuple[int, int, int], Tuple[str, str]] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        self.flushes = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+        self.reload()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Short-lived connections: safe to share the file with other processes
+        return sqlite3.connect(self.path, timeout=30.0)
+
+    def _index(self, axis: int, label: str) -> int:
+        """Position of ``label`` on ``axis``; unknown labels grow the tensor"""
+        labels = self.labels[axis]
+        if label not in labels:
+            labels.append(label)
+            padding = [(0, 0)] * 3
+            padding[axis] = (0, 1)
+            self.counts = np.pad(self.counts, padding)
+            self._pending = np.pad(self._pending, padding)
+        return labels.index(label)
+
+    def _cell(self, scenario: Dict) -> Tuple[int, int, int]:
+        return tuple(self._index(axis, scenario[name]) for axis, name in enumerate(AXES))
+
+    def reload(self) -> None:
+        """Replace in-memory counts with the database totals (plus unflushed deltas)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT capacity_level, authenticity_target, complexity_type, generated_count "
+                "FROM parameter_coverage"
+            ).fetchall()
+        with self._lock:
+            self.counts = self._pending.copy()
+            for capacity, authenticity, complexity, count in rows:
+                cell = self._cell(
+                    {"capacity_level": capacity, "authenticity_target": authenticity, "complexity_type": complexity}
+                )
+                self.counts[cell] += count or 0
+
+    def increment(self, scenario: Dict, count: int = 1) -> None:
+        """Count ``count`` generated samples for the scenario's combination"""
+        with self._lock:
+            cell = self._cell(scenario)
+            self.counts[cell] += count
+            self._pending[cell] += count
+            self._ranges.setdefault(
+                cell, (str(scenario.get("capacity_range", "")), str(scenario.get("authenticity_range", "")))
+            )
+            due = (
+                int(self._pending.sum()) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write pending deltas in one transaction; returns the number of combinations written"""
+        with self._lock:
+            cells = list(zip(*np.nonzero(self._pending)))
+            if not cells:
+                self._last_flush = time.monotonic()
+                return 0
+            rows = []
+            for cell in cells:
+                cell = tuple(int(i) for i in cell)
+                capacity_range, authenticity_range = self._ranges.get(cell, ("", ""))
+                rows.append(
+                    (
+                        self.labels[0][cell[0]],
+                        capacity_range,
+                        self.labels[1][cell[1]],
+                        authenticity_range,
+                        self.labels[2][cell[2]],
+                        int(self._pending[cell]),
+                    )
+                )
+            try:
+                with self._connect() as conn:
+                    conn.executemany(
+                        """
+                        INSERT INTO parameter_coverage
+                        (capacity_level, capacity_range, authenticity_target, authenticity_range,
+                         complexity_type, generated_count, first_generated, last_generated)
+                        VALUES (?, ?, ?, ?, ?, ?, datetime('now'), datetime('now'))
+                        ON CONFLICT(capacity_level, authenticity_target, complexity_type) DO UPDATE SET
+                            generated_count = generated_count + excluded.generated_count,
+                            last_generated = excluded.last_generated
+                        """,
+                        rows,
+                    )
+            except sqlite3.Error as e:
+                AppLogger.error("Failed to flush coverage matrix", e)
+                return 0
+            self._pending[:] = 0
+            self._last_flush = time.monotonic()
+            self.flushes += 1
+        # Pick up combinations counted by other processes
+        self.reload()
+        return len(rows)
+
+    def least_covered(self, below: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """Generated-before combinations with fewer than ``below`` samples, rarest first"""
+        with self._lock:
+            counts = self.counts.copy()
+            labels = [list(axis) for axis in self.labels]
+        cells = [tuple(int(i) for i in cell) for cell in zip(*np.nonzero((counts > 0) & (counts < below)))]
+        cells.sort(key=lambda cell: counts[cell])
+        return [
+            {
+                "capacity_level": labels[0][cell[0]],
+                "authenticity_target": labels[1][cell[1]],
+                "complexity_type": labels[2][cell[2]],
+                "generated_count": int(counts[cell]),
+            }
+            for cell in cells[:limit]
+        ]
+
+    def cell_counts(self) -> Dict[Tuple[str, str, str], int]:
+        """Samples per (capacity level, authenticity target, complexity type) with any samples"""
+        with self._lock:
+            return {
+                tuple(self.labels[axis][int(i)] for axis, i in enumerate(cell)): int(self.counts[cell])
+                for cell in zip(*np.nonzero(self.counts))
+            }
+
+    def totals(self, axis: str) -> Dict[str, int]:
+        """Samples per label along one axis (labels with no samples omitted)"""
+        index = AXES.index(axis)
+        with self._lock:
+            summed = self.counts.sum(axis=tuple(i for i in range(3) if i != index))
+            return {label: int(count) for label, count in zip(self.labels[index], summed) if count}
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            seen = self.counts[self.counts > 0]
+            return {
+                "combinations": int(seen.size),
+                "samples": int(seen.sum()),
+                "avg_per_combination": float(seen.mean()) if seen.size else 0,
+                "min_generated": int(seen.min()) if seen.size else 0,
+                "max_generated": int(seen.max()) if seen.size else 0,
+                "unflushed": int(self._pending.sum()),
+            }
@@ -0,0 +1,321 @@
+"""
+Append-Only Sharded JSONL Dataset Writer
+
+``save_batch`` and the runners used to write one pretty-printed JSON document
+per batch (one small file per sample with ``batch_size=1``), and the
+multi-step runner held the whole run in memory until its final dump. The
+writer instead appends one compact JSON line per sample:
+
+- Shards live in ``output_dir/dataset/<data_type>/shard-00000.jsonl`` and
+  rotate once they reach ``shard_bytes``
+- Serialization happens in the caller; a background thread does the file
+  I/O, so ``write`` is O(1) and never waits on the disk (unless the queue
+  of ``queue_size`` lines is full)
+- Shards are fsynced every ``fsync_every`` lines or ``fsync_seconds``, after
+  which ``manifest.json`` is replaced atomically with the durable byte and
+  record count of every shard
+- On start-up each shard is truncated back to its manifest size, dropping
+  any torn or unsynced tail left by a crash
+
+``on_durable(shard_path, [(record, byte_offset), ...])`` is called from the
+writer thread once records are on disk (the generation ledger uses it for
+output offsets).
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..utils.logger import AppLogger
+
+MANIFEST = "manifest.json"
+SHARD_FIELDS = ("path", "data_type", "records", "bytes", "sealed")
+
+Durable = Callable[[str, List[Tuple[Dict, int]]], None]
+
+
+class DatasetWriter:
+    """Background appender of JSONL records to size-rotated, manifest-tracked shards"""
+
+    def __init__(
+        self,
+        directory: Path,
+        shard_bytes: int = 64 * 1024 * 1024,
+        fsync_every: int = 256,
+        fsync_seconds: float = 2.0,
+        queue_size: int = 4096,
+        on_durable: Optional[Durable] = None,
+    ):
+        self.directory = Path(directory)
+        self.shard_bytes = max(1, shard_bytes)
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_seconds = fsync_seconds
+        self.on_durable = on_durable
+        self.records_written = 0
+        self.fsyncs = 0
+        self.errors = 0
+
+        self._shards: List[Dict[str, Any]] = []
+        self._open: Dict[str, Dict[str, Any]] = {}  # data_type -> current shard
+        self._next_index: Dict[str, int] = {}  # data_type -> index past every shard the manifest has named
+        self._handles: Dict[str, Any] = {}  # shard path -> append handle
+        self._unsynced: List[Tuple[str, Dict, int]] = []  # (shard path, record, byte offset)
+        self._last_sync = time.monotonic()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._recover()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="dataset-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["DatasetWriter"]:
+        """Build the writer from ``config.dataset_writer`` (None when disabled)"""
+        settings = getattr(config, "dataset_writer", {}) or {}
+        if not settings.get("enabled", False):
+            return None
+        directory = settings.get("directory") or Path(config.output_dir) / "dataset"
+        return cls(
+            directory,
+            shard_bytes=int(settings.get("shard_mb", 64) * 1024 * 1024),
+            fsync_every=settings.get("fsync_every", 256),
+            fsync_seconds=settings.get("fsync_seconds", 2.0),
+            queue_size=settings.get("queue_size", 4096),
+        )
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def write(self, data_type: str, record: Dict) -> None:
+        """Queue one record for ``data_type`` (serialized here, written by the writer thread)"""
+        if self._closed:
+            raise RuntimeError("DatasetWriter is closed")
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        self._queue.put(("record", data_type, line, record))
+
+    def write_many(self, data_type: str, records: Iterable[Dict]) -> None:
+        for record in records:
+            self.write(data_type, record)
+
+    def flush(self) -> None:
+        """Block until everything queued so far is fsynced and in the manifest"""
+        if self._closed or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait()
+
+    def close(self) -> None:
+        """Flush and stop the writer thread (idempotent)"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put(("stop", done))
+            done.wait()
+            self._thread.join()
+
+    def shard_path(self, data_type: str) -> Path:
+        """Directory holding ``data_type``'s shards"""
+        return self.directory / data_type
+
+    def stats(self) -> Dict[str, Any]:
+        with_type: Dict[str, Dict[str, int]] = {}
+        for shard in list(self._shards):
+            totals = with_type.setdefault(shard["data_type"], {"shards": 0, "records": 0, "bytes": 0})
+            totals["shards"] += 1
+            totals["records"] += shard["records"]
+            totals["bytes"] += shard["bytes"]
+        return {
+            "directory": str(self.directory),
+            "records_written": self.records_written,
+            "fsyncs": self.fsyncs,
+            "errors": self.errors,
+            "queued": self._queue.qsize(),
+            "by_data_type": with_type,
+        }
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._unsynced:
+                timeout = max(0.0, self.fsync_seconds - (time.monotonic() - self._last_sync))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ("sync",)
+            kind = item[0]
+            try:
+                if kind == "record":
+                    self._append(*item[1:])
+                    if len(self._unsynced) >= self.fsync_every:
+                        self._sync()
+                else:
+                    self._sync()
+            except Exception as e:
+                self.errors += 1
+                self._last_sync = time.monotonic()  # Retry after fsync_seconds, not in a tight loop
+                AppLogger.error("Dataset writer failed", e)
+            if kind == "stop":
+                for handle in self._handles.values():
+                    handle.close()
+                self._handles.clear()
+            if kind in ("flush", "stop"):
+                item[1].set()
+            if kind == "stop":
+                return
+
+    def _append(self, data_type: str, line: bytes, record: Dict) -> None:
+        shard = self._open.get(data_type)
+        if shard is not None and shard["_written_bytes"] and shard["_written_bytes"] + len(line) > self.shard_bytes:
+            shard["sealed"] = True
+            self._sync()  # Seal with its final size before starting the next shard
+            shard = None
+        if shard is None:
+            shard = self._new_shard(data_type)
+        handle = self._handles.get(shard["path"])
+        if handle is None:
+            handle = self._handles[shard["path"]] = open(self.directory / shard["path"], "ab")
+        offset = shard["_written_bytes"]
+        handle.write(line)
+        shard["_written_bytes"] += len(line)
+        shard["_written_records"] += 1
+        self.records_written += 1
+        self._unsynced.append((shard["path"], record, offset))
+
+    def _new_shard(self, data_type: str) -> Dict[str, Any]:
+        # Past the highest index (shards skipped by recovery included), never reusing a listed path
+        index = self._next_index.get(data_type, 0)
+        listed = {shard["path"] for shard in self._shards}
+        while _shard_path(data_type, index) in listed:
+            index += 1
+        self._next_index[data_type] = index + 1
+        path = _shard_path(data_type, index)
+        (self.directory / data_type).mkdir(parents=True, exist_ok=True)
+        open(self.directory / path, "wb").close()  # Discard a file left by a crash before it was listed
+        shard = {
+            "path": path,
+            "data_type": data_type,
+            "records": 0,
+            "bytes": 0,
+            "sealed": False,
+            "_written_bytes": 0,
+            "_written_records": 0,
+        }
+        self._shards.append(shard)
+        self._open[data_type] = shard
+        return shard
+
+    def _sync(self) -> None:
+        """fsync dirty shards, publish their sizes in the manifest, then report durable records"""
+        for shard in self._shards:
+            if shard["_written_bytes"] == shard["bytes"] and not (shard["sealed"] and shard["path"] in self._handles):
+                continue
+            handle = self._handles.get(shard["path"])
+            if handle is not None:
+                handle.flush()
+                os.fsync(handle.fileno())
+                if shard["sealed"]:
+                    handle.close()
+                    del self._handles[shard["path"]]
+                    self._open.pop(shard["data_type"], None)
+            shard["bytes"], shard["records"] = shard["_written_bytes"], shard["_written_records"]
+        self._write_manifest()
+        self.fsyncs += 1
+        self._last_sync = time.monotonic()
+
+        durable, self._unsynced = self._unsynced, []
+        if durable and self.on_durable is not None:
+            by_shard: Dict[str, List[Tuple[Dict, int]]] = {}
+            for path, record, offset in durable:
+                by_shard.setdefault(path, []).append((record, offset))
+            for path, written in by_shard.items():
+                try:
+                    self.on_durable(str(self.directory / path), written)
+                except Exception as e:
+                    AppLogger.error("Dataset on_durable callback failed", e)
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "format": "jsonl",
+            "updated_at": time.time(),
+            "shards": [{name: shard[name] for name in SHARD_FIELDS} for shard in self._shards],
+        }
+        tmp = self.directory / f"{MANIFEST}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.directory / MANIFEST)
+
+    def _recover(self) -> None:
+        """Load the manifest and cut every shard back to its last durable size"""
+        path = self.directory / MANIFEST
+        if not path.exists():
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                shards = json.load(f).get("shards", [])
+        except (OSError, ValueError) as e:
+            AppLogger.error("Unreadable dataset manifest; starting new shards", e, data={"path": str(path)})
+            return
+        for entry in shards:
+            shard = {name: entry[name] for name in SHARD_FIELDS}
+            index = _shard_index(shard["path"])
+            if index is not None:
+                self._next_index[shard["data_type"]] = max(self._next_index.get(shard["data_type"], 0), index + 1)
+            shard_file = self.directory / shard["path"]
+            if not shard_file.exists():
+                AppLogger.warning("Dataset shard missing", data={"path": str(shard_file)})
+                continue
+            if shard_file.stat().st_size > shard["bytes"]:
+                with open(shard_file, "r+b") as f:
+                    f.truncate(shard["bytes"])
+                AppLogger.info("Truncated unsynced dataset tail", data={"path": shard["path"], "bytes": shard["bytes"]})
+            shard["_written_bytes"], shard["_written_records"] = shard["bytes"], shard["records"]
+            self._shards.append(shard)
+            if not shard["sealed"]:
+                self._open[shard["data_type"]] = shard
+
+
+def _shard_path(data_type: str, index: int) -> str:
+    return f"{data_type}/shard-{index:05d}.jsonl"
+
+
+def _shard_index(path: str) -> Optional[int]:
+    """Index of a ``<data_type>/shard-NNNNN.jsonl`` path (None for any other name)"""
+    stem = Path(path).stem
+    if not stem.startswith("shard-") or not stem[len("shard-"):].isdigit():
+        return None
+    return int(stem[len("shard-"):])
+
+
+def read_records(directory: Path, data_type: Optional[str] = None) -> Iterable[Tuple[str, Dict]]:
+    """Yield ``(data_type, record)`` for every durable record listed in the manifest"""
+    directory = Path(directory)
+    with open(directory / MANIFEST, encoding="utf-8") as f:
+        shards = json.load(f)["shards"]
+    for shard in shards:
+        if data_type is not None and shard["data_type"] != data_type:
+            continue
+        with open(directory / shard["path"], "rb") as f:
+            remaining = shard["bytes"]
+            for line in f:
+                remaining -= len(line)
+                if remaining < 0:
+                    break  # Beyond the durable size (still being written)
+                yield shard["data_type"], json.loads(line)
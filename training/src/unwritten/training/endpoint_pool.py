@@ -0,0 +1,286 @@
+"""
+Multi-Endpoint Ollama Pool
+
+Spreads generation across several Ollama hosts (GPU workstations) instead of
+the single ``ollama_url``:
+
+- Each endpoint has its own base URL, model set and in-flight limit, backed
+  by its own :class:`AsyncOllamaClient` (and model-affinity scheduler)
+- Requests go to the least-loaded healthy endpoint that serves the model
+- Endpoints that refuse connections or fail repeatedly are drained for
+  ``drain_seconds``, then re-admitted after a ``/api/tags`` health check
+- Per-host request, failure and token throughput counters
+
+The pool exposes the same coroutine API as ``AsyncOllamaClient``, so
+``OllamaClient`` can wrap either one.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+
+from .model_scheduler import ModelAffinityScheduler
+from .ollama_client import AsyncOllamaClient, fetch_ollama_models
+from ..utils.logger import AppLogger
+
+
+class OllamaEndpoint:
+    """One Ollama host in the pool: its client, model set, health and throughput"""
+
+    def __init__(
+        self,
+        client: AsyncOllamaClient,
+        models: Optional[List[str]] = None,
+        name: Optional[str] = None,
+    ):
+        self.client = client
+        self.name = name or client.base_url
+        self.models = set(models) if models else None  # None: discover via /api/tags
+        self.assigned = 0  # Dispatched and not yet finished (includes queued in the client)
+        self.healthy = True
+        self.drained_until = 0.0
+        self.consecutive_failures = 0
+        self.times_drained = 0
+
+        self.requests = 0
+        self.failures = 0
+        self.eval_tokens = 0
+        self.eval_seconds = 0.0
+        self.busy_seconds = 0.0
+
+    @property
+    def base_url(self) -> str:
+        return self.client.base_url
+
+    @property
+    def load(self) -> float:
+        return self.assigned / self.client.max_in_flight
+
+    def serves(self, model: str) -> bool:
+        return self.models is None or model in self.models
+
+    def record(self, result: Dict[str, Any], seconds: float) -> None:
+        self.requests += 1
+        self.consecutive_failures = 0
+        self.busy_seconds += seconds
+        self.eval_tokens += result.get("eval_count") or 0
+        self.eval_seconds += (result.get("eval_duration") or 0) / 1e9
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "models": sorted(self.models) if self.models is not None else None,
+            "max_in_flight": self.client.max_in_flight,
+            "in_flight": self.assigned,
+            "requests": self.requests,
+            "failures": self.failures,
+            "times_drained": self.times_drained,
+            "eval_tokens": self.eval_tokens,
+            "tokens_per_second": round(self.eval_tokens / self.eval_seconds, 1) if self.eval_seconds else 0.0,
+            "requests_per_busy_second": round(self.requests / self.busy_seconds, 3) if self.busy_seconds else 0.0,
+        }
+
+
+class EndpointPool:
+    """
+    Least-loaded dispatch over several Ollama endpoints.
+
+    ``load`` is requests assigned to an endpoint divided by its
+    ``max_in_flight``; ties go to the endpoint that has served fewer requests.
+    A connection that cannot be established drains the endpoint and the
+    request fails over to the next candidate; other failures drain it after
+    ``failure_threshold`` in a row.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[OllamaEndpoint],
+        drain_seconds: float = 60.0,
+        failure_threshold: int = 3,
+    ):
+        if not endpoints:
+            raise ValueError("EndpointPool needs at least one endpoint")
+        self.endpoints = endpoints
+        self.drain_seconds = drain_seconds
+        self.failure_threshold = max(1, failure_threshold)
+        self.scheduler = None  # Scheduling is per endpoint
+        self.peak_in_flight = 0
+
+    @classmethod
+    def from_config(cls, config: Any) -> "EndpointPool":
+        """Build a pool from ``config.endpoint_pool["endpoints"]`` and ``ollama_concurrency``"""
+        settings = config.endpoint_pool
+        concurrency = getattr(config, "ollama_concurrency", {}) or {}
+        scheduling = getattr(config, "model_scheduling", {}) or {}
+
+        endpoints = []
+        for entry in settings.get("endpoints", []):
+            scheduler = None
+            if scheduling.get("enabled", False):
+                scheduler = ModelAffinityScheduler(max_wave=scheduling.get("max_wave", 32))
+            client = AsyncOllamaClient(
+                entry["url"],
+                max_in_flight=entry.get("max_in_flight", concurrency.get("max_in_flight", 4)),
+                default_per_model=concurrency.get("default_per_model", 2),
+                per_model=entry.get("per_model", concurrency.get("per_model")),
+                scheduler=scheduler,
+                keep_alive=scheduling.get("keep_alive"),
+            )
+            endpoints.append(OllamaEndpoint(client, models=entry.get("models"), name=entry.get("name")))
+
+        return cls(
+            endpoints,
+            drain_seconds=settings.get("drain_seconds", 60),
+            failure_threshold=settings.get("failure_threshold", 3),
+        )
+
+    @property
+    def base_url(self) -> str:
+        return self.endpoints[0].base_url
+
+    @property
+    def max_in_flight(self) -> int:
+        return sum(e.client.max_in_flight for e in self.endpoints if e.healthy) or 1
+
+    @property
+    def in_flight(self) -> int:
+        return sum(e.assigned for e in self.endpoints)
+
+    async def check_health(self, endpoint: OllamaEndpoint) -> bool:
+        """Probe ``/api/tags``; re-admits a drained endpoint and learns its models"""
+        loop = asyncio.get_running_loop()
+        models = await loop.run_in_executor(None, fetch_ollama_models, endpoint.base_url)
+        if models is None:
+            self._drain(endpoint, "health check failed")
+            return False
+        if endpoint.models is None:
+            endpoint.models = set(models)
+        if not endpoint.healthy:
+            AppLogger.info(f"Endpoint {endpoint.name} back in rotation", data={"models": sorted(endpoint.models)})
+        endpoint.healthy = True
+        endpoint.consecutive_failures = 0
+        return True
+
+    async def check_all(self) -> Dict[str, bool]:
+        """Health-check every endpoint concurrently"""
+        results = await asyncio.gather(*(self.check_health(e) for e in self.endpoints))
+        return {e.name: ok for e, ok in zip(self.endpoints, results)}
+
+    def _drain(self, endpoint: OllamaEndpoint, reason: str) -> None:
+        if endpoint.healthy:
+            endpoint.times_drained += 1
+            AppLogger.warning(
+                f"Draining endpoint {endpoint.name}",
+                data={"reason": reason, "drain_seconds": self.drain_seconds},
+            )
+        endpoint.healthy = False
+        endpoint.drained_until = time.monotonic() + self.drain_seconds
+
+    async def _candidates(self, model: str) -> List[OllamaEndpoint]:
+        """Healthy endpoints serving ``model``, least loaded first"""
+        now = time.monotonic()
+        for endpoint in self.endpoints:
+            if not endpoint.healthy and now >= endpoint.drained_until:
+                endpoint.drained_until = now + self.drain_seconds  # One probe at a time
+                await self.check_health(endpoint)
+        candidates = [e for e in self.endpoints if e.healthy and e.serves(model)]
+        return sorted(candidates, key=lambda e: (e.load, e.requests))
+
+    async def _dispatch(self, model: str, call: Callable[[AsyncOllamaClient], Any]) -> Dict[str, Any]:
+        tried = set()
+        while True:
+            candidates = [e for e in await self._candidates(model) if e.name not in tried]
+            if not candidates:
+                raise ConnectionError(f"No healthy Ollama endpoint serves {model}")
+            endpoint = candidates[0]
+            tried.add(endpoint.name)
+
+            endpoint.assigned += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            start = time.monotonic()
+            try:
+                result = await call(endpoint.client)
+            except aiohttp.ClientConnectorError as e:
+                # Nothing was sent: drain the host and fail over
+                endpoint.failures += 1
+                self._drain(endpoint, str(e))
+                continue
+            except Exception:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.failure_threshold:
+                    self._drain(endpoint, f"{endpoint.consecutive_failures} consecutive failures")
+                raise
+            finally:
+                endpoint.assigned -= 1
+
+            endpoint.record(result, time.monotonic() - start)
+            return result
+
+    async def generate(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        return await self._dispatch(payload["model"], lambda client: client.generate(payload, timeout))
+
+    async def generate_stream(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        on_chunk: Callable[[str], Optional[str]],
+    ) -> Dict[str, Any]:
+        return await self._dispatch(
+            payload["model"], lambda client: client.generate_stream(payload, timeout, on_chunk)
+        )
+
+    async def generate_many(
+        self, requests: List[Tuple[Dict[str, Any], float]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        return await asyncio.gather(
+            *(self.generate(payload, timeout) for payload, timeout in requests),
+            return_exceptions=True,
+        )
+
+    async def warm_up(self, model: str, timeout: float = 600) -> Dict[str, Any]:
+        """Load ``model`` on every healthy endpoint that serves it"""
+        candidates = await self._candidates(model)
+        if not candidates:
+            raise ConnectionError(f"No healthy Ollama endpoint serves {model}")
+        results = await asyncio.gather(
+            *(e.client.warm_up(model, timeout) for e in candidates), return_exceptions=True
+        )
+        loaded = [r for r in results if not isinstance(r, Exception)]
+        if not loaded:
+            raise results[0]
+        # Report the slowest load
+        return max(loaded, key=lambda r: r.get("load_duration") or 0)
+
+    async def get(self, path: str, timeout: float = 5) -> Dict[str, Any]:
+        """GET from the first healthy endpoint"""
+        for endpoint in self.endpoints:
+            if endpoint.healthy:
+                return await endpoint.client.get(path, timeout)
+        raise ConnectionError("No healthy Ollama endpoint")
+
+    async def loaded_models(self) -> List[str]:
+        """Models resident on any healthy endpoint"""
+        names = set()
+        for endpoint in self.endpoints:
+            if endpoint.healthy:
+                try:
+                    names.update(await endpoint.client.loaded_models())
+                except Exception:
+                    continue
+        return sorted(names)
+
+    def endpoint_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host health and throughput"""
+        stats = {}
+        for endpoint in self.endpoints:
+            stats[endpoint.name] = endpoint.stats()
+            if endpoint.client.scheduler is not None:
+                stats[endpoint.name]["model_scheduling"] = endpoint.client.scheduler.stats()
+        return stats
+
+    async def close(self) -> None:
+        for endpoint in self.endpoints:
+            await endpoint.client.close()
@@ -0,0 +1,427 @@
+"""
+Record/Replay Fake Ollama Server
+
+Local HTTP stand-in for Ollama used to benchmark orchestration overhead,
+concurrency gains and parser throughput without a GPU. Implements
+``/api/generate``, ``/api/chat``, ``/api/tags`` and ``/api/ps``.
+
+Completions come from a :class:`CompletionLibrary`:
+
+- recorded completions (JSONL recordings or a ``ResponseCache`` database),
+  matched to requests by the schema sent as ``format``
+- the ``failed_*.txt`` debug corpus, replayed as malformed output at
+  ``malformed_rate``
+- otherwise a synthetic instance of the requested schema
+
+Latency follows a configurable distribution, a share of responses can come
+back empty (``empty_rate``, the 30B empty-response bug), and switching to an
+unloaded model costs ``load_seconds``. Streaming requests get NDJSON chunks
+and a final chunk with Ollama-style token/timing metrics.
+
+``prompt_eval_count`` only counts the words a request does not share with
+the model's previous prompt (or that follow a ``context``), like Ollama's
+KV-cache reuse. For tests, ``responses`` pins a completion per model,
+``models=None`` serves any model and ``record_requests`` keeps every
+``(path, payload)`` in ``requests``.
+"""
+
+import json
+import math
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .parser_corpus import read_failed_dump
+from .schemas import SCHEMAS
+from ..utils.logger import AppLogger
+
+_WORDS = (
+    "she hesitates and glances at the door before answering . I can't do this right now , "
+    "but I'll be there tomorrow . his voice is tired and the kitchen smells of burnt coffee . "
+    "they don't say it , yet the silence between them carries every unpaid debt"
+).split()
+
+
+def synthesize_instance(schema: Dict[str, Any], rng: random.Random) -> Any:
+    """Random instance of a (registry-subset) JSON schema"""
+    kind = schema.get("type")
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if kind == "object":
+        properties = schema.get("properties", {})
+        required = set(schema.get("required", []))
+        return {
+            name: synthesize_instance(sub_schema, rng)
+            for name, sub_schema in properties.items()
+            if name in required or rng.random() < 0.5
+        }
+    if kind == "array":
+        count = max(schema.get("minItems", 0), rng.randint(1, 3))
+        return [synthesize_instance(schema.get("items", {"type": "string"}), rng) for _ in range(count)]
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0.0), schema.get("maximum", 5.0)), 2)
+    if kind == "integer":
+        return rng.randint(int(schema.get("minimum", 1)), int(schema.get("maximum", 5)))
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "string":
+        start = rng.randrange(len(_WORDS))
+        length = rng.randint(4, 24)
+        return " ".join(_WORDS[(start + i) % len(_WORDS)] for i in range(length)).capitalize()
+    return None
+
+
+def _schema_name(schema: Any) -> Optional[str]:
+    for name, registered in SCHEMAS.items():
+        if registered == schema:
+            return name
+    return None
+
+
+class CompletionLibrary:
+    """Recorded, malformed and synthetic completions keyed by schema name"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.recorded: Dict[str, List[str]] = defaultdict(list)
+        self.malformed: Dict[str, List[str]] = defaultdict(list)
+
+    def add(self, schema_name: Optional[str], text: str, malformed: bool = False) -> None:
+        pool = self.malformed if malformed else self.recorded
+        pool[schema_name or ""].append(text)
+
+    def load_recordings(self, path: Path) -> int:
+        """JSONL lines of ``{"schema": name, "response": text}``"""
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                self.add(record.get("schema") or record.get("data_type"), record["response"])
+                count += 1
+        return count
+
+    def load_response_cache(self, path: Path) -> int:
+        """Completions stored by ``ResponseCache`` (schema from their metadata)"""
+        from .response_cache import ResponseCache
+
+        cache = ResponseCache(path, mode="read_through")
+        count = 0
+        try:
+            for entry in cache.iter_responses():
+                metadata = entry["metadata"]
+                self.add(metadata.get("schema") or metadata.get("data_type"), entry["response"])
+                count += 1
+        finally:
+            cache.close()
+        return count
+
+    def load_failed_corpus(self, directory: Path) -> int:
+        """``failed_<data_type>_<timestamp>.txt`` debug dumps, as malformed completions"""
+        count = 0
+        for path in sorted(Path(directory).rglob("failed_*.txt")):
+            dump = read_failed_dump(path)
+            if dump is None:
+                continue
+            data_type, text = dump
+            self.add(data_type, text, malformed=True)
+            count += 1
+        return count
+
+    def pick(self, schema: Any, malformed_rate: float = 0.0) -> str:
+        """Completion for a request whose ``format`` is ``schema``"""
+        name = _schema_name(schema) or ""
+        with self._lock:
+            if malformed_rate and self.rng.random() < malformed_rate:
+                pool = self.malformed.get(name) or [t for texts in self.malformed.values() for t in texts]
+                if pool:
+                    return self.rng.choice(pool)
+            if self.recorded.get(name):
+                return self.rng.choice(self.recorded[name])
+            if isinstance(schema, dict):
+                return json.dumps(synthesize_instance(schema, self.rng))
+            return "{}"
+
+
+class LatencyProfile:
+    """Per-request latency: ``fixed``, ``uniform`` (median ± spread) or ``lognormal``"""
+
+    def __init__(self, distribution: str = "lognormal", median_seconds: float = 0.05, spread: float = 0.5):
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.median_seconds = median_seconds
+        self.spread = spread
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "fixed":
+            return self.median_seconds
+        if self.distribution == "uniform":
+            return max(0.0, rng.uniform(self.median_seconds * (1 - self.spread), self.median_seconds * (1 + self.spread)))
+        return rng.lognormvariate(math.log(max(self.median_seconds, 1e-6)), self.spread)
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients drop keep-alive connections and cancel streams; not an error here
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class FakeOllama:
+    """Threaded fake Ollama HTTP server"""
+
+    def __init__(
+        self,
+        library: Optional[CompletionLibrary] = None,
+        models: Optional[Iterable[str]] = ("qwen3:8b", "qwen3:30b-a3b", "qwen3:32b"),
+        latency: Optional[LatencyProfile] = None,
+        empty_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        load_seconds: float = 0.0,
+        max_loaded_models: int = 1,
+        prefill_share: float = 0.2,
+        chunk_chars: int = 16,
+        chunk_delay: Optional[float] = None,
+        record_requests: bool = False,
+        seed: Optional[int] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.library = library or CompletionLibrary(seed)
+        self.models = list(models) if models is not None else None  # None: serve any model
+        self.responses: Dict[str, str] = {}  # model -> fixed completion (overrides the library)
+        self.latency = latency or LatencyProfile()
+        self.empty_rate = empty_rate
+        self.malformed_rate = malformed_rate
+        self.load_seconds = load_seconds
+        self.max_loaded_models = max(1, max_loaded_models)
+        self.prefill_share = prefill_share
+        self.chunk_chars = max(1, chunk_chars)
+        self.chunk_delay = chunk_delay  # None: decode time spread over the chunks
+        self.rng = random.Random(seed)
+        self.requests: Optional[List[Tuple[str, Dict[str, Any]]]] = [] if record_requests else None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+        self._lock = threading.Lock()
+        self._loaded: "OrderedDict[str, float]" = OrderedDict()
+        self._last_prompt: Dict[str, List[str]] = {}  # model -> previous prompt words (simulated KV cache)
+        self.counts = {"requests": 0, "streamed": 0, "empty": 0, "loads": 0, "cancelled": 0, "chunks": 0}
+
+        self.server = _QuietHTTPServer((host, port), self._handler())
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-ollama", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeOllama":
+        self._thread.start()
+        AppLogger.info("Fake Ollama listening", data={"url": self.url, "models": self.served_models()})
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeOllama":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.counts, "loaded_models": list(self._loaded)}
+
+    def served_models(self) -> List[str]:
+        """Models advertised by ``/api/tags``"""
+        models = list(self.models or [])
+        return models + [model for model in self.responses if model not in models]
+
+    def serves(self, model: str) -> bool:
+        return self.models is None or model in self.models or model in self.responses
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def _admit(self, path: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            if self.requests is not None:
+                self.requests.append((path, payload))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _prompt_tokens(self, model: str, payload: Dict[str, Any]) -> int:
+        """Prompt words not already in the model's KV cache"""
+        if "messages" in payload:
+            words = " ".join(m.get("content", "") for m in payload["messages"]).split()
+        else:
+            words = payload.get("prompt", "").split()
+        if payload.get("context"):
+            return len(words)  # The context tokens are already evaluated
+        with self._lock:
+            previous = self._last_prompt.get(model, [])
+            self._last_prompt[model] = words
+        shared = 0
+        for cached, word in zip(previous, words):
+            if cached != word:
+                break
+            shared += 1
+        return max(1, len(words) - shared) if words else 0
+
+    def _load(self, model: str) -> float:
+        """Seconds spent loading ``model`` (0 when already resident)"""
+        with self._lock:
+            if model in self._loaded:
+                self._loaded.move_to_end(model)
+                return 0.0
+            while len(self._loaded) >= self.max_loaded_models:
+                self._loaded.popitem(last=False)
+            self._loaded[model] = time.time()
+            self.counts["loads"] += 1
+        time.sleep(self.load_seconds)
+        return self.load_seconds
+
+    def _plan(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Completion text and timings for one request"""
+        with self._lock:
+            latency = self.latency.sample(self.rng)
+            empty = self.rng.random() < self.empty_rate
+        model = payload.get("model", "")
+        if empty:
+            text = ""
+        elif model in self.responses:
+            text = self.responses[model]
+        else:
+            text = self.library.pick(payload.get("format"), self.malformed_rate)
+        return {
+            "text": text,
+            "empty": empty,
+            "prefill_seconds": latency * self.prefill_share,
+            "decode_seconds": latency * (1 - self.prefill_share),
+            "prompt_tokens": self._prompt_tokens(model, payload),
+            "eval_tokens": len(text.split()),
+        }
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: Dict[str, Any], status: int = 200) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _message(self, model: str, text: str, chat: bool, **extra) -> Dict[str, Any]:
+                if chat:
+                    return {"model": model, "message": {"role": "assistant", "content": text}, **extra}
+                return {"model": model, "response": text, **extra}
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send({"models": [{"name": name, "model": name} for name in fake.served_models()]})
+                elif self.path == "/api/ps":
+                    self._send({"models": [{"name": name, "model": name} for name in fake.stats()["loaded_models"]]})
+                else:
+                    self._send({"error": "not found"}, 404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path not in ("/api/generate", "/api/chat"):
+                    self._send({"error": "not found"}, 404)
+                    return
+                model = payload.get("model", "")
+                if not fake.serves(model):
+                    self._send({"error": f"model '{model}' not found"}, 404)
+                    return
+                fake._admit(self.path, payload)
+                try:
+                    self._generate(model, payload)
+                finally:
+                    fake._release()
+
+            def _generate(self, model: str, payload: Dict[str, Any]) -> None:
+                load_seconds = fake._load(model)
+                chat = self.path == "/api/chat"
+                if not payload.get("prompt") and not payload.get("messages"):
+                    # Warm-up: load only
+                    self._send(self._message(model, "", chat, done=True, load_duration=int(load_seconds * 1e9)))
+                    return
+
+                fake._count("requests")
+                plan = fake._plan(payload)
+                if plan["empty"]:
+                    fake._count("empty")
+                metrics = {
+                    "done": True,
+                    "done_reason": "stop",
+                    "load_duration": int(load_seconds * 1e9),
+                    "prompt_eval_count": plan["prompt_tokens"],
+                    "prompt_eval_duration": int(plan["prefill_seconds"] * 1e9),
+                    "eval_count": plan["eval_tokens"],
+                    "eval_duration": int(plan["decode_seconds"] * 1e9),
+                    "total_duration": int((load_seconds + plan["prefill_seconds"] + plan["decode_seconds"]) * 1e9),
+                }
+                if not chat:
+                    metrics["context"] = list(range(plan["prompt_tokens"] + plan["eval_tokens"]))
+
+                if payload.get("stream", True):
+                    fake._count("streamed")
+                    self._stream(model, chat, plan, metrics)
+                else:
+                    time.sleep(plan["prefill_seconds"] + plan["decode_seconds"])
+                    self._send(self._message(model, plan["text"], chat, **metrics))
+
+            def _stream(self, model: str, chat: bool, plan: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+                text = plan["text"]
+                pieces = [text[i : i + fake.chunk_chars] for i in range(0, len(text), fake.chunk_chars)]
+                delay = fake.chunk_delay if fake.chunk_delay is not None else plan["decode_seconds"] / max(1, len(pieces))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                time.sleep(plan["prefill_seconds"])
+                try:
+                    for piece in pieces:
+                        self._write_chunk(self._message(model, piece, chat, done=False))
+                        time.sleep(delay)
+                    self._write_chunk(self._message(model, "", chat, **metrics))
+                    self.wfile.write(b"0\r\n\r\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    fake._count("cancelled")  # Client stopped the stream early
+                    self.close_connection = True
+
+            def _write_chunk(self, body: Dict[str, Any]) -> None:
+                data = json.dumps(body).encode("utf-8") + b"\n"
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+                fake._count("chunks")
+
+        return Handler
@@ -0,0 +1,287 @@
+"""
+Per-Sample Generation Ledger
+
+``parameter_coverage`` only counts samples per cell, so questions like
+"which cells have the worst parse-failure rate, latency or authenticity hit
+rate" had no data behind them. The ledger keeps one row per generation
+attempt (one per sample on success, one per failed call), with indexed
+columns:
+
+- Scenario cell (capacity level, authenticity target, complexity type)
+- Model, wall latency and per-step latencies (JSON) for multi-step chains
+- Prompt / eval tokens (a batch call's tokens are shared across its samples)
+- Parse outcome (strict / repaired / failed / empty / cached)
+- Validation score and whether it landed in the targeted authenticity range
+- Output file and offset once saved: the index in a JSON batch file's
+  ``samples`` list, or the byte offset of the line in a JSONL dataset shard
+
+Rows are buffered and written in one transaction every ``flush_every``
+records (WAL mode, so reports can read while generators write). The query
+methods are single GROUP BY / indexed lookups for schedulers and reports.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logger import AppLogger
+
+Cell = Tuple[str, str, str]  # (capacity_level, authenticity_target, complexity_type)
+
+FAILED_OUTCOMES = ("failed", "empty")
+
+COLUMNS = (
+    "sample_id",
+    "recorded_at",
+    "data_type",
+    "capacity_level",
+    "authenticity_target",
+    "complexity_type",
+    "model",
+    "latency_seconds",
+    "step_latencies",
+    "prompt_tokens",
+    "eval_tokens",
+    "parse_outcome",
+    "validation_score",
+    "authenticity_hit",
+)
+
+# Aggregates shared by cell_stats / model_stats; keys double as order_by choices
+AGGREGATES = {
+    "attempts": "COUNT(*)",
+    "samples": f"SUM(parse_outcome NOT IN {FAILED_OUTCOMES})",
+    "parse_failure_rate": f"AVG(parse_outcome IN {FAILED_OUTCOMES})",
+    "avg_latency_seconds": "AVG(latency_seconds)",
+    "avg_eval_tokens": "AVG(eval_tokens)",
+    "authenticity_hit_rate": "AVG(authenticity_hit)",
+    "yield": "SUM(authenticity_hit = 1) * 1.0 / COUNT(*)",  # On-target samples per attempt
+}
+
+
+def in_range(score: Any, target_range: Optional[Sequence[float]]) -> Optional[bool]:
+    """Whether ``score`` lies in ``target_range`` (None when either is missing)"""
+    if target_range is None:
+        return None
+    try:
+        score = float(score)
+    except (TypeError, ValueError):
+        return None
+    return target_range[0] <= score <= target_range[1]
+
+
+class GenerationLedger:
+    """Buffered SQLite ledger of generation attempts with analytics queries"""
+
+    def __init__(self, path: Path, flush_every: int = 50):
+        self.path = Path(path)
+        self.flush_every = max(1, flush_every)
+        self._pending: List[Tuple] = []
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS generation_ledger (
+                    sample_id TEXT PRIMARY KEY,
+                    recorded_at REAL NOT NULL,
+                    data_type TEXT,
+                    capacity_level TEXT,
+                    authenticity_target TEXT,
+                    complexity_type TEXT,
+                    model TEXT,
+                    latency_seconds REAL,
+                    step_latencies TEXT,
+                    prompt_tokens REAL,
+                    eval_tokens REAL,
+                    parse_outcome TEXT,
+                    validation_score REAL,
+                    authenticity_hit INTEGER,
+                    output_file TEXT,
+                    output_offset INTEGER
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ledger_cell "
+                "ON generation_ledger (capacity_level, authenticity_target, complexity_type)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ledger_model ON generation_ledger (model)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ledger_outcome ON generation_ledger (parse_outcome)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ledger_hit ON generation_ledger (authenticity_hit)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ledger_output ON generation_ledger (output_file)")
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["GenerationLedger"]:
+        """Build the ledger from ``config.generation_ledger`` (None when disabled)"""
+        settings = getattr(config, "generation_ledger", {}) or {}
+        if not settings.get("enabled", False):
+            return None
+        path = settings.get("path") or Path(config.output_dir) / "generation_ledger.db"
+        return cls(path, flush_every=settings.get("flush_every", 50))
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0)
+
+    def record(
+        self,
+        scenario: Dict,
+        call: Optional[Dict] = None,
+        data_type: str = "emotional_authenticity",
+        parse_outcome: Optional[str] = None,
+        sample: Optional[Dict] = None,
+        share: int = 1,
+        step_latencies: Optional[Dict[str, float]] = None,
+    ) -> str:
+        """
+        Buffer one attempt and return its ``sample_id``
+
+        ``call`` is ``last_call_metrics()`` of the generator; ``share`` splits
+        a batch call's tokens and latency over the samples it produced.
+        ``sample`` (None for a failed attempt) supplies the validation score.
+        """
+        call = call or {}
+        share = max(1, share)
+        score = sample.get("authenticity_score") if sample else None
+        hit = in_range(score, scenario.get("authenticity_range")) if sample else None
+        if step_latencies:
+            latency = sum(step_latencies.values())
+        else:
+            latency = call.get("wall_seconds", 0.0) / share
+        outcome = parse_outcome or call.get("parse_outcome") or ("repaired" if sample else "failed")
+        if call.get("cached"):
+            outcome = "cached"
+        sample_id = uuid.uuid4().hex
+        row = (
+            sample_id,
+            time.time(),
+            data_type,
+            scenario.get("capacity_level"),
+            scenario.get("authenticity_target"),
+            scenario.get("complexity_type"),
+            call.get("model"),
+            round(latency, 4),
+            json.dumps({name: round(seconds, 4) for name, seconds in step_latencies.items()})
+            if step_latencies
+            else None,
+            call.get("prompt_tokens", 0) / share,
+            call.get("eval_tokens", 0) / share,
+            outcome,
+            score if isinstance(score, (int, float)) else None,
+            None if hit is None else int(hit),
+        )
+        with self._lock:
+            self._pending.append(row)
+            due = len(self._pending) >= self.flush_every
+        if due:
+            self.flush()
+        return sample_id
+
+    def flush(self) -> int:
+        """Write buffered rows in one transaction; returns the number written"""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO generation_ledger ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in COLUMNS)})",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            AppLogger.error("Failed to flush generation ledger", e)
+            return 0
+        return len(rows)
+
+    def assign_output(self, output_file: str, samples: List[Dict]) -> int:
+        """Record where each ledgered sample was saved (offset = index in the file's samples)"""
+        return self.assign_offsets(str(output_file), [(sample, offset) for offset, sample in enumerate(samples)])
+
+    def assign_offsets(self, output_file: str, written: List[Tuple[Dict, int]]) -> int:
+        """Record ``(sample, offset)`` locations in ``output_file`` (a DatasetWriter ``on_durable`` hook)"""
+        updates = [
+            (str(output_file), offset, sample["_ledger_id"])
+            for sample, offset in written
+            if isinstance(sample, dict) and sample.get("_ledger_id")
+        ]
+        if not updates:
+            return 0
+        self.flush()
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "UPDATE generation_ledger SET output_file = ?, output_offset = ? WHERE sample_id = ?", updates
+                )
+        except sqlite3.Error as e:
+            AppLogger.error("Failed to record ledger output offsets", e)
+            return 0
+        return len(updates)
+
+    def _grouped(
+        self, group_by: Sequence[str], order_by: str, limit: Optional[int], min_attempts: int
+    ) -> List[Dict[str, Any]]:
+        if order_by not in AGGREGATES:
+            raise ValueError(f"Unknown ledger metric '{order_by}' (expected one of {sorted(AGGREGATES)})")
+        self.flush()
+        columns = ", ".join(group_by)
+        descending = order_by not in ("authenticity_hit_rate", "yield", "samples")  # Worst first
+        query = (
+            f"SELECT {columns}, {', '.join(f'{sql} AS {name}' for name, sql in AGGREGATES.items())} "
+            f"FROM generation_ledger GROUP BY {columns} HAVING COUNT(*) >= ? "
+            f"ORDER BY {order_by} IS NULL, {order_by} {'DESC' if descending else 'ASC'}"
+        )
+        params: List[Any] = [min_attempts]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(query, params).fetchall()
+        return [
+            {key: round(row[key], 4) if isinstance(row[key], float) else row[key] for key in row.keys()}
+            for row in rows
+        ]
+
+    def cell_stats(
+        self, order_by: str = "parse_failure_rate", limit: Optional[int] = None, min_attempts: int = 1
+    ) -> List[Dict[str, Any]]:
+        """Per-cell attempts, failure rate, latency, tokens and hit rate, worst ``order_by`` first"""
+        return self._grouped(
+            ("capacity_level", "authenticity_target", "complexity_type"), order_by, limit, min_attempts
+        )
+
+    def model_stats(self, order_by: str = "avg_latency_seconds") -> List[Dict[str, Any]]:
+        """The same aggregates per model"""
+        return self._grouped(("model",), order_by, None, 1)
+
+    def cell_yield(self) -> Dict[Cell, float]:
+        """On-target samples per attempt for every ledgered cell (for yield-based scheduling)"""
+        return {
+            (row["capacity_level"], row["authenticity_target"], row["complexity_type"]): row["yield"]
+            for row in self.cell_stats(order_by="yield")
+        }
+
+    def regeneration_candidates(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Saved samples that missed their authenticity target, with file and offset to replace"""
+        self.flush()
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT sample_id, capacity_level, authenticity_target, complexity_type, validation_score, "
+                "output_file, output_offset FROM generation_ledger "
+                "WHERE authenticity_hit = 0 AND output_file IS NOT NULL "
+                "ORDER BY recorded_at LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        self.flush()
@@ -0,0 +1,240 @@
+"""
+Durable Job Journal
+
+Append-only SQLite log of a production run's work items, so a run killed
+hours in (crash, reboot, Ctrl+C) resumes exactly where it stopped instead of
+regenerating everything that was only held in memory.
+
+Every state change is a new row in ``events`` — ``planned`` (with the item's
+parameters), ``in_flight``, ``completed`` (with the generated samples and
+their IDs) or ``failed`` — and an item's current state is its latest event.
+The RNG state is journaled after each completion so parameter sampling
+continues where it left off.
+
+A run is identified by its kind (``production_cycle``, ``systematic``,
+``multi_step``) and parameters; opening a journal with the same kind and
+parameters picks up the most recent unfinished run.
+"""
+
+import hashlib
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..utils.logger import AppLogger
+
+PLANNED = "planned"
+IN_FLIGHT = "in_flight"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+def sample_id(sample: Any) -> str:
+    """Content hash identifying a generated sample"""
+    encoded = json.dumps(sample, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def _encode_rng_state(state: Any) -> Any:
+    return [_encode_rng_state(part) for part in state] if isinstance(state, tuple) else state
+
+
+def _decode_rng_state(state: Any) -> Any:
+    return tuple(_decode_rng_state(part) for part in state) if isinstance(state, list) else state
+
+
+class JobJournal:
+    """
+    Work-item journal for one run.
+
+    One connection is shared by all generator threads behind a lock; every
+    write is committed immediately (WAL mode), so the journal survives a
+    crash at any point.
+    """
+
+    def __init__(self, path: Path, kind: str, params: Optional[Dict[str, Any]] = None, resume: bool = True):
+        self.path = Path(path)
+        self.kind = kind
+        self.params = params or {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._init_database()
+
+        self.run_id = self._find_unfinished_run() if resume else None
+        self.resumed = self.run_id is not None
+        if self.resumed:
+            AppLogger.info(f"Resuming {kind} run {self.run_id}", data=self.stats())
+        else:
+            self.run_id = uuid.uuid4().hex[:12]
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO runs (run_id, kind, params, created_at) VALUES (?, ?, ?, ?)",
+                    (self.run_id, kind, self._params_json, time.time()),
+                )
+
+    @classmethod
+    def from_config(cls, config: Any, kind: str, params: Optional[Dict[str, Any]] = None) -> Optional["JobJournal"]:
+        """Build the journal from ``config.job_journal`` (None when disabled)"""
+        settings = getattr(config, "job_journal", {}) or {}
+        if not settings.get("enabled", False):
+            return None
+        path = settings.get("path") or Path(config.output_dir) / "job_journal.db"
+        return cls(path, kind, params, resume=settings.get("resume", True))
+
+    @property
+    def _params_json(self) -> str:
+        return json.dumps(self.params, sort_keys=True, default=str)
+
+    def _init_database(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    finished_at REAL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT NOT NULL,
+                    item TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT,
+                    sample_ids TEXT,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_events_run ON events (run_id, item)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rng_states (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _find_unfinished_run(self) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id FROM runs WHERE kind = ? AND params = ? AND finished_at IS NULL "
+                "ORDER BY created_at DESC LIMIT 1",
+                (self.kind, self._params_json),
+            ).fetchone()
+        return row[0] if row else None
+
+    # ===================================================================
+    # Writing
+    # ===================================================================
+
+    def _append(self, item: str, status: str, payload: Any = None, sample_ids: Optional[List[str]] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO events (run_id, item, status, payload, sample_ids, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.run_id,
+                    item,
+                    status,
+                    None if payload is None else json.dumps(payload, ensure_ascii=False, default=str),
+                    None if sample_ids is None else json.dumps(sample_ids),
+                    time.time(),
+                ),
+            )
+
+    def plan(self, item: str, params: Optional[Dict[str, Any]] = None) -> None:
+        self._append(item, PLANNED, params or {})
+
+    def start(self, item: str) -> None:
+        self._append(item, IN_FLIGHT)
+
+    def complete(self, item: str, samples: List[Any]) -> List[str]:
+        """Journal the item's samples; returns their IDs"""
+        ids = [sample_id(sample) for sample in samples]
+        self._append(item, COMPLETED, samples, ids)
+        return ids
+
+    def fail(self, item: str, reason: str = "") -> None:
+        self._append(item, FAILED, {"reason": reason})
+
+    def save_rng_state(self, rng: Any = random) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO rng_states (run_id, state, created_at) VALUES (?, ?, ?)",
+                (self.run_id, json.dumps(_encode_rng_state(rng.getstate())), time.time()),
+            )
+
+    def restore_rng_state(self, rng: Any = random) -> bool:
+        """Restore the last journaled RNG state (False when none was saved)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM rng_states WHERE run_id = ? ORDER BY seq DESC LIMIT 1", (self.run_id,)
+            ).fetchone()
+        if row is None:
+            return False
+        rng.setstate(_decode_rng_state(json.loads(row[0])))
+        return True
+
+    def finish(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?", (time.time(), self.run_id))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ===================================================================
+    # Reading
+    # ===================================================================
+
+    def _latest(self) -> Dict[str, tuple]:
+        """item -> (status, payload) of its latest event"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item, status, payload FROM events WHERE run_id = ? AND status != ? ORDER BY seq",
+                (self.run_id, PLANNED),
+            ).fetchall()
+        return {item: (status, payload) for item, status, payload in rows}
+
+    def planned(self) -> Dict[str, Dict[str, Any]]:
+        """item -> planned parameters, in planning order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item, payload FROM events WHERE run_id = ? AND status = ? ORDER BY seq",
+                (self.run_id, PLANNED),
+            ).fetchall()
+        return {item: json.loads(payload) if payload else {} for item, payload in rows}
+
+    def completed(self) -> Dict[str, List[Any]]:
+        """item -> journaled samples, for every completed item"""
+        return {
+            item: json.loads(payload) if payload else []
+            for item, (status, payload) in self._latest().items()
+            if status == COMPLETED
+        }
+
+    def statuses(self) -> Dict[str, str]:
+        return {item: status for item, (status, _) in self._latest().items()}
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for status in self.statuses().values():
+            counts[status] = counts.get(status, 0) + 1
+        return {"run_id": self.run_id, "kind": self.kind, "planned": len(self.planned()), **counts}
@@ -0,0 +1,205 @@
+"""
+Concurrent Generation Job Queue
+
+Turns a production cycle into a stream of ``(data_type, batch)`` jobs that a
+fixed pool of workers drains, so a new request is dispatched the moment one
+finishes instead of waiting for a whole data type to complete (and instead
+of sleeping between batches):
+
+- :class:`TypeQuota` — per-type priority and sample quota (``target_*``)
+- :class:`JobQueue` — thread-safe issue/complete bookkeeping; a type stops
+  receiving jobs once collected plus in-flight samples cover its quota, and
+  failed or empty batches are replaced automatically up to a batch cap
+- :class:`RateLimiter` — optional token bucket on job dispatch
+- :func:`run_jobs` — keeps ``workers`` jobs in flight until the queue drains
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.logger import AppLogger
+
+
+@dataclass
+class TypeQuota:
+    """Work still owed for one data type"""
+
+    data_type: str
+    target_samples: int
+    samples_per_batch: int
+    priority: int = 0  # Lower runs first
+    max_batches: Optional[int] = None
+    issued: int = 0
+    in_flight: int = 0
+    completed: int = 0
+    failed: int = 0
+    samples: int = 0
+
+    def __post_init__(self):
+        if self.max_batches is None:
+            self.max_batches = math.ceil(self.target_samples / max(1, self.samples_per_batch))
+
+    def wants_more(self) -> bool:
+        expected = self.samples + self.in_flight * self.samples_per_batch
+        return expected < self.target_samples and self.issued < self.max_batches
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "target": self.target_samples,
+            "samples": self.samples,
+            "batches": self.completed,
+            "failed_batches": self.failed,
+            "priority": self.priority,
+        }
+
+
+@dataclass
+class GenerationJob:
+    data_type: str
+    batch_index: int
+
+    @property
+    def key(self) -> str:
+        """Journal item key, e.g. ``dramatic_irony:12``"""
+        return f"{self.data_type}:{self.batch_index}"
+
+    @classmethod
+    def from_key(cls, key: str) -> "GenerationJob":
+        data_type, batch_index = key.rsplit(":", 1)
+        return cls(data_type, int(batch_index))
+
+
+class JobQueue:
+    """Hands out jobs by priority until every quota is met (or capped)"""
+
+    def __init__(self, quotas: List[TypeQuota]):
+        self.quotas: Dict[str, TypeQuota] = {quota.data_type: quota for quota in quotas}
+        self._lock = threading.Lock()
+
+    def next_job(self) -> Optional[GenerationJob]:
+        """Highest-priority type that still wants work; ties go to the type with fewest batches"""
+        with self._lock:
+            open_quotas = [quota for quota in self.quotas.values() if quota.wants_more()]
+            if not open_quotas:
+                return None
+            quota = min(open_quotas, key=lambda q: (q.priority, q.issued))
+            job = GenerationJob(quota.data_type, quota.issued)
+            quota.issued += 1
+            quota.in_flight += 1
+            return job
+
+    def restore(self, job: GenerationJob, samples: int) -> None:
+        """Count a batch journaled by an interrupted run as already done"""
+        with self._lock:
+            quota = self.quotas[job.data_type]
+            quota.issued = max(quota.issued, job.batch_index + 1)
+            if samples:
+                quota.completed += 1
+                quota.samples += samples
+            else:
+                quota.failed += 1
+
+    def complete(self, job: GenerationJob, samples: int) -> None:
+        with self._lock:
+            quota = self.quotas[job.data_type]
+            quota.in_flight -= 1
+            if samples:
+                quota.completed += 1
+                quota.samples += samples
+            else:
+                quota.failed += 1
+
+    @property
+    def expected_batches(self) -> int:
+        return sum(
+            math.ceil(quota.target_samples / max(1, quota.samples_per_batch))
+            for quota in self.quotas.values()
+        )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {data_type: quota.stats() for data_type, quota in self.quotas.items()}
+
+
+class RateLimiter:
+    """Token bucket: at most ``rate`` acquisitions per second, bursts up to ``burst``"""
+
+    def __init__(self, rate: Optional[float], burst: int = 1):
+        self.rate = rate if rate and rate > 0 else None
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate is None:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+def run_jobs(
+    queue: JobQueue,
+    execute: Callable[[GenerationJob], List[Dict]],
+    on_result: Callable[[GenerationJob, List[Dict]], None],
+    workers: int,
+    limiter: Optional[RateLimiter] = None,
+) -> None:
+    """
+    Keep ``workers`` jobs running until the queue is drained
+
+    ``execute`` runs on worker threads; ``on_result`` runs on the calling
+    thread, one result at a time, so it can write files without locking.
+
+    On KeyboardInterrupt, jobs that have not started are cancelled and the
+    in-flight ones are abandoned (their results are dropped) instead of
+    waited for; the interrupt is re-raised.
+    """
+    workers = max(1, workers)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="qwen3-job")
+    running = {}
+    interrupted = False
+    try:
+        while True:
+            while len(running) < workers:
+                job = queue.next_job()
+                if job is None:
+                    break
+                if limiter is not None:
+                    limiter.acquire()
+                running[pool.submit(execute, job)] = job
+            if not running:
+                return
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = running.pop(future)
+                try:
+                    batch = future.result() or []
+                except Exception as e:
+                    AppLogger.error(f"{job.data_type} batch {job.batch_index} failed", e)
+                    batch = []
+                queue.complete(job, len(batch))
+                on_result(job, batch)
+    except KeyboardInterrupt:
+        interrupted = True
+        cancelled = [job.key for future, job in running.items() if future.cancel()]
+        AppLogger.warning(
+            "Job queue interrupted",
+            data={"cancelled": cancelled, "abandoned": [job.key for job in running.values() if job.key not in cancelled]},
+        )
+        raise
+    finally:
+        pool.shutdown(wait=not interrupted, cancel_futures=interrupted)
@@ -0,0 +1,479 @@
+"""
+Single-Pass Tolerant JSON Extractor
+
+Replaces the legacy repair chain in ``Qwen3DataGenerator`` (bounds search,
+a dozen ``str.replace`` calls, several ``re.sub`` passes, then trial-and-error
+re-parses to salvage truncated arrays) with one incremental parser that walks
+the response once, left to right, and repairs as it goes:
+
+- preamble prose, ``<think>`` blocks and Markdown code fences around the JSON
+- smart quotes used as string delimiters, and unescaped quotes inside strings
+- leading ``+`` on numbers, trailing commas, missing commas between items,
+  unquoted keys, Python ``True``/``False``/``None``, raw control characters
+- truncated output: every element of the root array that closed before the
+  text ended (or before an unrecoverable error) is kept
+
+String values are normalised like the legacy parser (dashes, smart quotes,
+ellipsis, ``×`` mapped to ASCII, other non-ASCII runs replaced by a space)
+unless ``ascii_only=False``. Every repair is counted in the returned
+:class:`RepairReport`.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Repair kinds
+PREAMBLE = "preamble"
+CODE_FENCE = "code_fence"
+THINK_BLOCK = "think_block"
+TRAILING_TEXT = "trailing_text"
+SMART_QUOTE_DELIMITER = "smart_quote_delimiter"
+UNESCAPED_QUOTE = "unescaped_quote"
+INVALID_ESCAPE = "invalid_escape"
+CONTROL_CHARACTER = "control_character"
+PLUS_SIGN = "plus_sign"
+TRAILING_COMMA = "trailing_comma"
+MISSING_COMMA = "missing_comma"
+UNQUOTED_KEY = "unquoted_key"
+PYTHON_LITERAL = "python_literal"
+NON_ASCII = "non_ascii"
+MULTIPLE_ROOTS = "multiple_roots"
+
+MAX_DEPTH = 64  # Deeper nesting is reported as malformed instead of exhausting the stack
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_RUN = re.compile(r'[^"\\“”\x00-\x1f]*')
+_NUMBER = re.compile(r"([+-]?)(\d+)(\.\d+)?([eE][+-]?\d+)?")
+_BARE_KEY = re.compile(r"[A-Za-z_][\w\-]*")
+_NON_ASCII = re.compile(r"[^\x00-\x7F]+")
+
+OPEN_SMART_QUOTE = "“"
+CLOSE_SMART_QUOTE = "”"
+_STRING_OPENERS = ('"', OPEN_SMART_QUOTE, CLOSE_SMART_QUOTE)
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_LITERALS = {"true": True, "false": False, "null": None}
+_PYTHON_LITERALS = {"True": True, "False": False, "None": None}
+
+# Same mapping as the legacy cleaner, applied per string value
+_ASCII_MAP = str.maketrans(
+    {
+        "—": "-",
+        "–": "-",
+        "‘": "'",
+        "’": "'",
+        "“": '"',
+        "”": '"',
+        "×": "*",
+        "…": "...",
+    }
+)
+
+
+@dataclass
+class RepairReport:
+    """What the extractor had to fix (or give up on)"""
+
+    repairs: Dict[str, int] = field(default_factory=dict)
+    truncated: bool = False
+    error: Optional[str] = None
+    error_position: Optional[int] = None
+
+    def add(self, kind: str) -> None:
+        self.repairs[kind] = self.repairs.get(kind, 0) + 1
+
+    @property
+    def clean(self) -> bool:
+        return not self.repairs and not self.truncated and self.error is None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "repairs": dict(self.repairs),
+            "truncated": self.truncated,
+            "error": self.error,
+            "error_position": self.error_position,
+        }
+
+
+@dataclass
+class ExtractionResult:
+    """Complete top-level items plus the repair report"""
+
+    items: List[Any]
+    report: RepairReport
+    root: Optional[str] = None  # "array", "object" or None when no JSON was found
+
+
+class _Truncated(Exception):
+    """The text ended inside a value"""
+
+
+class _Malformed(Exception):
+    def __init__(self, position: int, message: str):
+        super().__init__(message)
+        self.position = position
+
+
+class _TolerantParser:
+    def __init__(self, text: str, report: RepairReport, ascii_only: bool):
+        self.text = text
+        self.n = len(text)
+        self.pos = 0
+        self.report = report
+        self.ascii_only = ascii_only
+        self.depth = 0
+
+    # -------------------------------------------------------------------
+    # Lexing helpers
+    # -------------------------------------------------------------------
+
+    def _skip_ws(self) -> None:
+        self.pos = _WHITESPACE.match(self.text, self.pos).end()
+
+    def _peek(self) -> str:
+        self._skip_ws()
+        if self.pos >= self.n:
+            raise _Truncated()
+        return self.text[self.pos]
+
+    def _normalize(self, value: str) -> str:
+        if not self.ascii_only or value.isascii():
+            return value
+        self.report.add(NON_ASCII)
+        return _NON_ASCII.sub(" ", value.translate(_ASCII_MAP))
+
+    # -------------------------------------------------------------------
+    # Root
+    # -------------------------------------------------------------------
+
+    def seek_json(self) -> bool:
+        """Skip preamble, <think> blocks and fences; stop at the first [ or {"""
+        text = self.text
+        preamble = False
+        while self.pos < self.n:
+            char = text[self.pos]
+            if char in "[{":
+                if preamble and PREAMBLE not in self.report.repairs:
+                    self.report.add(PREAMBLE)
+                return True
+            if text.startswith("<think>", self.pos):
+                end = text.find("</think>", self.pos)
+                self.report.add(THINK_BLOCK)
+                if end == -1:
+                    self.pos = self.n
+                    return False
+                self.pos = end + len("</think>")
+                continue
+            if text.startswith("```", self.pos):
+                self.report.add(CODE_FENCE)
+                self.pos += 3
+                if text.startswith("json", self.pos):
+                    self.pos += 4
+                continue
+            if not char.isspace():
+                preamble = True
+            self.pos += 1
+        if preamble and PREAMBLE not in self.report.repairs:
+            self.report.add(PREAMBLE)
+        return False
+
+    def parse_root(self) -> ExtractionResult:
+        """
+        Parse from the first plausible root bracket.
+
+        A bracket in preamble prose ("the [2] items:", "[see below]") is only
+        a candidate: when it yields no object or array before failing or being
+        followed by more text, the search resumes after it. If no candidate is
+        plausible the first one is returned.
+        """
+        outer = self.report
+        fallback = None
+        while self.seek_json():
+            start = self.pos
+            self.report = RepairReport()
+            result = self._parse_candidate()
+            candidate, self.report = self.report, outer
+            if fallback is None:
+                fallback = (result, candidate, dict(outer.repairs))
+            if self._plausible(result, candidate):
+                return self._accept(result, candidate)
+            self.pos = max(self.pos, start + 1)
+        if fallback is None:
+            outer.error = "no JSON found"
+            return ExtractionResult([], outer)
+        result, candidate, outer.repairs = fallback
+        return self._accept(result, candidate)
+
+    @staticmethod
+    def _plausible(result: ExtractionResult, report: RepairReport) -> bool:
+        if any(isinstance(item, (dict, list)) for item in result.items):
+            return True
+        return report.error is None and TRAILING_TEXT not in report.repairs
+
+    def _accept(self, result: ExtractionResult, candidate: RepairReport) -> ExtractionResult:
+        for kind, count in candidate.repairs.items():
+            self.report.repairs[kind] = self.report.repairs.get(kind, 0) + count
+        self.report.truncated = candidate.truncated
+        self.report.error = candidate.error
+        self.report.error_position = candidate.error_position
+        return ExtractionResult(result.items, self.report, result.root)
+
+    def _parse_candidate(self) -> ExtractionResult:
+        items: List[Any] = []
+        self.depth = 0
+        root = "array" if self.text[self.pos] == "[" else "object"
+        try:
+            if root == "array":
+                self._root_array(items)
+            else:
+                items.append(self._object())
+                # Several objects in a row (one per line, or separated by commas)
+                while True:
+                    self._skip_ws()
+                    if self.pos < self.n and self.text[self.pos] == ",":
+                        self.pos += 1
+                        self._skip_ws()
+                    if self.pos >= self.n or self.text[self.pos] != "{":
+                        break
+                    self.report.add(MULTIPLE_ROOTS)
+                    items.append(self._object())
+        except _Truncated:
+            self.report.truncated = True
+        except _Malformed as e:
+            self.report.error = str(e)
+            self.report.error_position = e.position
+
+        if not self.report.truncated and self.report.error is None:
+            self._trailing()
+        return ExtractionResult(items, self.report, root)
+
+    def _root_array(self, items: List[Any]) -> None:
+        """Like _array, but keeps every element completed before a failure"""
+        self.pos += 1
+        expect_value = True
+        while True:
+            char = self._peek()
+            if char == "]":
+                if expect_value and items:
+                    self.report.add(TRAILING_COMMA)
+                self.pos += 1
+                return
+            if char == ",":
+                if expect_value:
+                    self.report.add(TRAILING_COMMA)
+                self.pos += 1
+                expect_value = True
+                continue
+            if not expect_value:
+                self.report.add(MISSING_COMMA)
+            items.append(self._value())
+            expect_value = False
+
+    def _trailing(self) -> None:
+        self._skip_ws()
+        rest = self.text[self.pos :].strip()
+        if not rest:
+            return
+        if rest.startswith("```") and not rest[3:].strip():
+            self.report.add(CODE_FENCE)
+        else:
+            self.report.add(TRAILING_TEXT)
+
+    # -------------------------------------------------------------------
+    # Values
+    # -------------------------------------------------------------------
+
+    def _value(self) -> Any:
+        char = self._peek()
+        if char == "{":
+            return self._object()
+        if char == "[":
+            return self._array()
+        if char in _STRING_OPENERS:
+            return self._normalize(self._string())
+        if char in "+-" or char.isdigit():
+            return self._number()
+        return self._literal()
+
+    def _enter(self) -> None:
+        self.depth += 1
+        if self.depth > MAX_DEPTH:
+            position, self.pos = self.pos, self.n  # No root candidates inside the runaway nesting
+            raise _Malformed(position, f"nesting deeper than {MAX_DEPTH} levels")
+
+    def _object(self) -> Dict[str, Any]:
+        self._enter()
+        self.pos += 1  # {
+        result: Dict[str, Any] = {}
+        expect_key = True
+        while True:
+            char = self._peek()
+            if char == "}":
+                if expect_key and result:
+                    self.report.add(TRAILING_COMMA)
+                self.pos += 1
+                self.depth -= 1
+                return result
+            if char == ",":
+                if expect_key:
+                    self.report.add(TRAILING_COMMA)
+                self.pos += 1
+                expect_key = True
+                continue
+            if not expect_key:
+                self.report.add(MISSING_COMMA)
+
+            key = self._key()
+            if self._peek() != ":":
+                raise _Malformed(self.pos, f"expected ':' after key {key!r}")
+            self.pos += 1
+            result[key] = self._value()
+            expect_key = False
+
+    def _key(self) -> str:
+        char = self.text[self.pos]
+        if char in _STRING_OPENERS:
+            return self._normalize(self._string())
+        match = _BARE_KEY.match(self.text, self.pos)
+        if not match:
+            raise _Malformed(self.pos, f"unexpected {char!r} where a key was expected")
+        self.report.add(UNQUOTED_KEY)
+        self.pos = match.end()
+        return match.group()
+
+    def _array(self) -> List[Any]:
+        self._enter()
+        self.pos += 1  # [
+        result: List[Any] = []
+        expect_value = True
+        while True:
+            char = self._peek()
+            if char == "]":
+                if expect_value and result:
+                    self.report.add(TRAILING_COMMA)
+                self.pos += 1
+                self.depth -= 1
+                return result
+            if char == ",":
+                if expect_value:
+                    self.report.add(TRAILING_COMMA)
+                self.pos += 1
+                expect_value = True
+                continue
+            if not expect_value:
+                self.report.add(MISSING_COMMA)
+            result.append(self._value())
+            expect_value = False
+
+    def _string(self) -> str:
+        text = self.text
+        if text[self.pos] != '"':
+            self.report.add(SMART_QUOTE_DELIMITER)
+        self.pos += 1
+        parts: List[str] = []
+        while True:
+            run = _STRING_RUN.match(text, self.pos)
+            parts.append(run.group())
+            self.pos = run.end()
+            if self.pos >= self.n:
+                raise _Truncated()
+
+            char = text[self.pos]
+            if char == "\\":
+                self.pos += 1
+                if self.pos >= self.n:
+                    raise _Truncated()
+                escape = text[self.pos]
+                if escape in _ESCAPES:
+                    parts.append(_ESCAPES[escape])
+                    self.pos += 1
+                elif escape == "u":
+                    digits = text[self.pos + 1 : self.pos + 5]
+                    if len(digits) < 4:
+                        raise _Truncated()
+                    try:
+                        parts.append(chr(int(digits, 16)))
+                        self.pos += 5
+                    except ValueError:
+                        self.report.add(INVALID_ESCAPE)
+                        parts.append("u")
+                        self.pos += 1
+                else:
+                    self.report.add(INVALID_ESCAPE)
+                    parts.append(escape)
+                    self.pos += 1
+            elif char in _STRING_OPENERS:
+                self.pos += 1
+                if self._closes_string():
+                    if char != '"':
+                        self.report.add(SMART_QUOTE_DELIMITER)
+                    return "".join(parts)
+                if char == '"':
+                    self.report.add(UNESCAPED_QUOTE)
+                parts.append(char)
+            else:
+                # Raw newline/tab/control character inside a string
+                self.report.add(CONTROL_CHARACTER)
+                parts.append(char)
+                self.pos += 1
+
+    def _closes_string(self) -> bool:
+        """Does a quote just before ``self.pos`` end the string? (bounded lookahead)"""
+        text = self.text
+        p = _WHITESPACE.match(text, self.pos).end()
+        if p >= self.n:
+            return True
+        char = text[p]
+        if char in ":}]":
+            return True
+        if char != ",":
+            return False
+        p = _WHITESPACE.match(text, p + 1).end()
+        if p >= self.n:
+            return True
+        char = text[p]
+        return char in '"{[]}“' or char.isdigit() or char == "-"
+
+    def _number(self) -> Any:
+        match = _NUMBER.match(self.text, self.pos)
+        if not match:
+            raise _Malformed(self.pos, f"invalid number at {self.text[self.pos:self.pos + 10]!r}")
+        sign, whole, fraction, exponent = match.groups()
+        if match.end() >= self.n:
+            raise _Truncated()  # The number may continue
+        if sign == "+":
+            self.report.add(PLUS_SIGN)
+        self.pos = match.end()
+        if fraction is None and exponent is None:
+            return int(("-" if sign == "-" else "") + whole)
+        return float(("-" if sign == "-" else "") + whole + (fraction or "") + (exponent or ""))
+
+    def _literal(self) -> Any:
+        text = self.text
+        for literals, repaired in ((_LITERALS, False), (_PYTHON_LITERALS, True)):
+            for word, value in literals.items():
+                if text.startswith(word, self.pos):
+                    if repaired:
+                        self.report.add(PYTHON_LITERAL)
+                    self.pos += len(word)
+                    return value
+        remaining = text[self.pos : self.pos + 5]
+        if any(word.startswith(remaining) for word in (*_LITERALS, *_PYTHON_LITERALS)):
+            raise _Truncated()
+        raise _Malformed(self.pos, f"unexpected {text[self.pos]!r}")
+
+
+def extract_json(text: str, ascii_only: bool = True) -> ExtractionResult:
+    """
+    Parse an LLM response into its complete top-level items in one pass.
+
+    A root array yields its elements, a root object (or several objects in a
+    row) yields those objects. Elements that were still open when the text
+    ended or became unparseable are dropped; everything before them is kept.
+    """
+    report = RepairReport()
+    if not text:
+        report.error = "empty response"
+        return ExtractionResult([], report)
+    return _TolerantParser(text, report, ascii_only).parse_root()
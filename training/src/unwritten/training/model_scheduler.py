@@ -0,0 +1,123 @@
+"""
+Model-Affinity Scheduler
+
+On a 12GB card only one of qwen3:8b / 30b / 32b fits at a time, so every
+switch between models makes Ollama unload and reload weights. This scheduler
+sits in front of :class:`AsyncOllamaClient` and admits requests in
+model-grouped waves:
+
+- While a model is active, only requests for that model are admitted
+- Requests for other models queue until the active wave drains
+- The next wave goes to the model with the most queued requests
+- A wave is capped at ``max_wave`` admissions when other models are waiting,
+  so a busy model cannot starve the rest
+
+Every change of active model is counted as a swap (the first load is not).
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+
+class ModelAffinityScheduler:
+    """asyncio admission gate that groups requests into per-model waves"""
+
+    def __init__(self, max_wave: int = 32):
+        self.max_wave = max(1, max_wave)
+
+        self.active_model: Optional[str] = None
+        self.loaded_model: Optional[str] = None
+        self.active_in_flight = 0
+        self.wave_served = 0
+        self.waiting: Dict[str, int] = {}
+
+        self.swaps = 0
+        self.waves: List[Dict[str, Any]] = []
+        self.load_seconds: Dict[str, float] = {}
+
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _others_waiting(self, model: str) -> bool:
+        return any(count for name, count in self.waiting.items() if name != model)
+
+    def _can_enter(self, model: str) -> bool:
+        if self.active_model is None:
+            return True
+        if self.active_in_flight == 0 and not self.waiting.get(self.active_model):
+            # Active model is idle with nothing queued: hand over immediately
+            return True
+        if model != self.active_model:
+            return False
+        return not (self._others_waiting(model) and self.wave_served >= self.max_wave)
+
+    def _start_wave(self, model: str) -> None:
+        if self.loaded_model is not None and self.loaded_model != model:
+            self.swaps += 1
+        self.active_model = model
+        self.loaded_model = model
+        self.wave_served = 0
+        self.waves.append({"model": model, "requests": 0})
+
+    def _rotate(self) -> None:
+        """Called when the active wave has nothing in flight"""
+        queued_active = self.waiting.get(self.active_model, 0)
+        wave_exhausted = self.wave_served >= self.max_wave
+        if queued_active and not (wave_exhausted and self._others_waiting(self.active_model)):
+            return
+        candidates = {
+            name: count for name, count in self.waiting.items() if count and name != self.active_model
+        }
+        if candidates:
+            self._start_wave(max(candidates, key=candidates.get))
+        elif not queued_active:
+            self.active_model = None
+
+    async def acquire(self, model: str) -> None:
+        """Wait until ``model`` may run"""
+        condition = self._get_condition()
+        async with condition:
+            self.waiting[model] = self.waiting.get(model, 0) + 1
+            try:
+                while not self._can_enter(model):
+                    await condition.wait()
+            finally:
+                self.waiting[model] -= 1
+
+            if self.active_model != model:
+                self._start_wave(model)
+            self.active_in_flight += 1
+            self.wave_served += 1
+            self.waves[-1]["requests"] += 1
+
+    async def release(self, model: str) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self.active_in_flight -= 1
+            if self.active_in_flight == 0:
+                self._rotate()
+            condition.notify_all()
+
+    def record_load(self, model: str, load_duration_ns: Optional[int]) -> None:
+        """Accumulate Ollama's reported ``load_duration`` (nanoseconds) per model"""
+        if load_duration_ns:
+            self.load_seconds[model] = self.load_seconds.get(model, 0.0) + load_duration_ns / 1e9
+
+    def reset_loop_state(self) -> None:
+        """Drop the loop-bound condition (called when the client closes)"""
+        self._condition = None
+
+    def stats(self) -> Dict[str, Any]:
+        requests_per_model: Dict[str, int] = {}
+        for wave in self.waves:
+            requests_per_model[wave["model"]] = requests_per_model.get(wave["model"], 0) + wave["requests"]
+        return {
+            "swaps": self.swaps,
+            "waves": len(self.waves),
+            "requests_per_model": requests_per_model,
+            "load_seconds": {name: round(seconds, 2) for name, seconds in self.load_seconds.items()},
+        }
@@ -11,18 +11,51 @@ Instead of generating everything in one massive prompt, break into focused steps
 Benefits:
 - Faster generation (smaller prompts)
 - Modular (swap components to create variations)
-- Reusable (1 base scenario → many dialogue variations)
+- Reusable (1 base scenario → many dialogue variations, see scenario_pool.py)
 - Testable (validate each step independently)
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass
 import random
+import threading
+import zlib
 
 from unwritten.training.qwen3_generator import Qwen3DataGenerator
 from unwritten.training.config import EnhancedTrainingConfig
+from unwritten.training.npc_synthesizer import NPCSynthesizer
+from unwritten.training.pipeline_executor import PipelineExecutor, Step
+from unwritten.training.scenario_pool import ScenarioPool
+from unwritten.training.step_store import StepStore
 from unwritten.utils.logger import AppLogger
 
+# generate_complete_interaction defaults, applied to executor specs
+INTERACTION_DEFAULTS = {
+    "complexity_type": "baseline",
+    "authenticity_target": "authentic",
+    "capacity_level": "medium",
+    "support_needed": 5.0,
+}
+
+# Target effective capacity per capacity level
+CAPACITY_RANGES = {
+    "crisis": (1.5, 2.5),
+    "low": (3.0, 4.5),
+    "medium": (5.0, 6.5),
+    "high": (7.0, 9.0),
+}
+
+# Steps a pooled base provides to every dialogue fanned out from it
+SHARED_STEPS = ["primitives", "context", "tension"]
+
+
+def capacity_tier(effective_capacity: float) -> str:
+    """Capacity level whose range ``effective_capacity`` falls in (gaps split evenly)"""
+    for level, (_, high) in CAPACITY_RANGES.items():
+        if effective_capacity < high + 0.25:
+            return level
+    return "high"
+
 
 @dataclass
 class NPCPrimitives:
@@ -89,21 +122,46 @@ class MultiStepPipeline(Qwen3DataGenerator):
     primitives → context → tension → dialogue → outcomes
     """
 
+    telemetry_data_type = "multi_step_interaction"
+
     def __init__(self, config: EnhancedTrainingConfig):
         super().__init__(config)
         self.config = config
 
+        self.step_store = StepStore.from_config(
+            config, (NPCPrimitives, SituationalContext, TensionMemoryElements, DialogueOutput, GameOutcomes)
+        )
+        self.scenario_pool = ScenarioPool.from_config(config, (NPCPrimitives, SituationalContext))
+        self.npc_synthesizer = NPCSynthesizer.from_config(config)
+        self.dialogues_per_base = max(1, config.scenario_pool.get("dialogues_per_base", 5))
+        self._call_counts = {"llm_calls": 0, "samples": 0}
+        self._call_lock = threading.Lock()
+
+        settings = config.pipeline_executor
+        self.step_executor = PipelineExecutor(
+            self._interaction_steps(),
+            max_in_flight=settings.get("max_in_flight") or self.client.max_in_flight,
+            per_model=settings.get("per_model", {}),
+        )
+
     # ===================================================================
     # STEP 1: NPC PRIMITIVES
     # ===================================================================
 
-    def generate_npc_primitives(self, complexity_type: str = "baseline") -> NPCPrimitives:
+    def generate_npc_primitives(
+        self, complexity_type: str = "baseline", interaction_id: Optional[str] = None, npc_index: Optional[int] = None
+    ) -> NPCPrimitives:
         """
         Generate core NPC attributes.
 
-        Fast, focused prompt (< 30 seconds).
+        Sampled locally when ``config.npc_synthesizer`` is enabled (no LLM
+        call; reproducible per ``interaction_id``, stratified per planned
+        ``npc_index``); otherwise a fast, focused prompt (< 30 seconds).
         Returns: OCEAN traits, base capacity, relationship state.
         """
+        if self.npc_synthesizer is not None:
+            return NPCPrimitives(**self.npc_synthesizer.sample(complexity_type, interaction_id, npc_index))
+
         prompt = f"""Generate ONE Unwritten NPC profile for complexity: {complexity_type}
 
 {{
@@ -124,9 +182,10 @@ Return ONLY JSON."""
             prompt=prompt,
             temperature=0.7,  # Lower for consistent primitives
             max_tokens=3000,  # HIGH to avoid Ollama bug
+            schema="npc_primitives",
         )
 
-        data = self._parse_json_response(response, "npc_primitives")[0]
+        data = self._parse_json_response(response, "npc_primitives", schema="npc_primitives")[0]
 
         return NPCPrimitives(
             name=data["name"],
@@ -153,13 +212,7 @@ Return ONLY JSON."""
         Fast, focused prompt (< 30 seconds).
         Returns: capacity factors, urgency, support needs.
         """
-        capacity_ranges = {
-            "crisis": (1.5, 2.5),
-            "low": (3.0, 4.5),
-            "medium": (5.0, 6.5),
-            "high": (7.0, 9.0),
-        }
-        target_capacity = random.uniform(*capacity_ranges[target_capacity_level])
+        target_capacity = random.uniform(*CAPACITY_RANGES[target_capacity_level])
 
         prompt = f"""Generate capacity context for NPC "{primitives.name}".
 Base capacity: {primitives.base_capacity:.1f} → Target: {target_capacity:.1f}
@@ -182,9 +235,10 @@ Return ONLY the JSON object above with your own values."""
             prompt=prompt,
             temperature=0.5,  # Very low for reliable JSON completion
             max_tokens=4000,  # HIGH to avoid Ollama bug (returns empty if hitting limit)
+            schema="situational_context",
         )
 
-        parsed_data = self._parse_json_response(response, "situational_context")
+        parsed_data = self._parse_json_response(response, "situational_context", schema="situational_context")
         data = parsed_data[0]
 
         return SituationalContext(
@@ -229,9 +283,10 @@ Return ONLY the JSON object above with your own values."""
             prompt=prompt,
             temperature=0.85,  # Higher for creative tension
             max_tokens=3000,  # HIGH to avoid Ollama bug
+            schema="tension_memory",
         )
 
-        parsed_data = self._parse_json_response(response, "tension_memory")
+        parsed_data = self._parse_json_response(response, "tension_memory", schema="tension_memory")
         data = parsed_data[0]
 
         return TensionMemoryElements(
@@ -306,9 +361,10 @@ Return ONLY JSON."""
             prompt=prompt,
             temperature=self.config.temp_emotional,
             max_tokens=self.config.max_tokens,  # Use config value (4000) - avoid Ollama bug
+            schema="dialogue",
         )
 
-        data = self._parse_json_response(response, "dialogue")[0]
+        data = self._parse_json_response(response, "dialogue", schema="dialogue")[0]
 
         return DialogueOutput(
             setting_context=data["setting_context"],
@@ -423,10 +479,14 @@ Return ONLY JSON."""
         authenticity_target: str = "authentic",
         capacity_level: str = "medium",
         support_needed: float = 5.0,
+        interaction_id: Optional[str] = None,
     ) -> Dict:
         """
         Run complete multi-step pipeline.
 
+        A failing step is retried on its own; with an ``interaction_id``,
+        step outputs are stored and reused (see ``config.step_store``).
+
         Steps:
         1. Generate NPC primitives (30 sec)
         2. Generate situational context (30 sec)
@@ -442,33 +502,57 @@ Return ONLY JSON."""
             f"Starting multi-step pipeline: {complexity_type}, {authenticity_target}, {capacity_level}"
         )
 
+        steps = self.step_executor.steps
+        run = {
+            "spec": {
+                "complexity_type": complexity_type,
+                "authenticity_target": authenticity_target,
+                "capacity_level": capacity_level,
+                "support_needed": support_needed,
+                "interaction_id": interaction_id,
+            }
+        }
+
         # Step 1: Primitives
-        primitives = self.generate_npc_primitives(complexity_type)
+        primitives = run["primitives"] = steps["primitives"].fn(run)
         AppLogger.info(f"Generated NPC: {primitives.name}")
 
         # Step 2: Context
-        context = self.generate_situational_context(primitives, capacity_level, support_needed)
+        context = run["context"] = steps["context"].fn(run)
         AppLogger.info(
             f"Generated context: capacity={context.effective_capacity:.1f}, urgency={context.urgency_level}"
         )
 
         # Step 3: Tension/Memory
-        tension = self.generate_tension_memory_elements(primitives, context)
+        tension = run["tension"] = steps["tension"].fn(run)
         AppLogger.info(f"Generated tension: {tension.tension_hook['type']}")
 
         # Step 4: Dialogue
-        dialogue = self.generate_dialogue(
-            primitives, context, tension, complexity_type, authenticity_target
-        )
+        dialogue = run["dialogue"] = steps["dialogue"].fn(run)
         AppLogger.info(f"Generated dialogue: {dialogue.word_count} words")
 
         # Step 5: Outcomes
-        outcomes = self.calculate_outcomes(
-            primitives, context, dialogue, complexity_type, authenticity_target
-        )
+        outcomes = run["outcomes"] = steps["outcomes"].fn(run)
         AppLogger.info(f"Calculated outcomes: trust_change={outcomes.trust_change:.2f}")
 
         # Assemble complete interaction
+        return self._assemble_interaction(
+            primitives, context, tension, dialogue, outcomes,
+            complexity_type, authenticity_target, capacity_level,
+        )
+
+    def _assemble_interaction(
+        self,
+        primitives: NPCPrimitives,
+        context: SituationalContext,
+        tension: TensionMemoryElements,
+        dialogue: DialogueOutput,
+        outcomes: GameOutcomes,
+        complexity_type: str,
+        authenticity_target: str,
+        capacity_level: str,
+    ) -> Dict:
+        """Complete Unwritten NPC interaction card from the five step outputs"""
         return {
             "npc_profile": {
                 "name": primitives.name,
@@ -519,6 +603,243 @@ Return ONLY JSON."""
             },
         }
 
+    def generate_complete_interactions(self, specs: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Run several complete pipelines concurrently.
+
+        Each spec holds generate_complete_interaction keyword arguments. The
+        steps run as a DAG on the step executor: inside one interaction they
+        stay in dependency order, while steps of different interactions
+        overlap so the server always has requests in flight.
+
+        Returns: Interactions in spec order (None where a step raised)
+        """
+        runs = self.step_executor.run([{**INTERACTION_DEFAULTS, **spec} for spec in specs])
+        return [self._assemble_run(run) for run in runs]
+
+    def generate_fanned_out_interactions(self, specs: List[Dict]) -> List[Optional[Dict]]:
+        """
+        Run several interactions, sharing one base per group of dialogues.
+
+        Specs with the same complexity type and capacity level are grouped,
+        up to ``scenario_pool.dialogues_per_base`` per group. Each group draws
+        a base (primitives + context) from the scenario pool, or generates
+        and pools a new one, adds one tension step, and fans out a dialogue
+        and outcome per spec. Falls back to generate_complete_interactions
+        when the pool is disabled.
+
+        Returns: Interactions in spec order (None where a step raised)
+        """
+        if self.scenario_pool is None:
+            return self.generate_complete_interactions(specs)
+
+        specs = [{**INTERACTION_DEFAULTS, **spec} for spec in specs]
+        grouped: Dict[tuple, List[List[int]]] = {}
+        for index, spec in enumerate(specs):
+            chunks = grouped.setdefault((spec["complexity_type"], spec["capacity_level"]), [[]])
+            if len(chunks[-1]) >= self.dialogues_per_base:
+                chunks.append([])
+            chunks[-1].append(index)
+        groups = [chunk for chunks in grouped.values() for chunk in chunks]
+
+        # Phase 1: one shared base and tension per group
+        base_specs, pooled = [], []
+        for group in groups:
+            lead = specs[group[0]]
+            base = self.scenario_pool.acquire(lead["complexity_type"], lead["capacity_level"], len(group))
+            pooled.append(base is not None)
+            lead_id = lead.get("interaction_id")
+            base_specs.append(
+                {
+                    **lead,
+                    # Stored shared steps belong to this exact base
+                    "interaction_id": f"{lead_id}:base:{base[0] if base else 'new'}" if lead_id else None,
+                    "reuse": {"primitives": base[1], "context": base[2]} if base else {},
+                }
+            )
+        bases = self.step_executor.run(base_specs, only=SHARED_STEPS)
+
+        # Phase 2: fan out dialogue + outcomes per spec
+        fanned_specs, owners = [], []
+        for group, base, was_pooled in zip(groups, bases, pooled):
+            if base is None:
+                continue
+            if not was_pooled:
+                self._pool_base(base, len(group))
+            for index in group:
+                fanned_specs.append({**specs[index], "reuse": {name: base[name] for name in SHARED_STEPS}})
+                owners.append(index)
+        runs = self.step_executor.run(fanned_specs)
+
+        interactions: List[Optional[Dict]] = [None] * len(specs)
+        for index, run in zip(owners, runs):
+            interactions[index] = self._assemble_run(run)
+        return interactions
+
+    def _pool_base(self, base: Dict, uses: int) -> None:
+        """Add a freshly generated base to the scenario pool if it is sound"""
+        primitives, context = base["primitives"], base["context"]
+        spec = base["spec"]
+        sound = (
+            bool(primitives.name.strip())
+            and all(0.0 <= value <= 5.0 for value in primitives.ocean.values())
+            and len(primitives.ocean) == 5
+            and 0.0 <= primitives.trust <= 1.0
+            and 0.0 <= context.effective_capacity <= 10.0
+            and 0.0 <= context.support_needed <= 10.0
+            and context.urgency_level in ("routine", "important", "urgent", "crisis")
+        )
+        if not sound:
+            self.scenario_pool.reject()
+            return
+        # Indexed by the capacity the context actually has, not the one requested
+        tier = capacity_tier(context.effective_capacity)
+        self.scenario_pool.add(
+            spec["complexity_type"],
+            tier,
+            context.urgency_level,
+            primitives,
+            context,
+            uses=uses if tier == spec["capacity_level"] else 0,
+        )
+
+    def _assemble_run(self, run: Optional[Dict]) -> Optional[Dict]:
+        """Interaction for one executor run (None where a step raised)"""
+        if run is None:
+            return None
+        spec = run["spec"]
+        with self._call_lock:
+            self._call_counts["samples"] += 1
+        return self._assemble_interaction(
+            run["primitives"],
+            run["context"],
+            run["tension"],
+            run["dialogue"],
+            run["outcomes"],
+            spec["complexity_type"],
+            spec["authenticity_target"],
+            spec["capacity_level"],
+        )
+
+    def _interaction_steps(self) -> List[Step]:
+        """primitives → context → tension → dialogue → outcomes as executor steps"""
+        model = self.models["primary"]
+        limits = self.config.pipeline_executor.get("per_step", {})
+
+        def primitives(run: Dict) -> NPCPrimitives:
+            spec = run["spec"]
+            return self.generate_npc_primitives(
+                spec["complexity_type"], spec.get("interaction_id"), spec.get("npc_index")
+            )
+
+        def context(run: Dict) -> SituationalContext:
+            spec = run["spec"]
+            return self.generate_situational_context(
+                run["primitives"], spec["capacity_level"], spec["support_needed"]
+            )
+
+        def tension(run: Dict) -> TensionMemoryElements:
+            return self.generate_tension_memory_elements(run["primitives"], run["context"])
+
+        def dialogue(run: Dict) -> DialogueOutput:
+            spec = run["spec"]
+            return self.generate_dialogue(
+                run["primitives"],
+                run["context"],
+                run["tension"],
+                spec["complexity_type"],
+                spec["authenticity_target"],
+            )
+
+        def outcomes(run: Dict) -> GameOutcomes:
+            spec = run["spec"]
+            return self.calculate_outcomes(
+                run["primitives"],
+                run["context"],
+                run["dialogue"],
+                spec["complexity_type"],
+                spec["authenticity_target"],
+            )
+
+        return [
+            Step(
+                "primitives",
+                self._retrying("primitives", primitives, llm=self.npc_synthesizer is None),
+                [],
+                model if self.npc_synthesizer is None else None,
+                limits.get("primitives"),
+            ),
+            Step("context", self._retrying("context", context), ["primitives"], model, limits.get("context")),
+            Step("tension", self._retrying("tension", tension), ["context"], model, limits.get("tension")),
+            Step("dialogue", self._retrying("dialogue", dialogue), ["tension"], model, limits.get("dialogue")),
+            Step("outcomes", self._retrying("outcomes", outcomes, llm=False), ["dialogue"], None, limits.get("outcomes")),
+        ]
+
+    def _retrying(self, name: str, fn: Callable[[Dict], Any], llm: bool = True) -> Callable[[Dict], Any]:
+        """
+        Wrap a step so a failure retries only that step
+
+        An output supplied in the spec's ``reuse`` (a pooled base) or stored
+        for the run's ``interaction_id`` is reused; otherwise
+        the step is attempted up to ``step_store.max_step_attempts`` times,
+        each retry with a nudged temperature and a fresh seed, and the result
+        is stored for later steps, retries and resumes.
+        """
+        settings = self.config.step_store
+        max_attempts = max(1, settings.get("max_step_attempts", 3))
+        temperature_step = settings.get("temperature_step", 0.05)
+
+        def run_step(run: Dict) -> Any:
+            reused = run["spec"].get("reuse", {})
+            if name in reused:
+                return reused[name]
+            interaction_id = run["spec"].get("interaction_id")
+            store = self.step_store if interaction_id else None
+            if store is not None:
+                stored = store.get(interaction_id, name)
+                if stored is not None:
+                    return stored
+
+            for attempt in range(max_attempts):
+                if llm:
+                    with self._call_lock:
+                        self._call_counts["llm_calls"] += 1
+                try:
+                    if attempt == 0:
+                        value = fn(run)
+                    else:
+                        seed = zlib.crc32(f"{interaction_id or id(run)}:{name}:{attempt}".encode("utf-8"))
+                        with self.sampling_perturbation(attempt * temperature_step, seed):
+                            value = fn(run)
+                    break
+                except Exception as e:
+                    if self.step_store is not None:
+                        self.step_store.record_failure(interaction_id, name, attempt + 1, str(e))
+                    if attempt == max_attempts - 1:
+                        raise
+                    AppLogger.warning(
+                        f"Step '{name}' failed, retrying this step only",
+                        data={"attempt": attempt + 1, "error": str(e), "interaction_id": interaction_id},
+                    )
+
+            if store is not None:
+                store.put(interaction_id, name, value, attempt + 1)
+            return value
+
+        return run_step
+
+    def step_stats(self) -> Dict[str, Dict]:
+        """Per-step queue depth, queue wait and latency of the step executor"""
+        return self.step_executor.stats()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Scenario pool reuse and LLM calls per finished sample"""
+        with self._call_lock:
+            calls, samples = self._call_counts["llm_calls"], self._call_counts["samples"]
+        stats = self.scenario_pool.stats() if self.scenario_pool is not None else {}
+        stats["llm_calls_per_sample"] = round(calls / samples, 2) if samples else None
+        return stats
+
     def _authenticity_to_score(self, target: str) -> float:
         """Convert authenticity target to numeric score"""
         scores = {"failed": 0.25, "struggling": 0.55, "authentic": 0.85, "excellent": 0.95}
@@ -16,12 +16,14 @@ Combines Best of Both Approaches:
 """
 
 import json
+import threading
 import time
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
 from .config import EnhancedTrainingConfig
+from .pipeline_executor import PipelineExecutor, Step
 from .systematic_generator import SystematicParameterGenerator
 from ..utils.logger import AppLogger
 
@@ -37,12 +39,26 @@ class MultiStepSystematicGenerator(SystematicParameterGenerator):
     4. Generate responses with systematic constraints
     5. Add complexity layers based on systematic requirements
     6. Validate against full spectrum requirements
+
+    Steps 2-6 run per sample as concurrent chains on a PipelineExecutor:
+    a slow sample holds up only its own chain.
     """
     
+    telemetry_data_type = 'systematic_multi_step'
+    
     def __init__(self, config: Optional[EnhancedTrainingConfig] = None):
         """Initialize multi-step systematic generator"""
         super().__init__(config)
         
+        settings = self.config.pipeline_executor
+        self.chain_executor = PipelineExecutor(
+            self._sample_chain_steps(),
+            max_in_flight=settings.get("max_in_flight") or self.client.max_in_flight,
+            per_model=settings.get("per_model", {}),
+        )
+        self._validation_lock = threading.Lock()
+        self._chain_calls: Dict[int, Dict] = {}  # id(params) -> step latencies and tokens (ledger)
+        
         AppLogger.info("MultiStepSystematicGenerator initialized", data={
             'approach': 'multi_step_systematic',
             'features': [
@@ -100,11 +116,12 @@ Generate targeting exactly {target_capacity:.1f}/10 capacity. Show math."""
             model=self.config.model_speed,
             prompt=prompt,
             temperature=0.8,
-            max_tokens=1000
+            max_tokens=1000,
+            schema="targeted_state"
         )
         
         if response_text:
-            parsed = self._parse_json_response(response_text, 'targeted_state')
+            parsed = self._parse_json_response(response_text, 'targeted_state', schema='targeted_state')
             return parsed[0] if parsed else {}
         return {}
     
@@ -169,11 +186,12 @@ Generate interaction targeting {params['authenticity_target']} authenticity."""
             model=self.config.model_speed,
             prompt=prompt,
             temperature=0.85,
-            max_tokens=1000
+            max_tokens=1000,
+            schema="targeted_interaction"
         )
         
         if response_text:
-            parsed = self._parse_json_response(response_text, 'targeted_interaction')
+            parsed = self._parse_json_response(response_text, 'targeted_interaction', schema='targeted_interaction')
             return parsed[0] if parsed else {}
         return {}
     
@@ -235,11 +253,12 @@ JSON FORMAT:
             model=self.models['primary'],
             prompt=prompt,
             temperature=0.85,
-            max_tokens=2000
+            max_tokens=2000,
+            schema="systematic_response"
         )
         
         if response_text:
-            parsed = self._parse_json_response(response_text, 'systematic_response')
+            parsed = self._parse_json_response(response_text, 'systematic_response', schema='systematic_response')
             return parsed[0] if parsed else {}
         return {}
     
@@ -353,11 +372,12 @@ JSON FORMAT:
             model=self.models['primary'],
             prompt=prompt,
             temperature=0.88,
-            max_tokens=1000
+            max_tokens=1000,
+            schema="complexity_enhancement"
         )
         
         if response_text:
-            parsed = self._parse_json_response(response_text, 'complexity_enhancement')
+            parsed = self._parse_json_response(response_text, 'complexity_enhancement', schema='complexity_enhancement')
             return parsed[0] if parsed else {}
         return {}
     
@@ -371,8 +391,15 @@ JSON FORMAT:
         
         IMPROVEMENT: Comprehensive validation vs lenient current validation.
         """
-        analysis = {
-            'total_samples': len(samples),
+        analysis = self._new_spectrum_analysis()
+        for sample, target_params in zip(samples, parameters):
+            self._accumulate_spectrum(analysis, sample, target_params)
+        return self._finalize_spectrum(analysis)
+    
+    def _new_spectrum_analysis(self) -> Dict:
+        """Empty spectrum analysis, filled one sample at a time"""
+        return {
+            'total_samples': 0,
             'parameter_compliance': {},
             'authenticity_distribution': {
                 'failed (0.2-0.4)': 0,
@@ -389,37 +416,41 @@ JSON FORMAT:
             }
         }
         
-        # Analyze each sample against its target parameters
-        for sample, target_params in zip(samples, parameters):
-            auth_score = sample.get('authenticity_score', 0.8)
-            complexity = sample.get('complexity_exhibited',
-                                   sample.get('complexity_type', 'baseline'))
-            
-            # Check authenticity distribution
-            if 0.2 <= auth_score < 0.4:
-                analysis['authenticity_distribution']['failed (0.2-0.4)'] += 1
-            elif 0.4 <= auth_score < 0.6:
-                analysis['authenticity_distribution']['struggling (0.4-0.6)'] += 1
-            elif 0.6 <= auth_score < 0.8:
-                analysis['authenticity_distribution']['authentic (0.6-0.8)'] += 1
-            else:
-                analysis['authenticity_distribution']['excellent (0.8-1.0)'] += 1
-            
-            # Track complexity coverage
-            analysis['complexity_coverage'][complexity] = \
-                analysis['complexity_coverage'].get(complexity, 0) + 1
-            
-            # Validate against target parameters
-            target_range = target_params['authenticity_range']
-            if not (target_range[0] <= auth_score <= target_range[1]):
-                analysis['systematic_validation']['quality_issues'].append({
-                    'issue': 'authenticity_target_missed',
-                    'target': target_params['authenticity_target'],
-                    'target_range': target_range,
-                    'actual_score': auth_score,
-                    'sample_id': sample.get('scenario_id', 'unknown')
-                })
-        
+    
+    def _accumulate_spectrum(self, analysis: Dict, sample: Dict, target_params: Dict) -> None:
+        """Analyze one sample against its target parameters"""
+        analysis['total_samples'] += 1
+        auth_score = sample.get('authenticity_score', 0.8)
+        complexity = sample.get('complexity_exhibited',
+                               sample.get('complexity_type', 'baseline'))
+        
+        # Check authenticity distribution
+        if 0.2 <= auth_score < 0.4:
+            analysis['authenticity_distribution']['failed (0.2-0.4)'] += 1
+        elif 0.4 <= auth_score < 0.6:
+            analysis['authenticity_distribution']['struggling (0.4-0.6)'] += 1
+        elif 0.6 <= auth_score < 0.8:
+            analysis['authenticity_distribution']['authentic (0.6-0.8)'] += 1
+        else:
+            analysis['authenticity_distribution']['excellent (0.8-1.0)'] += 1
+        
+        # Track complexity coverage
+        analysis['complexity_coverage'][complexity] = \
+            analysis['complexity_coverage'].get(complexity, 0) + 1
+        
+        # Validate against target parameters
+        target_range = target_params['authenticity_range']
+        if not (target_range[0] <= auth_score <= target_range[1]):
+            analysis['systematic_validation']['quality_issues'].append({
+                'issue': 'authenticity_target_missed',
+                'target': target_params['authenticity_target'],
+                'target_range': target_range,
+                'actual_score': auth_score,
+                'sample_id': sample.get('scenario_id', 'unknown')
+            })
+    
+    def _finalize_spectrum(self, analysis: Dict) -> Dict:
+        """Check the accumulated analysis against the spectrum requirements"""
         # Check spectrum requirements (from config)
         required_minimums = self.config.systematic_coverage['authenticity_spectrum']
         
@@ -479,55 +510,30 @@ JSON FORMAT:
         else:
             parameter_combinations = self._generate_systematic_parameters(batch_size)
         
-        # Phase 2: Generate targeted character states
-        AppLogger.info("Phase 2: Generating targeted character states")
-        character_states = []
-        for params in parameter_combinations:
-            state = self.generate_targeted_character_state(params)
-            if state:
-                character_states.append(state)
-            time.sleep(0.3)
-        
-        # Phase 3: Generate targeted interactions
-        AppLogger.info("Phase 3: Generating targeted interactions")
-        interactions = []
-        for params, state in zip(parameter_combinations, character_states):
-            interaction = self.generate_targeted_interaction(params, state)
-            if interaction:
-                interactions.append(interaction)
-            time.sleep(0.3)
-        
-        # Phase 4: Generate responses with systematic constraints
-        AppLogger.info("Phase 4: Generating responses with systematic constraints")
-        samples = []
-        for state, interaction, params in zip(character_states, interactions, parameter_combinations):
-            response = self.generate_response_with_systematic_constraints(
-                state, interaction, params
-            )
-            if response:
-                # Combine all components
-                response['character_state'] = state
-                response['interaction_context'] = interaction
-                response['systematic_parameters'] = params
-                samples.append(response)
-            time.sleep(0.5)
-        
-        # Phase 5: Add complexity layers
-        AppLogger.info("Phase 5: Adding complexity layers")
-        for sample, params in zip(samples, parameter_combinations):
-            if params['complexity_type'] != 'baseline':
-                complexity = self.add_targeted_complexity_layer(sample, params)
-                if complexity:
-                    sample['complexity_enhancement'] = complexity
-            time.sleep(0.3)
-        
-        # Phase 6: Validate systematic spectrum
-        AppLogger.info("Phase 6: Validating systematic spectrum")
-        quality_analysis = self.validate_systematic_spectrum(samples, parameter_combinations)
+        # Phases 2-6 as one concurrent chain per sample (parameters stay attached)
+        AppLogger.info("Phases 2-6: Running per-sample chains", data={
+            'max_in_flight': self.chain_executor.max_in_flight
+        })
+        # One analysis per batch, handed to the validate step through each run spec
+        analysis = self._new_spectrum_analysis()
+        runs = self.chain_executor.run(
+            [{'params': params, 'analysis': analysis} for params in parameter_combinations]
+        )
         
-        # Track in database
-        for sample, params in zip(samples, parameter_combinations):
-            self._track_generated_combination(params)
+        samples = []
+        for params, run in zip(parameter_combinations, runs):
+            if run is None:
+                # A phase came back empty; the other samples are unaffected
+                self._record_chain(params, None)
+                continue
+            samples.append(run['validate'])
+        for params in parameter_combinations:
+            self._chain_calls.pop(id(params), None)
+        self._release_unfinished(parameter_combinations)
+        quality_analysis = self._finalize_spectrum(analysis)
+        self.coverage.flush()
+        if self.ledger is not None:
+            self.ledger.flush()
         
         AppLogger.info("Systematic multi-step generation complete", data={
             'samples_generated': len(samples),
@@ -538,6 +544,99 @@ JSON FORMAT:
         
         return samples, quality_analysis
     
+    def _sample_chain_steps(self) -> List[Step]:
+        """Phases 2-6 for one sample as executor steps (an empty phase result drops the sample)"""
+        
+        def required(value: Dict, phase: str) -> Dict:
+            if not value:
+                raise ValueError(f"{phase} came back empty")
+            return value
+        
+        def timed(name: str, fn):
+            # Per-sample step latency and token use for the generation ledger
+            def run_step(run: Dict):
+                self._call_metrics.values = {}
+                start = time.monotonic()
+                try:
+                    return fn(run)
+                finally:
+                    seconds, call = time.monotonic() - start, self.last_call_metrics()
+                    with self._validation_lock:
+                        entry = self._chain_calls.setdefault(
+                            id(run['spec']['params']), {'steps': {}, 'prompt_tokens': 0, 'eval_tokens': 0, 'outcomes': []}
+                        )
+                        entry['steps'][name] = seconds
+                        entry['prompt_tokens'] += call.get('prompt_tokens', 0)
+                        entry['eval_tokens'] += call.get('eval_tokens', 0)
+                        if 'parse_outcome' in call:
+                            entry['outcomes'].append(call['parse_outcome'])
+            return run_step
+        
+        def state(run: Dict) -> Dict:
+            return required(self.generate_targeted_character_state(run['spec']['params']), 'character state')
+        
+        def interaction(run: Dict) -> Dict:
+            return required(
+                self.generate_targeted_interaction(run['spec']['params'], run['state']), 'interaction'
+            )
+        
+        def response(run: Dict) -> Dict:
+            params = run['spec']['params']
+            sample = required(
+                self.generate_response_with_systematic_constraints(run['state'], run['interaction'], params),
+                'response'
+            )
+            # Combine all components
+            sample['character_state'] = run['state']
+            sample['interaction_context'] = run['interaction']
+            sample['systematic_parameters'] = params
+            return sample
+        
+        def complexity(run: Dict) -> Dict:
+            params = run['spec']['params']
+            sample = run['response']
+            if params['complexity_type'] != 'baseline':
+                enhancement = self.add_targeted_complexity_layer(sample, params)
+                if enhancement:
+                    sample['complexity_enhancement'] = enhancement
+            return sample
+        
+        def validate(run: Dict) -> Dict:
+            # Validated and tracked as soon as the sample completes
+            params = run['spec']['params']
+            with self._validation_lock:
+                self._accumulate_spectrum(run['spec']['analysis'], run['complexity'], params)
+                self._track_generated_combination(params)
+            self._record_chain(params, run['complexity'])
+            return run['complexity']
+        
+        return [
+            Step('state', timed('state', state), [], self.config.model_speed),
+            Step('interaction', timed('interaction', interaction), ['state'], self.config.model_speed),
+            Step('response', timed('response', response), ['interaction'], self.models['primary']),
+            Step('complexity', timed('complexity', complexity), ['response'], self.models['primary']),
+            Step('validate', validate, ['complexity']),
+        ]
+    
+    def _record_chain(self, params: Dict, sample: Optional[Dict]):
+        """Ledger one chain: summed tokens, per-step latencies, worst parse outcome"""
+        with self._validation_lock:
+            entry = self._chain_calls.pop(id(params), None) or {'steps': {}, 'outcomes': []}
+        outcomes = entry['outcomes']
+        # A kept sample whose optional layer failed to parse still needed repair
+        outcome = 'repaired' if {'failed', 'repaired'} & set(outcomes) else ('strict' if outcomes else None)
+        self._record_ledger(
+            params,
+            {
+                'model': self.models['primary'],
+                'prompt_tokens': entry.get('prompt_tokens', 0),
+                'eval_tokens': entry.get('eval_tokens', 0),
+            },
+            sample,
+            parse_outcome='failed' if sample is None else outcome,
+            step_latencies=entry['steps'],
+        )
+    
     def _generate_gap_filling_combinations(self,
                                           target_coverage: Dict,
                                           batch_size: int) -> List[Dict]:
@@ -577,6 +676,17 @@ JSON FORMAT:
                                         quality_analysis: Dict,
                                         batch_number: int) -> str:
         """Save systematic multi-step batch with comprehensive metadata"""
+        if self.dataset_writer is not None:
+            # Samples only; the batch's quality analysis is in the log and coverage reports
+            data_type = "emotional_authenticity_systematic_multi_step"
+            self.dataset_writer.write_many(data_type, samples)
+            AppLogger.info(f"Appended systematic multi-step batch", data={
+                'shards': str(self.dataset_writer.shard_path(data_type)),
+                'samples': len(samples),
+                'quality_met': quality_analysis['systematic_validation']['meets_spectrum_requirements']
+            })
+            return str(self.dataset_writer.shard_path(data_type))
+        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"systematic_multi_step_batch{batch_number:04d}_{timestamp}.json"
         filepath = self.output_dir / filename
@@ -610,6 +720,8 @@ JSON FORMAT:
             
             with open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(output, f, indent=2, ensure_ascii=False)
+            if self.ledger is not None:
+                self.ledger.assign_output(filepath, samples)
             
             AppLogger.info(f"Saved systematic multi-step batch", data={
                 'file': filename,
@@ -0,0 +1,273 @@
+"""
+Local NPC Primitive Synthesizer
+
+Step 1 of the multi-step pipeline asked the LLM to invent five OCEAN floats,
+a capacity, a relationship level, a trust value and a name: a whole
+round-trip (``max_tokens=3000``) for numbers a sampler draws better. This
+module draws them locally instead:
+
+- Latin hypercube sampling per complexity type, so every block of
+  ``block_size`` NPCs covers each trait's range evenly (random draws clump)
+- Trait ranges conditioned on complexity type (e.g. Agreeableness > 4.0 for
+  ``people_pleasing``), matching the generators' complexity instructions
+- Names from a built-in bank of first names and surnames; streamed draws
+  are not repeated until the bank runs out (then a new round starts), and
+  used names are kept in ``output_dir/npc_names_used.txt`` across runs
+
+An NPC sampled for an ``interaction_id`` is a function of (seed, complexity
+type, index) alone, so it is the same whatever the thread scheduling, resume
+point or used-names file. ``index`` is the NPC's ordinal within its type
+(planned up front by the caller) and picks a fixed (block, stratum) of a
+hypercube block seeded per type, plus a fixed slot of a seeded permutation
+of the name bank. Without an index the NPC is a uniform draw seeded by
+``crc32(seed:interaction_id)``: reproducible, but neither stratified nor
+free of repeated names. Sobol sequences would need scipy,
+which is not a dependency; stratified LHS gives the same even marginal
+coverage.
+"""
+
+import random
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.logger import AppLogger
+from .schemas import OCEAN_TRAITS
+
+FIRST_NAMES = (
+    "Jordan", "Mara", "Theo", "Priya", "Dmitri", "Aisha", "Elena", "Kofi", "Hana", "Mateo",
+    "Sofia", "Ravi", "Ingrid", "Tomas", "Leila", "Oskar", "Nadia", "Emeka", "Yuki", "Caleb",
+    "Rosa", "Arjun", "Freya", "Malik", "Iris", "Bastian", "Amara", "Felix", "Zara", "Hugo",
+    "Camila", "Kenji", "Noor", "Silas", "Esme", "Tariq", "Lucia", "Anders", "Chioma", "Declan",
+    "Mira", "Rafael", "Sana", "Emil", "Thandiwe", "Jonah", "Ines", "Kwame", "Ava", "Idris",
+    "Clara", "Luca", "Fatima", "Rowan", "Ayla", "Nikolai", "Beatriz", "Samir", "Greta", "Omar",
+    "Lena", "Diego", "Yara", "Callum", "Mei", "Abel", "Selin", "Magnus", "Imani", "Pablo",
+    "Vera", "Hamid", "Astrid", "Ezra", "Lucía", "Jun", "Talia", "Ibrahim", "Maeve", "Santiago",
+    "Anya", "Kai", "Delphine", "Rashid", "Elodie", "Marcus", "Keiko", "Nico", "Olga", "Tobias",
+    "Zainab", "Ruben", "Wren", "Anton", "Adaeze", "Quinn", "Paloma", "Viktor", "Suki", "Elias",
+    "Nia", "Henrik", "Lior", "Carmen", "Yusuf", "Tessa", "Bruno", "Asha", "Leon", "Marisol",
+    "Cyrus", "Linnea", "Femi", "June", "Alejandro", "Saoirse", "Hiro", "Dalia", "Gideon", "Pilar",
+    "Ansel", "Kamala", "Reza", "Harriet", "Enzo", "Lulu", "Dorian", "Nalani", "Sven", "Farah",
+    "Miles", "Ottilie", "Jamal", "Renata", "Cosmo", "Soraya", "Aurelio", "Tamsin", "Bao", "Esther",
+    "Xavier", "Noa", "Ramon", "Signe", "Levi", "Ximena", "Ade", "Isolde", "Wendell", "Parisa",
+)
+
+SURNAMES = (
+    "Okafor", "Lindqvist", "Moreau", "Tanaka", "Reyes", "Novak", "Haddad", "Brennan", "Castillo", "Petrov",
+    "Mensah", "Fischer", "Iyer", "Sato", "Delgado", "Kowalski", "Nakamura", "Oduya", "Larsen", "Quinn",
+    "Rahman", "Silva", "Whitaker", "Abara", "Hollis", "Ferreira", "Kim", "Dubois", "Varga", "Osei",
+    "Albrecht", "Marchetti", "Nguyen", "Sandoval", "Eriksen", "Bello", "Ashford", "Kaur", "Romero", "Weiss",
+    "Adeyemi", "Caldwell", "Jansen", "Morales", "Park", "Sorensen", "Toure", "Vance", "Zhou", "Aguilar",
+    "Blackwood", "Costa", "Dahl", "Estrada", "Gallo", "Hartmann", "Ivanova", "Kiplagat", "Lowell", "Mbeki",
+)
+
+# Trait ranges on the 0.0-5.0 OCEAN scale; complexity types narrow some
+DEFAULT_RANGES: Dict[str, Tuple[float, float]] = {trait: (1.0, 5.0) for trait in OCEAN_TRAITS}
+DEFAULT_RANGES.update({"base_capacity": (3.0, 9.0)})
+
+COMPLEXITY_RANGES: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "people_pleasing": {"agreeableness": (4.0, 5.0)},
+    "misjudgment": {"conscientiousness": (1.0, 2.5)},
+    "misjudgment_over": {"conscientiousness": (1.0, 2.5)},
+    "misjudgment_under": {"neuroticism": (3.5, 5.0)},
+    "defensive_lashing": {"neuroticism": (3.5, 5.0), "agreeableness": (1.0, 3.0)},
+    "emotional_shutdown": {"extraversion": (1.0, 2.5), "neuroticism": (3.0, 5.0)},
+    "over_commitment": {"conscientiousness": (3.5, 5.0), "agreeableness": (3.5, 5.0)},
+    "avoidance": {"extraversion": (1.0, 2.5), "agreeableness": (2.0, 4.0)},
+    "projection": {"neuroticism": (3.0, 5.0), "openness": (1.0, 2.5)},
+    "mixed_emotions": {"agreeableness": (2.5, 4.0), "neuroticism": (2.5, 4.5)},
+}
+
+# Unit-cube dimensions: OCEAN, base capacity, relationship level, trust, interaction count
+DIMENSIONS = OCEAN_TRAITS + ("base_capacity", "relationship_level", "trust", "interaction_count")
+
+# Keyed NPCs of these types interleave in the name permutation, so equal indices never share a name
+NAME_SLOTS = ("baseline",) + tuple(sorted(COMPLEXITY_RANGES))
+
+
+class LatinHypercube:
+    """Stream of points in [0, 1)^d, stratified per dimension in blocks"""
+
+    def __init__(self, dimensions: int, block_size: int, rng: random.Random):
+        self.dimensions = dimensions
+        self.block_size = max(1, block_size)
+        self.rng = rng
+        self._block: List[List[float]] = []
+
+    def block(self) -> List[List[float]]:
+        """``block_size`` points with one point per stratum of every dimension"""
+        n = self.block_size
+        columns = []
+        for _ in range(self.dimensions):
+            strata = list(range(n))
+            self.rng.shuffle(strata)
+            columns.append([(stratum + self.rng.random()) / n for stratum in strata])
+        return [list(point) for point in zip(*columns)]
+
+    def _fill(self) -> None:
+        self._block = self.block()
+
+    def next(self) -> List[float]:
+        if not self._block:
+            self._fill()
+        return self._block.pop()
+
+
+class NameBank:
+    """First names, then first + last names, each handed out once per round"""
+
+    def __init__(self, rng: random.Random, used_path: Optional[Path] = None, seed: Optional[int] = None):
+        self.rng = rng
+        self.used_path = Path(used_path) if used_path else None
+        self.used = set()
+        if self.used_path is not None and self.used_path.exists():
+            self.used = {line.strip() for line in self.used_path.read_text(encoding="utf-8").splitlines() if line.strip()}
+
+        self.bank = list(FIRST_NAMES) + [f"{name} {surname}" for name in FIRST_NAMES for surname in SURNAMES]
+        self.rounds = 0
+        self._names = self._shuffled([name for name in self.bank if name not in self.used])
+        # Keyed draws read a fixed permutation instead of the stream
+        self._order = self._shuffled(list(self.bank), random.Random(zlib.crc32(f"{seed}:names".encode("utf-8"))))
+        self._order.reverse()
+
+    def _shuffled(self, names: List[str], rng: Optional[random.Random] = None) -> List[str]:
+        rng = rng or self.rng
+        first = [name for name in names if " " not in name]
+        full = [name for name in names if " " in name]
+        rng.shuffle(first)
+        rng.shuffle(full)
+        names = first + full
+        names.reverse()  # pop() from the end keeps the shuffled order
+        return names
+
+    @property
+    def remaining(self) -> int:
+        return len(self._names)
+
+    def at(self, position: int) -> str:
+        """Name at ``position`` of the seeded permutation; positions past the bank start a new round"""
+        rounds, offset = divmod(position, len(self._order))
+        if rounds > self.rounds:
+            self.rounds = rounds
+            AppLogger.info("NPC name bank exhausted; reusing names", data={"round": self.rounds + 1})
+        return self._order[offset]
+
+    def draw(self) -> str:
+        if not self._names:
+            # Every name has been used: start another round rather than fail
+            self.rounds += 1
+            self.used.clear()
+            self._names = self._shuffled(list(self.bank))
+            AppLogger.info("NPC name bank exhausted; reusing names", data={"round": self.rounds + 1})
+        name = self._names.pop()
+        self.used.add(name)
+        if self.used_path is not None:
+            self.used_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.used_path, "a", encoding="utf-8") as f:
+                f.write(name + "\n")
+        return name
+
+
+class NPCSynthesizer:
+    """Seeded local replacement for the LLM primitives step"""
+
+    def __init__(self, seed: Optional[int] = None, block_size: int = 64, names_path: Optional[Path] = None):
+        # Keyed NPCs need a concrete seed; None picks one for this run only
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.block_size = max(1, block_size)
+        self.names = NameBank(self.rng, names_path, self.seed)
+        self.generated: Dict[str, int] = {}
+        self._samplers: Dict[str, LatinHypercube] = {}
+        self._blocks: Dict[Tuple[str, int], List[List[float]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["NPCSynthesizer"]:
+        """Build the synthesizer from ``config.npc_synthesizer`` (None when disabled)"""
+        settings = getattr(config, "npc_synthesizer", {}) or {}
+        if not settings.get("enabled", False):
+            return None
+        names_path = settings.get("names_path") or Path(config.output_dir) / "npc_names_used.txt"
+        return cls(settings.get("seed"), settings.get("block_size", 64), names_path)
+
+    def sample(
+        self, complexity_type: str = "baseline", interaction_id: Optional[str] = None, index: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        NPCPrimitives fields for one NPC of ``complexity_type``
+
+        With an ``index`` (the NPC's ordinal within its type) it is a fixed
+        hypercube point and bank name; with only an ``interaction_id`` it is
+        a uniform draw seeded by the id; without either it is the next point
+        of the type's hypercube stream.
+        """
+        if index is not None:
+            return self._keyed(complexity_type, index)
+        if interaction_id is not None:
+            rng = random.Random(zlib.crc32(f"{self.seed}:{interaction_id}".encode("utf-8")))
+            point = {dimension: rng.random() for dimension in DIMENSIONS}
+            name = self.names.at(rng.randrange(len(self.names.bank)))
+            with self._lock:
+                self.generated[complexity_type] = self.generated.get(complexity_type, 0) + 1
+            return self._primitives(complexity_type, point, name)
+
+        with self._lock:
+            sampler = self._samplers.get(complexity_type)
+            if sampler is None:
+                # One hypercube per type, so each type's NPCs are stratified on their own
+                sampler = LatinHypercube(len(DIMENSIONS), self.block_size, self.rng)
+                self._samplers[complexity_type] = sampler
+            point = dict(zip(DIMENSIONS, sampler.next()))
+            name = self.names.draw()
+            self.generated[complexity_type] = self.generated.get(complexity_type, 0) + 1
+        return self._primitives(complexity_type, point, name)
+
+    def _keyed(self, complexity_type: str, index: int) -> Dict[str, Any]:
+        """The point at (block, stratum) ``divmod(index, block_size)`` of the type's seeded blocks"""
+        block_index, position = divmod(index, self.block_size)
+        slot = NAME_SLOTS.index(complexity_type) if complexity_type in NAME_SLOTS else len(NAME_SLOTS)
+        with self._lock:
+            block = self._blocks.get((complexity_type, block_index))
+            if block is None:
+                if len(self._blocks) >= 64:
+                    self._blocks.pop(next(iter(self._blocks)))  # Keep the most recent blocks only
+                seed = zlib.crc32(f"{self.seed}:{complexity_type}:{block_index}".encode("utf-8"))
+                block = LatinHypercube(len(DIMENSIONS), self.block_size, random.Random(seed)).block()
+                self._blocks[(complexity_type, block_index)] = block
+            name = self.names.at(index * (len(NAME_SLOTS) + 1) + slot)
+            self.generated[complexity_type] = self.generated.get(complexity_type, 0) + 1
+        return self._primitives(complexity_type, dict(zip(DIMENSIONS, block[position])), name)
+
+    def _primitives(self, complexity_type: str, point: Dict[str, float], name: str) -> Dict[str, Any]:
+        """Scale a unit-cube point to the type's trait ranges"""
+
+        ranges = {**DEFAULT_RANGES, **COMPLEXITY_RANGES.get(complexity_type, {})}
+
+        def scale(dimension: str) -> float:
+            low, high = ranges[dimension]
+            return low + point[dimension] * (high - low)
+
+        relationship_level = min(5, int(point["relationship_level"] * 6))
+        # Closer relationships carry more trust and more shared history
+        trust = 0.05 + 0.1 * relationship_level + point["trust"] * 0.4
+        low_count, high_count = max(1, relationship_level * 8), relationship_level * 20 + 5
+        interaction_count = int(low_count + point["interaction_count"] * (high_count - low_count))
+
+        return {
+            "name": name,
+            "ocean": {trait: round(scale(trait), 1) for trait in OCEAN_TRAITS},
+            "base_capacity": round(scale("base_capacity"), 1),
+            "relationship_level": relationship_level,
+            "trust": round(trust, 2),
+            "interaction_count": interaction_count,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "generated": dict(self.generated),
+                "names_remaining": self.names.remaining,
+                "name_rounds": self.names.rounds + 1,
+            }
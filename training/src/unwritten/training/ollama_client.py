@@ -0,0 +1,457 @@
+"""
+Async Ollama Client with Bounded Concurrency
+
+The generators used to issue one blocking ``requests.post`` at a time, which
+left Ollama's ``OLLAMA_NUM_PARALLEL`` slots idle. This client keeps several
+requests in flight at once:
+
+- A global in-flight limit (match it to ``OLLAMA_NUM_PARALLEL``)
+- Per-model semaphores so a memory-heavy model cannot hog every slot
+- A synchronous wrapper so existing (threaded or sequential) callers can
+  share the same limits without becoming async themselves
+- Streaming requests that can be cut off mid-generation (see ``streaming.py``)
+- Optional model-affinity waves and ``keep_alive`` to avoid model swaps
+  (see ``model_scheduler.py``)
+- Several hosts behind one client via ``endpoint_pool.py``
+"""
+
+import asyncio
+import contextlib
+import json
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .model_scheduler import ModelAffinityScheduler
+from ..utils.logger import AppLogger
+
+
+def ollama_base_url(url: str) -> str:
+    """Strip the API path from an Ollama URL (``.../api/generate`` → ``http://host:port``)"""
+    parts = urlsplit(url)
+    if not parts.scheme:
+        return url.rstrip("/")
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def fetch_ollama_models(url: str, timeout: float = 5) -> Optional[List[str]]:
+    """Model names from ``/api/tags`` (None when the host is unreachable)"""
+    import requests
+
+    base_url = ollama_base_url(url)
+    try:
+        response = requests.get(f"{base_url}/api/tags", timeout=timeout)
+        response.raise_for_status()
+        return [entry.get("name", "") for entry in response.json().get("models", [])]
+    except Exception as e:
+        AppLogger.warning("Ollama health check failed", data={"url": base_url, "error": str(e)})
+        return None
+
+
+def check_ollama_connection(url: str = "http://localhost:11434/api/tags") -> bool:
+    """Check if Ollama service is running"""
+    return fetch_ollama_models(url) is not None
+
+
+class AsyncOllamaClient:
+    """
+    asyncio client for the Ollama HTTP API.
+
+    Every request acquires the semaphore of the requested model first and then
+    the global semaphore, so at most ``max_in_flight`` requests run in total
+    and at most ``per_model[model]`` (or ``default_per_model``) per model.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_in_flight: int = 4,
+        default_per_model: int = 2,
+        per_model: Optional[Dict[str, int]] = None,
+        scheduler: Optional[ModelAffinityScheduler] = None,
+        keep_alive: Optional[str] = None,
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.base_url = ollama_base_url(base_url)
+        self.max_in_flight = max_in_flight
+        self.default_per_model = max(1, default_per_model)
+        self.per_model = dict(per_model or {})
+        self.scheduler = scheduler
+        self.keep_alive = keep_alive
+
+        self._global_semaphore: Optional[asyncio.Semaphore] = None
+        self._model_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def model_limit(self, model: str) -> int:
+        """In-flight cap for one model (never above the global cap)"""
+        return min(self.max_in_flight, max(1, self.per_model.get(model, self.default_per_model)))
+
+    def _semaphores(self, model: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(self.max_in_flight)
+        if model not in self._model_semaphores:
+            self._model_semaphores[model] = asyncio.Semaphore(self.model_limit(model))
+        return self._global_semaphore, self._model_semaphores[model]
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            # Connection pool sized to the in-flight limit; timeouts are per request
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight * 2)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def post(self, path: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """POST a JSON payload and return the decoded JSON response"""
+        session = await self._get_session()
+        async with session.post(
+            f"{self.base_url}{path}",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def get(self, path: str, timeout: float = 5) -> Dict[str, Any]:
+        """GET an API path and return the decoded JSON response"""
+        session = await self._get_session()
+        async with session.get(
+            f"{self.base_url}{path}", timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    def _prepare(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.keep_alive is not None and "keep_alive" not in payload:
+            payload = {**payload, "keep_alive": self.keep_alive}
+        return payload
+
+    @staticmethod
+    def _endpoint(payload: Dict[str, Any]) -> str:
+        """Chat payloads (``messages``) go to /api/chat, everything else to /api/generate"""
+        return "/api/chat" if "messages" in payload else "/api/generate"
+
+    @staticmethod
+    def _fragment(chunk: Dict[str, Any]) -> str:
+        """Completion text of a generate or chat response (or stream chunk)"""
+        if "message" in chunk:
+            return (chunk.get("message") or {}).get("content", "") or ""
+        return chunk.get("response", "") or ""
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, model: str) -> AsyncIterator[None]:
+        """
+        Model-affinity admission (when enabled), then the per-model and global semaphores.
+
+        The per-model slot is taken first so requests queued behind a saturated
+        model do not hold global slots that other models could use.
+        """
+        if self.scheduler is not None:
+            await self.scheduler.acquire(model)
+        try:
+            global_semaphore, model_semaphore = self._semaphores(model)
+            async with model_semaphore:
+                async with global_semaphore:
+                    self.in_flight += 1
+                    self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                    try:
+                        yield
+                    finally:
+                        self.in_flight -= 1
+        finally:
+            if self.scheduler is not None:
+                await self.scheduler.release(model)
+
+    def _record(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if self.scheduler is not None:
+            self.scheduler.record_load(result.get("model", ""), result.get("load_duration"))
+        return result
+
+    async def generate(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """
+        Run one generation under the concurrency limits.
+
+        Payloads with ``messages`` are sent to ``/api/chat``; the reply text is
+        copied into ``response`` so callers handle both endpoints the same way.
+        ``request_seconds`` is the time from sending the request to its reply,
+        without the wait for a concurrency slot.
+        """
+        async with self._slot(payload["model"]):
+            sent = time.monotonic()
+            result = await self.post(self._endpoint(payload), self._prepare({**payload, "stream": False}), timeout)
+            result["request_seconds"] = time.monotonic() - sent
+            result["response"] = self._fragment(result)
+            return self._record(result)
+
+    async def warm_up(self, model: str, timeout: float = 600) -> Dict[str, Any]:
+        """Load ``model`` ahead of a wave (a prompt-less generate loads weights only)"""
+        async with self._slot(model):
+            return self._record(
+                await self.post("/api/generate", self._prepare({"model": model, "stream": False}), timeout)
+            )
+
+    async def loaded_models(self) -> List[str]:
+        """Models currently resident in Ollama (``/api/ps``)"""
+        response = await self.get("/api/ps")
+        return [entry.get("name", "") for entry in response.get("models", [])]
+
+    async def generate_stream(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        on_chunk: Callable[[str], Optional[str]],
+    ) -> Dict[str, Any]:
+        """
+        Run one streaming generation (``/api/generate`` or ``/api/chat``) under
+        the concurrency limits.
+
+        ``on_chunk`` receives each response fragment and returns a stop reason
+        (or ``None``); as soon as it returns a reason the connection is closed,
+        which makes Ollama stop decoding. The result looks like a non-streaming
+        response: ``response`` holds the text received so far, ``done_reason``
+        the stop reason, and the final chunk's metrics are kept when present.
+        """
+        payload = self._prepare({**payload, "stream": True})
+        async with self._slot(payload["model"]):
+            sent = time.monotonic()
+            result = await self._read_stream(payload, timeout, on_chunk)
+            result["request_seconds"] = time.monotonic() - sent
+            return self._record(result)
+
+    async def _read_stream(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        on_chunk: Callable[[str], Optional[str]],
+    ) -> Dict[str, Any]:
+        session = await self._get_session()
+        pieces: List[str] = []
+        result: Dict[str, Any] = {"model": payload["model"], "done": False}
+
+        async with session.post(
+            f"{self.base_url}{self._endpoint(payload)}",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            response.raise_for_status()
+            buffer = b""
+            finished = False
+            # Split NDJSON by hand: the final chunk carries the whole token
+            # context and can exceed aiohttp's readline limit
+            async for data in response.content.iter_any():
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+
+                    fragment = self._fragment(chunk)
+                    if fragment:
+                        pieces.append(fragment)
+                        stop_reason = on_chunk(fragment)
+                        if stop_reason is not None:
+                            # Dropping the connection cancels generation server-side
+                            response.close()
+                            result["done_reason"] = stop_reason
+                            finished = True
+                            break
+
+                    if chunk.get("done"):
+                        result.update(
+                            {k: v for k, v in chunk.items() if k not in ("response", "message")}
+                        )
+                        finished = True
+                        break
+                if finished:
+                    break
+
+        result["response"] = "".join(pieces)
+        return result
+
+    async def generate_many(
+        self, requests: List[Tuple[Dict[str, Any], float]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Run several ``(payload, timeout)`` requests concurrently, preserving order"""
+        return await asyncio.gather(
+            *(self.generate(payload, timeout) for payload, timeout in requests),
+            return_exceptions=True,
+        )
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        # Semaphores bind to the loop that first awaits them
+        self._global_semaphore = None
+        self._model_semaphores = {}
+        if self.scheduler is not None:
+            self.scheduler.reset_loop_state()
+
+
+class OllamaClient:
+    """
+    Synchronous wrapper around :class:`AsyncOllamaClient`.
+
+    Runs the async client on a private event loop in a daemon thread, so any
+    number of caller threads can submit requests and still share one set of
+    semaphores and one connection pool.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_in_flight: int = 4,
+        default_per_model: int = 2,
+        per_model: Optional[Dict[str, int]] = None,
+        scheduler: Optional[ModelAffinityScheduler] = None,
+        keep_alive: Optional[str] = None,
+        async_client: Optional[Any] = None,
+    ):
+        # ``async_client`` may be an AsyncOllamaClient or an EndpointPool
+        self.async_client = async_client or AsyncOllamaClient(
+            base_url,
+            max_in_flight=max_in_flight,
+            default_per_model=default_per_model,
+            per_model=per_model,
+            scheduler=scheduler,
+            keep_alive=keep_alive,
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Any) -> "OllamaClient":
+        """
+        Build a client from ``config.ollama_url``, ``ollama_concurrency`` and
+        ``model_scheduling``, or over ``config.endpoint_pool["endpoints"]``
+        when several hosts are configured.
+        """
+        pool_settings = getattr(config, "endpoint_pool", {}) or {}
+        if pool_settings.get("endpoints"):
+            from .endpoint_pool import EndpointPool
+
+            return cls(config.ollama_url, async_client=EndpointPool.from_config(config))
+
+        concurrency = getattr(config, "ollama_concurrency", {}) or {}
+        scheduling = getattr(config, "model_scheduling", {}) or {}
+        scheduler = None
+        if scheduling.get("enabled", False):
+            scheduler = ModelAffinityScheduler(max_wave=scheduling.get("max_wave", 32))
+        return cls(
+            config.ollama_url,
+            max_in_flight=concurrency.get("max_in_flight", 4),
+            default_per_model=concurrency.get("default_per_model", 2),
+            per_model=concurrency.get("per_model"),
+            scheduler=scheduler,
+            keep_alive=scheduling.get("keep_alive"),
+        )
+
+    @property
+    def base_url(self) -> str:
+        return self.async_client.base_url
+
+    @property
+    def max_in_flight(self) -> int:
+        return self.async_client.max_in_flight
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="ollama-client", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coroutine: Any) -> Any:
+        """Run a coroutine on the client loop and block until it finishes"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop()).result()
+
+    def generate(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Blocking ``/api/generate`` call (raises on HTTP/transport errors)"""
+        return self.run(self.async_client.generate(payload, timeout))
+
+    def generate_stream(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        on_chunk: Callable[[str], Optional[str]],
+    ) -> Dict[str, Any]:
+        """Blocking streaming call; ``on_chunk`` runs on the client loop thread"""
+        return self.run(self.async_client.generate_stream(payload, timeout, on_chunk))
+
+    def generate_many(
+        self, requests: List[Tuple[Dict[str, Any], float]]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Blocking fan-out; failed requests come back as exception objects"""
+        return self.run(self.async_client.generate_many(requests))
+
+    def get(self, path: str, timeout: float = 5) -> Dict[str, Any]:
+        return self.run(self.async_client.get(path, timeout))
+
+    def warm_up(self, model: str, timeout: float = 600) -> bool:
+        """Load ``model`` before a wave; returns False (and logs) if loading failed"""
+        try:
+            result = self.run(self.async_client.warm_up(model, timeout))
+        except Exception as e:
+            AppLogger.warning(f"Warm-up failed for {model}", data={"error": str(e)})
+            return False
+        AppLogger.info(
+            f"Warmed up {model}",
+            data={"load_seconds": round((result.get("load_duration") or 0) / 1e9, 2)},
+        )
+        return True
+
+    def check_health(self) -> Dict[str, bool]:
+        """``/api/tags`` health per host (drained pool endpoints are re-admitted when they pass)"""
+        if hasattr(self.async_client, "check_all"):
+            return self.run(self.async_client.check_all())
+        return {self.base_url: check_ollama_connection(self.base_url)}
+
+    def loaded_models(self) -> List[str]:
+        """Models resident in Ollama right now (empty list if /api/ps is unavailable)"""
+        try:
+            return self.run(self.async_client.loaded_models())
+        except Exception:
+            return []
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "max_in_flight": self.async_client.max_in_flight,
+            "in_flight": self.async_client.in_flight,
+            "peak_in_flight": self.async_client.peak_in_flight,
+        }
+        if self.async_client.scheduler is not None:
+            stats["model_scheduling"] = self.async_client.scheduler.stats()
+        if hasattr(self.async_client, "endpoint_stats"):
+            stats["endpoints"] = self.async_client.endpoint_stats()
+        return stats
+
+    def close(self) -> None:
+        """Close the HTTP session and stop the background loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.async_client.close(), loop).result(timeout=5)
+        except Exception as e:
+            AppLogger.warning("Failed to close Ollama session cleanly", data={"error": str(e)})
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
@@ -0,0 +1,142 @@
+"""
+Parser Regression Corpus
+
+Harvests the raw responses that parsing has choked on — the
+``failed_<data_type>_<timestamp>.txt`` debug dumps and raw completions kept
+in the ``ResponseCache`` — into a versioned JSONL fixture set, and measures
+any parser against it: recovery rate, objects recovered and µs per KB.
+
+Parser changes are judged against real failures: build the corpus once,
+commit it, and re-run the benchmark (``scripts/benchmark_parser.py``) or the
+regression test whenever the parser changes.
+"""
+
+import hashlib
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+CORPUS_VERSION = 1
+
+FAILED_DUMP_NAME = re.compile(r"failed_(?P<data_type>[a-z_]+?)_\d{8}_\d{6}\.txt$")
+_ORIGINAL_MARKER = "ORIGINAL RESPONSE:"
+_SECTION_RULE = "=" * 80
+
+# parse(response_text, data_type) -> recovered items
+ParseFunction = Callable[[str, str], List[Any]]
+
+
+def read_failed_dump(path: Path) -> Optional[Tuple[str, str]]:
+    """``(data_type, raw_response)`` from a failed_*.txt debug dump"""
+    match = FAILED_DUMP_NAME.search(Path(path).name)
+    if not match:
+        return None
+    text = Path(path).read_text(encoding="utf-8", errors="replace")
+    if _ORIGINAL_MARKER in text:
+        # Debug dumps wrap the raw response in ===== sections
+        text = text.split(_ORIGINAL_MARKER, 1)[1].lstrip("=\n")
+        text = text.split(f"\n\n{_SECTION_RULE}", 1)[0]
+    return match.group("data_type"), text
+
+
+def _entry(data_type: str, response: str, source: str) -> Dict[str, Any]:
+    digest = hashlib.sha256(response.encode("utf-8")).hexdigest()[:16]
+    return {"id": digest, "data_type": data_type, "source": source, "response": response}
+
+
+def harvest_failed_dumps(directory: Path) -> List[Dict[str, Any]]:
+    """Corpus entries for every failed_*.txt below ``directory``"""
+    directory = Path(directory)
+    entries = []
+    for path in sorted(directory.rglob("failed_*.txt")):
+        dump = read_failed_dump(path)
+        if dump is not None:
+            data_type, response = dump
+            entries.append(_entry(data_type, response, path.relative_to(directory).as_posix()))
+    return entries
+
+
+def harvest_response_cache(path: Path, data_types: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """Corpus entries for cached raw completions (data type from their metadata)"""
+    from .response_cache import ResponseCache
+
+    wanted = set(data_types) if data_types else None
+    cache = ResponseCache(path, mode="read_through")
+    entries = []
+    try:
+        for cached in cache.iter_responses():
+            metadata = cached["metadata"]
+            data_type = metadata.get("data_type") or metadata.get("schema")
+            if not data_type or (wanted is not None and data_type not in wanted):
+                continue
+            entries.append(_entry(data_type, cached["response"], f"cache:{cached['key'][:12]}"))
+    finally:
+        cache.close()
+    return entries
+
+
+def build_corpus(entries: Iterable[Dict[str, Any]], path: Path) -> int:
+    """Write (deduplicated) entries as a versioned JSONL fixture; returns the entry count"""
+    unique: Dict[str, Dict[str, Any]] = {}
+    for entry in entries:
+        unique.setdefault(entry["id"], entry)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        header = {
+            "corpus_version": CORPUS_VERSION,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "count": len(unique),
+        }
+        f.write(json.dumps(header) + "\n")
+        for entry in sorted(unique.values(), key=lambda e: (e["data_type"], e["source"])):
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return len(unique)
+
+
+def load_corpus(path: Path) -> List[Dict[str, Any]]:
+    """Entries of a corpus written by :func:`build_corpus`"""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+    if not lines:
+        return []
+    header = json.loads(lines[0])
+    if header.get("corpus_version") != CORPUS_VERSION:
+        raise ValueError(f"Unsupported parser corpus version: {header.get('corpus_version')}")
+    return [json.loads(line) for line in lines[1:]]
+
+
+def benchmark_parser(entries: List[Dict[str, Any]], parse: ParseFunction, repeat: int = 1) -> Dict[str, Any]:
+    """
+    Recovery rate, objects recovered and µs/KB of ``parse`` over the corpus
+
+    ``per_entry`` maps entry id to the number of objects recovered, so two
+    parsers can be compared response by response.
+    """
+    per_entry: Dict[str, int] = {}
+    seconds = 0.0
+    total_bytes = 0
+    for entry in entries:
+        response = entry["response"]
+        total_bytes += len(response.encode("utf-8"))
+        items: List[Any] = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            items = parse(response, entry["data_type"]) or []
+            seconds += time.perf_counter() - start
+        per_entry[entry["id"]] = len(items)
+
+    recovered = sum(1 for count in per_entry.values() if count)
+    kilobytes = total_bytes * max(1, repeat) / 1024
+    return {
+        "responses": len(entries),
+        "recovered": recovered,
+        "recovery_rate": round(recovered / len(entries), 3) if entries else 0.0,
+        "objects": sum(per_entry.values()),
+        "us_per_kb": round(seconds * 1e6 / kilobytes, 1) if kilobytes else 0.0,
+        "per_entry": per_entry,
+    }
@@ -0,0 +1,189 @@
+"""
+Pipelined DAG Executor
+
+Runs many multi-step interactions at once as a DAG of step tasks: a step of
+one interaction is ready as soon as its own dependencies are done, whatever
+the other interactions are doing, so primitives of interaction 7 overlap
+dialogue of interaction 2 on the server.
+
+- Per-interaction dependency order is kept (``Step.depends_on``)
+- In-flight work is bounded overall, per step and per model
+- Among ready tasks, later steps go first so started interactions finish
+  (and release their memory) before new ones fan out
+- Per-step queue depth, queue wait and latency are reported by ``stats()``
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .resilience import percentile
+from ..utils.logger import AppLogger
+
+
+@dataclass
+class Step:
+    """One node of the per-interaction DAG"""
+
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]  # Receives {"spec": ..., <dependency name>: result}
+    depends_on: List[str] = field(default_factory=list)
+    model: Optional[str] = None  # Ollama model the step calls (None: local work)
+    max_in_flight: Optional[int] = None
+
+
+class _StepStats:
+    def __init__(self):
+        self.completed = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.latencies: List[float] = []
+        self.waits: List[float] = []
+
+    def summary(self, queued: int, running: int) -> Dict[str, Any]:
+        latencies, waits = sorted(self.latencies), sorted(self.waits)
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "queued": queued,
+            "running": running,
+            "max_queue_depth": self.max_queue_depth,
+            "latency_p50": round(percentile(latencies, 0.50), 3) if latencies else None,
+            "latency_p95": round(percentile(latencies, 0.95), 3) if latencies else None,
+            "queue_wait_p50": round(percentile(waits, 0.50), 3) if waits else None,
+        }
+
+
+class PipelineExecutor:
+    """Bounded concurrent execution of a step DAG over many specs"""
+
+    def __init__(
+        self,
+        steps: List[Step],
+        max_in_flight: int,
+        per_model: Optional[Dict[str, int]] = None,
+    ):
+        names = [step.name for step in steps]
+        for step in steps:
+            for dependency in step.depends_on:
+                if dependency not in names:
+                    raise ValueError(f"Step '{step.name}' depends on unknown step '{dependency}'")
+        self.steps = {step.name: step for step in steps}
+        self.order = {name: index for index, name in enumerate(names)}
+        self.max_in_flight = max(1, max_in_flight)
+        self.per_model = per_model or {}
+
+        self._lock = threading.Lock()
+        self._stats = {name: _StepStats() for name in names}
+        self._queued = {name: 0 for name in names}
+        self._running = {name: 0 for name in names}
+
+    def _has_capacity(self, step: Step, running_models: Dict[str, int]) -> bool:
+        if step.max_in_flight is not None and self._running[step.name] >= step.max_in_flight:
+            return False
+        limit = self.per_model.get(step.model) if step.model else None
+        return limit is None or running_models.get(step.model, 0) < limit
+
+    def run(
+        self, specs: List[Dict[str, Any]], only: Optional[List[str]] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Run every step (or the steps named in ``only``) for every spec
+
+        Returns, in spec order, ``{step name: result}`` for each spec, or None
+        where a step raised (its remaining steps are skipped).
+        """
+        selected = [name for name in self.steps if only is None or name in only]
+        for name in selected:
+            missing = [dependency for dependency in self.steps[name].depends_on if dependency not in selected]
+            if missing:
+                raise ValueError(f"Step '{name}' needs {missing}, which are not selected")
+        results: List[Optional[Dict[str, Any]]] = [{"spec": spec} for spec in specs]
+        done: List[set] = [set() for _ in specs]
+        scheduled: List[set] = [set() for _ in specs]
+        ready: List[tuple] = []  # (index, step name, enqueued at)
+        running_models: Dict[str, int] = {}
+
+        def enqueue(index: int) -> None:
+            for step in self.steps.values():
+                if step.name in scheduled[index] or step.name not in selected:
+                    continue
+                if all(dependency in done[index] for dependency in step.depends_on):
+                    scheduled[index].add(step.name)
+                    ready.append((index, step.name, time.monotonic()))
+                    with self._lock:
+                        self._queued[step.name] += 1
+                        stats = self._stats[step.name]
+                        stats.max_queue_depth = max(stats.max_queue_depth, self._queued[step.name])
+
+        def execute(index: int, step: Step, inputs: Dict[str, Any]) -> tuple:
+            start = time.monotonic()
+            return step.fn(inputs), time.monotonic() - start
+
+        running: Dict[Any, tuple] = {}
+        for index in range(len(specs)):
+            enqueue(index)
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="pipeline-step") as pool:
+            while ready or running:
+                # Later steps first, then older interactions
+                ready.sort(key=lambda task: (-self.order[task[1]], task[0]))
+                for task in list(ready):
+                    if len(running) >= self.max_in_flight:
+                        break
+                    index, name, enqueued_at = task
+                    step = self.steps[name]
+                    if results[index] is None:
+                        ready.remove(task)
+                        with self._lock:
+                            self._queued[name] -= 1
+                        continue
+                    if not self._has_capacity(step, running_models):
+                        continue
+                    ready.remove(task)
+                    with self._lock:
+                        self._queued[name] -= 1
+                        self._running[name] += 1
+                        self._stats[name].waits.append(time.monotonic() - enqueued_at)
+                    if step.model:
+                        running_models[step.model] = running_models.get(step.model, 0) + 1
+                    future = pool.submit(execute, index, step, dict(results[index]))
+                    running[future] = (index, step)
+
+                if not running:
+                    break  # Only tasks of failed interactions were left
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index, step = running.pop(future)
+                    if step.model:
+                        running_models[step.model] -= 1
+                    with self._lock:
+                        self._running[step.name] -= 1
+                    try:
+                        value, seconds = future.result()
+                    except Exception as e:
+                        AppLogger.error(f"Pipeline step '{step.name}' failed", e, data=specs[index])
+                        with self._lock:
+                            self._stats[step.name].failed += 1
+                        results[index] = None
+                        continue
+                    with self._lock:
+                        self._stats[step.name].completed += 1
+                        self._stats[step.name].latencies.append(seconds)
+                    if results[index] is not None:
+                        results[index][step.name] = value
+                        done[index].add(step.name)
+                        enqueue(index)
+
+        return results
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-step completed/failed counts, queue depth, queue wait and latency"""
+        with self._lock:
+            return {
+                name: self._stats[name].summary(self._queued[name], self._running[name])
+                for name in self.steps
+            }
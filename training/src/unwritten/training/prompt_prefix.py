@@ -0,0 +1,152 @@
+"""
+Static Prompt-Prefix Reuse
+
+The batch prompts (capacity tables, behaviour tiers, JSON schema) are the same
+on every call; only a short suffix changes. Sending the static part as a
+stable prefix lets Ollama reuse its evaluated KV cache instead of prefilling
+thousands of tokens per request.
+
+Strategies (``config.prefix_reuse["strategy"]``):
+- chat:    prefix as the ``/api/chat`` system message, suffix as the user turn;
+           the runner's prompt cache reuses the shared prefix across requests
+- context: prime the prefix once via ``/api/generate`` and pass the returned
+           ``context`` tokens with each suffix
+- off:     concatenate prefix and suffix into one prompt (legacy behaviour)
+
+Savings are measured from Ollama's ``prompt_eval_count``: the largest count
+seen for a prefix approximates a cold prefill, and every call that evaluated
+fewer tokens is counted as reuse. With ``context`` the priming call's prompt
+tokens are counted as evaluated, and a primed call's cold estimate adds the
+prefix it did not have to send.
+"""
+
+import hashlib
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+PREFIX_STRATEGIES = ("chat", "context", "off")
+
+
+def prefix_key(model: str, prefix: str) -> str:
+    """Short stable identifier for a (model, prefix) pair"""
+    digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:12]
+    return f"{model}:{digest}"
+
+
+class PrefixReuseTracker:
+    """Per-prefix ``prompt_eval_count`` bookkeeping (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._prefixes: Dict[str, Dict[str, Any]] = {}
+
+    def _entry(self, key: str) -> Dict[str, Any]:
+        return self._prefixes.setdefault(
+            key,
+            {
+                "calls": 0,
+                "evaluated_tokens": 0,
+                "cold_tokens": 0,
+                "priming_tokens": 0,
+                "prefix_tokens": 0,
+                "prompt_eval_seconds": 0.0,
+            },
+        )
+
+    def record(self, key: str, response_data: Dict[str, Any], primed: bool = False) -> None:
+        """One call; ``primed`` when its prefix was sent as a primed ``context``"""
+        prompt_tokens = response_data.get("prompt_eval_count")
+        if prompt_tokens is None:
+            return
+        prompt_seconds = (response_data.get("prompt_eval_duration") or 0) / 1e9
+        with self._lock:
+            entry = self._entry(key)
+            entry["calls"] += 1
+            entry["evaluated_tokens"] += prompt_tokens
+            cold_tokens = prompt_tokens + (entry["prefix_tokens"] if primed else 0)
+            entry["cold_tokens"] = max(entry["cold_tokens"], cold_tokens)
+            entry["prompt_eval_seconds"] += prompt_seconds
+
+    def record_priming(self, key: str, response_data: Dict[str, Any]) -> None:
+        """The ``context`` strategy's prefix evaluation: a prefill cost, not a call"""
+        prompt_tokens = response_data.get("prompt_eval_count")
+        if prompt_tokens is None:
+            return
+        prompt_seconds = (response_data.get("prompt_eval_duration") or 0) / 1e9
+        with self._lock:
+            entry = self._entry(key)
+            entry["evaluated_tokens"] += prompt_tokens
+            entry["priming_tokens"] += prompt_tokens
+            entry["prefix_tokens"] = max(entry["prefix_tokens"], prompt_tokens)
+            entry["prompt_eval_seconds"] += prompt_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-prefix and total prefill tokens evaluated vs. estimated cold prefill"""
+        with self._lock:
+            per_prefix = {}
+            total_evaluated = total_cold = 0
+            for key, entry in self._prefixes.items():
+                cold_total = entry["cold_tokens"] * entry["calls"]
+                saved = cold_total - entry["evaluated_tokens"]
+                per_prefix[key] = {
+                    "calls": entry["calls"],
+                    "evaluated_tokens": entry["evaluated_tokens"],
+                    "priming_tokens": entry["priming_tokens"],
+                    "cold_tokens_per_call": entry["cold_tokens"],
+                    "saved_tokens": saved,
+                    "saved_fraction": round(saved / cold_total, 3) if cold_total else 0.0,
+                    "prompt_eval_seconds": round(entry["prompt_eval_seconds"], 2),
+                }
+                total_evaluated += entry["evaluated_tokens"]
+                total_cold += cold_total
+
+        saved_total = total_cold - total_evaluated
+        return {
+            "prefixes": per_prefix,
+            "evaluated_tokens": total_evaluated,
+            "saved_tokens": saved_total,
+            "saved_fraction": round(saved_total / total_cold, 3) if total_cold else 0.0,
+        }
+
+
+class PrimedContextStore:
+    """
+    Evaluated prefix ``context`` tokens per (model, prefix), for the
+    ``context`` strategy. Each prefix is primed once; concurrent callers for
+    the same prefix wait for the first priming instead of repeating it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contexts: Dict[str, List[int]] = {}
+        self._priming: Dict[str, threading.Event] = {}
+
+    def get_or_prime(self, key: str, prime: Callable[[], Optional[List[int]]]) -> Optional[List[int]]:
+        with self._lock:
+            if key in self._contexts:
+                return self._contexts[key]
+            event = self._priming.get(key)
+            owner = event is None
+            if owner:
+                event = self._priming[key] = threading.Event()
+
+        if not owner:
+            event.wait()
+            with self._lock:
+                return self._contexts.get(key)
+
+        try:
+            context = prime()
+            if context:
+                with self._lock:
+                    self._contexts[key] = context
+            return context
+        finally:
+            with self._lock:
+                self._priming.pop(key, None)
+            event.set()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._contexts.pop(key, None)
+
@@ -8,22 +8,42 @@ Hardware: RTX 4070 SUPER (12GB VRAM) + 128GB RAM
 Models: Qwen3-30B-A3B (primary), Qwen3-8B (speed), Qwen3-32B (validation)
 """
 
+import asyncio
 import json
+import math
+import threading
 import time
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Any, Callable, Iterable, List, Dict, Optional
 from tqdm import tqdm
 import random
 from pathlib import Path
 
+from .budget_scheduler import BudgetedJobQueue
 from .config import TrainingConfig
+from .dataset_writer import DatasetWriter
+from .job_journal import COMPLETED, FAILED, JobJournal
+from .job_queue import GenerationJob, JobQueue, RateLimiter, TypeQuota, run_jobs
+from .json_extract import RepairReport, extract_json
+from .ollama_client import OllamaClient
+from .prompt_prefix import PrefixReuseTracker, PrimedContextStore, prefix_key
+from .resilience import ModelResilience
+from .response_cache import ResponseCache
+from .schemas import get_schema, item_schema, validate_instance
+from .streaming import ABORT_REASONS, COMPLETE, PREAMBLE, StreamingJSONGuard
+from .telemetry import ThroughputTelemetry
 from ..utils.logger import AppLogger
 
 
 class Qwen3DataGenerator:
     """Generate Master Truths v1.2 compliant training data using Qwen3"""
 
+    # Telemetry data type for every call of a multi-step pipeline (subclasses);
+    # their steps are then tagged by schema name
+    telemetry_data_type: Optional[str] = None
+
     def __init__(self, config: Optional[TrainingConfig] = None):
         """Initialize the Qwen3 data generator with v1.2 spec compliance"""
         self.config = config or TrainingConfig()
@@ -32,10 +52,35 @@ class Qwen3DataGenerator:
         self.ollama_url = self.config.ollama_url
         self.models = self.config.models
 
+        # Shared client: bounded concurrency with per-model limits
+        self.client = OllamaClient.from_config(self.config)
+
         # Ensure output directory exists
         self.output_dir = Path(self.config.output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Persistent raw-completion cache (None when mode is "off")
+        self.response_cache = ResponseCache.from_config(self.config)
+
+        # Static prompt-prefix reuse (KV cache) bookkeeping
+        self.prefix_tracker = PrefixReuseTracker()
+        self._primed_contexts = PrimedContextStore()
+
+        # Latency-adaptive timeouts, retries and per-model circuit breakers
+        self.resilience = ModelResilience.from_config(self.config)
+
+        # Per-call token/timing metrics (None when disabled)
+        self.telemetry = ThroughputTelemetry.from_config(self.config)
+
+        # Append-only JSONL shards for generated samples (None: one JSON file per batch)
+        self.dataset_writer = DatasetWriter.from_config(self.config)
+
+        # Parse outcomes per data type: strict / repaired / failed / dropped items
+        self._parse_counts: Dict[str, Dict[str, int]] = {}
+        self._parse_lock = threading.Lock()
+        self._sampling = threading.local()  # Per-thread retry perturbation (see sampling_perturbation)
+        self._call_metrics = threading.local()  # Per-thread last call metrics (see last_call_metrics)
+
         AppLogger.info(
             "Qwen3DataGenerator initialized (Master Truths v1.2)",
             data={
@@ -46,76 +91,454 @@ class Qwen3DataGenerator:
             },
         )
 
-    def generate_with_qwen3(
-        self, model: str, prompt: str, temperature: float = 0.85, max_tokens: int = 4000
-    ) -> Optional[str]:
-        """Call local Qwen3 model via Ollama"""
-
-        # Auto-select timeout based on model
+    def _select_timeout(self, model: str) -> float:
+        """Auto-select request timeout based on model"""
         if "8b" in model.lower():
-            timeout = getattr(self.config, "timeout_8b", 120)
+            return getattr(self.config, "timeout_8b", 120)
         elif "30b" in model.lower():
-            timeout = getattr(self.config, "timeout_30b", 600)
-        else:
-            timeout = self.config.request_timeout
+            return getattr(self.config, "timeout_30b", 600)
+        return self.config.request_timeout
+
+    def _build_payload(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        prefix: Optional[str] = None,
+        schema: Optional[str] = None,
+    ) -> Dict:
+        """
+        Build the Ollama payload shared by single and concurrent calls.
 
-        payload = {
-            "model": model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_predict": max_tokens,
-                "top_p": 0.98,  # v1.6.2: Near-maximum for truly diverse sampling
-                "top_k": 80,  # v1.6.2: Doubled for maximum vocabulary diversity (was 40)
-            },
-        }
+        With a static ``prefix`` the payload follows ``config.prefix_reuse``:
+        a chat system message, a primed ``context``, or (``off``) the legacy
+        single prompt with the prefix prepended. A registered ``schema`` name
+        is sent as ``format`` for grammar-constrained decoding.
+        """
+        payload = self._build_base_payload(model, prompt, temperature, max_tokens, prefix)
+        json_schema = self._active_schema(schema)
+        if json_schema is not None:
+            payload["format"] = json_schema
+        return payload
+
+    def _active_schema(self, schema: Optional[str]) -> Optional[Dict]:
+        """JSON schema for ``schema`` when structured output is enabled"""
+        if not self.config.structured_output.get("enabled", False):
+            return None
+        return get_schema(schema)
 
+    @contextmanager
+    def sampling_perturbation(self, temperature_delta: float = 0.0, seed: Optional[int] = None):
+        """
+        Nudge temperature and pin a seed for calls made by this thread
+
+        Used to retry a failed step with different sampling; the perturbed
+        options also change the response-cache key, so a bad cached
+        completion is not served again.
+        """
+        previous = getattr(self._sampling, "value", None)
+        self._sampling.value = (temperature_delta, seed)
         try:
-            start_time = time.time()
-            
-            # DEBUG: Log prompt length and first 200 chars
+            yield
+        finally:
+            self._sampling.value = previous
+
+    def _build_base_payload(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        prefix: Optional[str] = None,
+    ) -> Dict:
+        options = {
+            "temperature": temperature,
+            "num_predict": max_tokens,
+            "top_p": 0.98,  # v1.6.2: Near-maximum for truly diverse sampling
+            "top_k": 80,  # v1.6.2: Doubled for maximum vocabulary diversity (was 40)
+        }
+        perturbation = getattr(self._sampling, "value", None)
+        if perturbation is not None:
+            temperature_delta, seed = perturbation
+            options["temperature"] = round(min(1.5, max(0.0, temperature + temperature_delta)), 3)
+            if seed is not None:
+                options["seed"] = seed
+        strategy = self.config.prefix_reuse.get("strategy", "off") if prefix else None
+
+        if strategy == "chat":
+            return {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": prefix},
+                    {"role": "user", "content": prompt},
+                ],
+                "stream": False,
+                "options": options,
+            }
+
+        payload = {"model": model, "prompt": prompt, "stream": False, "options": options}
+        if strategy == "context":
+            context = self._primed_context(model, prefix)
+            if context:
+                payload["context"] = context
+                return payload
+        if prefix:
+            payload["prompt"] = f"{prefix}\n\n{prompt}"
+        return payload
+
+    def _cache_payload(self, payload: Dict, prefix: Optional[str]) -> Dict:
+        """
+        ``payload`` as the response cache keys it: a primed ``context`` is
+        replaced by the prefix text it encodes, so replay (which never primes)
+        and runs against other servers fingerprint the request identically
+        """
+        if "context" not in payload or not prefix:
+            return payload
+        keyed = {name: value for name, value in payload.items() if name != "context"}
+        keyed["prompt"] = f"{prefix}\n\n{payload['prompt']}"
+        return keyed
+
+    def _primed_context(self, model: str, prefix: str) -> Optional[List[int]]:
+        """Evaluated ``context`` tokens for ``prefix`` (primed once per model)"""
+        if self.response_cache is not None and self.response_cache.mode == "replay":
+            return None
+
+        def prime() -> Optional[List[int]]:
+            try:
+                response_data = self.client.generate(
+                    {
+                        "model": model,
+                        "prompt": prefix,
+                        "stream": False,
+                        "options": {"num_predict": 1, "temperature": 0},
+                    },
+                    self._select_timeout(model),
+                )
+            except Exception as e:
+                AppLogger.warning(f"Prefix priming failed for {model}", data={"error": str(e)})
+                return None
             AppLogger.info(
-                f"Sending to {model}",
+                f"Primed static prefix for {model}",
+                data={"prefix_tokens": response_data.get("prompt_eval_count")},
+            )
+            self.prefix_tracker.record_priming(prefix_key(model, prefix), response_data)
+            return response_data.get("context")
+
+        return self._primed_contexts.get_or_prime(prefix_key(model, prefix), prime)
+
+    def prefix_reuse_stats(self) -> Dict:
+        """Measured prefill savings from static prompt prefixes (prompt_eval_count)"""
+        return self.prefix_tracker.stats()
+
+    def _log_request(
+        self, model: str, prompt: str, temperature: float, max_tokens: int, prefix: Optional[str] = None
+    ) -> None:
+        # DEBUG: Log prompt length and first 200 chars
+        AppLogger.info(
+            f"Sending to {model}",
+            data={
+                "prompt_length": len(prompt),
+                "prefix_length": len(prefix) if prefix else 0,
+                "prompt_preview": prompt[:200] + "..." if len(prompt) > 200 else prompt,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            },
+        )
+
+    def _extract_response_text(
+        self, model: str, response_data: Dict, elapsed: float, temperature: float
+    ) -> Optional[str]:
+        """Pull the completion out of an Ollama response and log it"""
+        result = response_data.get("response", "")
+
+        if not result:
+            # DEBUG: Log full response to understand what Ollama returned
+            AppLogger.warning(
+                f"Empty response from {model}",
                 data={
-                    "prompt_length": len(prompt),
-                    "prompt_preview": prompt[:200] + "..." if len(prompt) > 200 else prompt,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
+                    "response_keys": list(response_data.keys()),
+                    "done": response_data.get("done"),
+                    "done_reason": response_data.get("done_reason"),
+                    "eval_count": response_data.get("eval_count"),
+                    "context_length": len(response_data.get("context", [])) if response_data.get("context") else 0,
                 },
             )
-            
-            response = requests.post(self.ollama_url, json=payload, timeout=timeout)
-            response.raise_for_status()
-            elapsed = time.time() - start_time
 
-            response_data = response.json()
-            result = response_data.get("response", "")
+        AppLogger.performance(
+            f"Qwen3 generation ({model})",
+            elapsed,
+            data={"temperature": temperature, "response_length": len(result) if result else 0},
+        )
+
+        return result if result else None
+
+    def _generate_streaming(self, model: str, payload: Dict, timeout: float) -> Dict:
+        """
+        Stream a generation and stop as soon as the JSON closes or goes off-schema.
+
+        Returns a response dict shaped like the non-streaming API. After an
+        early stop, ``response`` is trimmed to the JSON; after an abort it keeps
+        the partial text (or is emptied when ``return_partial_on_abort`` is off,
+        and always for prose preambles).
+        """
+        settings = self.config.streaming
+        guard = StreamingJSONGuard.from_config(settings)
+        response_data = self.client.generate_stream(payload, timeout, guard.feed)
+
+        if guard.stop_reason == COMPLETE:
+            response_data["response"] = guard.json_text
+            AppLogger.info(
+                f"Stopped {model} stream at end of JSON",
+                data={"response_length": len(guard.json_text), "trailing_chars": len(guard.text) - len(guard.json_text)},
+            )
+        elif guard.stop_reason in ABORT_REASONS:
+            AppLogger.warning(
+                f"Aborted {model} stream: {guard.stop_reason}",
+                data={"response_length": len(guard.text), "preview": guard.text[:200]},
+            )
+            if guard.stop_reason == PREAMBLE or not settings.get("return_partial_on_abort", True):
+                response_data["response"] = ""
+
+        return response_data
+
+    def generate_with_qwen3(
+        self,
+        model: str,
+        prompt: str,
+        temperature: float = 0.85,
+        max_tokens: int = 4000,
+        stream: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        schema: Optional[str] = None,
+        data_type: Optional[str] = None,
+        step: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Call local Qwen3 model via Ollama
+
+        ``prefix`` is the static part of the prompt (instructions, tables,
+        schema) and ``prompt`` the per-call suffix; the prefix is sent so
+        Ollama can reuse its evaluated KV cache (see ``config.prefix_reuse``).
+        ``schema`` names an entry of ``schemas.SCHEMAS`` used to constrain the
+        output; pass the same name to ``_parse_json_response``.
+
+        ``stream`` defaults to ``config.streaming["enabled"]``; streamed calls
+        stop decoding at the end of the JSON instead of running to max_tokens.
+        Completions are served from / recorded in ``self.response_cache``
+        according to ``config.response_cache["mode"]``.
+
+        Failed or empty attempts are retried with jittered backoff under a
+        latency-adaptive timeout; a model whose circuit is open sheds the
+        request to its fallback, or waits for its cooldown (bounded by the
+        remaining attempts' timeouts) when no fallback admits it (see
+        ``config.resilience``).
+
+        Token counts and prefill/decode/load timings of every attempt are
+        recorded in ``self.telemetry``, tagged with ``data_type`` (default:
+        ``schema``) and pipeline ``step``.
+        """
+        tags = self._telemetry_tags(schema, data_type, step)
+        self._call_metrics.values = {}
+        payload = self._build_payload(model, prompt, temperature, max_tokens, prefix, schema)
+        if stream is None:
+            stream = self.config.streaming.get("enabled", False)
+
+        cache = self.response_cache
+        # One key per request: key_for advances the occurrence counter, so lookup and store must share it
+        cache_key = cache.key_for(self._cache_payload(payload, prefix)) if cache is not None else None
+        if cache is not None and cache.serves_hits:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                AppLogger.info(f"Cache hit for {model}", data={"response_length": len(cached)})
+                self._record_telemetry(model, None, 0.0, tags, cached=True)
+                return cached
+            if cache.mode == "replay":
+                AppLogger.warning(f"Replay cache miss for {model}", data={"key": cache_key})
+                return None
+
+        resilience = self.resilience
+        for attempt in range(resilience.max_attempts):
+            if attempt:
+                time.sleep(resilience.backoff(attempt - 1))
+            # With every circuit open, wait for a cooldown or trial rather than fail instantly
+            target = resilience.wait_for_route(model, self._select_timeout(model) * (resilience.max_attempts - attempt))
+            if target is None:
+                AppLogger.warning(f"Circuit open for {model} and its fallbacks; skipping request")
+                return None
+            if target != model:
+                AppLogger.info(f"Shedding {model} request to fallback {target}")
+                payload = self._build_payload(target, prompt, temperature, max_tokens, prefix, schema)
+            timeout = resilience.timeout_for(target, self._select_timeout(target), attempt)
+
+            try:
+                start_time = time.time()
+                self._log_request(target, prompt, temperature, max_tokens, prefix)
+
+                if stream:
+                    response_data = self._generate_streaming(target, payload, timeout)
+                else:
+                    response_data = self.client.generate(payload, timeout)
+                elapsed = time.time() - start_time
+                if prefix:
+                    self.prefix_tracker.record(prefix_key(target, prefix), response_data, primed="context" in payload)
+
+                result = self._extract_response_text(target, response_data, elapsed, temperature)
+                self._record_telemetry(target, response_data, elapsed, tags)
+            except Exception as e:
+                is_timeout = isinstance(e, (TimeoutError, asyncio.TimeoutError))
+                resilience.record_failure(target, "timeout" if is_timeout else "error")
+                AppLogger.error(
+                    f"Generation failed for {target}",
+                    e,
+                    data={"attempt": attempt + 1, "max_attempts": resilience.max_attempts, "timeout": timeout},
+                )
+                continue
 
             if not result:
-                # DEBUG: Log full response to understand what Ollama returned
-                AppLogger.warning(
-                    f"Empty response from {model}",
-                    data={
-                        "response_keys": list(response_data.keys()),
-                        "done": response_data.get("done"),
-                        "done_reason": response_data.get("done_reason"),
-                        "eval_count": response_data.get("eval_count"),
-                        "context_length": len(response_data.get("context", [])) if response_data.get("context") else 0,
+                resilience.record_failure(target, "empty")
+                continue
+
+            # The adaptive timeout bounds the request itself, so queue wait for a slot is left out
+            resilience.record_success(target, response_data.get("request_seconds", elapsed))
+            # An aborted stream's partial text is not a reproducible completion, and a fallback's is not
+            # the completion cache_key (built from the requested model's payload) stands for
+            if (
+                cache is not None
+                and cache.stores_results
+                and target == model
+                and response_data.get("done_reason") not in ABORT_REASONS
+            ):
+                cache.put(
+                    cache_key,
+                    self._cache_payload(payload, prefix),
+                    result,
+                    metadata={
+                        **{
+                            name: response_data.get(name)
+                            for name in ("done_reason", "eval_count", "prompt_eval_count", "total_duration")
+                        },
+                        "schema": schema,
+                        **tags,
                     },
                 )
+            return result
+
+        return None
+
+    def _telemetry_tags(
+        self, schema: Optional[str], data_type: Optional[str], step: Optional[str]
+    ) -> Dict[str, str]:
+        """(data_type, step) telemetry tags for one call"""
+        if self.telemetry_data_type is not None:
+            return {"data_type": data_type or self.telemetry_data_type, "step": step or schema or "generation"}
+        return {"data_type": data_type or schema or "untyped", "step": step or "generation"}
+
+    def _record_telemetry(
+        self, model: str, response_data: Optional[Dict], elapsed: float, tags: Dict[str, str], cached: bool = False
+    ) -> None:
+        response_data = response_data or {}
+        self._call_metrics.values = {
+            "model": model,
+            "cached": cached,
+            "wall_seconds": elapsed,
+            "prompt_tokens": response_data.get("prompt_eval_count") or 0,
+            "eval_tokens": response_data.get("eval_count") or 0,
+        }
+        if self.telemetry is not None:
+            self.telemetry.record(model, response_data, elapsed, cached=cached, **tags)
+
+    def last_call_metrics(self) -> Dict:
+        """Model, latency, tokens and parse outcome of this thread's latest call (for the ledger)"""
+        return dict(getattr(self._call_metrics, "values", {}))
+
+    def throughput_summary(self) -> Optional[Dict]:
+        """Aggregated token throughput (None when telemetry is disabled)"""
+        return self.telemetry.summary() if self.telemetry is not None else None
+
+    def generate_many_with_qwen3(self, calls: List[Dict]) -> List[Optional[str]]:
+        """
+        Issue several generations concurrently.
 
-            AppLogger.performance(
-                f"Qwen3 generation ({model})",
-                elapsed,
-                data={"temperature": temperature, "response_length": len(result) if result else 0},
+        Args:
+            calls: generate_with_qwen3 keyword arguments, one dict per request
+
+        Returns:
+            Completions in the same order as ``calls`` (None where a call failed)
+        """
+        if (
+            self.config.streaming.get("enabled", False)
+            or self.response_cache is not None
+            or self.resilience.enabled
+        ):
+            # Streamed/cached/retried calls each go through generate_with_qwen3
+            return self._map_concurrent(lambda call: self.generate_with_qwen3(**call), calls)
+
+        requests_to_send = []
+        for call in calls:
+            model = call["model"]
+            temperature = call.get("temperature", 0.85)
+            max_tokens = call.get("max_tokens", 4000)
+            prefix = call.get("prefix")
+            self._log_request(model, call["prompt"], temperature, max_tokens, prefix)
+            requests_to_send.append(
+                (
+                    self._build_payload(
+                        model, call["prompt"], temperature, max_tokens, prefix, call.get("schema")
+                    ),
+                    self._select_timeout(model),
+                )
             )
 
-            return result if result else None
+        start_time = time.time()
+        responses = self.client.generate_many(requests_to_send)
+        elapsed = time.time() - start_time
+
+        results = []
+        for call, (payload, _), response_data in zip(calls, requests_to_send, responses):
+            if isinstance(response_data, Exception):
+                AppLogger.error(f"Generation failed for {call['model']}", response_data)
+                results.append(None)
+            else:
+                if call.get("prefix"):
+                    self.prefix_tracker.record(
+                        prefix_key(call["model"], call["prefix"]), response_data, primed="context" in payload
+                    )
+                self._record_telemetry(
+                    call["model"],
+                    response_data,
+                    elapsed,
+                    self._telemetry_tags(call.get("schema"), call.get("data_type"), call.get("step")),
+                )
+                results.append(
+                    self._extract_response_text(
+                        call["model"], response_data, elapsed, call.get("temperature", 0.85)
+                    )
+                )
+        return results
+
+    def _warm_up(self, model: str) -> None:
+        """Load ``model`` before a phase that uses it (model-affinity scheduling)"""
+        scheduling = self.config.model_scheduling
+        if not (scheduling.get("enabled", False) and scheduling.get("warm_up", True)):
+            return
+        if self.response_cache is not None and self.response_cache.mode == "replay":
+            return
+        self.client.warm_up(model, scheduling.get("warm_up_timeout", 600))
+
+    def _map_concurrent(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Run ``fn`` over ``items`` on a thread pool sized to the client's in-flight limit.
 
-        except Exception as e:
-            AppLogger.error(f"Generation failed for {model}", e)
-            return None
+        Lets the prompt-building/parsing generators keep several Ollama requests
+        in flight; results are returned in input order.
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        workers = min(len(items), self.client.max_in_flight)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="qwen3-gen") as pool:
+            return list(pool.map(fn, items))
 
     # ===================================================================
     # 1. EMOTIONAL AUTHENTICITY DATA (CORE SYSTEM - Master Truths v1.2 Section 16)
@@ -133,9 +556,10 @@ class Qwen3DataGenerator:
         if batch_size is None:
             batch_size = self.config.batch_size_emotional
 
-        prompt = f"""You are an expert at modeling realistic human emotional capacity constraints per Master Truths Canonical Spec v1.2.
+        # Static instructions/schema (shared KV prefix); the count goes in the suffix
+        prefix = f"""You are an expert at modeling realistic human emotional capacity constraints per Master Truths Canonical Spec v1.2.
 
-Generate {batch_size} examples of characters responding within their emotional capacity limitations.
+Generate examples of characters responding within their emotional capacity limitations.
 
 CANONICAL CONSTRAINTS (Master Truths v1.2 Section 16):
 
@@ -299,20 +723,23 @@ Example 4 - High Capacity (8.5/10):
   "ocean_context": {{"agreeableness": 0.85, "extraversion": 0.7, "openness": 0.75}},
   "tags": ["high_capacity", "full_support", "deep_processing"]
 }}
+"""
 
-Generate {batch_size} diverse, high-quality examples that demonstrate realistic capacity constraints. 
+        prompt = f"""Generate {batch_size} diverse, high-quality examples that demonstrate realistic capacity constraints. 
 Focus on authenticity scores ≥ 0.7.
 Return ONLY valid JSON array."""
 
         response_text = self.generate_with_qwen3(
             model=self.models["primary"],
             prompt=prompt,
+            prefix=prefix,
             temperature=self.config.temp_emotional,
             max_tokens=6000,
+            schema="emotional_authenticity",
         )
 
         if response_text:
-            return self._parse_json_response(response_text, "emotional_authenticity")
+            return self._parse_json_response(response_text, "emotional_authenticity", schema="emotional_authenticity")
         return []
 
     # ===================================================================
@@ -330,11 +757,11 @@ Return ONLY valid JSON array."""
         if batch_size is None:
             batch_size = self.config.batch_size_dramatic
 
-        prompt = f"""You are an expert at creating dramatic irony scenarios per Master Truths v1.2 Section 17.
+        prefix = f"""You are an expert at creating dramatic irony scenarios per Master Truths v1.2 Section 17.
 
 Dramatic irony: PLAYER knows something CHARACTER doesn't, creating "yelling at screen" tension.
 
-Generate {batch_size} complete dramatic irony scenarios with 3 response options.
+Generate complete dramatic irony scenarios with 3 response options.
 
 **DRAMATIC IRONY STRUCTURE:**
 
@@ -482,20 +909,23 @@ Example 2 - Capacity-Limited Perception:
   "dramatic_irony_score": 0.75,
   "tags": ["capacity_perception", "missed_signals", "relationship_crisis"]
 }}
+"""
 
-Generate {batch_size} complete scenarios with all three response options.
+        prompt = f"""Generate {batch_size} complete scenarios with all three response options.
 Focus on dramatic_irony_score ≥ 0.5.
 Return ONLY valid JSON array."""
 
         response_text = self.generate_with_qwen3(
             model=self.models["primary"],
             prompt=prompt,
+            prefix=prefix,
             temperature=self.config.temp_dramatic,
             max_tokens=6000,
+            schema="dramatic_irony",
         )
 
         if response_text:
-            return self._parse_json_response(response_text, "dramatic_irony")
+            return self._parse_json_response(response_text, "dramatic_irony", schema="dramatic_irony")
         return []
 
     # ===================================================================
@@ -513,9 +943,9 @@ Return ONLY valid JSON array."""
         if batch_size is None:
             batch_size = self.config.batch_size_tension
 
-        prompt = f"""You are an expert at creating narrative tension per Master Truths v1.2 Section 17.
+        prefix = f"""You are an expert at creating narrative tension per Master Truths v1.2 Section 17.
 
-Generate {batch_size} tension-building examples using the four canonical types.
+Generate tension-building examples using the four canonical types.
 
 **FOUR TENSION TYPES (Master Truths v1.2):**
 
@@ -663,20 +1093,23 @@ Example 4 - Stakes Escalation (Level 4, Crisis):
   "tension_score": 0.95,
   "tags": ["stakes_escalation", "ticking_clock", "major_decision"]
 }}
+"""
 
-Generate {batch_size} diverse tension hooks across all four types.
+        prompt = f"""Generate {batch_size} diverse tension hooks across all four types.
 Focus on hook_effectiveness ≥ 0.6 and tension_score ≥ 0.6.
 Return ONLY valid JSON array."""
 
         response_text = self.generate_with_qwen3(
             model=self.models["primary"],
             prompt=prompt,
+            prefix=prefix,
             temperature=self.config.temp_tension,
             max_tokens=6000,
+            schema="tension_building",
         )
 
         if response_text:
-            return self._parse_json_response(response_text, "tension_building")
+            return self._parse_json_response(response_text, "tension_building", schema="tension_building")
         return []
 
     # ===================================================================
@@ -694,9 +1127,9 @@ Return ONLY valid JSON array."""
         if batch_size is None:
             batch_size = self.config.batch_size_memory
 
-        prompt = f"""You are an expert at modeling emotionally resonant memory recall per Master Truths v1.2 Section 17.
+        prefix = f"""You are an expert at modeling emotionally resonant memory recall per Master Truths v1.2 Section 17.
 
-Generate {batch_size} examples of memories being recalled based on emotional resonance with current situation.
+Generate examples of memories being recalled based on emotional resonance with current situation.
 
 **FIVE RESONANCE TYPES (Master Truths v1.2):**
 
@@ -836,20 +1269,23 @@ Example 5 - Emotional Growth Callback (0.7):
   "emotional_authenticity": 0.85,
   "tags": ["emotional_regulation", "therapy_success", "quiet_growth"]
 }}
+"""
 
-Generate {batch_size} diverse memory resonance examples across all five types.
+        prompt = f"""Generate {batch_size} diverse memory resonance examples across all five types.
 Focus on emotional_authenticity ≥ 0.7.
 Return ONLY valid JSON array."""
 
         response_text = self.generate_with_qwen3(
             model=self.models["primary"],
             prompt=prompt,
+            prefix=prefix,
             temperature=self.config.temp_memory,
             max_tokens=6000,
+            schema="memory_resonance",
         )
 
         if response_text:
-            return self._parse_json_response(response_text, "memory_resonance")
+            return self._parse_json_response(response_text, "memory_resonance", schema="memory_resonance")
         return []
 
     # ===================================================================
@@ -865,7 +1301,7 @@ Return ONLY valid JSON array."""
         if batch_size is None:
             batch_size = self.config.batch_size_personality
 
-        prompt = f"""Generate {batch_size} character dialogue examples with OCEAN personality trait predictions.
+        prefix = f"""Generate character dialogue examples with OCEAN personality trait predictions.
 
 OCEAN Traits (all scored 0.0 to 1.0):
 - openness: curiosity, creativity, willingness to try new things
@@ -889,19 +1325,22 @@ JSON FORMAT:
     "trait_justification": "Why these scores fit the dialogue"
   }}
 ]
+"""
 
-Generate diverse scenarios: conversations, reactions, decisions, conflicts, support moments.
+        prompt = f"""Generate {batch_size} diverse scenarios: conversations, reactions, decisions, conflicts, support moments.
 Return ONLY valid JSON array."""
 
         response_text = self.generate_with_qwen3(
             model=self.models["speed"],
             prompt=prompt,
+            prefix=prefix,
             temperature=self.config.temp_personality,
             max_tokens=4000,
+            schema="personality_traits",
         )
 
         if response_text:
-            return self._parse_json_response(response_text, "personality_traits")
+            return self._parse_json_response(response_text, "personality_traits", schema="personality_traits")
         return []
 
     # ===================================================================
@@ -917,7 +1356,7 @@ Return ONLY valid JSON array."""
         if batch_size is None:
             batch_size = self.config.batch_size_relationship
 
-        prompt = f"""Generate {batch_size} player-character interaction examples with relationship impact scores.
+        prefix = f"""Generate player-character interaction examples with relationship impact scores.
 
 Score interactions from -1.5 to +1.0 based on:
 - Emotional appropriateness
@@ -937,18 +1376,21 @@ JSON FORMAT:
     "impact_justification": "Why this score"
   }}
 ]
+"""
 
-Generate diverse examples. Return ONLY valid JSON array."""
+        prompt = f"""Generate {batch_size} diverse examples. Return ONLY valid JSON array."""
 
         response_text = self.generate_with_qwen3(
             model=self.models["speed"],
             prompt=prompt,
+            prefix=prefix,
             temperature=self.config.temp_relationship,
             max_tokens=3000,
+            schema="relationship_scoring",
         )
 
         if response_text:
-            return self._parse_json_response(response_text, "relationship_scoring")
+            return self._parse_json_response(response_text, "relationship_scoring", schema="relationship_scoring")
         return []
 
     # ===================================================================
@@ -968,9 +1410,9 @@ Generate diverse examples. Return ONLY valid JSON array."""
         """
         sample = random.sample(data_batch, min(5, len(data_batch)))
 
-        prompt = f"""You are a quality validator for AI training data per Master Truths Canonical Spec v1.2.
+        prefix = f"""You are a quality validator for AI training data per Master Truths Canonical Spec v1.2.
 
-Evaluate these {data_type} examples against canonical requirements.
+Evaluate the examples you are given against canonical requirements.
 
 QUALITY THRESHOLDS (Master Truths v1.2 Section 17):
 - Emotional Authenticity: ≥ 0.7 (responses constrained by capacity)
@@ -979,9 +1421,6 @@ QUALITY THRESHOLDS (Master Truths v1.2 Section 17):
 - Hook Effectiveness: ≥ 0.6 ("one more week" engagement)
 - Overall Novel-Quality: ≥ 0.7 (MANDATORY)
 
-Data to evaluate:
-{json.dumps(sample, indent=2)}
-
 Evaluate each example:
 1. **Emotional Authenticity** (0-1): Capacity constraints respected? X+2 rule followed?
 2. **Tension Building** (0-1): Creates page-turner tension? Clear hooks?
@@ -1009,11 +1448,20 @@ Return JSON:
   "strengths": ["What works well"]
 }}"""
 
+        prompt = f"""Evaluate these {data_type} examples against canonical requirements.
+
+Data to evaluate:
+{json.dumps(sample, indent=2)}"""
+
         response_text = self.generate_with_qwen3(
             model=self.models["validation"],
             prompt=prompt,
+            prefix=prefix,
             temperature=self.config.temp_validation,
             max_tokens=2000,
+            schema="validation",
+            data_type=data_type,
+            step="validation",
         )
 
         if response_text:
@@ -1039,8 +1487,113 @@ Return JSON:
             "error": "Validation generation failed",
         }
 
-    def _parse_json_response(self, response_text: str, data_type: str) -> List[Dict]:
-        """Parse JSON response from Qwen3"""
+    def _parse_json_response(
+        self, response_text: str, data_type: str, schema: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Parse JSON response from Qwen3
+
+        With a ``schema`` name (see ``schemas.SCHEMAS``), a schema-constrained
+        response that parses and validates is returned directly. Anything else
+        goes through the repair path, after which items that still
+        violate the schema are dropped (``structured_output.drop_invalid_items``).
+        """
+        json_schema = self._active_schema(schema)
+        if json_schema is None:
+            return self._repair_json_response(response_text, data_type)
+
+        try:
+            data = json.loads(response_text)
+        except (TypeError, ValueError):
+            data = None
+        if data is not None and not validate_instance(data, json_schema):
+            items = data if isinstance(data, list) else [data]
+            self._count_parse(data_type, "strict")
+            AppLogger.info(f"Successfully parsed {data_type} batch", data={"count": len(items), "schema": schema})
+            return items
+
+        items = self._repair_json_response(response_text, data_type)
+        self._count_parse(data_type, "repaired" if items else "failed")
+        if not self.config.structured_output.get("drop_invalid_items", True):
+            return items
+
+        valid = []
+        for item in items:
+            errors = validate_instance(item, item_schema(json_schema))
+            if errors:
+                self._count_parse(data_type, "dropped_items")
+                AppLogger.warning(f"Dropped {data_type} item violating schema", data={"errors": errors[:5]})
+            else:
+                valid.append(item)
+        return valid
+
+    def _count_parse(self, data_type: str, outcome: str) -> None:
+        if outcome != "dropped_items" and hasattr(self._call_metrics, "values"):
+            self._call_metrics.values["parse_outcome"] = outcome
+        with self._parse_lock:
+            counts = self._parse_counts.setdefault(data_type, {})
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+    def parse_stats(self) -> Dict[str, Dict[str, int]]:
+        """Schema parse outcomes per data type (strict / repaired / failed / dropped_items)"""
+        with self._parse_lock:
+            return {data_type: dict(counts) for data_type, counts in self._parse_counts.items()}
+
+    def _repair_json_response(self, response_text: str, data_type: str) -> List[Dict]:
+        """
+        Repair path for responses that fail strict parsing
+
+        Uses the single-pass tolerant extractor (``json_extract``), which keeps
+        every complete item of a truncated array; ``structured_output.parser =
+        "legacy"`` switches back to the regex repair chain.
+        """
+        if self.config.structured_output.get("parser", "tolerant") == "legacy":
+            return self._legacy_repair_json_response(response_text, data_type)
+
+        result = extract_json(response_text)
+        report = result.report
+        if not result.items:
+            AppLogger.error(
+                f"JSON parsing failed for {data_type}",
+                ValueError(report.error or "no complete items"),
+            )
+            self._save_failed_response(response_text, data_type, report)
+            return []
+
+        if not report.clean:
+            AppLogger.info(f"Repaired {data_type} response", data=report.as_dict())
+        if report.truncated or report.error:
+            AppLogger.warning(
+                f"Salvaged {len(result.items)} complete objects from partial JSON for {data_type}"
+            )
+        AppLogger.info(f"Successfully parsed {data_type} batch", data={"count": len(result.items)})
+        return result.items
+
+    def _save_failed_response(self, response_text: str, data_type: str, report: RepairReport) -> None:
+        """Write a failed_<data_type>_<timestamp>.txt debug dump"""
+        if not response_text:
+            return
+        debug_file = (
+            self.output_dir / f"failed_{data_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        )
+        try:
+            with open(debug_file, "w", encoding="utf-8") as f:
+                f.write(f"ERROR: {report.error or 'truncated before the first complete item'}\n")
+                f.write(f"Location: char {report.error_position}\n")
+                f.write(f"\n{'='*80}\n")
+                f.write(f"ORIGINAL RESPONSE:\n")
+                f.write(f"{'='*80}\n")
+                f.write(response_text)
+                f.write(f"\n\n{'='*80}\n")
+                f.write(f"REPAIR REPORT:\n")
+                f.write(f"{'='*80}\n")
+                f.write(json.dumps(report.as_dict(), indent=2))
+            AppLogger.info(f"Saved failed response to {debug_file}")
+        except OSError:
+            pass
+
+    def _legacy_repair_json_response(self, response_text: str, data_type: str) -> List[Dict]:
+        """Legacy repair path: strip fences/unicode, regex fixes, salvage partial arrays"""
         try:
             cleaned = response_text.strip()
 
@@ -1191,7 +1744,16 @@ Return JSON:
     def save_batch(
         self, data: List[Dict], data_type: str, batch_number: int, timestamp: str
     ) -> str:
-        """Save batch to disk with v1.2 metadata"""
+        """
+        Save batch to disk with v1.2 metadata
+
+        With ``config.dataset_writer`` enabled the samples are appended to the
+        data type's JSONL shards instead, and the shard directory is returned.
+        """
+        if self.dataset_writer is not None:
+            self.dataset_writer.write_many(data_type, data)
+            return str(self.dataset_writer.shard_path(data_type))
+
         filename = f"{data_type}_batch{batch_number:04d}_{timestamp}.json"
         filepath = self.output_dir / filename
 
@@ -1218,7 +1780,7 @@ Return JSON:
             raise
 
     def run_production_cycle(self, duration_hours: int = 24) -> Dict[str, List[Dict]]:
-        """Run Master Truths v1.2 compliant production cycle"""
+        """Run Master Truths v1.2 compliant production cycle (within duration_hours when budgeted)"""
         AppLogger.info(
             f"Starting {duration_hours}h production (Master Truths v1.2)",
             data={
@@ -1230,6 +1792,10 @@ Return JSON:
         start_time = time.time()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+        if self.config.endpoint_pool.get("endpoints"):
+            # Learn each host's models and drain unreachable ones up front
+            AppLogger.info("Ollama endpoint health", data=self.client.check_health())
+
         results = {
             "emotional_authenticity": [],
             "dramatic_irony": [],
@@ -1239,97 +1805,115 @@ Return JSON:
             "relationship_scoring": [],
         }
 
-        # Calculate batches (prioritized by Master Truths v1.2)
-        batches_needed = {
-            "emotional_authenticity": (self.config.target_emotional_authenticity // 12) + 3,
-            "dramatic_irony": (self.config.target_dramatic_irony // 8) + 3,
-            "tension_building": (self.config.target_tension_building // 10) + 3,
-            "memory_resonance": (self.config.target_memory_resonance // 15) + 3,
-            "personality_traits": (self.config.target_personality_traits // 25) + 5,
-            "relationship_scoring": (self.config.target_relationship_scoring // 20) + 3,
-        }
-
-        total_batches = sum(batches_needed.values())
+        # (data_type, model role, batch generator, samples it requests per batch)
+        config = self.config
+        generators = [
+            ("emotional_authenticity", "primary", self.generate_emotional_authenticity_batch, config.batch_size_emotional),
+            ("dramatic_irony", "primary", self.generate_dramatic_irony_batch, config.batch_size_dramatic),
+            ("tension_building", "primary", self.generate_tension_building_batch, config.batch_size_tension),
+            ("memory_resonance", "primary", self.generate_memory_resonance_batch, config.batch_size_memory),
+            ("personality_traits", "speed", self.generate_personality_trait_batch, config.batch_size_personality),
+            ("relationship_scoring", "speed", self.generate_relationship_scoring_batch, config.batch_size_relationship),
+        ]
+        batch_generators = {data_type: generate for data_type, _, generate, _ in generators}
+
+        # Quotas come from the target_* fields (prioritized by Master Truths v1.2)
+        settings = self.config.job_queue
+        priorities = settings.get("priorities", {})
+        factor = settings.get("max_batch_factor", 1.5)
+        quotas = []
+        for data_type, _, _, per_batch in generators:
+            target = getattr(self.config, f"target_{data_type}")
+            quotas.append(
+                TypeQuota(
+                    data_type,
+                    target,
+                    max(1, per_batch),
+                    priority=priorities.get(data_type, 0),
+                    max_batches=math.ceil(target / max(1, per_batch) * factor),
+                )
+            )
+        budget = self.config.budget_scheduler
+        if budget.get("enabled", False):
+            # Spend the duration_hours window by measured yield, then drain
+            thresholds = self.config.quality_thresholds
+            queue = BudgetedJobQueue(
+                quotas,
+                deadline=start_time + duration_hours * 3600,
+                weights={
+                    data_type: thresholds.get(data_type, thresholds["overall_quality"])
+                    for data_type, _, _, _ in generators
+                },
+                models={data_type: self.models[role] for data_type, role, _, _ in generators},
+                fill_window=budget.get("fill_window", False),
+                alpha=budget.get("ewma_alpha", 0.3),
+            )
+        else:
+            queue = JobQueue(quotas)
+        workers = settings.get("workers") or self.client.max_in_flight
+        limiter = RateLimiter(settings.get("rate_limit_per_second"), settings.get("burst", 1))
+
+        # Resume an interrupted cycle with the same targets from its journal
+        journal = JobJournal.from_config(
+            self.config,
+            "production_cycle",
+            {"targets": {quota.data_type: quota.target_samples for quota in quotas}},
+        )
+        if journal is not None:
+            timestamp = self._restore_production_journal(journal, queue, results, timestamp)
 
         try:
-            pbar = tqdm(total=total_batches, desc="Generating v1.2 compliant data")
+            pbar = tqdm(total=queue.expected_batches, desc="Generating v1.2 compliant data")
 
-            # 1. Emotional Authenticity (CORE)
-            AppLogger.info("Generating emotional authenticity data (Master Truths v1.2)")
-            for i in range(batches_needed["emotional_authenticity"]):
-                batch = self.generate_emotional_authenticity_batch()
-                if batch:
-                    results["emotional_authenticity"].extend(batch)
-                    self.save_batch(batch, "emotional_authenticity", i, timestamp)
-                pbar.update(1)
-                time.sleep(1)
+            # Load generation models in priority order before the queue starts
+            roles = [role for _, role, _, _ in sorted(generators, key=lambda g: priorities.get(g[0], 0))]
+            for role in dict.fromkeys(roles):
+                self._warm_up(self.models[role])
 
-            # 2. Dramatic Irony
-            AppLogger.info("Generating dramatic irony scenarios")
-            for i in range(batches_needed["dramatic_irony"]):
-                batch = self.generate_dramatic_irony_batch()
-                if batch:
-                    results["dramatic_irony"].extend(batch)
-                    self.save_batch(batch, "dramatic_irony", i, timestamp)
-                pbar.update(1)
-                time.sleep(1)
+            def execute(job: GenerationJob) -> List[Dict]:
+                if journal is not None:
+                    journal.start(job.key)
+                return batch_generators[job.data_type]()
 
-            # 3. Tension Building
-            AppLogger.info("Generating tension building hooks")
-            for i in range(batches_needed["tension_building"]):
-                batch = self.generate_tension_building_batch()
-                if batch:
-                    results["tension_building"].extend(batch)
-                    self.save_batch(batch, "tension_building", i, timestamp)
+            def on_result(job: GenerationJob, batch: List[Dict]) -> None:
                 pbar.update(1)
-                time.sleep(1)
-
-            # 4. Memory Resonance (NEW v1.2)
-            AppLogger.info("Generating memory resonance data (NEW v1.2)")
-            for i in range(batches_needed["memory_resonance"]):
-                batch = self.generate_memory_resonance_batch()
                 if batch:
-                    results["memory_resonance"].extend(batch)
-                    self.save_batch(batch, "memory_resonance", i, timestamp)
-                pbar.update(1)
-                time.sleep(1)
-
-            # 5. Personality Traits
-            AppLogger.info("Generating personality trait data")
-            for i in range(batches_needed["personality_traits"]):
-                batch = self.generate_personality_trait_batch()
-                if batch:
-                    results["personality_traits"].extend(batch)
-                    self.save_batch(batch, "personality_traits", i, timestamp)
-                pbar.update(1)
-                time.sleep(0.5)
-
-            # 6. Relationship Scoring
-            AppLogger.info("Generating relationship scoring data")
-            for i in range(batches_needed["relationship_scoring"]):
-                batch = self.generate_relationship_scoring_batch()
-                if batch:
-                    results["relationship_scoring"].extend(batch)
-                    self.save_batch(batch, "relationship_scoring", i, timestamp)
-                pbar.update(1)
-                time.sleep(0.5)
+                    results[job.data_type].extend(batch)
+                    self.save_batch(batch, job.data_type, job.batch_index, timestamp)
+                if journal is not None:
+                    if batch:
+                        if self.dataset_writer is not None:
+                            self.dataset_writer.flush()  # Durable in the shards before the journal says complete
+                        journal.complete(job.key, batch)
+                    else:
+                        journal.fail(job.key, "empty batch")
+                    journal.save_rng_state()
 
+            AppLogger.info(
+                "Generation job queue", data={"workers": workers, "quotas": queue.stats()}
+            )
+            run_jobs(queue, execute, on_result, workers, limiter)
             pbar.close()
 
             # Quality validation
             AppLogger.info("Running Master Truths v1.2 quality validation")
+            to_validate = [(data_type, data) for data_type, data in results.items() if len(data) > 5]
+            if to_validate:
+                self._warm_up(self.models["validation"])
+            # One validation-model wave instead of alternating with generation
+            validations = self._map_concurrent(
+                lambda item: self.validate_with_qwen3_32b(item[1], item[0]), to_validate
+            )
             validation_results = []
-            for data_type, data in results.items():
-                if len(data) > 5:
-                    validation = self.validate_with_qwen3_32b(data, data_type)
-                    validation_results.append(
-                        {
-                            "type": data_type,
-                            "quality": validation.get("overall_quality", 0.5),
-                            "meets_v1_2": validation.get("meets_v1_2_standards", False),
-                            "sample_size": len(data),
-                        }
-                    )
+            for (data_type, data), validation in zip(to_validate, validations):
+                validation_results.append(
+                    {
+                        "type": data_type,
+                        "quality": validation.get("overall_quality", 0.5),
+                        "meets_v1_2": validation.get("meets_v1_2_standards", False),
+                        "sample_size": len(data),
+                    }
+                )
 
             # Summary
             elapsed = time.time() - start_time
@@ -1341,14 +1925,57 @@ Return JSON:
                     "duration_hours": f"{elapsed/3600:.1f}",
                     "total_samples": total_generated,
                     "validation_scores": validation_results,
+                    "model_scheduling": self.client.stats().get("model_scheduling"),
+                    "prefix_reuse": self.prefix_reuse_stats(),
+                    "parse_outcomes": self.parse_stats(),
+                    "model_resilience": self.resilience.stats(),
+                    "endpoints": self.client.stats().get("endpoints"),
+                    "job_queue": queue.stats(),
+                    "budget": queue.budget_stats() if isinstance(queue, BudgetedJobQueue) else None,
                 },
             )
+            if self.telemetry is not None:
+                AppLogger.info("Ollama throughput summary", data=self.throughput_summary())
+            if self.dataset_writer is not None:
+                self.dataset_writer.flush()
+            if journal is not None:
+                journal.finish()
 
             return results
 
         except KeyboardInterrupt:
             AppLogger.warning("Production interrupted")
+            if self.dataset_writer is not None:
+                self.dataset_writer.flush()  # Batches were appended as they finished
+                return results
             for data_type, data in results.items():
                 if data:
                     self.save_batch(data, f"{data_type}_PARTIAL", 0, timestamp)
             return results
+        finally:
+            if journal is not None:
+                journal.close()
+
+    def _restore_production_journal(
+        self, journal: JobJournal, queue: JobQueue, results: Dict[str, List[Dict]], timestamp: str
+    ) -> str:
+        """Load completed batches of an interrupted cycle; returns the cycle's file timestamp"""
+        if not journal.resumed:
+            journal.plan("cycle", {"timestamp": timestamp})
+            return timestamp
+
+        journal.restore_rng_state()
+        completed = journal.completed()
+        for key, status in journal.statuses().items():
+            if key == "cycle" or status not in (COMPLETED, FAILED):
+                continue
+            job = GenerationJob.from_key(key)
+            batch = completed.get(key, [])
+            results[job.data_type].extend(batch)
+            queue.restore(job, len(batch))
+
+        AppLogger.info(
+            "Restored production cycle from journal",
+            data={"journal": journal.stats(), "samples": {k: len(v) for k, v in results.items()}},
+        )
+        return journal.planned().get("cycle", {}).get("timestamp", timestamp)
@@ -0,0 +1,308 @@
+"""
+Per-Model Request Resilience
+
+Replaces the fixed timeout guesses and single-shot calls with:
+
+- LatencyTracker: rolling per-model latency window (p50/p95/p99)
+- adaptive timeouts: ``p99 * timeout_multiplier``, clamped between
+  ``min_timeout`` and the model's static timeout, doubling on each retry
+- RetryPolicy: exponential backoff with full jitter
+- CircuitBreaker: opens after ``failure_threshold`` consecutive failures or
+  empty responses (the 30B empty-response bug), sheds work to the model's
+  fallback while open, and lets one trial request through after the cooldown;
+  with no fallback admitting it, a request waits for the cooldown or trial
+"""
+
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from ..utils.logger import AppLogger
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# How often a request waiting on a half-open circuit's trial checks again
+TRIAL_POLL_SECONDS = 1.0
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies per model (thread-safe)"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def count(self, model: str) -> int:
+        with self._lock:
+            return len(self._samples.get(model, ()))
+
+    def percentiles(self, model: str) -> Dict[str, float]:
+        with self._lock:
+            values = sorted(self._samples.get(model, ()))
+        return {
+            "count": len(values),
+            "p50": round(percentile(values, 0.50), 2),
+            "p95": round(percentile(values, 0.95), 2),
+            "p99": round(percentile(values, 0.99), 2),
+        }
+
+    def models(self):
+        with self._lock:
+            return list(self._samples)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: ``uniform(0, min(max_delay, base * 2**attempt))``"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 2.0, max_delay: float = 60.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2**attempt)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one model"""
+
+    def __init__(self, failure_threshold: int = 3, cooldown_seconds: float = 300.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_flight = False
+
+    def allow(self, now: float) -> bool:
+        """True when a request may be sent to this model"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and now - self.opened_at >= self.cooldown_seconds:
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def retry_after(self, now: float) -> float:
+        """Seconds until ``allow`` may admit a request (a poll interval while a trial is in flight)"""
+        if self.state == OPEN:
+            return max(0.0, self.opened_at + self.cooldown_seconds - now)
+        if self.state == HALF_OPEN and self._trial_in_flight:
+            return TRIAL_POLL_SECONDS
+        return 0.0
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self, now: float) -> bool:
+        """Count a failure; returns True when this failure opened the circuit"""
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = OPEN
+            self.opened_at = now
+            self.times_opened += 1
+            return True
+        return False
+
+
+class ModelResilience:
+    """
+    Latency tracking, adaptive timeouts, retries and circuit breaking for
+    every model the generator talks to.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        latency_window: int = 200,
+        min_samples: int = 5,
+        timeout_multiplier: float = 3.0,
+        min_timeout: float = 60.0,
+        retry: Optional[RetryPolicy] = None,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 300.0,
+        fallback_models: Optional[Dict[str, str]] = None,
+    ):
+        self.enabled = enabled
+        self.latency = LatencyTracker(latency_window)
+        self.min_samples = min_samples
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.retry = retry or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.fallback_models = dict(fallback_models or {})
+
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    @classmethod
+    def from_config(cls, config) -> "ModelResilience":
+        settings = config.resilience
+        return cls(
+            enabled=settings.get("enabled", True),
+            latency_window=settings.get("latency_window", 200),
+            min_samples=settings.get("min_samples", 5),
+            timeout_multiplier=settings.get("timeout_multiplier", 3.0),
+            min_timeout=settings.get("min_timeout", 60),
+            retry=RetryPolicy(
+                max_attempts=settings.get("max_attempts", 3),
+                base_delay=settings.get("backoff_base_seconds", 2.0),
+                max_delay=settings.get("backoff_max_seconds", 60.0),
+            ),
+            failure_threshold=settings.get("failure_threshold", 3),
+            cooldown_seconds=settings.get("cooldown_seconds", 300),
+            fallback_models=settings.get("fallback_models", {}),
+        )
+
+    @property
+    def max_attempts(self) -> int:
+        return self.retry.max_attempts if self.enabled else 1
+
+    def _breaker(self, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers[model] = CircuitBreaker(self.failure_threshold, self.cooldown_seconds)
+        return breaker
+
+    def _count(self, model: str, outcome: str) -> None:
+        counts = self._counts.setdefault(model, {})
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+    def route(self, model: str) -> Optional[str]:
+        """
+        Model to send the next request to: ``model`` itself, or the first
+        fallback along its chain whose circuit admits it. None when every
+        model in the chain is open.
+        """
+        if not self.enabled:
+            return model
+        now = time.monotonic()
+        seen = set()
+        candidate = model
+        with self._lock:
+            while candidate is not None and candidate not in seen:
+                seen.add(candidate)
+                if self._breaker(candidate).allow(now):
+                    if candidate != model:
+                        self._count(model, "shed")
+                    return candidate
+                candidate = self.fallback_models.get(candidate)
+        return None
+
+    def wait_for_route(self, model: str, max_wait: float) -> Optional[str]:
+        """
+        ``route``, waiting out the chain's cooldowns and half-open trials for
+        up to ``max_wait`` seconds instead of giving up while every circuit is open
+        """
+        deadline = time.monotonic() + max_wait
+        logged = False
+        while True:
+            target = self.route(model)
+            if target is not None:
+                return target
+            now = time.monotonic()
+            if now >= deadline:
+                return None
+            wait = self._retry_after(model, now)
+            if not logged:
+                with self._lock:
+                    self._count(model, "waited")
+                AppLogger.info(
+                    f"Circuit open for {model} and its fallbacks; waiting", data={"retry_after": round(wait, 1)}
+                )
+                logged = True
+            time.sleep(min(deadline - now, max(wait, 0.01)))
+
+    def _retry_after(self, model: str, now: float) -> float:
+        """Shortest wait until some model along ``model``'s fallback chain may admit a request"""
+        waits = []
+        seen = set()
+        candidate = model
+        with self._lock:
+            while candidate is not None and candidate not in seen:
+                seen.add(candidate)
+                waits.append(self._breaker(candidate).retry_after(now))
+                candidate = self.fallback_models.get(candidate)
+        return min(waits)
+
+    def timeout_for(self, model: str, static_timeout: float, attempt: int = 0) -> float:
+        """Adaptive timeout from the model's p99, capped by its static timeout"""
+        if not self.enabled or self.latency.count(model) < self.min_samples:
+            return static_timeout
+        p99 = self.latency.percentiles(model)["p99"]
+        adaptive = max(self.min_timeout, p99 * self.timeout_multiplier) * (2**attempt)
+        return min(static_timeout, adaptive)
+
+    def backoff(self, attempt: int) -> float:
+        return self.retry.delay(attempt)
+
+    def record_success(self, model: str, seconds: float) -> None:
+        self.latency.record(model, seconds)
+        with self._lock:
+            self._breaker(model).record_success()
+            self._count(model, "success")
+
+    def record_failure(self, model: str, reason: str) -> None:
+        """Count a failed attempt (``reason``: "error", "timeout" or "empty")"""
+        with self._lock:
+            self._count(model, reason)
+            opened = self._breaker(model).record_failure(time.monotonic())
+        if opened:
+            AppLogger.warning(
+                f"Circuit opened for {model}",
+                data={
+                    "reason": reason,
+                    "cooldown_seconds": self.cooldown_seconds,
+                    "fallback": self.fallback_models.get(model),
+                },
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            models = set(self._breakers) | set(self._counts)
+            breakers = {
+                model: {
+                    "state": self._breaker(model).state,
+                    "times_opened": self._breaker(model).times_opened,
+                }
+                for model in models
+            }
+            counts = {model: dict(outcomes) for model, outcomes in self._counts.items()}
+        return {
+            model: {
+                **self.latency.percentiles(model),
+                **breakers.get(model, {}),
+                "outcomes": counts.get(model, {}),
+            }
+            for model in sorted(models | set(self.latency.models()))
+        }
@@ -0,0 +1,289 @@
+"""
+Persistent LLM Response Cache
+
+Content-addressed SQLite store for raw completions, so a crashed run can be
+resumed (and a fixed parser re-applied to old outputs) without spending GPU
+time on completions we already have.
+
+Keys are a SHA-256 of the request (model, prompt, options including any seed,
+plus format/system/context when present) and an occurrence index. The
+generator prompts are largely deterministic, so the N-th identical request in
+a run maps to the N-th cached completion rather than all of them collapsing
+onto one sample.
+
+Modes:
+- off:           no caching
+- read_through:  serve hits, generate and store misses
+- write_through: always generate, store every result (refreshes the cache)
+- replay:        serve hits only; misses return None without calling Ollama
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from ..utils.logger import AppLogger
+
+CACHE_MODES = ("off", "read_through", "write_through", "replay")
+
+# Payload fields that change the completion (stream/keep_alive do not)
+KEY_FIELDS = ("model", "prompt", "system", "template", "format", "context", "messages", "options")
+
+
+def request_fingerprint(payload: Dict[str, Any]) -> str:
+    """Stable hash of the parts of an Ollama payload that determine the output"""
+    material = {name: payload[name] for name in KEY_FIELDS if name in payload}
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed completion cache with size and age eviction.
+
+    One connection is shared by all generator threads behind a lock; the
+    database runs in WAL mode so readers in other processes are not blocked.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        mode: str = "read_through",
+        max_size_mb: float = 2048,
+        max_age_days: float = 90,
+        evict_every: int = 200,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode '{mode}' (expected one of {CACHE_MODES})")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_days * 86400
+        self.evict_every = evict_every
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        self._occurrences: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._init_database()
+        self.evict()
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["ResponseCache"]:
+        """Build the cache from ``config.response_cache`` (None when mode is off)"""
+        settings = getattr(config, "response_cache", {}) or {}
+        mode = settings.get("mode", "off")
+        if mode == "off":
+            return None
+        path = settings.get("path") or Path(config.output_dir) / "llm_cache.db"
+        return cls(
+            path,
+            mode=mode,
+            max_size_mb=settings.get("max_size_mb", 2048),
+            max_age_days=settings.get("max_age_days", 90),
+        )
+
+    @property
+    def serves_hits(self) -> bool:
+        return self.mode in ("read_through", "replay")
+
+    @property
+    def stores_results(self) -> bool:
+        return self.mode in ("read_through", "write_through")
+
+    def _init_database(self) -> None:
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    occurrence INTEGER NOT NULL,
+                    model TEXT,
+                    prompt TEXT,
+                    options TEXT,
+                    response TEXT NOT NULL,
+                    metadata TEXT,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_model ON responses(model)")
+            self._conn.commit()
+
+    def key_for(self, payload: Dict[str, Any]) -> str:
+        """
+        Cache key for the next occurrence of ``payload`` in this run.
+
+        Call once per request: each call advances the occurrence counter.
+        """
+        fingerprint = request_fingerprint(payload)
+        with self._lock:
+            occurrence = self._occurrences.get(fingerprint, 0)
+            self._occurrences[fingerprint] = occurrence + 1
+        return f"{fingerprint}:{occurrence}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached completion for ``key``, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(
+        self,
+        key: str,
+        payload: Dict[str, Any],
+        response: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Store (or replace) the completion for ``key``"""
+        fingerprint, occurrence = key.rsplit(":", 1)
+        options = json.dumps(payload.get("options", {}), sort_keys=True)
+        metadata_json = json.dumps(metadata or {}, default=str)
+        prompt = payload.get("prompt", "")
+        size_bytes = len(response.encode("utf-8")) + len(prompt.encode("utf-8")) + len(metadata_json)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO responses
+                    (key, fingerprint, occurrence, model, prompt, options, response,
+                     metadata, size_bytes, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    response = excluded.response,
+                    metadata = excluded.metadata,
+                    size_bytes = excluded.size_bytes,
+                    created_at = excluded.created_at,
+                    last_access = excluded.last_access
+                """,
+                (
+                    key,
+                    fingerprint,
+                    int(occurrence),
+                    payload.get("model"),
+                    prompt,
+                    options,
+                    response,
+                    metadata_json,
+                    size_bytes,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+            self.writes += 1
+            evict_now = self.writes % self.evict_every == 0
+
+        if evict_now:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop entries older than max_age, then least-recently-used until under max_size"""
+        removed = 0
+        with self._lock:
+            cutoff = time.time() - self.max_age_seconds
+            removed += self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (cutoff,)
+            ).rowcount
+
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM responses"
+            ).fetchone()[0]
+            if total > self.max_size_bytes:
+                excess = total - self.max_size_bytes
+                freed = 0
+                stale_keys = []
+                for key, size_bytes in self._conn.execute(
+                    "SELECT key, size_bytes FROM responses ORDER BY last_access ASC"
+                ):
+                    stale_keys.append((key,))
+                    freed += size_bytes
+                    if freed >= excess:
+                        break
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+                removed += len(stale_keys)
+            self._conn.commit()
+
+        if removed:
+            AppLogger.info("Evicted cached responses", data={"removed": removed, "cache": str(self.path)})
+        return removed
+
+    def iter_responses(
+        self, model: Optional[str] = None, since: Optional[float] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over cached completions (oldest first), e.g. to re-run a fixed
+        parser over historical raw outputs.
+        """
+        query = "SELECT key, model, prompt, options, response, metadata, created_at FROM responses"
+        clauses, params = [], []
+        if model is not None:
+            clauses.append("model = ?")
+            params.append(model)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_at ASC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        for key, row_model, prompt, options, response, metadata, created_at in rows:
+            yield {
+                "key": key,
+                "model": row_model,
+                "prompt": prompt,
+                "options": json.loads(options or "{}"),
+                "response": response,
+                "metadata": json.loads(metadata or "{}"),
+                "created_at": created_at,
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM responses"
+            ).fetchone()
+        return {
+            "mode": self.mode,
+            "entries": entries,
+            "size_mb": round(size_bytes / (1024 * 1024), 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,258 @@
+"""
+Deficit-Weighted Stratified Scenario Planner
+
+Replaces ``random.choices`` over fixed bucket frequencies (plus a
+"missing combinations" list capped at 10 rows) with quotas per cell of the
+capacity level × authenticity target × complexity type grid:
+
+- Cell targets: the ``target_*`` total split by the ``systematic_coverage``
+  ``min_examples`` weights of each axis (largest-remainder rounding), at
+  least ``min_per_cell`` each
+- Scenarios are issued by largest remaining deficit relative to the cell's
+  target (``target - generated - already planned``), ties broken at random,
+  so every cell fills at the same pace and none is over-generated
+- The plan is persisted (SQLite, ``output_dir/scenario_plan.db``); parallel
+  workers lease slices of it, and leases that are not completed in
+  ``lease_seconds`` return to the plan; a worker releases the slots that
+  produced nothing right away
+- Once every target is met, the next round of targets is planned
+
+``report()`` projects the samples still needed for full coverage.
+"""
+
+import os
+import random
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..utils.logger import AppLogger
+
+Cell = Tuple[str, str, str]  # (capacity_level, authenticity_target, complexity_type)
+
+PLANNED = "planned"
+LEASED = "leased"
+DONE = "done"
+
+
+def _apportion(total: int, weights: Dict[Any, float]) -> Dict[Any, int]:
+    """Split ``total`` by ``weights`` with largest-remainder rounding"""
+    weight_sum = sum(weights.values()) or 1.0
+    exact = {key: total * weight / weight_sum for key, weight in weights.items()}
+    shares = {key: int(value) for key, value in exact.items()}
+    leftover = total - sum(shares.values())
+    for key in sorted(exact, key=lambda k: exact[k] - shares[k], reverse=True)[:leftover]:
+        shares[key] += 1
+    return shares
+
+
+def cell_targets(
+    total: int,
+    capacity_weights: Dict[str, float],
+    authenticity_weights: Dict[str, float],
+    complexity_weights: Dict[str, float],
+    min_per_cell: int = 1,
+) -> Dict[Cell, int]:
+    """Per-cell sample targets for a stratified grid (axes independent)"""
+    weights = {
+        (capacity, authenticity, complexity): capacity_weight * authenticity_weight * complexity_weight
+        for capacity, capacity_weight in capacity_weights.items()
+        for authenticity, authenticity_weight in authenticity_weights.items()
+        for complexity, complexity_weight in complexity_weights.items()
+    }
+    return {cell: max(min_per_cell, share) for cell, share in _apportion(total, weights).items()}
+
+
+class ScenarioPlanner:
+    """Persistent deficit-ordered plan of grid cells that workers lease from"""
+
+    def __init__(
+        self,
+        path: Path,
+        targets: Dict[Cell, int],
+        generated: Callable[[], Dict[Cell, int]],
+        lease_seconds: float = 1800.0,
+        plan_chunk: int = 256,
+        worker_id: Optional[str] = None,
+        rng: Any = random,
+    ):
+        self.path = Path(path)
+        self.targets = dict(targets)
+        self.generated = generated
+        self.lease_seconds = lease_seconds
+        self.plan_chunk = max(1, plan_chunk)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.rng = rng
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scenario_plan (
+                    slot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    capacity_level TEXT NOT NULL,
+                    authenticity_target TEXT NOT NULL,
+                    complexity_type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    leased_at REAL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_plan_status ON scenario_plan (status, slot_id)")
+
+    @classmethod
+    def from_config(
+        cls,
+        config: Any,
+        axes: Sequence[Sequence[str]],
+        generated: Callable[[], Dict[Cell, int]],
+    ) -> Optional["ScenarioPlanner"]:
+        """
+        Build the planner from ``config.scenario_planner`` (None when disabled)
+
+        ``axes`` lists the capacity levels, authenticity targets and complexity
+        types; their weights come from ``systematic_coverage`` min_examples
+        (1 where a label has none) and the total from ``target_emotional_authenticity``.
+        """
+        settings = getattr(config, "scenario_planner", {}) or {}
+        if not settings.get("enabled", False):
+            return None
+        coverage = config.systematic_coverage
+        sections = ("capacity_levels", "authenticity_spectrum", "complexity_types")
+        weights = [
+            {label: coverage.get(section, {}).get(label, {}).get("min_examples", 1) for label in labels}
+            for section, labels in zip(sections, axes)
+        ]
+        targets = cell_targets(
+            config.target_emotional_authenticity, *weights, min_per_cell=settings.get("min_per_cell", 1)
+        )
+        path = settings.get("path") or Path(config.output_dir) / "scenario_plan.db"
+        return cls(
+            path,
+            targets,
+            generated,
+            lease_seconds=settings.get("lease_seconds", 1800.0),
+            plan_chunk=settings.get("plan_chunk", 256),
+            worker_id=settings.get("worker_id"),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+
+    def _open_slots(self, conn: sqlite3.Connection) -> Dict[Cell, int]:
+        rows = conn.execute(
+            "SELECT capacity_level, authenticity_target, complexity_type, COUNT(*) FROM scenario_plan "
+            "WHERE status != ? GROUP BY capacity_level, authenticity_target, complexity_type",
+            (DONE,),
+        ).fetchall()
+        return {(row[0], row[1], row[2]): row[3] for row in rows}
+
+    def _deficits(self, conn: sqlite3.Connection) -> Dict[Cell, int]:
+        """Samples still owed per cell, after generated and already-planned samples"""
+        generated = self.generated()
+        open_slots = self._open_slots(conn)
+        done_total = sum(generated.get(cell, 0) for cell in self.targets)
+        # Past full coverage, plan the next round of targets
+        rounds = 1 + done_total // max(1, sum(self.targets.values()))
+        return {
+            cell: target * rounds - generated.get(cell, 0) - open_slots.get(cell, 0)
+            for cell, target in self.targets.items()
+        }
+
+    def _extend_plan(self, conn: sqlite3.Connection, count: int) -> int:
+        """Append up to ``count`` slots in deficit order (caller holds the write lock)"""
+        deficits = self._deficits(conn)
+        owed = {cell: deficit for cell, deficit in deficits.items() if deficit > 0}
+        if not owed:
+            # Every open slot covers the current round; start the next one
+            owed = {cell: target for cell, target in self.targets.items()}
+        # Random tie-break keys, fixed per extension so equal cells interleave
+        ties = {cell: self.rng.random() for cell in owed}
+        now = time.time()
+        slots = []
+        for _ in range(count):
+            cell = max(owed, key=lambda c: (owed[c] / self.targets[c], ties[c]))
+            if owed[cell] <= 0:
+                break
+            slots.append((*cell, PLANNED, now))
+            owed[cell] -= 1
+        conn.executemany(
+            "INSERT INTO scenario_plan (capacity_level, authenticity_target, complexity_type, status, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            slots,
+        )
+        return len(slots)
+
+    def lease(self, count: int) -> List[Dict[str, Any]]:
+        """
+        Lease the next ``count`` planned cells to this worker
+
+        Returns ``{"plan_slot", "capacity_level", "authenticity_target",
+        "complexity_type"}`` dicts; the plan is extended as needed.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Expired leases go back to the plan
+            conn.execute(
+                "UPDATE scenario_plan SET status = ?, worker = NULL, leased_at = NULL "
+                "WHERE status = ? AND leased_at < ?",
+                (PLANNED, LEASED, time.time() - self.lease_seconds),
+            )
+            available = conn.execute("SELECT COUNT(*) FROM scenario_plan WHERE status = ?", (PLANNED,)).fetchone()[0]
+            if available < count:
+                self._extend_plan(conn, max(self.plan_chunk, count - available))
+            rows = conn.execute(
+                "SELECT slot_id, capacity_level, authenticity_target, complexity_type FROM scenario_plan "
+                "WHERE status = ? ORDER BY slot_id LIMIT ?",
+                (PLANNED, count),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE scenario_plan SET status = ?, worker = ?, leased_at = ? WHERE slot_id = ?",
+                [(LEASED, self.worker_id, time.time(), row[0]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK")
+            AppLogger.error("Failed to lease scenario plan slots", e)
+            return []
+        finally:
+            conn.close()
+        return [
+            {"plan_slot": row[0], "capacity_level": row[1], "authenticity_target": row[2], "complexity_type": row[3]}
+            for row in rows
+        ]
+
+    def complete(self, slot_id: int) -> None:
+        """Mark a leased slot generated"""
+        with self._connect() as conn:
+            conn.execute("UPDATE scenario_plan SET status = ? WHERE slot_id = ?", (DONE, slot_id))
+
+    def release(self, slot_id: int) -> None:
+        """Return a leased slot that produced nothing to the plan (no-op once completed)"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE scenario_plan SET status = ?, worker = NULL, leased_at = NULL WHERE slot_id = ? AND status = ?",
+                (PLANNED, slot_id, LEASED),
+            )
+
+    def report(self) -> Dict[str, Any]:
+        """Targets, progress and projected samples still needed for full coverage"""
+        generated = self.generated()
+        with self._connect() as conn:
+            statuses = dict(conn.execute("SELECT status, COUNT(*) FROM scenario_plan GROUP BY status").fetchall())
+        remaining = {cell: max(0, target - generated.get(cell, 0)) for cell, target in self.targets.items()}
+        return {
+            "cells": len(self.targets),
+            "covered_cells": sum(1 for cell in self.targets if generated.get(cell, 0) > 0),
+            "complete_cells": sum(1 for owed in remaining.values() if owed == 0),
+            "target_samples": sum(self.targets.values()),
+            "generated_samples": sum(generated.get(cell, 0) for cell in self.targets),
+            "projected_samples_to_full_coverage": sum(remaining.values()),
+            "plan": {status: statuses.get(status, 0) for status in (PLANNED, LEASED, DONE)},
+        }
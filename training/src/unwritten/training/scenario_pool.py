@@ -0,0 +1,178 @@
+"""
+Reusable NPC/Context Scenario Pool
+
+One NPC primitives + situational context base can carry many dialogues (see
+``MultiStepPipeline.generate_dialogue_variations``), so regenerating both
+for every sample pays two LLM calls that buy no new dialogue. The pool keeps
+validated bases (SQLite, ``output_dir/scenario_pool.db``) indexed by
+complexity type, capacity tier and urgency level, and hands them out again:
+
+- Least-used base first, so reuse spreads over the whole pool
+- ``max_uses`` caps the dialogues drawn from one base
+- ``new_base_fraction`` of draws are refused on purpose, so fresh NPCs keep
+  entering the pool instead of the first few bases being recycled
+
+With ``dialogues_per_base`` dialogues fanned out per drawn base, LLM calls
+per finished sample drop from 4 toward ``1 + 1/dialogues_per_base``.
+"""
+
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .step_store import decode_output, encode_output
+from ..utils.logger import AppLogger
+
+
+class ScenarioPool:
+    """SQLite pool of validated (primitives, context) bases with reuse limits"""
+
+    def __init__(
+        self,
+        path: Path,
+        types: Iterable[type] = (),
+        max_uses: int = 15,
+        new_base_fraction: float = 0.2,
+        rng: Optional[random.Random] = None,
+    ):
+        self.path = Path(path)
+        self.types: Dict[str, type] = {cls.__name__: cls for cls in types}
+        self.max_uses = max(1, max_uses)
+        self.new_base_fraction = new_base_fraction
+        self.rng = rng or random
+        self.draws = 0
+        self.misses = 0
+        self.added = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bases (
+                    base_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    complexity_type TEXT NOT NULL,
+                    capacity_tier TEXT NOT NULL,
+                    urgency_level TEXT NOT NULL,
+                    primitives TEXT NOT NULL,
+                    context TEXT NOT NULL,
+                    uses INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_bases_key "
+                "ON bases (complexity_type, capacity_tier, urgency_level, uses)"
+            )
+
+    @classmethod
+    def from_config(cls, config: Any, types: Iterable[type] = ()) -> Optional["ScenarioPool"]:
+        """Build the pool from ``config.scenario_pool`` (None when disabled)"""
+        settings = getattr(config, "scenario_pool", {}) or {}
+        if not settings.get("enabled", False):
+            return None
+        path = settings.get("path") or Path(config.output_dir) / "scenario_pool.db"
+        return cls(
+            path,
+            types,
+            max_uses=settings.get("max_uses", 15),
+            new_base_fraction=settings.get("new_base_fraction", 0.2),
+        )
+
+    def acquire(
+        self,
+        complexity_type: str,
+        capacity_tier: str,
+        uses: int = 1,
+        urgency_level: Optional[str] = None,
+    ) -> Optional[Tuple[int, Any, Any]]:
+        """
+        Reserve ``uses`` dialogues on the least-used matching base
+
+        Returns ``(base_id, primitives, context)``, or None when no base has
+        that many uses left (or this draw is kept for a new base).
+        """
+        with self._lock:
+            self.draws += 1
+            if self.rng.random() < self.new_base_fraction:
+                self.misses += 1
+                return None
+            query = (
+                "SELECT base_id, primitives, context FROM bases "
+                "WHERE complexity_type = ? AND capacity_tier = ? AND uses + ? <= ?"
+            )
+            params = [complexity_type, capacity_tier, uses, self.max_uses]
+            if urgency_level is not None:
+                query += " AND urgency_level = ?"
+                params.append(urgency_level)
+            row = self._conn.execute(query + " ORDER BY uses, base_id LIMIT 1", params).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE bases SET uses = uses + ? WHERE base_id = ?", (uses, row[0]))
+
+        try:
+            return row[0], decode_output(row[1], self.types), decode_output(row[2], self.types)
+        except (TypeError, ValueError) as e:
+            AppLogger.warning(f"Dropping unreadable pooled base {row[0]}", data={"error": str(e)})
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM bases WHERE base_id = ?", (row[0],))
+            return None
+
+    def add(
+        self,
+        complexity_type: str,
+        capacity_tier: str,
+        urgency_level: str,
+        primitives: Any,
+        context: Any,
+        uses: int = 0,
+    ) -> int:
+        """Pool a validated base (``uses`` already drawn from it); returns its ID"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO bases (complexity_type, capacity_tier, urgency_level, primitives, context, uses, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    complexity_type,
+                    capacity_tier,
+                    urgency_level,
+                    encode_output(primitives),
+                    encode_output(context),
+                    uses,
+                    time.time(),
+                ),
+            )
+            self.added += 1
+            return cursor.lastrowid
+
+    def reject(self) -> None:
+        """Count a generated base that failed validation"""
+        with self._lock:
+            self.rejected += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            bases, exhausted = self._conn.execute(
+                "SELECT COUNT(*), SUM(uses >= ?) FROM bases", (self.max_uses,)
+            ).fetchone()
+            return {
+                "bases": bases,
+                "exhausted": exhausted or 0,
+                "draws": self.draws,
+                "reused": self.draws - self.misses,
+                "added": self.added,
+                "rejected": self.rejected,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,433 @@
+"""
+JSON Schema Registry for Structured Generation
+
+One schema per generated data type. Schemas are sent as Ollama's ``format``
+parameter so decoding is grammar-constrained to valid JSON of the right
+shape, and every response is validated again on receipt.
+
+Only the fields downstream code relies on are ``required``; the rest are
+declared so the grammar knows their types but the model may omit them.
+Validation uses a small built-in subset of JSON Schema (type, properties,
+required, items, enum, minimum/maximum, minItems) to avoid a jsonschema
+dependency.
+"""
+
+from typing import Any, Dict, List, Optional
+
+STRING = {"type": "string"}
+NUMBER = {"type": "number"}
+INTEGER = {"type": "integer"}
+BOOLEAN = {"type": "boolean"}
+STRING_LIST = {"type": "array", "items": STRING}
+SCORE = {"type": "number", "minimum": 0.0, "maximum": 1.0}
+
+OCEAN_TRAITS = ("openness", "conscientiousness", "extraversion", "agreeableness", "neuroticism")
+
+
+def _object(required: Dict[str, Dict], optional: Optional[Dict[str, Dict]] = None) -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": {**required, **(optional or {})},
+        "required": list(required),
+    }
+
+
+def _array_of(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "array", "items": item, "minItems": 1}
+
+
+def _enum(*values: str) -> Dict[str, Any]:
+    return {"type": "string", "enum": list(values)}
+
+
+OCEAN = _object({trait: NUMBER for trait in OCEAN_TRAITS})
+OCEAN_PARTIAL = _object({}, {trait: NUMBER for trait in OCEAN_TRAITS})
+CAPACITY_FACTORS = {
+    "type": "array",
+    "items": _object({"factor": STRING, "impact": NUMBER}, {"description": STRING}),
+}
+
+# ===================================================================
+# BATCH DATA TYPES (qwen3_generator.py)
+# ===================================================================
+
+EMOTIONAL_AUTHENTICITY = _object(
+    {
+        "context": STRING,
+        "effective_capacity": NUMBER,
+        "situation": STRING,
+        "support_level_needed": NUMBER,
+        "character_response": STRING,
+        "internal_thought": STRING,
+        "authenticity_score": SCORE,
+        "demonstrates_constraint": STRING,
+    },
+    {
+        "base_capacity": NUMBER,
+        "capacity_factors": CAPACITY_FACTORS,
+        "relationship_impact": NUMBER,
+        "ocean_context": OCEAN_PARTIAL,
+        "tags": STRING_LIST,
+    },
+)
+
+_IRONY_OPTION = _object(
+    {"dialogue": STRING, "internal_thought": STRING, "tension_score": NUMBER, "relationship_impact": NUMBER},
+    {
+        "player_overlay": STRING,
+        "consequence": STRING,
+        "growth_opportunity": STRING,
+        "maturity_demonstration": STRING,
+    },
+)
+
+DRAMATIC_IRONY = _object(
+    {
+        "player_knowledge": STRING,
+        "character_knowledge": STRING,
+        "knowledge_gap": STRING,
+        "knowledge_gap_score": SCORE,
+        "scenario_context": STRING,
+        "option_1_tone_deaf": _IRONY_OPTION,
+        "option_2_misguided": _IRONY_OPTION,
+        "option_3_growth": _IRONY_OPTION,
+        "dramatic_irony_score": SCORE,
+    },
+    {
+        "irony_type": _enum(
+            "character_oblivious_to_npc_truth",
+            "character_misinterprets_situation",
+            "capacity_limited_perception",
+        ),
+        "character_capacity": NUMBER,
+        "tags": STRING_LIST,
+    },
+)
+
+TENSION_BUILDING = _object(
+    {
+        "tension_type": _enum("mystery_hook", "partial_reveal", "contradiction", "stakes_escalation"),
+        "relationship_level": INTEGER,
+        "should_inject_tension": BOOLEAN,
+        "scenario": STRING,
+        "hook_description": STRING,
+        "information_debt": STRING_LIST,
+        "dialogue_snippet": STRING,
+        "hook_effectiveness": SCORE,
+        "tension_score": SCORE,
+    },
+    {
+        "expected_payoff_timeline": STRING,
+        "player_curiosity_score": SCORE,
+        "connects_to_previous_hooks": STRING_LIST,
+        "tags": STRING_LIST,
+    },
+)
+
+MEMORY_RESONANCE = _object(
+    {
+        "resonance_type": _enum(
+            "same_emotion_different_context",
+            "opposite_emotion_growth",
+            "past_trauma_trigger",
+            "joy_sadness_contrast",
+            "growth_callback",
+        ),
+        "resonance_weight": NUMBER,
+        "current_situation": STRING,
+        "current_emotion": STRING,
+        "recalled_memory": STRING,
+        "memory_emotion": STRING,
+        "resonance_explanation": STRING,
+        "character_reaction": STRING,
+        "resonance_score": SCORE,
+        "emotional_authenticity": SCORE,
+    },
+    {"memory_context": STRING, "narrative_impact": STRING, "tags": STRING_LIST},
+)
+
+PERSONALITY_TRAITS = _object(
+    {
+        "dialogue": STRING,
+        "context": STRING,
+        "ocean_traits": _object({trait: SCORE for trait in OCEAN_TRAITS}),
+        "trait_justification": STRING,
+    }
+)
+
+RELATIONSHIP_SCORING = _object(
+    {
+        "player_action": STRING,
+        "character_state": STRING,
+        "interaction_context": STRING,
+        "relationship_impact": NUMBER,
+        "trust_impact": NUMBER,
+        "impact_justification": STRING,
+    }
+)
+
+VALIDATION = _object(
+    {"overall_quality": SCORE, "meets_v1_2_standards": BOOLEAN},
+    {
+        "individual_scores": {
+            "type": "array",
+            "items": _object(
+                {"sample_index": INTEGER, "overall": SCORE},
+                {
+                    "emotional_authenticity": SCORE,
+                    "tension_building": SCORE,
+                    "dramatic_irony": SCORE,
+                    "hook_effectiveness": SCORE,
+                    "passes_threshold": BOOLEAN,
+                    "issues": STRING_LIST,
+                },
+            ),
+        },
+        "recommendations": STRING_LIST,
+        "strengths": STRING_LIST,
+    },
+)
+
+# ===================================================================
+# MULTI-STEP PIPELINE (multi_step_pipeline.py)
+# ===================================================================
+
+NPC_PRIMITIVES = _object(
+    {
+        "name": STRING,
+        "ocean": OCEAN,  # 0.0-5.0 scale
+        "base_capacity": NUMBER,
+        "relationship_level": INTEGER,
+        "trust": SCORE,
+        "interaction_count": INTEGER,
+    }
+)
+
+SITUATIONAL_CONTEXT = _object(
+    {
+        "effective_capacity": NUMBER,
+        "support_needed": NUMBER,
+        "urgency_level": _enum("routine", "important", "urgent", "crisis"),
+        "urgency_multiplier": NUMBER,
+        "situation_description": STRING,
+        "location": STRING,
+        "time_context": STRING,
+    }
+)
+
+TENSION_MEMORY = _object({"subtext": STRING, "tension_type": STRING, "tension_element": STRING})
+
+DIALOGUE = _object(
+    {"setting_context": STRING, "dialogue_prose": STRING, "primary_action": STRING, "word_count": INTEGER}
+)
+
+# ===================================================================
+# SYSTEMATIC GENERATORS (systematic_generator.py, multi_step_systematic.py)
+# ===================================================================
+
+NPC_INTERACTION_CARD = _object(
+    {
+        "npc_profile": _object(
+            {"name": STRING},
+            {"relationship_level": INTEGER, "trust": NUMBER, "interaction_count": INTEGER},
+        ),
+        "npc_emotional_state": _object(
+            {"effective_capacity": NUMBER},
+            {
+                "base_capacity": NUMBER,
+                "capacity_factors": CAPACITY_FACTORS,
+                "can_support_up_to": NUMBER,
+                "capacity_tier": STRING,
+            },
+        ),
+        "npc_ocean_personality": OCEAN_PARTIAL,
+        "interaction_context": _object(
+            {"support_needed": NUMBER},
+            {
+                "player_request_type": STRING,
+                "urgency_level": STRING,
+                "urgency_multiplier": NUMBER,
+                "situation_description": STRING,
+                "location": STRING,
+                "time_context": STRING,
+            },
+        ),
+        "npc_card_narrative": _object(
+            {"dialogue_prose": STRING},
+            {
+                "setting_context": STRING,
+                "primary_action": STRING,
+                "subtext": STRING,
+                "tension_hook": _object({}, {"type": STRING, "element": STRING}),
+                "word_count": INTEGER,
+            },
+        ),
+    },
+    {
+        "capacity_analysis": {"type": "object"},
+        "game_outcomes": {"type": "object"},
+        "training_metadata": {"type": "object"},
+    },
+)
+
+EMOTIONAL_AUTHENTICITY_BATCH = _object(
+    {
+        "character_state": _object(
+            {"effective_capacity": NUMBER},
+            {"base_capacity": NUMBER, "capacity_factors": CAPACITY_FACTORS},
+        ),
+        "situation": _object({"support_needed": NUMBER}, {"description": STRING}),
+        "character_response": _object({"dialogue": STRING}, {"behavioral_cues": STRING_LIST}),
+        "authenticity_score": SCORE,
+    },
+    {
+        "ocean_personality": OCEAN_PARTIAL,
+        "response_type": STRING,
+        "outcomes": {"type": "object"},
+        "demonstrates": STRING_LIST,
+    },
+)
+
+TARGETED_STATE = _object(
+    {"base_capacity": NUMBER, "effective_capacity": NUMBER, "capacity_tier": STRING},
+    {
+        "stressor_factors": {
+            "type": "array",
+            "items": _object({"type": STRING, "impact": NUMBER}, {"description": STRING}),
+        },
+        "positive_factors": {
+            "type": "array",
+            "items": _object({"type": STRING, "boost": NUMBER}, {"description": STRING}),
+        },
+        "formula_shown": STRING,
+        "calculation_steps": STRING,
+    },
+)
+
+TARGETED_INTERACTION = _object(
+    {
+        "situation_type": STRING,
+        "urgency": INTEGER,
+        "support_level_needed": NUMBER,
+        "relationship_context": _object(
+            {"level": INTEGER, "trust": NUMBER}, {"history_notes": STRING_LIST}
+        ),
+        "complexity_factors": STRING_LIST,
+    }
+)
+
+SYSTEMATIC_RESPONSE = _object(
+    {
+        "character_response": STRING,
+        "internal_thought": STRING,
+        "authenticity_score": SCORE,
+        "demonstrates_constraint": STRING,
+        "complexity_exhibited": STRING,
+    },
+    {
+        "relationship_impact": NUMBER,
+        "ocean_context": OCEAN_PARTIAL,
+        "tags": STRING_LIST,
+        "systematic_validation": _object(
+            {},
+            {
+                "meets_capacity_constraint": BOOLEAN,
+                "meets_authenticity_target": BOOLEAN,
+                "exhibits_complexity": BOOLEAN,
+            },
+        ),
+    },
+)
+
+COMPLEXITY_ENHANCEMENT = _object(
+    {"complexity_type": STRING, "enhanced_dialogue": STRING, "enhanced_internal_thought": STRING},
+    {"authenticity_impact": STRING, "why_this_adds_realism": STRING},
+)
+
+SCHEMAS: Dict[str, Dict[str, Any]] = {
+    # Batch generators return arrays
+    "emotional_authenticity": _array_of(EMOTIONAL_AUTHENTICITY),
+    "dramatic_irony": _array_of(DRAMATIC_IRONY),
+    "tension_building": _array_of(TENSION_BUILDING),
+    "memory_resonance": _array_of(MEMORY_RESONANCE),
+    "personality_traits": _array_of(PERSONALITY_TRAITS),
+    "relationship_scoring": _array_of(RELATIONSHIP_SCORING),
+    "npc_interaction_card": _array_of(NPC_INTERACTION_CARD),
+    "emotional_authenticity_batch": _array_of(EMOTIONAL_AUTHENTICITY_BATCH),
+    # Single-object steps
+    "validation": VALIDATION,
+    "npc_primitives": NPC_PRIMITIVES,
+    "situational_context": SITUATIONAL_CONTEXT,
+    "tension_memory": TENSION_MEMORY,
+    "dialogue": DIALOGUE,
+    "targeted_state": TARGETED_STATE,
+    "targeted_interaction": TARGETED_INTERACTION,
+    "systematic_response": SYSTEMATIC_RESPONSE,
+    "complexity_enhancement": COMPLEXITY_ENHANCEMENT,
+}
+
+
+def get_schema(name: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Schema registered under ``name`` (None for unknown names)"""
+    if name is None:
+        return None
+    return SCHEMAS.get(name)
+
+
+def item_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema of one parsed item (array schemas → their ``items``)"""
+    if schema.get("type") == "array":
+        return schema.get("items", {})
+    return schema
+
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def validate_instance(instance: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """
+    Validate ``instance`` against the supported JSON Schema subset.
+
+    Returns a list of human-readable errors (empty when valid).
+    """
+    errors: List[str] = []
+
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_TYPE_CHECKS[t](instance) for t in types):
+            return [f"{path}: expected {'/'.join(types)}, got {type(instance).__name__}"]
+
+    if "enum" in schema and instance not in schema["enum"]:
+        errors.append(f"{path}: {instance!r} not in {schema['enum']}")
+
+    if _TYPE_CHECKS["number"](instance):
+        if "minimum" in schema and instance < schema["minimum"]:
+            errors.append(f"{path}: {instance} < minimum {schema['minimum']}")
+        if "maximum" in schema and instance > schema["maximum"]:
+            errors.append(f"{path}: {instance} > maximum {schema['maximum']}")
+
+    if isinstance(instance, dict):
+        for name in schema.get("required", []):
+            if name not in instance:
+                errors.append(f"{path}: missing required '{name}'")
+        for name, sub_schema in schema.get("properties", {}).items():
+            if name in instance:
+                errors.extend(validate_instance(instance[name], sub_schema, f"{path}.{name}"))
+
+    if isinstance(instance, list):
+        if len(instance) < schema.get("minItems", 0):
+            errors.append(f"{path}: expected at least {schema['minItems']} items")
+        if "items" in schema:
+            for i, item in enumerate(instance):
+                errors.extend(validate_instance(item, schema["items"], f"{path}[{i}]"))
+
+    return errors
@@ -0,0 +1,147 @@
+"""
+Step-Level Memoization Store
+
+Persists every multi-step pipeline step output keyed by interaction ID and
+step name (SQLite, ``output_dir/step_store.db``), so a failure in a later
+step costs only that step: the already-paid-for primitives and context are
+reused when the step is retried or the interaction is resumed.
+
+Step outputs are the pipeline dataclasses; they are stored as JSON together
+with their type name and rebuilt from the registered types on read.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from ..utils.logger import AppLogger
+
+
+def encode_output(value: Any) -> str:
+    """JSON for a step output; dataclasses carry their type name"""
+    if is_dataclass(value):
+        return json.dumps({"type": type(value).__name__, "fields": asdict(value)}, ensure_ascii=False)
+    return json.dumps({"type": None, "value": value}, ensure_ascii=False, default=str)
+
+
+def decode_output(text: str, types: Dict[str, type]) -> Any:
+    """Inverse of :func:`encode_output` (dataclass types looked up by name)"""
+    data = json.loads(text)
+    if data.get("type") is None:
+        return data.get("value")
+    cls = types.get(data["type"])
+    if cls is None:
+        raise ValueError(f"Unregistered step output type '{data['type']}'")
+    return cls(**data["fields"])
+
+
+class StepStore:
+    """
+    SQLite store of step outputs (and failed attempts) per interaction.
+
+    One connection is shared by all executor threads behind a lock.
+    """
+
+    def __init__(self, path: Path, types: Iterable[type] = ()):
+        self.path = Path(path)
+        self.types: Dict[str, type] = {cls.__name__: cls for cls in types}
+        self.hits = 0
+        self.writes = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS step_outputs (
+                    interaction_id TEXT NOT NULL,
+                    step TEXT NOT NULL,
+                    output TEXT NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (interaction_id, step)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS step_failures (
+                    interaction_id TEXT NOT NULL,
+                    step TEXT NOT NULL,
+                    attempt INTEGER NOT NULL,
+                    error TEXT,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+
+    @classmethod
+    def from_config(cls, config: Any, types: Iterable[type] = ()) -> Optional["StepStore"]:
+        """Build the store from ``config.step_store`` (None when memoization is disabled)"""
+        settings = getattr(config, "step_store", {}) or {}
+        if not settings.get("enabled", False):
+            return None
+        path = settings.get("path") or Path(config.output_dir) / "step_store.db"
+        return cls(path, types)
+
+    def get(self, interaction_id: str, step: str) -> Optional[Any]:
+        """Stored output of ``step`` for the interaction (None when not stored)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output FROM step_outputs WHERE interaction_id = ? AND step = ?",
+                (interaction_id, step),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            value = decode_output(row[0], self.types)
+        except (TypeError, ValueError) as e:
+            AppLogger.warning(f"Discarding unreadable stored step '{step}'", data={"error": str(e)})
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, interaction_id: str, step: str, value: Any, attempts: int = 1) -> None:
+        encoded = encode_output(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO step_outputs (interaction_id, step, output, attempts, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (interaction_id, step, encoded, attempts, time.time()),
+            )
+            self.writes += 1
+
+    def record_failure(self, interaction_id: Optional[str], step: str, attempt: int, error: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO step_failures (interaction_id, step, attempt, error, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (interaction_id or "", step, attempt, error, time.time()),
+            )
+            self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            retried = dict(
+                self._conn.execute(
+                    "SELECT step, COUNT(*) FROM step_outputs WHERE attempts > 1 GROUP BY step"
+                ).fetchall()
+            )
+            return {
+                "hits": self.hits,
+                "writes": self.writes,
+                "failed_attempts": self.failures,
+                "recovered_by_retry": retried,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,226 @@
+"""
+Streaming JSON Guard
+
+Watches an Ollama token stream and decides when to stop decoding:
+
+- COMPLETE: the top-level JSON array/object has closed, so every token
+  after it is wasted ``num_predict`` budget
+- PREAMBLE: too much prose before any JSON starts (off-schema output)
+- REPETITION: the tail of the output is the same span repeated over and over
+- LENGTH: the response exceeded its character budget
+
+Qwen3 ``<think>...</think>`` blocks and Markdown code fences before the JSON
+do not count as preamble. A bracket in the preamble only becomes the JSON
+root when the text after it looks like JSON, and a root that closes without
+parsing to at least one object or array (``"see [1]"``) is treated as
+preamble and scanning continues. After COMPLETE the guard can let a few more chunks
+through (``completion_grace_chunks``): the model usually ends right after the
+JSON, and letting it finish keeps the final chunk's ``prompt_eval_count`` /
+``eval_count`` metrics.
+"""
+
+from typing import Dict, Optional
+
+from .json_extract import extract_json
+
+# Stop reasons
+COMPLETE = "complete"
+PREAMBLE = "preamble"
+REPETITION = "repetition"
+LENGTH = "length"
+
+ABORT_REASONS = (PREAMBLE, REPETITION, LENGTH)
+
+# First non-space character after a bracket that makes it a plausible root
+_ARRAY_OPENERS = '{["“'
+_OBJECT_OPENERS = '"“}'
+
+
+class StreamingJSONGuard:
+    """
+    Incremental JSON boundary scanner with early-abort heuristics.
+
+    Feed it response chunks as they arrive; ``feed`` returns a stop reason as
+    soon as the stream should be closed, otherwise ``None``.
+    """
+
+    def __init__(
+        self,
+        max_preamble_chars: int = 400,
+        max_response_chars: int = 24000,
+        repetition_min_period: int = 16,
+        repetition_max_period: int = 200,
+        repetition_repeats: int = 4,
+        repetition_check_every: int = 16,
+        completion_grace_chunks: int = 0,
+    ):
+        self.max_preamble_chars = max_preamble_chars
+        self.max_response_chars = max_response_chars
+        self.repetition_min_period = repetition_min_period
+        self.repetition_max_period = repetition_max_period
+        self.repetition_repeats = repetition_repeats
+        self.repetition_check_every = max(1, repetition_check_every)
+        self._grace_left = max(0, completion_grace_chunks)
+
+        self.text = ""
+        self.stop_reason: Optional[str] = None
+        self.json_start: Optional[int] = None
+        self.json_end: Optional[int] = None
+
+        self._pos = 0  # Next unscanned index into self.text
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._in_think = False
+        self._preamble_chars = 0
+        self._chunks = 0
+
+    @classmethod
+    def from_config(cls, settings: Dict) -> "StreamingJSONGuard":
+        """Build a guard from ``config.streaming``"""
+        return cls(
+            max_preamble_chars=settings.get("max_preamble_chars", 400),
+            max_response_chars=settings.get("max_response_chars", 24000),
+            repetition_min_period=settings.get("repetition_min_period", 16),
+            repetition_max_period=settings.get("repetition_max_period", 200),
+            repetition_repeats=settings.get("repetition_repeats", 4),
+            completion_grace_chunks=settings.get("completion_grace_chunks", 8),
+        )
+
+    @property
+    def json_text(self) -> str:
+        """Text to hand to the parser (trimmed after the closing bracket when complete)"""
+        if self.stop_reason == COMPLETE and self.json_end is not None:
+            return self.text[: self.json_end]
+        return self.text
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """Consume one streamed chunk; return a stop reason or ``None`` to keep reading"""
+        if self.stop_reason is not None:
+            self.text += chunk
+            return self._after_stop()
+
+        self.text += chunk
+        self._chunks += 1
+
+        reason = self._scan()
+        if reason is None and len(self.text) > self.max_response_chars:
+            reason = LENGTH
+        if (
+            reason is None
+            and self.json_start is not None
+            and self._chunks % self.repetition_check_every == 0
+            and self._is_repeating()
+        ):
+            reason = REPETITION
+
+        self.stop_reason = reason
+        if reason == COMPLETE:
+            return self._after_stop()
+        return reason
+
+    def _after_stop(self) -> Optional[str]:
+        """Spend the completion grace before reporting COMPLETE to the caller"""
+        if self.stop_reason == COMPLETE and self._grace_left > 0:
+            self._grace_left -= 1
+            return None
+        return self.stop_reason
+
+    def _scan(self) -> Optional[str]:
+        text = self.text
+        while self._pos < len(text):
+            i = self._pos
+            char = text[i]
+            self._pos += 1
+
+            if self.json_start is None:
+                # Before the JSON: skip <think> blocks and code fences
+                if self._in_think:
+                    if text.startswith("</think>", i):
+                        self._in_think = False
+                        self._pos = i + len("</think>")
+                    elif len(text) - i < len("</think>") and "</think>".startswith(text[i:]):
+                        self._pos = i  # Partial closing tag; wait for more text
+                        return None
+                    continue
+                if char == "<":
+                    if text.startswith("<think>", i):
+                        self._in_think = True
+                        self._pos = i + len("<think>")
+                        continue
+                    if len(text) - i < len("<think>") and "<think>".startswith(text[i:]):
+                        self._pos = i
+                        return None
+                if char in "[{":
+                    opens = self._opens_json(i)
+                    if opens is None:
+                        self._pos = i  # Bracket at the end of the text; wait for more
+                        return None
+                    if opens:
+                        self.json_start = i
+                        self._depth = 1
+                        continue
+                if char == "`" or char.isspace():
+                    continue
+                if text.startswith("json", i) and text[:i].rstrip().endswith("```"):
+                    self._pos = i + len("json")
+                    continue
+                self._preamble_chars += 1
+                if self._preamble_chars > self.max_preamble_chars:
+                    return PREAMBLE
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    if self._parses(i + 1):
+                        self.json_end = i + 1
+                        return COMPLETE
+                    # Bracketed prose, not the JSON: count it as preamble and keep scanning
+                    self._preamble_chars += i + 1 - self.json_start
+                    self.json_start = None
+                    if self._preamble_chars > self.max_preamble_chars:
+                        return PREAMBLE
+        return None
+
+    def _opens_json(self, i: int) -> Optional[bool]:
+        """Does the bracket at ``i`` start JSON? None until the next non-space character arrives"""
+        text = self.text
+        j = i + 1
+        while j < len(text) and text[j].isspace():
+            j += 1
+        if j >= len(text):
+            return None
+        if text[i] == "[":
+            return text[j] in _ARRAY_OPENERS
+        return text[j] in _OBJECT_OPENERS or text[j].isalpha() or text[j] == "_"
+
+    def _parses(self, end: int) -> bool:
+        """Does the closed root yield at least one object or array?"""
+        result = extract_json(self.text[self.json_start : end], ascii_only=False)
+        return result.report.error is None and any(isinstance(item, (dict, list)) for item in result.items)
+
+    def _is_repeating(self) -> bool:
+        """True when the output ends with one span repeated ``repetition_repeats`` times"""
+        text = self.text
+        for period in range(self.repetition_min_period, self.repetition_max_period + 1):
+            span = period * self.repetition_repeats
+            if span > len(text) - self.json_start:
+                break
+            unit = text[-period:]
+            if text[-span:] == unit * self.repetition_repeats:
+                return True
+        return False
@@ -28,9 +28,42 @@ from pathlib import Path
 import random
 
 from .config import EnhancedTrainingConfig as TrainingConfig
+from .coverage_accumulator import CoverageAccumulator
+from .coverage_matrix import CoverageMatrix
+from .generation_ledger import GenerationLedger
+from .job_journal import COMPLETED, FAILED, JobJournal
 from .qwen3_generator import Qwen3DataGenerator
+from .scenario_planner import ScenarioPlanner
 from ..utils.logger import AppLogger
 
+# Systematic parameter buckets
+CAPACITY_LEVELS = [
+    {"name": "crisis", "range": (0.5, 1.5), "frequency": 0.15},
+    {"name": "low", "range": (2.0, 4.0), "frequency": 0.25},
+    {"name": "medium", "range": (4.5, 6.5), "frequency": 0.35},
+    {"name": "high", "range": (7.0, 9.5), "frequency": 0.25},
+]
+
+# FIX v1.6: Rebalanced to reduce excellent clustering (was 64%, should be ~25%)
+AUTHENTICITY_TARGETS = [
+    {"name": "failed", "range": (0.2, 0.4), "frequency": 0.20},  # Increased
+    {"name": "struggling", "range": (0.4, 0.6), "frequency": 0.25},  # Increased
+    {"name": "authentic", "range": (0.6, 0.8), "frequency": 0.30},  # Slight decrease
+    {"name": "excellent", "range": (0.8, 1.0), "frequency": 0.25},  # Decreased from 0.30
+]
+
+# IMPROVEMENT: 8 complexity types vs 0 in current system
+COMPLEXITY_TYPES = [
+    "baseline",  # Current system only has this
+    "people_pleasing",  # Says yes when should say no
+    "misjudgment_over",  # Overestimates capacity
+    "misjudgment_under",  # Underestimates capacity
+    "defensive_lashing",  # Lashes out when overwhelmed
+    "emergency_override",  # Pushes beyond limits in crisis
+    "cultural_indirect",  # Cultural barriers to directness
+    "mixed_emotions",  # Wants to help BUT resents
+]
+
 
 class SystematicParameterGenerator(Qwen3DataGenerator):
     """
@@ -52,6 +85,30 @@ class SystematicParameterGenerator(Qwen3DataGenerator):
         self.coverage_db = self.output_dir / "coverage_tracking.db"
         self._init_coverage_database()
 
+        # In-memory counts drive scheduling; the database is written behind in batches
+        tracking = self.config.coverage_tracking
+        self.coverage = CoverageMatrix(
+            self.coverage_db,
+            [level["name"] for level in CAPACITY_LEVELS],
+            [target["name"] for target in AUTHENTICITY_TARGETS],
+            COMPLEXITY_TYPES,
+            flush_every=tracking.get("flush_every", 25),
+            flush_seconds=tracking.get("flush_seconds", 30.0),
+        )
+        self.planner = ScenarioPlanner.from_config(
+            self.config,
+            [
+                [level["name"] for level in CAPACITY_LEVELS],
+                [target["name"] for target in AUTHENTICITY_TARGETS],
+                COMPLEXITY_TYPES,
+            ],
+            self.coverage.cell_counts,
+        )
+        # Per-sample cell/model/latency/tokens/parse/validation rows (None when disabled)
+        self.ledger = GenerationLedger.from_config(self.config)
+        if self.ledger is not None and self.dataset_writer is not None:
+            self.dataset_writer.on_durable = self.ledger.assign_offsets  # Shard byte offsets
+
         AppLogger.info(
             "SystematicParameterGenerator initialized",
             data={
@@ -118,37 +175,17 @@ class SystematicParameterGenerator(Qwen3DataGenerator):
         Generate systematic parameter combinations ensuring full spectrum coverage.
 
         IMPROVEMENT: Replaces random generation with systematic buckets.
+        With ``config.scenario_planner`` enabled, scenarios are leased from
+        the deficit-ordered plan instead.
         """
-        # Define systematic parameter buckets
-        capacity_levels = [
-            {"name": "crisis", "range": (0.5, 1.5), "frequency": 0.15},
-            {"name": "low", "range": (2.0, 4.0), "frequency": 0.25},
-            {"name": "medium", "range": (4.5, 6.5), "frequency": 0.35},
-            {"name": "high", "range": (7.0, 9.5), "frequency": 0.25},
-        ]
-
-        # FIX v1.6: Rebalanced to reduce excellent clustering (was 64%, should be ~25%)
-        authenticity_targets = [
-            {"name": "failed", "range": (0.2, 0.4), "frequency": 0.20},  # Increased
-            {"name": "struggling", "range": (0.4, 0.6), "frequency": 0.25},  # Increased
-            {"name": "authentic", "range": (0.6, 0.8), "frequency": 0.30},  # Slight decrease
-            {"name": "excellent", "range": (0.8, 1.0), "frequency": 0.25},  # Decreased from 0.30
-        ]
-
-        # IMPROVEMENT: 8 complexity types vs 0 in current system
-        complexity_types = [
-            "baseline",  # Current system only has this
-            "people_pleasing",  # Says yes when should say no
-            "misjudgment_over",  # Overestimates capacity
-            "misjudgment_under",  # Underestimates capacity
-            "defensive_lashing",  # Lashes out when overwhelmed
-            "emergency_override",  # Pushes beyond limits in crisis
-            "cultural_indirect",  # Cultural barriers to directness
-            "mixed_emotions",  # Wants to help BUT resents
-        ]
+        if self.planner is not None:
+            slots = self.planner.lease(batch_size)
+            if slots:
+                return [self._scenario_for_slot(slot) for slot in slots]
+            AppLogger.warning("Scenario plan unavailable, falling back to bucket sampling")
 
         # FIX v1.6: Shuffle complexity types each batch to ensure variety
-        shuffled_complexity = complexity_types.copy()
+        shuffled_complexity = COMPLEXITY_TYPES.copy()
         random.shuffle(shuffled_complexity)
 
         # Check for coverage gaps
@@ -161,8 +198,8 @@ class SystematicParameterGenerator(Qwen3DataGenerator):
                 scenario = missing_combinations[i]
             else:
                 # Systematic selection ensuring coverage
-                capacity = self._select_from_distribution(capacity_levels)
-                authenticity = self._select_from_distribution(authenticity_targets)
+                capacity = self._select_from_distribution(CAPACITY_LEVELS)
+                authenticity = self._select_from_distribution(AUTHENTICITY_TARGETS)
                 # FIX v1.6: Use shuffled list for better variety
                 complexity = shuffled_complexity[i % len(shuffled_complexity)]
 
@@ -186,6 +223,23 @@ class SystematicParameterGenerator(Qwen3DataGenerator):
 
         return scenarios
 
+    def _scenario_for_slot(self, slot: Dict) -> Dict:
+        """Full scenario for a leased plan cell"""
+        capacity_range = next(level["range"] for level in CAPACITY_LEVELS if level["name"] == slot["capacity_level"])
+        authenticity_range = next(
+            target["range"] for target in AUTHENTICITY_TARGETS if target["name"] == slot["authenticity_target"]
+        )
+        effective_capacity = random.uniform(*capacity_range)
+        return {
+            **slot,
+            "capacity_range": capacity_range,
+            "authenticity_range": authenticity_range,
+            "support_needed": self._calculate_support_for_authenticity(
+                effective_capacity, slot["authenticity_target"]
+            ),
+            "scenario_id": f"{slot['capacity_level']}_{slot['authenticity_target']}_{slot['complexity_type']}",
+        }
+
     def _select_from_distribution(self, options: List[Dict]) -> Dict:
         """Select option based on frequency distribution"""
         weights = [opt["frequency"] for opt in options]
@@ -213,40 +267,19 @@ class SystematicParameterGenerator(Qwen3DataGenerator):
             return max(1.0, effective_capacity - random.uniform(1.0, 2.0))
 
     def _get_missing_combinations(self) -> List[Dict]:
-        """Query database for missing parameter combinations"""
-        conn = sqlite3.connect(self.coverage_db)
-        cursor = conn.execute(
-            """
-            SELECT capacity_level, authenticity_target, complexity_type, generated_count
-            FROM parameter_coverage
-            ORDER BY generated_count ASC
-            LIMIT 10
-        """
-        )
-
+        """Under-generated parameter combinations, from the in-memory coverage matrix"""
         # Define ranges for reconstruction
-        capacity_ranges = {
-            "crisis": (0.5, 1.5),
-            "low": (2.0, 4.0),
-            "medium": (4.5, 6.5),
-            "high": (7.0, 9.5),
-        }
-
-        authenticity_ranges = {
-            "failed": (0.2, 0.4),
-            "struggling": (0.4, 0.6),
-            "authentic": (0.6, 0.8),
-            "excellent": (0.8, 1.0),
-        }
+        capacity_ranges = {level["name"]: level["range"] for level in CAPACITY_LEVELS}
+        authenticity_ranges = {target["name"]: target["range"] for target in AUTHENTICITY_TARGETS}
 
         missing = []
         min_count = 2  # Minimum times each combination should be generated
 
-        for row in cursor.fetchall():
-            if row[3] < min_count:  # generated_count < min_count
-                capacity_level = row[0]
-                authenticity_target = row[1]
-                complexity_type = row[2]
+        for row in self.coverage.least_covered(below=min_count, limit=10):
+            if row["generated_count"] < min_count:
+                capacity_level = row["capacity_level"]
+                authenticity_target = row["authenticity_target"]
+                complexity_type = row["complexity_type"]
 
                 # Reconstruct full scenario with all required fields
                 capacity_range = capacity_ranges.get(capacity_level, (2.0, 8.0))
@@ -268,7 +301,6 @@ class SystematicParameterGenerator(Qwen3DataGenerator):
                     }
                 )
 
-        conn.close()
         return missing
 
     # ===================================================================
@@ -387,7 +419,7 @@ NO parentheses. Prose format. Show calculations. 60-120 word dialogue. Return ON
     # IMPROVED BATCH GENERATION WITH SYSTEMATIC COVERAGE
     # ===================================================================
 
-    def generate_systematic_emotional_batch(self, batch_size: int = 1) -> List[Dict]:
+    def generate_systematic_emotional_batch(self, batch_size: int = 1, scenarios: Optional[List[Dict]] = None) -> List[Dict]:
         """
         Generate using systematic parameter space instead of random examples.
 
@@ -399,15 +431,19 @@ NO parentheses. Prose format. Show calculations. 60-120 word dialogue. Return ON
         5. Coverage tracking
 
         Replaces: generate_emotional_authenticity_batch() in qwen3_generator.py
+
+        ``scenarios`` (already leased by the caller) are generated instead of
+        new ones; plan slots that produce nothing are released.
         """
+        if scenarios is None:
+            # IMPROVEMENT 1: Systematic parameter combinations
+            scenarios = self._generate_systematic_parameters(batch_size)
+        batch_size = len(scenarios)
         AppLogger.info(f"Starting systematic generation for batch_size={batch_size}")
 
-        # IMPROVEMENT 1: Systematic parameter combinations
-        scenarios = self._generate_systematic_parameters(batch_size)
-
-        # IMPROVEMENT 2: Generate with focused prompts
-        examples = []
-        for i, scenario in enumerate(scenarios):
+        # IMPROVEMENT 2: Generate with focused prompts (scenarios run concurrently)
+        def generate_scenario(indexed_scenario: Tuple[int, Dict]) -> List[Dict]:
+            i, scenario = indexed_scenario
             prompt = self._build_focused_prompt(scenario)
 
             try:
@@ -416,11 +452,18 @@ NO parentheses. Prose format. Show calculations. 60-120 word dialogue. Return ON
                     prompt=prompt,
                     temperature=self.config.temp_emotional,  # v1.6.3: Use config temp
                     max_tokens=self.config.max_tokens,  # v1.6.3: Use config value for stability
+                    schema="npc_interaction_card",
+                    data_type="emotional_authenticity",
                 )
 
-                if response:
-                    parsed = self._parse_json_response(response, "emotional_authenticity")
-                    if parsed:
+                if not response:
+                    self._record_ledger(scenario, parse_outcome="empty")
+                else:
+                    parsed = self._parse_json_response(response, "emotional_authenticity", schema="npc_interaction_card")
+                    call = self.last_call_metrics()
+                    if not parsed:
+                        self._record_ledger(scenario, call)
+                    else:
                         # Add scenario metadata
                         for example in parsed:
                             example["_systematic_metadata"] = {
@@ -429,83 +472,75 @@ NO parentheses. Prose format. Show calculations. 60-120 word dialogue. Return ON
                                 "complexity_type": scenario["complexity_type"],
                                 "scenario_id": scenario.get("scenario_id", f"scenario_{i}"),
                             }
-                        examples.extend(parsed)
+                            self._record_ledger(scenario, call, example, share=len(parsed))
 
                         # Track coverage
                         self._track_generated_combination(scenario)
-
-                time.sleep(0.5)  # Rate limiting
+                        return parsed
 
             except Exception as e:
                 AppLogger.error(f"Generation failed for scenario {i}", e)
-                continue
+            return []
+
+        examples = []
+        for parsed in self._map_concurrent(generate_scenario, enumerate(scenarios)):
+            examples.extend(parsed)
+        self.coverage.flush()
+        self._release_unfinished(scenarios)
 
         AppLogger.info(
             f"Systematic batch generation complete",
             data={
                 "requested": batch_size,
                 "generated": len(examples),
-                "success_rate": f"{len(examples)/batch_size*100:.1f}%",
+                "success_rate": f"{len(examples)/max(1, batch_size)*100:.1f}%",
             },
         )
 
         return examples
 
-    def _track_generated_combination(self, scenario: Dict):
-        """Track generated parameter combination in database"""
-        conn = sqlite3.connect(self.coverage_db)
+    def _record_ledger(
+        self,
+        scenario: Dict,
+        call: Optional[Dict] = None,
+        sample: Optional[Dict] = None,
+        parse_outcome: Optional[str] = None,
+        share: int = 1,
+        step_latencies: Optional[Dict[str, float]] = None,
+    ):
+        """Ledger one attempt; a produced sample is tagged with ``_ledger_id`` for its output offset"""
+        if self.ledger is None:
+            return
+        sample_id = self.ledger.record(
+            scenario,
+            self.last_call_metrics() if call is None else call,
+            parse_outcome=parse_outcome,
+            sample=sample,
+            share=share,
+            step_latencies=step_latencies,
+        )
+        if sample is not None:
+            sample["_ledger_id"] = sample_id
 
+    def _track_generated_combination(self, scenario: Dict):
+        """Count a generated parameter combination (persisted by the coverage matrix's write-behind)"""
         try:
-            # Check if combination exists
-            cursor = conn.execute(
-                """
-                SELECT id, generated_count FROM parameter_coverage
-                WHERE capacity_level = ? AND authenticity_target = ? AND complexity_type = ?
-            """,
-                (
-                    scenario["capacity_level"],
-                    scenario["authenticity_target"],
-                    scenario["complexity_type"],
-                ),
-            )
-
-            result = cursor.fetchone()
-
-            if result:
-                # Update count
-                conn.execute(
-                    """
-                    UPDATE parameter_coverage
-                    SET generated_count = generated_count + 1,
-                        last_generated = datetime('now')
-                    WHERE id = ?
-                """,
-                    (result[0],),
-                )
-            else:
-                # Insert new
-                conn.execute(
-                    """
-                    INSERT INTO parameter_coverage 
-                    (capacity_level, capacity_range, authenticity_target, authenticity_range,
-                     complexity_type, first_generated, last_generated)
-                    VALUES (?, ?, ?, ?, ?, datetime('now'), datetime('now'))
-                """,
-                    (
-                        scenario["capacity_level"],
-                        str(scenario.get("capacity_range", "")),
-                        scenario["authenticity_target"],
-                        str(scenario.get("authenticity_range", "")),
-                        scenario["complexity_type"],
-                    ),
-                )
-
-            conn.commit()
-
+            self.coverage.increment(scenario)
+            if self.planner is not None and "plan_slot" in scenario:
+                self.planner.complete(scenario["plan_slot"])
         except Exception as e:
             AppLogger.error("Failed to track coverage", e)
-        finally:
-            conn.close()
+
+    def _release_unfinished(self, scenarios: List[Dict]):
+        """Hand plan slots whose scenarios produced no sample back to the plan"""
+        if self.planner is None:
+            return
+        for scenario in scenarios:
+            if "plan_slot" in scenario:
+                try:
+                    self.planner.release(scenario["plan_slot"])
+                except Exception as e:
+                    AppLogger.error("Failed to release scenario plan slot", e)
 
     # ===================================================================
     # BATCH PROCESSING OPTIMIZATION
@@ -573,10 +608,13 @@ Return ONLY JSON array with {len(scenarios)} objects. Make dialogue RICH and REA
             prompt=prompt,
             temperature=self.config.temp_emotional,  # v1.6.3: Use config temp
             max_tokens=self.config.max_tokens,  # v1.6.3: Use config value
+            schema="emotional_authenticity_batch",
         )
 
+        call = self.last_call_metrics()
         if response:
-            parsed = self._parse_json_response(response, "emotional_authenticity_batch")
+            parsed = self._parse_json_response(response, "emotional_authenticity_batch", schema="emotional_authenticity_batch")
+            call = self.last_call_metrics()
             if parsed:
                 # Add metadata
                 for i, (example, scenario) in enumerate(zip(parsed, scenarios)):
@@ -586,6 +624,7 @@ Return ONLY JSON array with {len(scenarios)} objects. Make dialogue RICH and REA
                         "complexity_type": scenario["complexity_type"],
                         "batch_index": i,
                     }
+                    self._record_ledger(scenario, call, example, share=len(parsed))
                     self._track_generated_combination(scenario)
 
                 AppLogger.info(
@@ -595,6 +634,8 @@ Return ONLY JSON array with {len(scenarios)} objects. Make dialogue RICH and REA
 
                 return parsed
 
+        for scenario in scenarios:
+            self._record_ledger(scenario, call, parse_outcome=None if response else "empty", share=len(scenarios))
         return []
 
     # ===================================================================
@@ -606,136 +647,58 @@ Return ONLY JSON array with {len(scenarios)} objects. Make dialogue RICH and REA
         Track which parameter combinations we've generated.
 
         IMPROVEMENT: Systematic tracking vs no tracking in current system.
+        One-off report over ``examples``; the production cycle keeps a
+        streaming CoverageAccumulator instead of re-scanning every batch.
         """
-        coverage = {
-            "total_examples": len(examples),
-            "authenticity_distribution": {},
-            "capacity_distribution": {},
-            "complexity_coverage": {},
-            "gaps": [],
-        }
-
-        # Analyze authenticity distribution
-        for example in examples:
-            score = example.get("authenticity_score", 0.8)
-            if score < 0.4:
-                coverage["authenticity_distribution"]["failed (0.2-0.4)"] = (
-                    coverage["authenticity_distribution"].get("failed (0.2-0.4)", 0) + 1
-                )
-            elif score < 0.6:
-                coverage["authenticity_distribution"]["struggling (0.4-0.6)"] = (
-                    coverage["authenticity_distribution"].get("struggling (0.4-0.6)", 0) + 1
-                )
-            elif score < 0.8:
-                coverage["authenticity_distribution"]["authentic (0.6-0.8)"] = (
-                    coverage["authenticity_distribution"].get("authentic (0.6-0.8)", 0) + 1
-                )
-            else:
-                coverage["authenticity_distribution"]["excellent (0.8-1.0)"] = (
-                    coverage["authenticity_distribution"].get("excellent (0.8-1.0)", 0) + 1
-                )
-
-            # Track complexity coverage
-            metadata = example.get("_systematic_metadata", {})
-            complexity = metadata.get("complexity_type", example.get("complexity_type", "unknown"))
-            coverage["complexity_coverage"][complexity] = (
-                coverage["complexity_coverage"].get(complexity, 0) + 1
-            )
-
-        # Identify gaps
-        required_minimums = {
-            "failed (0.2-0.4)": 2,
-            "struggling (0.4-0.6)": 3,
-            "authentic (0.6-0.8)": 4,
-            "excellent (0.8-1.0)": 3,
-        }
-
-        for auth_type, minimum in required_minimums.items():
-            actual = coverage["authenticity_distribution"].get(auth_type, 0)
-            if actual < minimum:
-                coverage["gaps"].append(f"Need {minimum - actual} more {auth_type} examples")
-
-        # Check complexity coverage
-        required_complexity = [
-            "baseline",
-            "people_pleasing",
-            "misjudgment_over",
-            "emergency_override",
-            "mixed_emotions",
-        ]
-        for complexity_type in required_complexity:
-            if complexity_type not in coverage["complexity_coverage"]:
-                coverage["gaps"].append(f"Missing complexity type: {complexity_type}")
-
-        return coverage
+        return CoverageAccumulator().extend(examples).report()
 
     def get_coverage_report(self) -> Dict:
-        """Generate comprehensive coverage report from database"""
-        conn = sqlite3.connect(self.coverage_db)
-
-        # Overall statistics
-        cursor = conn.execute(
-            """
-            SELECT 
-                COUNT(*) as total_combinations,
-                SUM(generated_count) as total_examples,
-                AVG(generated_count) as avg_per_combination,
-                MIN(generated_count) as min_generated,
-                MAX(generated_count) as max_generated
-            FROM parameter_coverage
-        """
-        )
-
-        stats = cursor.fetchone()
+        """Generate comprehensive coverage report from the coverage matrix"""
+        self.coverage.flush()  # Also merges in other processes' counts
+        stats = self.coverage.summary()
 
-        # Coverage by authenticity target
-        cursor = conn.execute(
-            """
-            SELECT authenticity_target, SUM(generated_count) as count
-            FROM parameter_coverage
-            GROUP BY authenticity_target
-            ORDER BY count DESC
-        """
-        )
-        authenticity_coverage = {row[0]: row[1] for row in cursor.fetchall()}
-
-        # Coverage by complexity type
-        cursor = conn.execute(
-            """
-            SELECT complexity_type, SUM(generated_count) as count
-            FROM parameter_coverage
-            GROUP BY complexity_type
-            ORDER BY count DESC
-        """
-        )
-        complexity_coverage = {row[0]: row[1] for row in cursor.fetchall()}
+        def by_count(totals: Dict[str, int]) -> Dict[str, int]:
+            return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
 
         # Under-represented combinations
-        cursor = conn.execute(
-            """
-            SELECT capacity_level, authenticity_target, complexity_type, generated_count
-            FROM parameter_coverage
-            WHERE generated_count < 2
-            ORDER BY generated_count ASC
-            LIMIT 10
-        """
-        )
         gaps = [
-            {"capacity": row[0], "authenticity": row[1], "complexity": row[2], "count": row[3]}
-            for row in cursor.fetchall()
+            {
+                "capacity": row["capacity_level"],
+                "authenticity": row["authenticity_target"],
+                "complexity": row["complexity_type"],
+                "count": row["generated_count"],
+            }
+            for row in self.coverage.least_covered(below=2, limit=10)
         ]
 
-        conn.close()
-
         return {
-            "total_combinations_tracked": stats[0] if stats[0] else 0,
-            "total_examples_generated": stats[1] if stats[1] else 0,
-            "avg_per_combination": stats[2] if stats[2] else 0,
-            "authenticity_coverage": authenticity_coverage,
-            "complexity_coverage": complexity_coverage,
+            "total_combinations_tracked": stats["combinations"],
+            "total_examples_generated": stats["samples"],
+            "avg_per_combination": stats["avg_per_combination"],
+            "authenticity_coverage": by_count(self.coverage.totals("authenticity_target")),
+            "complexity_coverage": by_count(self.coverage.totals("complexity_type")),
             "gaps_to_fill": gaps,
+            "ledger": self.get_ledger_report(),
+        }
+
+    def get_ledger_report(self, limit: int = 5) -> Optional[Dict]:
+        """Worst cells by parse failures, latency and on-target yield, plus per-model stats"""
+        if self.ledger is None:
+            return None
+        return {
+            "worst_parse_cells": self.ledger.cell_stats(order_by="parse_failure_rate", limit=limit),
+            "slowest_cells": self.ledger.cell_stats(order_by="avg_latency_seconds", limit=limit),
+            "lowest_yield_cells": self.ledger.cell_stats(order_by="yield", limit=limit),
+            "models": self.ledger.model_stats(),
         }
 
+    def save_batch(self, data: List[Dict], data_type: str, batch_number: int, timestamp: str) -> str:
+        """Save batch to disk and record each ledgered sample's file and offset"""
+        filepath = super().save_batch(data, data_type, batch_number, timestamp)
+        if self.ledger is not None and self.dataset_writer is None:
+            self.ledger.assign_output(filepath, data)
+        return filepath
+
     # ===================================================================
     # IMPROVED PRODUCTION CYCLE
     # ===================================================================
@@ -760,6 +723,16 @@ Return ONLY JSON array with {len(scenarios)} objects. Make dialogue RICH and REA
         results = {"emotional_authenticity": []}
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+        # Coverage is folded in per sample; the example list is only kept for the caller
+        tracking = self.config.coverage_tracking
+        keep_examples = tracking.get("keep_examples", True)
+        self.coverage_accumulator = accumulator = CoverageAccumulator(tracking.get("histogram_bins", 10))
+
+        def collect(examples: List[Dict]):
+            accumulator.extend(examples)
+            if keep_examples:
+                results["emotional_authenticity"].extend(examples)
+
         # Calculate batches needed
         # v1.6.3: Use config value (1 for single-example mode)
         batch_size = self.config.batch_size_emotional
@@ -770,8 +743,38 @@ Return ONLY JSON array with {len(scenarios)} objects. Make dialogue RICH and REA
         else:
             AppLogger.info(f"Using individual generation with batch_size={batch_size}")
 
+        # Resume an interrupted cycle with the same parameters from its journal
+        journal = JobJournal.from_config(
+            self.config,
+            "systematic",
+            {"target_examples": target_examples, "batch_processing": use_batch_processing},
+        )
+        finished_batches = set()
+        if journal is not None:
+            if journal.resumed:
+                journal.restore_rng_state()
+                timestamp = journal.planned().get("cycle", {}).get("timestamp", timestamp)
+                completed = journal.completed()
+                for key, status in journal.statuses().items():
+                    if key.startswith("batch:") and status in (COMPLETED, FAILED):
+                        finished_batches.add(int(key.split(":", 1)[1]))
+                for batch_num in sorted(finished_batches):
+                    collect(completed.get(f"batch:{batch_num}", []))
+                AppLogger.info(
+                    "Restored systematic cycle from journal",
+                    data={"journal": journal.stats(), "examples": accumulator.total},
+                )
+            else:
+                journal.plan("cycle", {"timestamp": timestamp})
+
         for batch_num in range(batches_needed):
+            if batch_num in finished_batches:
+                continue
+            if accumulator.total >= target_examples:
+                break
             AppLogger.info(f"Generating batch {batch_num + 1}/{batches_needed}")
+            if journal is not None:
+                journal.start(f"batch:{batch_num}")
 
             # Generate systematic parameters
             scenarios = self._generate_systematic_parameters(batch_size)
@@ -782,15 +785,15 @@ Return ONLY JSON array with {len(scenarios)} objects. Make dialogue RICH and REA
                 if not batch_examples:
                     # Fallback to individual generation
                     AppLogger.warning("Batch processing failed, falling back to individual")
-                    batch_examples = self.generate_systematic_emotional_batch(batch_size)
+                    batch_examples = self.generate_systematic_emotional_batch(scenarios=scenarios)
+                self._release_unfinished(scenarios)  # A partial batch leaves some slots unfilled
             else:
-                batch_examples = self.generate_systematic_emotional_batch(batch_size)
+                batch_examples = self.generate_systematic_emotional_batch(scenarios=scenarios)
 
             if batch_examples:
-                results["emotional_authenticity"].extend(batch_examples)
-
-                # Track coverage after each batch
-                coverage = self.track_generation_coverage(results["emotional_authenticity"])
+                # Track coverage after each batch (O(batch), not O(run))
+                collect(batch_examples)
+                coverage = accumulator.report()
 
                 # Save batch
                 self.save_batch(
@@ -801,26 +804,35 @@ Return ONLY JSON array with {len(scenarios)} objects. Make dialogue RICH and REA
                     f"Batch {batch_num + 1} complete",
                     data={
                         "examples_generated": len(batch_examples),
-                        "total_so_far": len(results["emotional_authenticity"]),
+                        "total_so_far": accumulator.total,
                         "coverage_gaps": coverage["gaps"][:3],  # Show first 3 gaps
                     },
                 )
 
+            if journal is not None:
+                if batch_examples:
+                    if self.dataset_writer is not None:
+                        self.dataset_writer.flush()  # Durable in the shards before the journal says complete
+                    journal.complete(f"batch:{batch_num}", batch_examples)
+                else:
+                    journal.fail(f"batch:{batch_num}", "no examples")
+                journal.save_rng_state()
+
             time.sleep(1)  # Rate limiting
 
             # Check if target reached
-            if len(results["emotional_authenticity"]) >= target_examples:
-                AppLogger.info(f"Target reached: {len(results['emotional_authenticity'])} examples")
+            if accumulator.total >= target_examples:
+                AppLogger.info(f"Target reached: {accumulator.total} examples")
                 break
 
         # Final coverage report
         coverage_report = self.get_coverage_report()
-        final_coverage = self.track_generation_coverage(results["emotional_authenticity"])
+        final_coverage = accumulator.report(histograms=True)
 
         AppLogger.success(
             "Systematic production cycle complete",
             data={
-                "total_generated": len(results["emotional_authenticity"]),
+                "total_generated": accumulator.total,
                 "authenticity_distribution": final_coverage["authenticity_distribution"],
                 "complexity_coverage": final_coverage["complexity_coverage"],
                 "remaining_gaps": len(final_coverage["gaps"]),
@@ -828,28 +840,38 @@ Return ONLY JSON array with {len(scenarios)} objects. Make dialogue RICH and REA
         )
 
         # Save comprehensive report
-        self._save_coverage_report(coverage_report, final_coverage, timestamp)
+        self._save_coverage_report(coverage_report, final_coverage, timestamp, accumulator.snapshot())
+        if self.dataset_writer is not None:
+            self.dataset_writer.flush()
+        if journal is not None:
+            journal.finish()
+            journal.close()
 
         # Return structured results for caller
         return {
-            "total_generated": len(results["emotional_authenticity"]),
+            "total_generated": accumulator.total,
             "emotional_authenticity": results["emotional_authenticity"],
             "coverage_report": {
                 "authenticity_spectrum": final_coverage["authenticity_distribution"],
                 "complexity_types": final_coverage["complexity_coverage"],
+                "authenticity_stats": final_coverage["authenticity_stats"],
                 "gaps": final_coverage["gaps"],
             },
             "database_coverage": coverage_report,
+            "scenario_plan": self.planner.report() if self.planner is not None else None,
         }
 
-    def _save_coverage_report(self, db_coverage: Dict, batch_coverage: Dict, timestamp: str):
-        """Save comprehensive coverage report"""
+    def _save_coverage_report(
+        self, db_coverage: Dict, batch_coverage: Dict, timestamp: str, accumulator: Optional[Dict] = None
+    ):
+        """Save comprehensive coverage report (with the accumulator snapshot, for merging workers)"""
         report_file = self.output_dir / f"coverage_report_{timestamp}.json"
 
         report = {
             "timestamp": timestamp,
             "database_coverage": db_coverage,
             "current_batch_coverage": batch_coverage,
+            "accumulator": accumulator,
             "quality_assessment": {
                 "meets_spectrum_requirements": len(batch_coverage["gaps"]) == 0,
                 "authenticity_balance": (
@@ -0,0 +1,194 @@
+"""
+Token-Level Throughput Telemetry
+
+Captures Ollama's per-response metadata instead of wall-clock time only:
+
+- ``prompt_eval_count`` / ``prompt_eval_duration``: prefill
+- ``eval_count`` / ``eval_duration``: decode
+- ``load_duration``: model (re)load overhead
+
+Each call is tagged by model, data type and pipeline step and appended to a
+JSONL metrics file. The run summary aggregates tokens/sec, the prefill vs
+decode split and load overhead, and names the dominant phase so it is clear
+whether a run is prefill-, decode- or reload-bound.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..utils.logger import AppLogger
+
+NANOSECONDS = 1e9
+
+# Summary groupings
+GROUP_BY = ("model", "data_type", "step")
+
+
+def _empty_totals() -> Dict[str, float]:
+    return {
+        "calls": 0,
+        "cache_hits": 0,
+        "empty": 0,
+        "wall_seconds": 0.0,
+        "prompt_tokens": 0,
+        "prompt_seconds": 0.0,
+        "eval_tokens": 0,
+        "eval_seconds": 0.0,
+        "load_seconds": 0.0,
+    }
+
+
+def summarize_totals(totals: Dict[str, float]) -> Dict[str, Any]:
+    """Rates, phase split and bottleneck for one group of calls"""
+    phases = {
+        "prefill": totals["prompt_seconds"],
+        "decode": totals["eval_seconds"],
+        "load": totals["load_seconds"],
+    }
+    server_seconds = sum(phases.values())
+    return {
+        "calls": totals["calls"],
+        "cache_hits": totals["cache_hits"],
+        "empty": totals["empty"],
+        "wall_seconds": round(totals["wall_seconds"], 2),
+        "prompt_tokens": totals["prompt_tokens"],
+        "eval_tokens": totals["eval_tokens"],
+        "prefill_tokens_per_second": (
+            round(totals["prompt_tokens"] / totals["prompt_seconds"], 1) if totals["prompt_seconds"] else 0.0
+        ),
+        "decode_tokens_per_second": (
+            round(totals["eval_tokens"] / totals["eval_seconds"], 1) if totals["eval_seconds"] else 0.0
+        ),
+        "time_split": {
+            phase: round(seconds / server_seconds, 3) if server_seconds else 0.0
+            for phase, seconds in phases.items()
+        },
+        "bound": max(phases, key=phases.get) if server_seconds else None,
+    }
+
+
+class ThroughputTelemetry:
+    """Per-call Ollama metrics sink and aggregator (thread-safe)"""
+
+    def __init__(self, metrics_path: Optional[Path] = None):
+        self.metrics_path = Path(metrics_path) if metrics_path else None
+        self._lock = threading.Lock()
+        self._file = None
+        self._totals = _empty_totals()
+        self._groups: Dict[str, Dict[str, Dict[str, float]]] = {key: {} for key in GROUP_BY}
+
+        if self.metrics_path is not None:
+            self.metrics_path.parent.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["ThroughputTelemetry"]:
+        """Build telemetry from ``config.telemetry`` (None when disabled)"""
+        settings = getattr(config, "telemetry", {}) or {}
+        if not settings.get("enabled", False):
+            return None
+        path = settings.get("metrics_file")
+        if path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = Path(config.output_dir) / "metrics" / f"ollama_calls_{timestamp}.jsonl"
+        return cls(path)
+
+    def record(
+        self,
+        model: str,
+        response_data: Optional[Dict[str, Any]],
+        wall_seconds: float,
+        data_type: str = "untyped",
+        step: str = "generation",
+        cached: bool = False,
+    ) -> Dict[str, Any]:
+        """Record one call (or cache hit) and return the metrics row"""
+        response_data = response_data or {}
+        row = {
+            "timestamp": time.time(),
+            "model": model,
+            "data_type": data_type,
+            "step": step,
+            "cached": cached,
+            "wall_seconds": round(wall_seconds, 4),
+            "prompt_tokens": response_data.get("prompt_eval_count") or 0,
+            "prompt_seconds": (response_data.get("prompt_eval_duration") or 0) / NANOSECONDS,
+            "eval_tokens": response_data.get("eval_count") or 0,
+            "eval_seconds": (response_data.get("eval_duration") or 0) / NANOSECONDS,
+            "load_seconds": (response_data.get("load_duration") or 0) / NANOSECONDS,
+            "done_reason": response_data.get("done_reason"),
+            "empty": not cached and not response_data.get("response"),
+        }
+
+        with self._lock:
+            for totals in self._targets(row):
+                totals["calls"] += 1
+                totals["cache_hits"] += int(cached)
+                totals["empty"] += int(row["empty"])
+                totals["wall_seconds"] += wall_seconds
+                for name in ("prompt_tokens", "prompt_seconds", "eval_tokens", "eval_seconds", "load_seconds"):
+                    totals[name] += row[name]
+            self._write(row)
+        return row
+
+    def _targets(self, row: Dict[str, Any]):
+        yield self._totals
+        for key in GROUP_BY:
+            yield self._groups[key].setdefault(row[key], _empty_totals())
+
+    def _write(self, row: Dict[str, Any]) -> None:
+        if self.metrics_path is None:
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.metrics_path, "a", encoding="utf-8", buffering=1)
+            self._file.write(json.dumps(row) + "\n")
+        except OSError as e:
+            AppLogger.warning("Failed to write call metrics", data={"path": str(self.metrics_path), "error": str(e)})
+            self.metrics_path = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals plus per-model, per-data-type and per-step breakdowns"""
+        with self._lock:
+            summary = {"total": summarize_totals(self._totals)}
+            for key in GROUP_BY:
+                summary[f"by_{key}"] = {
+                    name: summarize_totals(totals) for name, totals in sorted(self._groups[key].items())
+                }
+        if self.metrics_path is not None:
+            summary["metrics_file"] = str(self.metrics_path)
+        return summary
+
+    def format_summary(self) -> str:
+        """Human-readable run summary"""
+        summary = self.summary()
+        lines = ["", "=" * 70, "OLLAMA THROUGHPUT SUMMARY", "=" * 70]
+
+        def describe(name: str, stats: Dict[str, Any]) -> str:
+            split = stats["time_split"]
+            return (
+                f"   {name:<28} calls={stats['calls']:<5} "
+                f"prefill={stats['prefill_tokens_per_second']:>7} tok/s  "
+                f"decode={stats['decode_tokens_per_second']:>6} tok/s  "
+                f"split p/d/l={split['prefill']:.0%}/{split['decode']:.0%}/{split['load']:.0%}  "
+                f"bound={stats['bound']}"
+            )
+
+        lines.append(describe("TOTAL", summary["total"]))
+        for key in GROUP_BY:
+            lines.append(f"\n   By {key.replace('_', ' ')}:")
+            for name, stats in summary[f"by_{key}"].items():
+                lines.append(describe(name, stats))
+        if "metrics_file" in summary:
+            lines.append(f"\n   Metrics: {summary['metrics_file']}")
+        lines.append("=" * 70)
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
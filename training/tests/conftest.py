@@ -0,0 +1,76 @@
+"""
+Shared fixtures for the Unwritten test suite.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Allow running the suite without installing the package
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from unwritten.training.config import EnhancedTrainingConfig  # noqa: E402
+from unwritten.training.fake_ollama import FakeOllama, LatencyProfile  # noqa: E402
+from unwritten.training.qwen3_generator import Qwen3DataGenerator  # noqa: E402
+
+
+def start_stand_in(delay: float = 0.0) -> FakeOllama:
+    """Fake Ollama serving any model, pinned via ``responses``, with every request recorded"""
+    return FakeOllama(
+        models=None, latency=LatencyProfile("fixed", delay, 0.0), chunk_chars=8, record_requests=True
+    ).start()
+
+
+@pytest.fixture
+def stand_in_ollama():
+    server = start_stand_in()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def stand_in_factory():
+    """Start any number of stand-in hosts (multi-endpoint tests)"""
+    servers = []
+
+    def start(delay: float = 0.0) -> FakeOllama:
+        server = start_stand_in(delay)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def make_generator(request, tmp_path):
+    """
+    Build generators (or pipelines) against the stand-in Ollama; clients are closed on teardown
+
+    ``make_generator(cls=Qwen3DataGenerator, url=None, output_dir=None, **settings)``:
+    ``url`` defaults to the ``stand_in_ollama`` server and ``output_dir`` to
+    ``tmp_path``. Each setting replaces the config field of that name, or is
+    merged into it for dict fields. The response cache is off and model
+    warm-up skipped unless a setting says otherwise.
+    """
+    built = []
+
+    def make(cls=Qwen3DataGenerator, url=None, output_dir=None, **settings):
+        if url is None:
+            url = request.getfixturevalue("stand_in_ollama").url
+        config = EnhancedTrainingConfig(ollama_url=f"{url}/api/generate", output_dir=str(output_dir or tmp_path))
+        settings = {"response_cache": {"mode": "off"}, "model_scheduling": {"warm_up": False}, **settings}
+        for name, value in settings.items():
+            if isinstance(getattr(config, name), dict):
+                getattr(config, name).update(value)
+            else:
+                setattr(config, name, value)
+        generator = cls(config)
+        built.append(generator)
+        return generator
+
+    yield make
+    for generator in built:
+        generator.client.close()
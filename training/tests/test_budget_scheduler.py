@@ -0,0 +1,65 @@
+"""
+Tests for the deadline-aware budget scheduler.
+"""
+
+from unwritten.training.budget_scheduler import BudgetedJobQueue
+from unwritten.training.job_queue import TypeQuota
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_one(queue, clock, seconds, samples):
+    job = queue.next_job()
+    clock.now += seconds
+    queue.complete(job, samples)
+    return job
+
+
+def test_budget_goes_to_best_weighted_yield():
+    clock = FakeClock()
+    quotas = [
+        TypeQuota("slow", target_samples=100, samples_per_batch=10, priority=0),
+        TypeQuota("fast", target_samples=100, samples_per_batch=10, priority=1),
+    ]
+    queue = BudgetedJobQueue(quotas, deadline=clock.now + 3600, clock=clock)
+
+    # Unmeasured types run first, in priority order
+    assert run_one(queue, clock, seconds=60, samples=5).data_type == "slow"
+    assert run_one(queue, clock, seconds=60, samples=10).data_type == "fast"
+    assert [queue.next_job().data_type for _ in range(2)] == ["fast", "fast"]
+
+    # A quality weight can outbid raw yield
+    weighted = BudgetedJobQueue(
+        [TypeQuota("slow", 100, 10), TypeQuota("fast", 100, 10, priority=1)],
+        deadline=clock.now + 3600,
+        weights={"slow": 3.0, "fast": 1.0},
+        clock=clock,
+    )
+    run_one(weighted, clock, seconds=60, samples=5)
+    run_one(weighted, clock, seconds=60, samples=10)
+    assert weighted.next_job().data_type == "slow"
+    assert queue.stats()["fast"]["samples_per_gpu_minute"] == 10.0
+
+
+def test_drains_before_deadline_and_fills_window():
+    clock = FakeClock()
+    queue = BudgetedJobQueue([TypeQuota("a", 100, 10)], deadline=clock.now + 100, clock=clock)
+    run_one(queue, clock, seconds=60, samples=10)
+
+    # 40s left, jobs take 60s: nothing new starts
+    assert queue.next_job() is None
+    assert queue.draining and queue.budget_stats()["deadline_skips"] == 1
+
+    filling = BudgetedJobQueue([TypeQuota("a", 10, 10)], deadline=clock.now + 1000, fill_window=True, clock=clock)
+    run_one(filling, clock, seconds=60, samples=10)
+    assert filling.quotas["a"].samples == 10
+    assert filling.next_job() is not None  # Quota met, window not over
+
+    clock.now = filling.deadline
+    assert filling.next_job() is None
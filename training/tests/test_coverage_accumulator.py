@@ -0,0 +1,56 @@
+"""
+Tests for the streaming coverage accumulator.
+"""
+
+import json
+import random
+import statistics
+
+import pytest
+
+from unwritten.training.coverage_accumulator import CoverageAccumulator
+
+CAPACITIES, TARGETS, TYPES = ["crisis", "low", "high"], ["failed", "excellent"], ["baseline", "mixed_emotions"]
+
+
+def _examples(count, seed):
+    rng = random.Random(seed)
+    return [
+        {
+            "authenticity_score": round(rng.uniform(0.2, 1.0), 3),
+            "_systematic_metadata": {
+                "capacity_level": rng.choice(CAPACITIES),
+                "authenticity_target": rng.choice(TARGETS),
+                "complexity_type": rng.choice(TYPES),
+            },
+        }
+        for _ in range(count)
+    ]
+
+
+def test_streaming_matches_full_scan():
+    examples = _examples(200, seed=1)
+    accumulator = CoverageAccumulator()
+    for example in examples:
+        accumulator.update(example)
+    report = accumulator.report(histograms=True)
+
+    scores = [example["authenticity_score"] for example in examples]
+    assert report["total_examples"] == 200
+    assert report["authenticity_stats"]["mean"] == pytest.approx(statistics.mean(scores), abs=1e-4)
+    assert report["authenticity_stats"]["variance"] == pytest.approx(statistics.variance(scores), abs=1e-4)
+    assert sum(report["authenticity_distribution"].values()) == 200
+    assert sum(sum(histogram) for histogram in report["cell_histograms"].values()) == 200
+    assert "Missing complexity type: people_pleasing" in report["gaps"]
+
+
+def test_worker_snapshots_merge_exactly():
+    first, second = _examples(120, seed=2), _examples(80, seed=3)
+    worker = CoverageAccumulator().extend(second)
+    merged = CoverageAccumulator().extend(first).merge(json.loads(json.dumps(worker.snapshot())))
+    combined = CoverageAccumulator().extend(first + second)
+
+    assert merged.report(histograms=True) == combined.report(histograms=True)
+    assert merged.variance == pytest.approx(combined.variance)
+    with pytest.raises(ValueError):
+        merged.merge(CoverageAccumulator(histogram_bins=5))
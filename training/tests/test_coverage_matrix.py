@@ -0,0 +1,61 @@
+"""
+Tests for the in-memory coverage matrix and its write-behind persistence.
+"""
+
+import sqlite3
+
+from unwritten.training.coverage_matrix import CoverageMatrix
+from unwritten.training.systematic_generator import SystematicParameterGenerator
+
+LEVELS, TARGETS, TYPES = ["crisis", "low"], ["failed", "excellent"], ["baseline", "people_pleasing"]
+
+
+def _scenario(capacity, authenticity, complexity):
+    return {"capacity_level": capacity, "authenticity_target": authenticity, "complexity_type": complexity}
+
+
+def _db_counts(path):
+    with sqlite3.connect(path) as conn:
+        return {
+            (capacity, authenticity, complexity): count
+            for capacity, authenticity, complexity, count in conn.execute(
+                "SELECT capacity_level, authenticity_target, complexity_type, generated_count FROM parameter_coverage"
+            )
+        }
+
+
+def test_write_behind_merges_processes(make_generator):
+    path = make_generator(SystematicParameterGenerator).coverage_db  # Creates the coverage schema
+
+    first = CoverageMatrix(path, LEVELS, TARGETS, TYPES, flush_every=3, flush_seconds=3600)
+    second = CoverageMatrix(path, LEVELS, TARGETS, TYPES, flush_every=100, flush_seconds=3600)
+    first.increment(_scenario("crisis", "failed", "baseline"))
+    first.increment(_scenario("crisis", "failed", "baseline"))
+    second.increment(_scenario("crisis", "failed", "baseline"))
+    second.increment(_scenario("low", "excellent", "projection"))  # Unknown label grows the tensor
+    assert _db_counts(path) == {}  # Nothing written yet
+
+    first.increment(_scenario("low", "failed", "baseline"))  # Third increment flushes
+    assert _db_counts(path) == {("crisis", "failed", "baseline"): 2, ("low", "failed", "baseline"): 1}
+    assert second.flush() == 2
+    assert _db_counts(path)[("crisis", "failed", "baseline")] == 3
+    assert second.counts.shape == (2, 2, 3) and second.summary()["samples"] == 5
+
+    first.reload()
+    assert first.least_covered(below=2) == [
+        {"capacity_level": "low", "authenticity_target": "failed", "complexity_type": "baseline", "generated_count": 1},
+        {"capacity_level": "low", "authenticity_target": "excellent", "complexity_type": "projection", "generated_count": 1},
+    ]
+
+
+def test_generator_schedules_from_memory(make_generator):
+    generator = make_generator(SystematicParameterGenerator)
+
+    generator._track_generated_combination(_scenario("medium", "struggling", "mixed_emotions"))
+    missing = generator._get_missing_combinations()
+    assert [scenario["scenario_id"] for scenario in missing] == ["medium_struggling_mixed_emotions_gap"]
+    assert missing[0]["capacity_range"] == (4.5, 6.5)
+
+    report = generator.get_coverage_report()  # Flushes
+    assert report["total_examples_generated"] == 1 and report["complexity_coverage"] == {"mixed_emotions": 1}
+    assert _db_counts(generator.coverage_db) == {("medium", "struggling", "mixed_emotions"): 1}
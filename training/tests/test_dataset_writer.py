@@ -0,0 +1,74 @@
+"""
+Tests for the sharded JSONL dataset writer.
+"""
+
+import json
+import sqlite3
+
+from unwritten.training.dataset_writer import MANIFEST, DatasetWriter, read_records
+from unwritten.training.generation_ledger import GenerationLedger
+
+
+def test_rotation_manifest_and_ledger_offsets(tmp_path):
+    ledger = GenerationLedger(tmp_path / "ledger.db")
+    writer = DatasetWriter(tmp_path / "dataset", shard_bytes=200, fsync_every=3, on_durable=ledger.assign_offsets)
+    scenario = {"capacity_level": "low", "authenticity_target": "failed", "complexity_type": "baseline"}
+    samples = []
+    for i in range(10):
+        sample = {"dialogue": f"line {i} " + "x" * 40, "authenticity_score": 0.3}
+        sample["_ledger_id"] = ledger.record(scenario, sample=sample)
+        samples.append(sample)
+    writer.write_many("emotional_authenticity", samples)
+    writer.write("other", {"n": 1})
+    writer.close()
+
+    manifest = json.loads((tmp_path / "dataset" / MANIFEST).read_text())
+    shards = [shard for shard in manifest["shards"] if shard["data_type"] == "emotional_authenticity"]
+    assert len(shards) > 1 and all(shard["bytes"] <= 200 for shard in shards)
+    assert all(shard["sealed"] for shard in shards[:-1]) and not shards[-1]["sealed"]
+    assert [record for _, record in read_records(tmp_path / "dataset", "emotional_authenticity")] == samples
+
+    # Every ledgered sample points at its line
+    with sqlite3.connect(ledger.path) as conn:
+        rows = conn.execute("SELECT sample_id, output_file, output_offset FROM generation_ledger").fetchall()
+    by_id = {sample["_ledger_id"]: sample for sample in samples}
+    assert len(rows) == 10
+    for sample_id, output_file, offset in rows:
+        with open(output_file, "rb") as f:
+            f.seek(offset)
+            assert json.loads(f.readline()) == by_id[sample_id]
+
+
+def test_restart_truncates_unsynced_tail_and_appends(tmp_path):
+    directory = tmp_path / "dataset"
+    writer = DatasetWriter(directory, fsync_every=100, fsync_seconds=3600)
+    writer.write_many("npc", [{"n": 0}, {"n": 1}])
+    writer.flush()
+    writer.close()
+
+    # Simulate a crash mid-write: a torn line beyond the manifest size
+    shard = directory / "npc" / "shard-00000.jsonl"
+    with open(shard, "ab") as f:
+        f.write(b'{"n": 2, "trunc')
+
+    writer = DatasetWriter(directory)
+    writer.write("npc", {"n": 3})
+    writer.close()
+    assert [record["n"] for _, record in read_records(directory)] == [0, 1, 3]
+    assert len(list((directory / "npc").iterdir())) == 1
+
+
+def test_rotation_after_a_missing_shard_does_not_reuse_a_listed_path(tmp_path):
+    directory = tmp_path / "dataset"
+    writer = DatasetWriter(directory, shard_bytes=10)
+    writer.write_many("npc", [{"i": i} for i in range(3)])  # One record per shard
+    writer.close()
+    (directory / "npc" / "shard-00000.jsonl").unlink()
+
+    writer = DatasetWriter(directory, shard_bytes=10)
+    writer.write_many("npc", [{"i": i} for i in range(3, 6)])
+    writer.close()
+
+    paths = [shard["path"] for shard in json.loads((directory / MANIFEST).read_text())["shards"]]
+    assert len(paths) == len(set(paths)) == 5
+    assert [record["i"] for _, record in read_records(directory)] == [1, 2, 3, 4, 5]
@@ -0,0 +1,65 @@
+"""
+Tests for the multi-endpoint Ollama pool.
+"""
+
+from unwritten.training.config import EnhancedTrainingConfig
+from unwritten.training.ollama_client import OllamaClient
+
+
+def make_client(*endpoints, max_in_flight=2):
+    config = EnhancedTrainingConfig()
+    config.model_scheduling["enabled"] = False
+    config.endpoint_pool["endpoints"] = [
+        {"url": url, "max_in_flight": max_in_flight, **extra} for url, extra in endpoints
+    ]
+    return OllamaClient.from_config(config)
+
+
+def test_least_loaded_dispatch_spreads_across_hosts(stand_in_factory):
+    first, second = stand_in_factory(delay=0.2), stand_in_factory(delay=0.2)
+    client = make_client((first.url, {}), (second.url, {}))
+
+    try:
+        results = client.generate_many([({"model": "qwen3:8b", "prompt": str(i)}, 10) for i in range(8)])
+        stats = client.stats()["endpoints"]
+    finally:
+        client.close()
+
+    assert not any(isinstance(result, Exception) for result in results)
+    assert len(first.requests) == len(second.requests) == 4
+    assert first.peak_in_flight <= 2 and second.peak_in_flight <= 2
+    assert stats[first.url]["requests"] == 4
+
+
+def test_models_route_to_hosts_that_serve_them(stand_in_factory):
+    small, large = stand_in_factory(), stand_in_factory()
+    large.responses["qwen3:30b-a3b"] = "[]"  # Advertised via /api/tags
+    client = make_client((small.url, {"models": ["qwen3:8b"]}), (large.url, {}))
+
+    try:
+        assert client.check_health() == {small.url: True, large.url: True}
+        client.generate({"model": "qwen3:30b-a3b", "prompt": "p"}, 10)
+        client.generate({"model": "qwen3:8b", "prompt": "p"}, 10)
+    finally:
+        client.close()
+
+    assert [payload["model"] for _, payload in large.requests] == ["qwen3:30b-a3b"]
+    assert [payload["model"] for _, payload in small.requests] == ["qwen3:8b"]
+
+
+def test_unreachable_host_is_drained(stand_in_factory):
+    alive, dead = stand_in_factory(), stand_in_factory()
+    dead.stop()
+    client = make_client((dead.url, {}), (alive.url, {}))
+
+    try:
+        for _ in range(3):
+            client.generate({"model": "qwen3:8b", "prompt": "p"}, 10)
+        stats = client.stats()["endpoints"]
+    finally:
+        client.close()
+
+    assert len(alive.requests) == 3
+    assert stats[dead.url]["healthy"] is False
+    assert stats[dead.url]["times_drained"] == 1
+    assert stats[alive.url]["requests"] == 3
@@ -0,0 +1,58 @@
+"""
+Tests for the record/replay fake Ollama server.
+"""
+
+import json
+
+from unwritten.training.fake_ollama import CompletionLibrary, FakeOllama, LatencyProfile
+from unwritten.training.multi_step_pipeline import MultiStepPipeline
+from unwritten.training.ollama_client import OllamaClient
+from unwritten.training.schemas import get_schema, validate_instance
+
+
+def test_failed_corpus_is_replayed_as_malformed(tmp_path):
+    dump = "ERROR: x\n\n" + "=" * 80 + "\nORIGINAL RESPONSE:\n" + "=" * 80 + '\n{"broken": \n\n' + "=" * 80 + "\nCLEANED"
+    (tmp_path / "failed_dialogue_20251014_115937.txt").write_text(dump)
+    (tmp_path / "recorded.jsonl").write_text(json.dumps({"schema": "dialogue", "response": "recorded"}) + "\n")
+    library = CompletionLibrary(seed=1)
+
+    assert library.load_failed_corpus(tmp_path) == 1
+    assert library.load_recordings(tmp_path / "recorded.jsonl") == 1
+    assert library.pick(get_schema("dialogue"), malformed_rate=1.0) == '{"broken": '
+    assert library.pick(get_schema("dialogue")) == "recorded"
+    assert not validate_instance(json.loads(library.pick(get_schema("tension_memory"))), get_schema("tension_memory"))
+
+
+def test_server_speaks_ollama_api():
+    fake = FakeOllama(latency=LatencyProfile("fixed", 0.01), empty_rate=0.0, seed=3)
+    client = OllamaClient(fake.url)
+    with fake:
+        try:
+            tags = client.get("/api/tags")
+            result = client.generate_stream(
+                {"model": "qwen3:8b", "prompt": "p", "format": get_schema("dialogue")}, 10, lambda chunk: None
+            )
+            chat = client.generate(
+                {"model": "qwen3:8b", "stream": False, "messages": [{"role": "user", "content": "p"}]}, 10
+            )
+            loaded = client.loaded_models()
+        finally:
+            client.close()
+
+    assert {entry["name"] for entry in tags["models"]} >= {"qwen3:8b"}
+    assert not validate_instance(json.loads(result["response"]), get_schema("dialogue"))
+    assert result["eval_count"] > 0 and result["eval_duration"] > 0
+    assert chat["response"] == "{}"
+    assert loaded == ["qwen3:8b"]
+    assert fake.stats()["loads"] == 1
+
+
+def test_pipeline_runs_end_to_end(make_generator):
+    with FakeOllama(latency=LatencyProfile("fixed", 0.0), seed=5) as fake:
+        pipeline = make_generator(MultiStepPipeline, url=fake.url, npc_synthesizer={"enabled": False})
+        interactions = pipeline.generate_complete_interactions(
+            [{"complexity_type": "baseline"}, {"complexity_type": "people_pleasing"}]
+        )
+
+    assert all(interaction is not None for interaction in interactions)
+    assert fake.stats()["requests"] == 8  # Four LLM steps per interaction
@@ -0,0 +1,52 @@
+"""
+Tests for the per-sample generation ledger.
+"""
+
+import sqlite3
+
+from unwritten.training.fake_ollama import CompletionLibrary, FakeOllama, LatencyProfile
+from unwritten.training.generation_ledger import GenerationLedger
+from unwritten.training.systematic_generator import SystematicParameterGenerator
+
+CRISIS = {"capacity_level": "crisis", "authenticity_target": "failed", "complexity_type": "baseline", "authenticity_range": (0.2, 0.4)}
+HIGH = {"capacity_level": "high", "authenticity_target": "excellent", "complexity_type": "baseline", "authenticity_range": (0.8, 1.0)}
+
+
+def test_cell_queries_and_output_offsets(tmp_path):
+    ledger = GenerationLedger(tmp_path / "ledger.db", flush_every=100)
+    call = {"model": "qwen3:8b", "wall_seconds": 4.0, "prompt_tokens": 200, "eval_tokens": 600, "parse_outcome": "strict"}
+    ledger.record(CRISIS, {**call, "parse_outcome": "failed"})
+    ledger.record(CRISIS, parse_outcome="empty")
+    on_target = {"authenticity_score": 0.3}
+    ledger.record(CRISIS, call, sample=on_target)
+    batch = [{"authenticity_score": 0.9}, {"authenticity_score": 0.5}]
+    for sample in batch:
+        sample["_ledger_id"] = ledger.record(HIGH, call, sample=sample, share=2)
+
+    worst = ledger.cell_stats(limit=1)[0]
+    assert (worst["capacity_level"], worst["attempts"], worst["samples"]) == ("crisis", 3, 1)
+    assert worst["parse_failure_rate"] == round(2 / 3, 4) and worst["yield"] == round(1 / 3, 4)
+    high = ledger.cell_stats(order_by="authenticity_hit_rate")[0]
+    assert high["capacity_level"] == "high" and high["authenticity_hit_rate"] == 0.5
+    assert high["avg_latency_seconds"] == 2.0 and high["avg_eval_tokens"] == 300
+    assert ledger.cell_yield() == {("crisis", "failed", "baseline"): round(1 / 3, 4), ("high", "excellent", "baseline"): 0.5}
+
+    assert ledger.assign_output("batch.json", [{"no": "ledger id"}] + batch) == 2
+    assert [(row["validation_score"], row["output_offset"]) for row in ledger.regeneration_candidates()] == [(0.5, 2)]
+
+
+def test_systematic_batch_is_ledgered(make_generator):
+    with FakeOllama(CompletionLibrary(seed=6), latency=LatencyProfile("fixed", 0.01, 0.0)) as fake:
+        generator = make_generator(SystematicParameterGenerator, url=fake.url)
+        examples = generator.generate_systematic_emotional_batch(batch_size=3)
+        generator.save_batch(examples, "emotional_authenticity_systematic", 0, "test")
+        generator.dataset_writer.flush()  # Offsets are recorded once the shard is durable
+
+    report = generator.get_ledger_report()
+    assert sum(row["attempts"] for row in report["models"]) >= 3
+    assert report["models"][0]["model"] == generator.models["primary"]
+    assert all(row["avg_eval_tokens"] > 0 for row in report["models"])
+    with sqlite3.connect(generator.ledger.path) as conn:
+        saved = conn.execute("SELECT output_file FROM generation_ledger WHERE output_offset IS NOT NULL").fetchall()
+    assert len(saved) == len(examples) > 0
+    assert {row[0] for row in saved} == {str(generator.dataset_writer.directory / "emotional_authenticity_systematic" / "shard-00000.jsonl")}
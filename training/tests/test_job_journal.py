@@ -0,0 +1,63 @@
+"""
+Tests for the durable job journal and crash-safe resume.
+"""
+
+import random
+
+from unwritten.training.job_journal import COMPLETED, FAILED, IN_FLIGHT, JobJournal
+
+
+def test_journal_resumes_unfinished_run(tmp_path):
+    path = tmp_path / "job_journal.db"
+    journal = JobJournal(path, "multi_step", {"target_samples": 3})
+    for i in range(3):
+        journal.plan(f"interaction:{i}", {"support_needed": i})
+    journal.start("interaction:0")
+    ids = journal.complete("interaction:0", [{"dialogue": "a"}])
+    journal.start("interaction:1")
+    journal.fail("interaction:1", "timeout")
+    journal.start("interaction:2")
+
+    rng = random.Random(5)
+    journal.save_rng_state(rng)
+    expected = [rng.random() for _ in range(3)]
+    journal.close()  # Simulated crash
+
+    resumed = JobJournal(path, "multi_step", {"target_samples": 3})
+    assert resumed.resumed and resumed.run_id == journal.run_id
+    assert list(resumed.planned()) == ["interaction:0", "interaction:1", "interaction:2"]
+    assert resumed.completed() == {"interaction:0": [{"dialogue": "a"}]}
+    assert resumed.statuses() == {"interaction:0": COMPLETED, "interaction:1": FAILED, "interaction:2": IN_FLIGHT}
+    assert len(ids) == 1 and len(ids[0]) == 16
+
+    other = random.Random(99)
+    assert resumed.restore_rng_state(other)
+    assert [other.random() for _ in range(3)] == expected
+
+    # Different parameters or a finished run start fresh
+    assert not JobJournal(path, "multi_step", {"target_samples": 4}).resumed
+    resumed.finish()
+    assert not JobJournal(path, "multi_step", {"target_samples": 3}).resumed
+
+
+def test_production_cycle_restores_journaled_batches(stand_in_ollama, make_generator, tmp_path):
+    # An interrupted run already produced the only batch needed
+    journal = JobJournal(tmp_path / "job_journal.db", "production_cycle", {
+        "targets": {"emotional_authenticity": 0, "dramatic_irony": 2, "tension_building": 0,
+                    "memory_resonance": 0, "personality_traits": 0, "relationship_scoring": 0},
+    })
+    journal.plan("cycle", {"timestamp": "20261001_000000"})
+    journal.complete("dramatic_irony:0", [{"scenario": "a"}, {"scenario": "b"}])
+    journal.close()
+
+    generator = make_generator()
+    config = generator.config  # Targets this low fail config validation, so they are set after construction
+    for data_type in ("emotional_authenticity", "tension_building", "memory_resonance",
+                      "personality_traits", "relationship_scoring"):
+        setattr(config, f"target_{data_type}", 0)
+    config.target_dramatic_irony = 2
+    results = generator.run_production_cycle()
+
+    assert results["dramatic_irony"] == [{"scenario": "a"}, {"scenario": "b"}]
+    assert stand_in_ollama.requests == []
+    assert not JobJournal(tmp_path / "job_journal.db", "production_cycle", journal.params).resumed
@@ -0,0 +1,103 @@
+"""
+Tests for the concurrent generation job queue.
+"""
+
+import threading
+import time
+
+import pytest
+
+from unwritten.training.job_queue import JobQueue, RateLimiter, TypeQuota, run_jobs
+
+
+def test_priority_quota_and_failed_batch_replacement():
+    queue = JobQueue(
+        [
+            TypeQuota("speed", target_samples=4, samples_per_batch=2, priority=1),
+            TypeQuota("core", target_samples=4, samples_per_batch=2, priority=0, max_batches=3),
+        ]
+    )
+    order, results = [], []
+    # The first core batch comes back empty and is replaced
+    outcomes = {("core", 0): [], ("core", 1): [{}, {}], ("core", 2): [{}, {}]}
+
+    def execute(job):
+        order.append(job.data_type)
+        return outcomes.get((job.data_type, job.batch_index), [{}, {}])
+
+    run_jobs(queue, execute, lambda job, batch: results.append(batch), workers=1)
+
+    assert order == ["core", "core", "core", "speed", "speed"]
+    stats = queue.stats()
+    assert stats["core"]["samples"] == 4 and stats["core"]["failed_batches"] == 1
+    assert stats["speed"]["samples"] == 4
+    assert queue.next_job() is None
+
+
+def test_workers_stay_busy_across_types():
+    queue = JobQueue(
+        [
+            TypeQuota("a", target_samples=3, samples_per_batch=1, priority=0),
+            TypeQuota("b", target_samples=3, samples_per_batch=1, priority=1),
+        ]
+    )
+    lock = threading.Lock()
+    active = {"now": 0, "peak": 0}
+
+    def execute(job):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02 if job.data_type == "a" and job.batch_index == 0 else 0.005)
+        with lock:
+            active["now"] -= 1
+        return [{}]
+
+    start = time.time()
+    run_jobs(queue, execute, lambda job, batch: None, workers=4)
+
+    # No barrier between types: "b" jobs start while the slow "a" job runs
+    assert active["peak"] == 4
+    assert time.time() - start < 0.1
+    assert all(s["samples"] == 3 for s in queue.stats().values())
+
+
+def test_rate_limiter_spaces_dispatch():
+    limiter = RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.05
+
+    unlimited = RateLimiter(rate=None)
+    start = time.monotonic()
+    for _ in range(100):
+        unlimited.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+def test_interrupt_cancels_queued_and_abandons_running_jobs():
+    queue = JobQueue([TypeQuota("a", target_samples=10, samples_per_batch=1)])
+    second_started, release, started = threading.Event(), threading.Event(), []
+
+    def execute(job):
+        started.append(job.batch_index)
+        if job.batch_index == 0:
+            second_started.wait(5)
+        else:
+            second_started.set()
+            release.wait(5)  # Still in flight when the interrupt arrives
+        return [{}]
+
+    def on_result(job, batch):
+        raise KeyboardInterrupt
+
+    start = time.time()
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            run_jobs(queue, execute, on_result, workers=2)
+        assert time.time() - start < 1
+        time.sleep(0.05)
+        assert started == [0, 1]  # Nothing dispatched after the interrupt
+    finally:
+        release.set()
@@ -0,0 +1,65 @@
+"""
+Tests for the single-pass tolerant JSON extractor.
+"""
+
+from unwritten.training.json_extract import extract_json
+
+
+def test_repairs_are_applied_and_reported():
+    text = (
+        "Here is the batch:\n```json\n"
+        '[{"score": +0.5, "tags": ["a", "b",],},\n'
+        ' {"dialogue": "He said "no", then left — quietly"}\n'
+        ' {ok: True, “name”: “Mara”}]\n```'
+    )
+    result = extract_json(text)
+
+    assert result.root == "array"
+    assert result.items == [
+        {"score": 0.5, "tags": ["a", "b"]},
+        {"dialogue": 'He said "no", then left - quietly'},
+        {"ok": True, "name": "Mara"},
+    ]
+    repairs = result.report.repairs
+    assert repairs["plus_sign"] == 1
+    assert repairs["trailing_comma"] == 2
+    assert repairs["unescaped_quote"] == 2
+    assert repairs["missing_comma"] == 1
+    assert repairs["smart_quote_delimiter"] == 4
+    assert repairs["unquoted_key"] == 1
+    assert {"preamble", "code_fence", "non_ascii", "python_literal"} <= set(repairs)
+    assert not result.report.truncated
+
+
+def test_truncated_array_keeps_complete_items():
+    result = extract_json('[{"a": 1}, {"b": [2, 3]}, {"c": "unfinish')
+    assert result.items == [{"a": 1}, {"b": [2, 3]}]
+    assert result.report.truncated
+
+    # A single object containing an array is returned whole
+    assert extract_json('{"x": {"y": [1, 2]}}').items == [{"x": {"y": [1, 2]}}]
+    assert extract_json("no json here").report.error == "no JSON found"
+
+
+def test_prose_brackets_and_deep_nesting_are_not_roots():
+    result = extract_json('Here are the [2] items:\n[{"a": 1}, {"b": 2}]')
+    assert result.items == [{"a": 1}, {"b": 2}]
+    assert result.report.repairs == {"preamble": 1}
+    assert extract_json('Sources [see below] then {"a": 1}').items == [{"a": 1}]
+
+    deep = extract_json("[" * 5000)
+    assert deep.items == [] and "nesting deeper" in deep.report.error
+
+
+def test_generator_salvages_and_dumps_failures(make_generator, tmp_path):
+    generator = make_generator()
+    items = generator._repair_json_response('[{"a": 1}, {"b": 2', "emotional_authenticity")
+    assert items == [{"a": 1}]
+
+    assert generator._repair_json_response('[{"a": ', "emotional_authenticity") == []
+    dumps = list(tmp_path.glob("failed_emotional_authenticity_*.txt"))
+    assert len(dumps) == 1
+    assert "REPAIR REPORT:" in dumps[0].read_text(encoding="utf-8")
+
+    generator._save_failed_response(None, "emotional_authenticity", extract_json("").report)
+    assert len(list(tmp_path.glob("failed_*.txt"))) == 1
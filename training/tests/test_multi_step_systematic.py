@@ -0,0 +1,52 @@
+"""
+Tests for per-sample concurrent chains in MultiStepSystematicGenerator.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from unwritten.training.fake_ollama import CompletionLibrary, FakeOllama, LatencyProfile
+from unwritten.training.multi_step_systematic import MultiStepSystematicGenerator
+
+
+def test_chains_keep_samples_aligned_when_one_drops(make_generator):
+    with FakeOllama(CompletionLibrary(seed=4), latency=LatencyProfile("fixed", 0.01, 0.0)) as fake:
+        generator = make_generator(MultiStepSystematicGenerator, url=fake.url)
+
+        generate_interaction, generate_parameters = (
+            generator.generate_targeted_interaction,
+            generator._generate_systematic_parameters,
+        )
+        planned, dropped = [], []
+
+        def recording_parameters(batch_size):
+            planned.extend(generate_parameters(batch_size))
+            return planned
+
+        def flaky_interaction(params, state):
+            if not dropped:
+                dropped.append(params)
+                return {}  # Phase 3 loses this sample only
+            return generate_interaction(params, state)
+
+        generator.generate_targeted_interaction = flaky_interaction
+        generator._generate_systematic_parameters = recording_parameters
+        samples, analysis = generator.generate_complete_batch_systematic(batch_size=6)
+
+    assert len(samples) == 5 and analysis["total_samples"] == 5
+    # Surviving samples keep their own parameters, in plan order
+    assert [sample["systematic_parameters"] for sample in samples] == [
+        params for params in planned if params is not dropped[0]
+    ]
+    stats = generator.chain_executor.stats()
+    assert stats["state"]["completed"] == 6 and stats["interaction"]["failed"] == 1
+    assert stats["validate"]["completed"] == 5
+
+
+def test_concurrent_batches_keep_their_own_spectrum_analysis(make_generator):
+    with FakeOllama(CompletionLibrary(seed=7), latency=LatencyProfile("fixed", 0.01, 0.0)) as fake:
+        generator = make_generator(MultiStepSystematicGenerator, url=fake.url)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            batches = list(pool.map(lambda size: generator.generate_complete_batch_systematic(batch_size=size), (3, 4)))
+
+    for (samples, analysis), size in zip(batches, (3, 4)):
+        assert len(samples) == size and analysis["total_samples"] == size
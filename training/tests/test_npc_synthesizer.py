@@ -0,0 +1,64 @@
+"""
+Tests for the local NPC primitive synthesizer.
+"""
+
+import random
+
+from unwritten.training.fake_ollama import CompletionLibrary, FakeOllama, LatencyProfile
+from unwritten.training.multi_step_pipeline import MultiStepPipeline
+from unwritten.training.npc_synthesizer import NPCSynthesizer
+
+
+def test_stratified_conditioned_and_unique(tmp_path):
+    names_path = tmp_path / "names.txt"
+    synthesizer = NPCSynthesizer(seed=11, block_size=16, names_path=names_path)
+    npcs = [synthesizer.sample("people_pleasing") for _ in range(16)]
+
+    assert all(npc["ocean"]["agreeableness"] >= 4.0 for npc in npcs)
+    # One NPC per sixteenth of the capacity range (Latin hypercube)
+    strata = sorted(int((npc["base_capacity"] - 3.0) / 6.0 * 16 - 1e-9) for npc in npcs)
+    assert len(set(strata)) >= 14  # Rounding to 0.1 may merge adjacent strata
+    assert all(0 <= npc["relationship_level"] <= 5 and 0.0 <= npc["trust"] <= 1.0 for npc in npcs)
+
+    assert NPCSynthesizer(seed=11, block_size=16).sample("people_pleasing") == npcs[0]
+    resumed = NPCSynthesizer(seed=11, block_size=16, names_path=names_path)
+    names = {npc["name"] for npc in npcs}
+    assert len(names) == 16 and resumed.sample("baseline")["name"] not in names
+
+
+def test_keyed_npcs_are_reproducible_and_names_recycle(tmp_path):
+    first = NPCSynthesizer(seed=5, names_path=tmp_path / "names.txt")
+    first.sample("baseline")  # Stream draws and the used-names file do not shift keyed NPCs
+    second = NPCSynthesizer(seed=5)
+    ids = [f"run:{i}" for i in range(4)]
+    assert [first.sample("avoidance", i) for i in ids] == [second.sample("avoidance", i) for i in reversed(ids)][::-1]
+    assert NPCSynthesizer(seed=6).sample("avoidance", ids[0]) != second.sample("avoidance", ids[0])
+
+    bank = second.names
+    names = [bank.draw() for _ in range(len(bank.bank) + 3)]
+    assert len(set(names[: len(bank.bank)])) == len(bank.bank)
+    assert bank.rounds == 1 and set(names[-3:]) <= set(bank.bank)
+
+
+def test_indexed_npcs_are_stratified_and_unique_in_any_order():
+    synthesizer = NPCSynthesizer(seed=9, block_size=16)
+    order = list(range(16))
+    random.Random(2).shuffle(order)
+    npcs = {i: synthesizer.sample("people_pleasing", f"run:{i}", index=i) for i in order}
+
+    strata = {int((npc["base_capacity"] - 3.0) / 6.0 * 16 - 1e-9) for npc in npcs.values()}
+    assert len(strata) >= 14 and all(npc["ocean"]["agreeableness"] >= 4.0 for npc in npcs.values())
+    assert NPCSynthesizer(seed=9, block_size=16).sample("people_pleasing", index=5) == npcs[5]
+
+    keyed = [synthesizer.sample(ctype, index=i) for ctype in ("baseline", "avoidance", "projection") for i in range(700)]
+    assert len({npc["name"] for npc in keyed}) == len(keyed)
+
+
+def test_pipeline_skips_the_primitives_llm_call(make_generator):
+    with FakeOllama(CompletionLibrary(seed=3), latency=LatencyProfile("fixed", 0.0, 0.0)) as fake:
+        pipeline = make_generator(MultiStepPipeline, url=fake.url)
+        interaction = pipeline.generate_complete_interaction(complexity_type="over_commitment")
+        requests = fake.stats()["requests"]
+
+    assert interaction["npc_ocean_personality"]["conscientiousness"] >= 3.5
+    assert requests == 3  # Context, tension and dialogue only
@@ -0,0 +1,93 @@
+"""
+Tests for the bounded-concurrency Ollama client.
+"""
+
+from unwritten.training.fake_ollama import LatencyProfile
+from unwritten.training.ollama_client import OllamaClient, ollama_base_url
+
+
+def test_base_url_strips_api_path():
+    assert ollama_base_url("http://localhost:11434/api/generate") == "http://localhost:11434"
+    assert ollama_base_url("http://gpu-2:11434/") == "http://gpu-2:11434"
+
+
+def test_generate_many_keeps_requests_in_flight(stand_in_ollama):
+    stand_in_ollama.latency = LatencyProfile("fixed", 0.2, 0.0)
+    stand_in_ollama.responses["qwen3:8b"] = '[{"ok": true}]'
+    client = OllamaClient(stand_in_ollama.url, max_in_flight=4, default_per_model=4)
+
+    try:
+        payloads = [({"model": "qwen3:8b", "prompt": f"p{i}"}, 10) for i in range(8)]
+        results = client.generate_many(payloads)
+    finally:
+        client.close()
+
+    assert [r["response"] for r in results] == ['[{"ok": true}]'] * 8
+    assert stand_in_ollama.peak_in_flight == 4
+
+
+def test_per_model_limit_caps_one_model(stand_in_ollama):
+    stand_in_ollama.latency = LatencyProfile("fixed", 0.1, 0.0)
+    client = OllamaClient(
+        stand_in_ollama.url, max_in_flight=2, default_per_model=4, per_model={"qwen3:30b": 1}
+    )
+
+    try:
+        client.generate_many([({"model": "qwen3:30b", "prompt": "p"}, 10)] * 3)
+        assert stand_in_ollama.peak_in_flight == 1
+
+        # Requests queued on the saturated model do not hold global slots
+        del stand_in_ollama.requests[:]
+        client.generate_many(
+            [({"model": "qwen3:30b", "prompt": "p"}, 10)] * 3 + [({"model": "qwen3:8b", "prompt": "p"}, 10)]
+        )
+    finally:
+        client.close()
+
+    assert sorted(payload["model"] for _, payload in stand_in_ollama.requests[:2]) == ["qwen3:30b", "qwen3:8b"]
+
+
+def test_failed_request_is_returned_not_raised():
+    client = OllamaClient("http://127.0.0.1:9", max_in_flight=2)
+    try:
+        results = client.generate_many([({"model": "qwen3:8b", "prompt": "p"}, 2)])
+    finally:
+        client.close()
+
+    assert isinstance(results[0], Exception)
+
+
+def test_generator_fans_out_through_shared_client(stand_in_ollama, make_generator):
+    stand_in_ollama.latency = LatencyProfile("fixed", 0.1, 0.0)
+    stand_in_ollama.responses["qwen3:8b"] = "[]"
+
+    results = make_generator().generate_many_with_qwen3(
+        [{"model": "qwen3:8b", "prompt": f"p{i}"} for i in range(4)]
+    )
+
+    assert results == ["[]"] * 4
+    assert stand_in_ollama.peak_in_flight == 2  # default_per_model
+
+
+def test_model_affinity_groups_interleaved_requests(stand_in_ollama):
+    from unwritten.training.model_scheduler import ModelAffinityScheduler
+
+    stand_in_ollama.latency = LatencyProfile("fixed", 0.05, 0.0)
+    scheduler = ModelAffinityScheduler(max_wave=32)
+    client = OllamaClient(
+        stand_in_ollama.url, max_in_flight=4, default_per_model=2, scheduler=scheduler, keep_alive="30m"
+    )
+
+    try:
+        assert client.warm_up("qwen3:8b")
+        interleaved = [({"model": m, "prompt": "p"}, 10) for m in ["qwen3:8b", "qwen3:32b"] * 4]
+        client.generate_many(interleaved)
+        stats = client.stats()["model_scheduling"]
+    finally:
+        client.close()
+
+    served = [payload["model"] for _, payload in stand_in_ollama.requests[1:]]
+    assert served == ["qwen3:8b"] * 4 + ["qwen3:32b"] * 4
+    assert stats["swaps"] == 1
+    assert all(payload["keep_alive"] == "30m" for _, payload in stand_in_ollama.requests)
+    assert "prompt" not in stand_in_ollama.requests[0][1]
@@ -0,0 +1,63 @@
+"""
+Regression tests against the parser corpus harvested from failed_*.txt dumps.
+"""
+
+from pathlib import Path
+
+from unwritten.training.parser_corpus import (
+    benchmark_parser,
+    build_corpus,
+    harvest_failed_dumps,
+    load_corpus,
+)
+from unwritten.training.schemas import get_schema
+
+CORPUS = Path(__file__).parent / "fixtures" / "parser_corpus_v1.jsonl"
+
+# Recovery of the tolerant parser when the corpus was built; only ever raise these
+MIN_RECOVERED = 7
+MIN_OBJECTS = 18
+
+
+def run_parser(generator, entries):
+    def parse(response_text, data_type):
+        schema = data_type if get_schema(data_type) is not None else None
+        return generator._parse_json_response(response_text, data_type, schema=schema)
+
+    return benchmark_parser(entries, parse)
+
+
+def test_corpus_recovery_does_not_regress(make_generator, tmp_path):
+    entries = load_corpus(CORPUS)
+    tolerant = run_parser(
+        make_generator(output_dir=tmp_path / "tolerant", structured_output={"parser": "tolerant"}), entries
+    )
+    legacy = run_parser(make_generator(output_dir=tmp_path / "legacy", structured_output={"parser": "legacy"}), entries)
+
+    assert tolerant["recovered"] >= MIN_RECOVERED
+    assert tolerant["objects"] >= MIN_OBJECTS
+    for entry in entries:
+        assert tolerant["per_entry"][entry["id"]] >= legacy["per_entry"][entry["id"]], entry["source"]
+
+
+def test_harvest_build_and_load_round_trip(tmp_path):
+    dumps = tmp_path / "output"
+    (dumps / "run1").mkdir(parents=True)
+    (dumps / "run1" / "failed_dialogue_20251014_115937.txt").write_text(
+        "ERROR: x\nLocation: char 3\n\n" + "=" * 80 + "\nORIGINAL RESPONSE:\n" + "=" * 80 + "\n"
+        '[{"a": 1}, {"b"\n\n' + "=" * 80 + "\nREPAIR REPORT:\n" + "=" * 80 + "\n{}",
+        encoding="utf-8",
+    )
+    (dumps / "failed_dialogue_20251014_120000.txt").write_text('[{"a": 1}, {"b"', encoding="utf-8")
+    (dumps / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    entries = harvest_failed_dumps(dumps)
+    assert [e["source"] for e in entries] == [
+        "failed_dialogue_20251014_120000.txt",
+        "run1/failed_dialogue_20251014_115937.txt",
+    ]
+    assert entries[1]["response"] == '[{"a": 1}, {"b"'
+
+    corpus = tmp_path / "corpus.jsonl"
+    assert build_corpus(entries, corpus) == 1  # Same response twice
+    assert load_corpus(corpus)[0]["data_type"] == "dialogue"
@@ -0,0 +1,68 @@
+"""
+Tests for the pipelined multi-step DAG executor.
+"""
+
+import threading
+import time
+
+from unwritten.training.fake_ollama import CompletionLibrary, FakeOllama, LatencyProfile
+from unwritten.training.multi_step_pipeline import MultiStepPipeline
+from unwritten.training.pipeline_executor import PipelineExecutor, Step
+
+
+def test_dependency_order_overlap_and_limits():
+    lock = threading.Lock()
+    events, active, peak = [], {"all": 0, "b": 0}, {"all": 0, "b": 0}
+
+    def make(name):
+        def run(inputs):
+            with lock:
+                active["all"] += 1
+                active[name] = active.get(name, 0) + 1
+                peak["all"] = max(peak["all"], active["all"])
+                peak["b"] = max(peak["b"], active["b"])
+            time.sleep(0.01)
+            with lock:
+                active["all"] -= 1
+                active[name] -= 1
+                events.append((inputs["spec"]["id"], name))
+            if name == "b" and inputs["spec"]["id"] == 2:
+                raise RuntimeError("boom")
+            return f"{name}{inputs['spec']['id']}"
+
+        return run
+
+    executor = PipelineExecutor(
+        [
+            Step("a", make("a")),
+            Step("b", make("b"), ["a"], max_in_flight=1),
+            Step("c", make("c"), ["a", "b"]),
+        ],
+        max_in_flight=4,
+    )
+    results = executor.run([{"id": i} for i in range(4)])
+
+    assert results[2] is None
+    assert results[0] == {"spec": {"id": 0}, "a": "a0", "b": "b0", "c": "c0"}
+    for i in (0, 1, 3):
+        steps = [name for spec_id, name in events if spec_id == i]
+        assert steps == ["a", "b", "c"]
+    assert peak["all"] > 1 and peak["b"] == 1
+
+    stats = executor.stats()
+    assert stats["a"]["completed"] == 4 and stats["b"]["failed"] == 1 and stats["c"]["completed"] == 3
+    assert stats["a"]["max_queue_depth"] == 4 and stats["a"]["latency_p50"] >= 0.01
+
+
+def test_multi_step_pipeline_runs_on_executor(make_generator):
+    with FakeOllama(CompletionLibrary(seed=3), latency=LatencyProfile("fixed", 0.01, 0.0)) as fake:
+        pipeline = make_generator(MultiStepPipeline, url=fake.url)
+        interactions = pipeline.generate_complete_interactions(
+            [{"complexity_type": "defensive_lashing", "capacity_level": "low"} for _ in range(4)]
+        )
+
+    assert all(interaction is not None for interaction in interactions)
+    assert interactions[0]["training_metadata"]["complexity_type"] == "defensive_lashing"
+    assert {name: s["completed"] for name, s in pipeline.step_stats().items()} == {
+        "primitives": 4, "context": 4, "tension": 4, "dialogue": 4, "outcomes": 4,
+    }
@@ -0,0 +1,58 @@
+"""
+Tests for static prompt-prefix reuse.
+"""
+
+import json
+
+PERSONALITY_ITEM = {
+    "dialogue": "fine",
+    "context": "after work",
+    "ocean_traits": {
+        "openness": 0.5,
+        "conscientiousness": 0.5,
+        "extraversion": 0.5,
+        "agreeableness": 0.5,
+        "neuroticism": 0.5,
+    },
+    "trait_justification": "steady",
+}
+
+
+def test_batch_prompt_sends_static_prefix_as_system_message(stand_in_ollama, make_generator):
+    stand_in_ollama.responses["qwen3:8b"] = json.dumps([PERSONALITY_ITEM])
+    generator = make_generator(prefix_reuse={"strategy": "chat"})
+
+    for _ in range(3):
+        assert generator.generate_personality_trait_batch(batch_size=2)
+
+    paths = {path for path, _ in stand_in_ollama.requests}
+    assert paths == {"/api/chat"}
+    messages = stand_in_ollama.requests[0][1]["messages"]
+    assert "OCEAN Traits" in messages[0]["content"] and "{batch_size}" not in messages[0]["content"]
+    assert messages[1]["content"].startswith("Generate 2 diverse scenarios")
+
+    stats = generator.prefix_reuse_stats()
+    assert stats["saved_tokens"] > 0
+    assert stats["saved_fraction"] > 0.5
+
+
+def test_off_strategy_keeps_single_prompt(stand_in_ollama, make_generator):
+    make_generator(prefix_reuse={"strategy": "off"}).generate_with_qwen3("qwen3:8b", "suffix", prefix="static")
+
+    path, payload = stand_in_ollama.requests[0]
+    assert path == "/api/generate"
+    assert payload["prompt"] == "static\n\nsuffix"
+
+
+def test_context_strategy_counts_the_priming_call(stand_in_ollama, make_generator):
+    generator = make_generator(prefix_reuse={"strategy": "context"})
+    prefix = " ".join(f"rule{i}" for i in range(100))
+    for i in range(3):
+        generator.generate_with_qwen3("qwen3:8b", f"suffix {i}", prefix=prefix)
+
+    assert [bool(payload.get("context")) for _, payload in stand_in_ollama.requests] == [False, True, True, True]
+    stats = generator.prefix_reuse_stats()
+    (entry,) = stats["prefixes"].values()
+    assert entry["priming_tokens"] == 100
+    assert stats["evaluated_tokens"] == 100 + 3 * 2
+    assert stats["saved_tokens"] == 3 * 102 - 106
@@ -0,0 +1,85 @@
+"""
+Tests for adaptive timeouts, retries and circuit breaking.
+"""
+
+import time
+
+from unwritten.training.fake_ollama import LatencyProfile
+from unwritten.training.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, ModelResilience
+
+
+def test_adaptive_timeout_tracks_p99():
+    resilience = ModelResilience(min_samples=5, timeout_multiplier=2.0, min_timeout=1.0)
+    assert resilience.timeout_for("m", 480) == 480  # Not enough samples yet
+
+    for seconds in [10, 10, 10, 10, 20]:
+        resilience.record_success("m", seconds)
+
+    assert resilience.latency.percentiles("m")["p50"] == 10
+    assert resilience.timeout_for("m", 480) == 40
+    assert resilience.timeout_for("m", 480, attempt=1) == 80
+    assert resilience.timeout_for("m", 60, attempt=1) == 60  # Static timeout is the ceiling
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=10)
+    breaker.record_failure(now=0)
+    assert breaker.state == CLOSED
+    assert breaker.record_failure(now=1) and breaker.state == OPEN
+    assert not breaker.allow(now=5)
+
+    assert breaker.allow(now=12) and breaker.state == HALF_OPEN
+    assert not breaker.allow(now=12)  # Only one trial request
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_empty_responses_shed_to_fallback(stand_in_ollama, make_generator):
+    stand_in_ollama.responses["qwen3:30b-a3b"] = ""
+    stand_in_ollama.responses["qwen3:8b"] = '[{"ok": true}]'
+    generator = make_generator(
+        resilience={
+            "backoff_base_seconds": 0,
+            "failure_threshold": 2,
+            "fallback_models": {"qwen3:30b-a3b": "qwen3:8b"},
+        }
+    )
+
+    result = generator.generate_with_qwen3("qwen3:30b-a3b", "p")
+    again = generator.generate_with_qwen3("qwen3:30b-a3b", "p")
+
+    assert result == again == '[{"ok": true}]'
+    models = [payload["model"] for _, payload in stand_in_ollama.requests]
+    # Two empty attempts open the circuit; the retry and the next call go to the fallback
+    assert models == ["qwen3:30b-a3b", "qwen3:30b-a3b", "qwen3:8b", "qwen3:8b"]
+
+    stats = generator.resilience.stats()
+    assert stats["qwen3:30b-a3b"]["state"] == OPEN
+    assert stats["qwen3:30b-a3b"]["outcomes"] == {"empty": 2, "shed": 2}
+    assert stats["qwen3:8b"]["outcomes"] == {"success": 2}
+
+
+def test_latency_excludes_queue_wait(stand_in_ollama, make_generator):
+    stand_in_ollama.latency = LatencyProfile("fixed", 0.2, 0.0)
+    generator = make_generator(ollama_concurrency={"per_model": {"qwen3:8b": 1}})
+
+    # Four workers share one qwen3:8b slot, so each call queues behind the previous ones
+    generator.generate_many_with_qwen3([{"model": "qwen3:8b", "prompt": f"p{i}"} for i in range(4)])
+
+    assert stand_in_ollama.peak_in_flight == 1
+    assert generator.resilience.latency.count("qwen3:8b") == 4
+    assert generator.resilience.latency.percentiles("qwen3:8b")["p99"] < 0.35
+
+
+def test_open_circuit_without_fallback_delays_the_request(stand_in_ollama, make_generator):
+    stand_in_ollama.responses["qwen3:8b"] = '[{"ok": true}]'
+    generator = make_generator(resilience={"failure_threshold": 1, "cooldown_seconds": 0.3})
+    generator.resilience.record_failure("qwen3:8b", "error")
+
+    start = time.monotonic()
+    result = generator.generate_with_qwen3("qwen3:8b", "p")
+    waited = time.monotonic() - start
+
+    assert result == '[{"ok": true}]' and waited >= 0.25
+    assert generator.resilience.stats()["qwen3:8b"]["state"] == CLOSED
+    assert generator.resilience.stats()["qwen3:8b"]["outcomes"]["waited"] == 1
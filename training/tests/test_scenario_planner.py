@@ -0,0 +1,71 @@
+"""
+Tests for the deficit-weighted stratified scenario planner.
+"""
+
+import random
+from collections import Counter
+
+from unwritten.training.scenario_planner import ScenarioPlanner, cell_targets
+from unwritten.training.systematic_generator import SystematicParameterGenerator
+
+A, B, C = ("crisis", "failed", "baseline"), ("low", "failed", "baseline"), ("low", "excellent", "baseline")
+
+
+def _cells(slots):
+    return [(slot["capacity_level"], slot["authenticity_target"], slot["complexity_type"]) for slot in slots]
+
+
+def test_targets_and_deficit_order(tmp_path):
+    targets = cell_targets(100, {"crisis": 2, "low": 3}, {"failed": 1, "excellent": 1}, {"baseline": 1, "avoidance": 3})
+    assert sum(targets.values()) == 100
+    assert targets[("crisis", "excellent", "baseline")] == 5 and targets[("crisis", "failed", "avoidance")] == 15
+    assert sorted(targets[("low", target, "avoidance")] for target in ("failed", "excellent")) == [22, 23]
+
+    generated = {A: 2}
+    planner = ScenarioPlanner(tmp_path / "plan.db", {A: 4, B: 2, C: 2}, lambda: generated, plan_chunk=1, rng=random.Random(1))
+    first = _cells(planner.lease(2))
+    assert sorted(first) == sorted([B, C])  # Untouched cells before the half-done one
+    assert Counter(first + _cells(planner.lease(4))) == {A: 2, B: 2, C: 2}  # Exactly the deficits
+
+    report = planner.report()
+    assert report["projected_samples_to_full_coverage"] == 6 and report["plan"]["leased"] == 6
+
+
+def test_workers_lease_disjoint_slices_and_expired_leases_return(tmp_path):
+    generated = {}
+    path = tmp_path / "plan.db"
+    first = ScenarioPlanner(path, {A: 3, B: 3}, lambda: generated, worker_id="w1", rng=random.Random(2))
+    second = ScenarioPlanner(path, {A: 3, B: 3}, lambda: generated, worker_id="w2", rng=random.Random(3))
+
+    mine, theirs = first.lease(3), second.lease(3)
+    assert not {slot["plan_slot"] for slot in mine} & {slot["plan_slot"] for slot in theirs}
+    for slot in mine:
+        first.complete(slot["plan_slot"])
+        cell = _cells([slot])[0]
+        generated[cell] = generated.get(cell, 0) + 1
+
+    # Worker 2 died; its leases expire and are handed out again
+    expiring = ScenarioPlanner(path, {A: 3, B: 3}, lambda: generated, lease_seconds=0, worker_id="w3")
+    reissued = expiring.lease(3)
+    assert {slot["plan_slot"] for slot in reissued} == {slot["plan_slot"] for slot in theirs}
+    assert expiring.report()["plan"] == {"planned": 0, "leased": 3, "done": 3}
+
+
+def test_released_slots_return_to_the_plan(tmp_path):
+    planner = ScenarioPlanner(tmp_path / "plan.db", {A: 2, B: 2}, lambda: {}, rng=random.Random(4))
+    done, failed = planner.lease(2)
+    planner.complete(done["plan_slot"])
+    planner.release(failed["plan_slot"])
+    planner.release(done["plan_slot"])  # Completed slots stay done
+
+    assert planner.report()["plan"] == {"planned": 3, "leased": 0, "done": 1}
+    assert planner.lease(1)[0]["plan_slot"] == failed["plan_slot"]
+
+
+def test_batch_releases_the_slots_it_could_not_fill(make_generator):
+    generator = make_generator(SystematicParameterGenerator)
+    generator.generate_with_qwen3 = lambda **kwargs: None  # Every scenario comes back empty
+    scenarios = generator._generate_systematic_parameters(3)
+    assert generator.generate_systematic_emotional_batch(scenarios=scenarios) == []
+
+    assert generator.planner.report()["plan"]["leased"] == 0
@@ -0,0 +1,49 @@
+"""
+Tests for the reusable NPC/context scenario pool and dialogue fan-out.
+"""
+
+from unwritten.training.fake_ollama import CompletionLibrary, FakeOllama, LatencyProfile
+from unwritten.training.multi_step_pipeline import MultiStepPipeline, NPCPrimitives, SituationalContext
+from unwritten.training.scenario_pool import ScenarioPool
+
+OCEAN = {"openness": 3.0, "conscientiousness": 3.5, "extraversion": 2.0, "agreeableness": 4.2, "neuroticism": 2.5}
+
+
+def _base(name: str):
+    primitives = NPCPrimitives(name, dict(OCEAN), 6.5, 2, 0.4, 12)
+    context = SituationalContext([], 3.8, 6.0, "important", 2.0, "Needs a ride", "Bus stop", "evening")
+    return primitives, context
+
+
+def test_pool_hands_out_least_used_base_within_reuse_limit(tmp_path):
+    pool = ScenarioPool(tmp_path / "pool.db", (NPCPrimitives, SituationalContext), max_uses=6, new_base_fraction=0.0)
+    first = pool.add("avoidance", "low", "important", *_base("Mara"), uses=3)
+    second = pool.add("avoidance", "low", "important", *_base("Theo"))
+
+    assert pool.acquire("avoidance", "low", uses=3)[0] == second
+    base_id, primitives, context = pool.acquire("avoidance", "low", uses=3)
+    assert base_id == first and primitives.name == "Mara" and context.location == "Bus stop"
+    assert pool.acquire("avoidance", "low", uses=4) is None  # Over the reuse limit on both
+    assert pool.acquire("avoidance", "high", uses=1) is None
+    assert pool.stats() == {"bases": 2, "exhausted": 1, "draws": 4, "reused": 2, "added": 2, "rejected": 0}
+    pool.close()
+
+
+def test_dialogues_fan_out_from_a_pooled_base(make_generator):
+    with FakeOllama(CompletionLibrary(seed=3), latency=LatencyProfile("fixed", 0.0, 0.0)) as fake:
+        pipeline = make_generator(
+            MultiStepPipeline, url=fake.url, scenario_pool={"dialogues_per_base": 4, "new_base_fraction": 0.0}
+        )
+        pipeline.scenario_pool.add("avoidance", "low", "important", *_base("Mara"))
+        interactions = pipeline.generate_fanned_out_interactions(
+            [
+                {"complexity_type": "avoidance", "capacity_level": "low", "authenticity_target": target}
+                for target in ("failed", "struggling", "authentic", "excellent")
+            ]
+        )
+        requests = fake.stats()["requests"]
+
+    assert all(interaction["npc_profile"]["name"] == "Mara" for interaction in interactions)
+    assert len({interaction["tension_memory"]["subtext"] for interaction in interactions}) == 1
+    assert requests == 5  # One shared tension, four dialogues
+    assert pipeline.pool_stats()["llm_calls_per_sample"] == 1.25
@@ -0,0 +1,54 @@
+"""
+Tests for schema-constrained generation and parsing.
+"""
+
+import json
+
+from unwritten.training.schemas import get_schema, validate_instance
+
+VALIDATION_RESULT = {
+    "overall_quality": 0.8,
+    "meets_v1_2_standards": True,
+    "individual_scores": [{"sample_index": 0, "overall": 0.8}],
+}
+
+
+def test_validator_reports_paths():
+    schema = get_schema("personality_traits")
+    errors = validate_instance([{"dialogue": 3, "ocean_traits": {"openness": 2}}], schema)
+
+    assert any(error.startswith("$[0].dialogue: expected string") for error in errors)
+    assert any(error.startswith("$[0]: missing required 'context'") for error in errors)
+    assert any(error.startswith("$[0].ocean_traits.openness") for error in errors)
+    assert get_schema("unknown") is None
+
+
+def test_schema_is_sent_as_format(stand_in_ollama, make_generator):
+    stand_in_ollama.responses["qwen3:8b"] = json.dumps(VALIDATION_RESULT)
+    make_generator().generate_with_qwen3("qwen3:8b", "p", schema="validation")
+
+    assert stand_in_ollama.requests[0][1]["format"] == get_schema("validation")
+
+
+def test_strict_parse_and_invalid_item_drop(make_generator):
+    generator = make_generator()
+
+    parsed = generator._parse_json_response(json.dumps(VALIDATION_RESULT), "validation", schema="validation")
+    assert parsed == [VALIDATION_RESULT]
+
+    good = {
+        "player_action": "a",
+        "character_state": "b",
+        "interaction_context": "c",
+        "relationship_impact": 0.2,
+        "trust_impact": 0.1,
+        "impact_justification": "d",
+    }
+    response = "```json\n" + json.dumps([good, {"player_action": "only"}]) + "\n```"
+    parsed = generator._parse_json_response(response, "relationship_scoring", schema="relationship_scoring")
+
+    assert parsed == [good]
+    assert generator.parse_stats() == {
+        "validation": {"strict": 1},
+        "relationship_scoring": {"repaired": 1, "dropped_items": 1},
+    }
@@ -0,0 +1,53 @@
+"""
+Tests for step-level memoization and partial retry in MultiStepPipeline.
+"""
+
+from unwritten.training.fake_ollama import CompletionLibrary, FakeOllama, LatencyProfile
+from unwritten.training.multi_step_pipeline import MultiStepPipeline, NPCPrimitives
+from unwritten.training.step_store import StepStore
+
+
+def test_store_round_trip_and_sampling_perturbation(make_generator, tmp_path):
+    store = StepStore(tmp_path / "steps.db", types=[NPCPrimitives])
+    primitives = NPCPrimitives("Mara", {"openness": 3.0}, 6.5, 2, 0.4, 12)
+    store.put("run:interaction:0", "primitives", primitives)
+    assert store.get("run:interaction:0", "primitives") == primitives
+    assert store.get("run:interaction:0", "context") is None
+    store.close()
+
+    generator = make_generator()
+    plain = generator._build_base_payload("qwen3:8b", "p", 0.7, 100)
+    with generator.sampling_perturbation(0.1, seed=42):
+        perturbed = generator._build_base_payload("qwen3:8b", "p", 0.7, 100)
+    assert plain["options"]["temperature"] == 0.7 and "seed" not in plain["options"]
+    assert perturbed["options"]["temperature"] == 0.8 and perturbed["options"]["seed"] == 42
+
+
+def test_failed_step_is_retried_alone_and_outputs_reused(make_generator):
+    with FakeOllama(CompletionLibrary(seed=3), latency=LatencyProfile("fixed", 0.0, 0.0)) as fake:
+        pipeline = make_generator(MultiStepPipeline, url=fake.url)
+
+        calls = {"primitives": 0, "dialogue": []}
+        generate_primitives, generate_dialogue = pipeline.generate_npc_primitives, pipeline.generate_dialogue
+
+        def counting_primitives(*args, **kwargs):
+            calls["primitives"] += 1
+            return generate_primitives(*args, **kwargs)
+
+        def flaky_dialogue(*args, **kwargs):
+            calls["dialogue"].append(getattr(pipeline._sampling, "value", None))
+            if len(calls["dialogue"]) == 1:
+                raise IndexError("list index out of range")  # Empty parse result
+            return generate_dialogue(*args, **kwargs)
+
+        pipeline.generate_npc_primitives = counting_primitives
+        pipeline.generate_dialogue = flaky_dialogue
+        first = pipeline.generate_complete_interactions([{"interaction_id": "run:interaction:0"}])[0]
+        requests_after_first = fake.stats()["requests"]
+        again = pipeline.generate_complete_interaction(interaction_id="run:interaction:0")
+
+    assert first is not None and again == first
+    assert calls["primitives"] == 1
+    assert calls["dialogue"][0] is None and calls["dialogue"][1][0] == 0.05
+    assert fake.stats()["requests"] == requests_after_first  # Everything served from the store
+    assert pipeline.step_store.stats()["failed_attempts"] == 1
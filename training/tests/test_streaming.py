@@ -0,0 +1,72 @@
+"""
+Tests for streaming generation with early stop.
+"""
+
+from unwritten.training.ollama_client import OllamaClient
+from unwritten.training.streaming import (
+    COMPLETE,
+    LENGTH,
+    PREAMBLE,
+    REPETITION,
+    StreamingJSONGuard,
+)
+
+
+def feed_all(guard, text, size=5):
+    for i in range(0, len(text), size):
+        reason = guard.feed(text[i : i + size])
+        if reason:
+            return reason
+    return None
+
+
+def test_guard_stops_when_top_level_json_closes():
+    guard = StreamingJSONGuard()
+    text = '<think>plan [a] {b}</think>\n```json\n[{"line": "a ] tricky \\" }"}, {"n": [1, 2]}]\n```\nExtra notes'
+
+    assert feed_all(guard, text) == COMPLETE
+    assert guard.json_text.endswith('{"n": [1, 2]}]')
+    assert "Extra notes" not in guard.json_text
+
+
+def test_guard_skips_brackets_in_preamble_prose():
+    guard = StreamingJSONGuard()
+    text = 'Here are the 3 examples (see [1] and {note}):\n[{"line": "a"}]\nDone'
+    assert feed_all(guard, text, size=3) == COMPLETE
+    assert guard.json_text.endswith('(see [1] and {note}):\n[{"line": "a"}]')
+
+    # A bracket that never opens JSON falls back to the full stream
+    guard = StreamingJSONGuard()
+    assert feed_all(guard, "Here are the 3 examples (see [1") is None
+    assert guard.json_text == "Here are the 3 examples (see [1"
+
+
+def test_guard_aborts_on_prose_preamble():
+    guard = StreamingJSONGuard(max_preamble_chars=50)
+    assert feed_all(guard, "Sure! Here is a long explanation of what I am going to do. " * 3) == PREAMBLE
+
+
+def test_guard_aborts_on_repetition_and_length():
+    guard = StreamingJSONGuard(repetition_check_every=1)
+    assert feed_all(guard, '[{"dialogue": "' + "I can't, I just can't. " * 10) == REPETITION
+
+    guard = StreamingJSONGuard(max_response_chars=100)
+    assert feed_all(guard, '[{"text": "' + "".join(str(i) for i in range(200))) == LENGTH
+
+
+def test_client_closes_stream_after_json(stand_in_ollama):
+    stand_in_ollama.chunk_delay = 0.01
+    stand_in_ollama.responses["qwen3:8b"] = '[{"ok": true}]' + " trailing" * 100
+    client = OllamaClient(stand_in_ollama.url)
+    guard = StreamingJSONGuard()
+
+    try:
+        result = client.generate_stream({"model": "qwen3:8b", "prompt": "p"}, 10, guard.feed)
+    finally:
+        client.close()
+
+    assert result["done_reason"] == COMPLETE
+    assert guard.json_text == '[{"ok": true}]'
+    assert stand_in_ollama.requests[0][1]["stream"] is True
+    # 113 chunks would have been streamed without the early stop
+    assert stand_in_ollama.stats()["chunks"] < 20
@@ -0,0 +1,57 @@
+"""
+Tests for token-level throughput telemetry.
+"""
+
+import json
+
+from unwritten.training.fake_ollama import LatencyProfile
+from unwritten.training.multi_step_pipeline import MultiStepPipeline
+from unwritten.training.qwen3_generator import Qwen3DataGenerator
+from unwritten.training.telemetry import ThroughputTelemetry
+
+
+def test_summary_splits_prefill_decode_and_load(tmp_path):
+    telemetry = ThroughputTelemetry(tmp_path / "calls.jsonl")
+    response = {
+        "response": "[]",
+        "prompt_eval_count": 1000,
+        "prompt_eval_duration": 1_000_000_000,
+        "eval_count": 200,
+        "eval_duration": 4_000_000_000,
+        "load_duration": 5_000_000_000,
+    }
+    telemetry.record("qwen3:8b", response, 10.0, data_type="dialogue", step="dialogue")
+    telemetry.record("qwen3:8b", None, 0.0, data_type="dialogue", step="dialogue", cached=True)
+    telemetry.close()
+
+    total = telemetry.summary()["total"]
+    assert total["calls"] == 2 and total["cache_hits"] == 1
+    assert total["prefill_tokens_per_second"] == 1000
+    assert total["decode_tokens_per_second"] == 50
+    assert total["time_split"] == {"prefill": 0.1, "decode": 0.4, "load": 0.5}
+    assert total["bound"] == "load"
+    assert "bound=load" in telemetry.format_summary()
+
+    rows = [json.loads(line) for line in (tmp_path / "calls.jsonl").read_text().splitlines()]
+    assert [row["cached"] for row in rows] == [False, True]
+
+
+def test_generator_tags_calls(stand_in_ollama, make_generator):
+    stand_in_ollama.responses["qwen3:8b"] = '{"ok": true}'
+    stand_in_ollama.latency = LatencyProfile("fixed", 0.05, 0.0)  # 0.04 s of decode per call
+
+    generator = make_generator(Qwen3DataGenerator, structured_output={"enabled": False})
+    pipeline = make_generator(MultiStepPipeline, structured_output={"enabled": False})
+    generator.generate_with_qwen3("qwen3:8b", "p", schema="dramatic_irony")
+    generator.generate_with_qwen3("qwen3:8b", "p", data_type="dramatic_irony", step="validation")
+    pipeline.generate_with_qwen3("qwen3:8b", "p", schema="dialogue")
+
+    summary = generator.throughput_summary()
+    assert summary["by_step"]["generation"]["calls"] == 1
+    assert summary["by_step"]["validation"]["calls"] == 1
+    assert summary["by_data_type"]["dramatic_irony"]["eval_tokens"] == 4
+    assert summary["total"]["decode_tokens_per_second"] == 50
+
+    by_step = pipeline.throughput_summary()["by_step"]
+    assert list(by_step) == ["dialogue"]
+    assert list(pipeline.throughput_summary()["by_data_type"]) == ["multi_step_interaction"]